@@ -4,6 +4,7 @@ Complete scraper for all lawyers from Alençon Bar Association
 Clicks on each lawyer to extract their detailed information from modals
 """
 
+import argparse
 import json
 import csv
 import logging
@@ -29,9 +30,11 @@ logging.basicConfig(
     ]
 )
 
-def setup_driver():
+def setup_driver(headless=False):
     """Setup Chrome driver with optimized options"""
     chrome_options = Options()
+    if headless:
+        chrome_options.add_argument('--headless=new')
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('--disable-gpu')
@@ -239,9 +242,9 @@ def find_lawyer_elements(driver):
     logging.info(f"Found {len(filtered_lawyers)} lawyer elements to process")
     return filtered_lawyers
 
-def scrape_all_lawyers():
+def scrape_all_lawyers(headless=False):
     """Main scraping function for all lawyers"""
-    driver = setup_driver()
+    driver = setup_driver(headless)
     lawyers_data = []
     
     try:
@@ -353,9 +356,12 @@ def save_results(lawyers):
         return None, None
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Alençon Bar Association scraper")
+    parser.add_argument('--headless', action='store_true', help="Navigateur sans interface (serveur, lancement groupé)")
+    args = parser.parse_args()
     logging.info("Starting complete Alençon Bar Association scraper...")
     
-    lawyers = scrape_all_lawyers()
+    lawyers = scrape_all_lawyers(headless=args.headless)
     csv_file, json_file = save_results(lawyers)
     
     if csv_file and json_file:
@@ -2,24 +2,144 @@
 # -*- coding: utf-8 -*-
 
 import requests
-import json
-import csv
+import os
 import re
+import sys
 import time
 from datetime import datetime
-from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.async_fetch import AsyncFetchEngine
+from common.checkpoint import CheckpointStore
+from common.consent import ConsentSeed
+from common.dedup import unique_urls
+from common.fast_html import parse_html
+from common.http_cache import ResponseCache, install_cache
+
+# Politesse : plafond de requêtes simultanées et de débit sur barreau-angers.org
+MAX_PARALLEL = 8
+MAX_REQ_PER_SEC = 12.0
+
+# Choix axeptio envoyé dès la première requête, comme le navigateur après le bandeau
+CONSENT = ConsentSeed("https://barreau-angers.org", frameworks=('axeptio',))
+
+def parse_angers_profile(url, html):
+    """Extrait les données d'une fiche avocat d'Angers"""
+    page = parse_html(html)
+    text_content = page.get_text()
+    
+    # Extraction des données
+    lawyer = {'url': url, 'extraction_date': datetime.now().isoformat()}
+    
+    # 1. Nom complet
+    title_tag = page.select_one('h1')
+    if title_tag:
+        full_name = title_tag.get_text().strip()
+        full_name = re.sub(r'^(Me\\.?\\s+|Maître\\s+)', '', full_name, flags=re.IGNORECASE).strip()
+        lawyer['nom_complet'] = full_name
+        
+        # Séparer prénom/nom
+        parts = full_name.split()
+        if len(parts) >= 2:
+            lawyer['prenom'] = parts[0]
+            lawyer['nom'] = ' '.join(parts[1:])
+        else:
+            lawyer['prenom'] = ""
+            lawyer['nom'] = full_name
+    else:
+        lawyer['nom_complet'] = "Non trouvé"
+        lawyer['prenom'] = ""
+        lawyer['nom'] = ""
+    
+    # 2. Email
+    email = None
+    
+    # Recherche mailto
+    mailto_links = page.select('a[href^="mailto:"]')
+    if mailto_links:
+        email = mailto_links[0]['href'].replace('mailto:', '').strip()
+    
+    # Recherche regex dans le texte
+    if not email:
+        email_pattern = r'\\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,}\\b'
+        matches = re.findall(email_pattern, text_content)
+        if matches:
+            email = matches[0]
+    
+    lawyer['email'] = email if email else "Non trouvé"
+    
+    # 3. Adresse
+    address_pattern = r'[^\\n]*49\\d{3}[^\\n]*'
+    address_matches = re.findall(address_pattern, text_content)
+    if address_matches:
+        address = address_matches[0].strip()
+        address = re.sub(r'\\s+', ' ', address)
+        lawyer['adresse'] = address
+    else:
+        lawyer['adresse'] = "Non trouvé"
+    
+    # 4. Année d'inscription
+    year_patterns = [
+        r'inscrit.*?(\\d{4})',
+        r'inscription.*?(\\d{4})',
+        r'barreau.*?(\\d{4})',
+        r'asserment.*?(\\d{4})'
+    ]
+    
+    year = None
+    for pattern in year_patterns:
+        matches = re.findall(pattern, text_content.lower())
+        for match in matches:
+            y = int(match)
+            if 1970 <= y <= 2024:
+                year = str(y)
+                break
+        if year:
+            break
+    
+    lawyer['annee_inscription'] = year if year else "Non trouvé"
+    
+    # 5. Spécialisations
+    specializations = []
+    domains = [
+        'droit civil', 'droit pénal', 'droit commercial', 'droit du travail',
+        'droit de la famille', 'droit immobilier', 'droit des affaires',
+        'droit public', 'droit administratif', 'droit fiscal', 'droit social'
+    ]
+    
+    text_lower = text_content.lower()
+    for domain in domains:
+        if domain in text_lower:
+            specializations.append(domain.title())
+    
+    lawyer['specialisations'] = specializations if specializations else ["Non trouvé"]
+    
+    # 6. Structure
+    if 'cabinet' in text_lower:
+        lawyer['structure'] = "Cabinet"
+    elif any(word in text_lower for word in ['société', 'scpa', 'scp']):
+        lawyer['structure'] = "Société d'avocats"
+    else:
+        lawyer['structure'] = "Exercice individuel"
+    
+    return lawyer
+
 
 def scrape_angers_complete():
     """Scraper de production optimisé pour le barreau d'Angers"""
     
     print("🚀 SCRAPING COMPLET - Barreau d'Angers")
-    print("⏰ Estimation: 5-7 minutes pour 455 avocats")
+    print("⏰ Estimation: moins d'une minute pour 455 avocats")
     
     # Configuration session
     session = requests.Session()
     session.headers.update({
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
     })
+    CONSENT.attach_session(session)
+    
+    # Cache disque : une relance ne récupère que les fiches modifiées
+    cache = install_cache(session, ResponseCache(ttl=0))
     
     start_time = time.time()
     
@@ -30,176 +150,71 @@ def scrape_angers_complete():
         response = session.get("https://barreau-angers.org/annuaire-des-avocats/", timeout=15)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        page = parse_html(response.content)
         
         # Extraire tous les liens d'avocats
         lawyer_links = []
-        for a in soup.find_all('a', href=True):
-            href = a['href']
+        for href in page.links():
             if '/avocat/' in href:
                 if href.startswith('/'):
                     href = f"https://barreau-angers.org{href}"
                 lawyer_links.append(href)
         
-        # Dédupliquer
-        lawyer_links = list(set(lawyer_links))
+        # Dédupliquer (URLs normalisées : "/" final, www., paramètres de suivi)
+        lawyer_links = unique_urls(lawyer_links)
         print(f"✅ {len(lawyer_links)} avocats identifiés")
         
         # Étape 2: Extraction des données
         print("📄 2/3 - Extraction des données...")
         
-        lawyers_data = []
-        errors = []
+        # Reprise : les fiches déjà écrites dans le checkpoint ne sont pas refaites
+        checkpoint = CheckpointStore("angers_checkpoint.jsonl", key='url')
+        todo_links = checkpoint.remaining(lawyer_links)
+        if len(checkpoint):
+            print(f"♻️ Reprise: {len(checkpoint)} fiches déjà extraites, {len(todo_links)} restantes")
         
-        for i, url in enumerate(lawyer_links):
+        def on_profile(lawyer):
+            checkpoint.append(lawyer)
+            n = len(checkpoint)
+            
             # Progress
-            if i % 25 == 0:
+            if n % 25 == 0:
                 elapsed = time.time() - start_time
-                rate = i / elapsed if elapsed > 0 else 0
-                eta_seconds = (len(lawyer_links) - i) / rate if rate > 0 else 0
-                print(f"⏳ {i+1}/{len(lawyer_links)} ({(i+1)/len(lawyer_links)*100:.1f}%) - ETA: {eta_seconds/60:.1f}min")
-            
-            try:
-                # Requête page avocat
-                resp = session.get(url, timeout=10)
-                resp.raise_for_status()
-                
-                soup = BeautifulSoup(resp.content, 'html.parser')
-                text_content = soup.get_text()
-                
-                # Extraction des données
-                lawyer = {'url': url, 'extraction_date': datetime.now().isoformat()}
-                
-                # 1. Nom complet
-                title_tag = soup.find('h1')
-                if title_tag:
-                    full_name = title_tag.get_text().strip()
-                    full_name = re.sub(r'^(Me\\.?\\s+|Maître\\s+)', '', full_name, flags=re.IGNORECASE).strip()
-                    lawyer['nom_complet'] = full_name
-                    
-                    # Séparer prénom/nom
-                    parts = full_name.split()
-                    if len(parts) >= 2:
-                        lawyer['prenom'] = parts[0]
-                        lawyer['nom'] = ' '.join(parts[1:])
-                    else:
-                        lawyer['prenom'] = ""
-                        lawyer['nom'] = full_name
-                else:
-                    lawyer['nom_complet'] = "Non trouvé"
-                    lawyer['prenom'] = ""
-                    lawyer['nom'] = ""
-                
-                # 2. Email
-                email = None
-                
-                # Recherche mailto
-                mailto_links = soup.find_all('a', href=re.compile(r'^mailto:'))
-                if mailto_links:
-                    email = mailto_links[0]['href'].replace('mailto:', '').strip()
-                
-                # Recherche regex dans le texte
-                if not email:
-                    email_pattern = r'\\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,}\\b'
-                    matches = re.findall(email_pattern, text_content)
-                    if matches:
-                        email = matches[0]
-                
-                lawyer['email'] = email if email else "Non trouvé"
-                
-                # 3. Adresse
-                address_pattern = r'[^\\n]*49\\d{3}[^\\n]*'
-                address_matches = re.findall(address_pattern, text_content)
-                if address_matches:
-                    address = address_matches[0].strip()
-                    address = re.sub(r'\\s+', ' ', address)
-                    lawyer['adresse'] = address
-                else:
-                    lawyer['adresse'] = "Non trouvé"
-                
-                # 4. Année d'inscription
-                year_patterns = [
-                    r'inscrit.*?(\\d{4})',
-                    r'inscription.*?(\\d{4})',
-                    r'barreau.*?(\\d{4})',
-                    r'asserment.*?(\\d{4})'
-                ]
-                
-                year = None
-                for pattern in year_patterns:
-                    matches = re.findall(pattern, text_content.lower())
-                    for match in matches:
-                        y = int(match)
-                        if 1970 <= y <= 2024:
-                            year = str(y)
-                            break
-                    if year:
-                        break
-                
-                lawyer['annee_inscription'] = year if year else "Non trouvé"
-                
-                # 5. Spécialisations
-                specializations = []
-                domains = [
-                    'droit civil', 'droit pénal', 'droit commercial', 'droit du travail',
-                    'droit de la famille', 'droit immobilier', 'droit des affaires',
-                    'droit public', 'droit administratif', 'droit fiscal', 'droit social'
-                ]
-                
-                text_lower = text_content.lower()
-                for domain in domains:
-                    if domain in text_lower:
-                        specializations.append(domain.title())
-                
-                lawyer['specialisations'] = specializations if specializations else ["Non trouvé"]
-                
-                # 6. Structure
-                if 'cabinet' in text_lower:
-                    lawyer['structure'] = "Cabinet"
-                elif any(word in text_lower for word in ['société', 'scpa', 'scp']):
-                    lawyer['structure'] = "Société d'avocats"
-                else:
-                    lawyer['structure'] = "Exercice individuel"
-                
-                lawyers_data.append(lawyer)
-                
-            except Exception as e:
-                print(f"\\n❌ Erreur {url}: {e}")
-                errors.append(url)
-            
-            # Pause respectueuse
-            time.sleep(0.3)
-            
-            # Sauvegarde intermédiaire tous les 100
-            if (i + 1) % 100 == 0:
-                backup_file = f"angers_backup_auto_{i+1}_{datetime.now().strftime('%H%M%S')}.json"
-                with open(backup_file, 'w', encoding='utf-8') as f:
-                    json.dump(lawyers_data, f, ensure_ascii=False, indent=2)
-                print(f"\\n💾 Sauvegarde: {backup_file}")
+                rate = n / elapsed if elapsed > 0 else 0
+                eta_seconds = (len(lawyer_links) - n) / rate if rate > 0 else 0
+                print(f"⏳ {n}/{len(lawyer_links)} ({n/len(lawyer_links)*100:.1f}%) - ETA: {eta_seconds/60:.1f}min")
+        
+        # Téléchargement parallèle, débit plafonné par hôte
+        engine = AsyncFetchEngine(max_per_host=MAX_PARALLEL, rate_per_host=MAX_REQ_PER_SEC,
+                                  timeout=10, headers={**session.headers, 'Cookie': CONSENT.cookie_header()},
+                                  cache=cache)
+        engine.fetch_all(todo_links, parse_angers_profile, on_profile)
+        
+        errors = []
+        for url, error in engine.errors:
+            print(f"\\n❌ Erreur {url}: {error}")
+            errors.append(url)
+        engine.print_stats()
+        cache.print_stats()
         
         print(f"\\n🎯 3/3 - Finalisation...")
         
         # Sauvegarde finale
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # JSON
+        # JSON + CSV compactés depuis le checkpoint
         json_file = f"angers_avocats_COMPLET_{timestamp}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(lawyers_data, f, ensure_ascii=False, indent=2)
-        
-        # CSV
         csv_file = f"angers_avocats_COMPLET_{timestamp}.csv"
         fieldnames = ['nom_complet', 'prenom', 'nom', 'email', 'adresse', 
                      'annee_inscription', 'specialisations', 'structure', 'url']
         
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for lawyer in lawyers_data:
-                row = {k: v for k, v in lawyer.items() if k in fieldnames}
-                if isinstance(row.get('specialisations'), list):
-                    row['specialisations'] = '; '.join(row['specialisations'])
-                writer.writerow(row)
+        lawyers_data = checkpoint.compact(json_path=json_file, csv_path=csv_file, fieldnames=fieldnames)
+        
+        # Les fiches en erreur restent à refaire : on ne garde le checkpoint que dans ce cas
+        if errors:
+            checkpoint.close()
+        else:
+            checkpoint.clear()
         
         # Statistiques finales
         total_time = time.time() - start_time
@@ -3,6 +3,8 @@
 
 import time
 import json
+import os
+import sys
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -11,6 +13,12 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.consent import ConsentSeed
+
+# Choix axeptio posé avant la première page : aucun bandeau à cliquer
+CONSENT = ConsentSeed("https://barreau-angers.org", frameworks=('axeptio',))
+
 def setup_driver(headless=False):
     """Configuration du driver Chrome"""
     chrome_options = Options()
@@ -162,14 +170,16 @@ def test_scraper():
         
         # Configuration du driver (mode visible pour le test)
         driver = setup_driver(headless=False)
+        consent_seeded = CONSENT.attach_selenium(driver)
         
         # Aller sur la page d'annuaire
         annuaire_url = "https://barreau-angers.org/annuaire-des-avocats/?recherche=&lieu=&domaine="
         print(f"📋 Accès à l'annuaire: {annuaire_url}")
         driver.get(annuaire_url)
         
-        # Accepter les cookies
-        accept_cookies(driver)
+        # Accepter les cookies (seulement si le consentement n'a pas pu être pré-posé)
+        if not consent_seeded:
+            accept_cookies(driver)
         
         # Attendre que la page soit complètement chargée
         time.sleep(5)
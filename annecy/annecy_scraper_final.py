@@ -4,15 +4,22 @@ Script corrigé pour extraire EXACTEMENT les 302 avocats du Barreau d'Annecy
 Basé sur le diagnostic qui confirme : 20 pages × 15 avocats + 1 page × 2 avocats = 302
 """
 
+import argparse
 import asyncio
 from playwright.async_api import async_playwright
 import pandas as pd
 import json
+import os
+import sys
 from datetime import datetime
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.lean_page import LeanMode
+
 class AnnecyExtractor302:
-    def __init__(self):
+    def __init__(self, headless=False):
+        self.headless = headless
         self.base_url = "https://www.barreau-annecy.com/annuaire/"
         self.lawyers_data = []
         self.stats = {
@@ -20,16 +27,22 @@ class AnnecyExtractor302:
             'lawyers_found': 0,
             'errors': []
         }
+        self.lean = LeanMode(first_party=self.base_url)
     
     async def extract_all_302_lawyers(self):
         """Extraction garantie des 302 avocats"""
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False)
+            browser = await p.chromium.launch(headless=self.headless)
             page = await browser.new_page()
+            # Seul le texte nous intéresse : images, CSS, polices et traceurs bloqués
+            await self.lean.attach(page)
             
             try:
                 print("🎯 DÉMARRAGE EXTRACTION 302 AVOCATS")
-                await page.goto(self.base_url, wait_until='networkidle')
+                # Pagination côté client : la page n'est chargée qu'une fois,
+                # en entier par calibrate (référence) ; le filtre ne s'applique
+                # qu'aux requêtes des changements de page
+                await self.lean.calibrate(page, self.base_url, wait_until='networkidle')
                 await asyncio.sleep(3)
                 
                 # Extraction page par page avec navigation séquentielle
@@ -207,12 +220,17 @@ class AnnecyExtractor302:
         
         if self.stats['errors']:
             print(f"   ⚠️ Erreurs: {len(self.stats['errors'])}")
+        self.lean.stats.print_stats()
 
 async def main():
+    parser = argparse.ArgumentParser(description="Extraction des avocats du barreau d'Annecy")
+    parser.add_argument('--headless', action='store_true', help="Navigateur sans interface (serveur, lancement groupé)")
+    args = parser.parse_args()
+    
     print("🚀 EXTRACTION GARANTIE 302 AVOCATS BARREAU ANNECY")
     print("=" * 50)
     
-    extractor = AnnecyExtractor302()
+    extractor = AnnecyExtractor302(headless=args.headless)
     
     # Phase 1: Extraction des noms
     await extractor.extract_all_302_lawyers()
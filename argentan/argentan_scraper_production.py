@@ -9,6 +9,8 @@ import time
 import random
 import json
 import csv
+import os
+import sys
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -19,16 +21,24 @@ from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
 import re
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.browser_pool import BrowserPool
+
+# Fiche suivante préchargée dans un onglet de fond pendant la pause entre fiches
+PREFETCH_TABS = 2
+
 class ArgentanScraperProduction:
     def __init__(self, headless=True):
         self.headless = headless
         self.base_url = "http://www.barreau-argentan.fr"
         self.list_url = f"{self.base_url}/annuaire/liste-des-avocats-de-a-a-d.html"
         self.lawyers_data = []
-        self.setup_driver()
+        # Navigateur chaud prêté fiche par fiche (self.driver le temps du prêt)
+        self.pool = BrowserPool(tabs=PREFETCH_TABS, driver_factory=self.setup_driver)
+        self.driver = None
     
     def setup_driver(self):
-        """Configuration Chrome optimisée"""
+        """Configuration Chrome optimisée ; retourne le driver"""
         chrome_options = Options()
         ua = UserAgent()
         
@@ -44,8 +54,9 @@ class ArgentanScraperProduction:
         chrome_options.add_experimental_option('useAutomationExtension', False)
         chrome_options.add_argument('--window-size=1366,768')
         
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        return driver
     
     def human_delay(self, min_sec=1, max_sec=3):
         """Délai humain aléatoire"""
@@ -288,7 +299,8 @@ class ArgentanScraperProduction:
             print(f"🕐 Démarrage: {datetime.now().strftime('%H:%M:%S')}")
             
             # Étape 1: Extraire tous les liens
-            lawyer_links = self.extract_all_lawyer_links()
+            with self.pool.lease() as self.driver:
+                lawyer_links = self.extract_all_lawyer_links()
             
             if not lawyer_links:
                 print("❌ Aucun avocat trouvé")
@@ -301,7 +313,9 @@ class ArgentanScraperProduction:
             for i, lawyer_link in enumerate(lawyer_links):
                 print(f"\n[{i+1}/{total_lawyers}] {lawyer_link['name']}")
                 
-                lawyer_data = self.extract_lawyer_data(lawyer_link)
+                with self.pool.lease(lawyer_link['url']) as self.driver:
+                    lawyer_data = self.extract_lawyer_data(lawyer_link)
+                    self.driver.prefetch([link['url'] for link in lawyer_links[i + 1:i + PREFETCH_TABS]])
                 
                 if lawyer_data:
                     self.lawyers_data.append(lawyer_data)
@@ -343,7 +357,8 @@ class ArgentanScraperProduction:
         
         finally:
             print("\n🔧 Fermeture du navigateur...")
-            self.driver.quit()
+            self.pool.print_stats()
+            self.pool.close()
     
     def save_complete_results(self):
         """Sauvegarde complète avec statistiques"""
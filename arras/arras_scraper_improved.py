@@ -6,6 +6,8 @@ Version avec debugging et timeout améliorés
 
 import time
 import json
+import os
+import sys
 import csv
 from datetime import datetime
 from selenium import webdriver
@@ -15,10 +17,17 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.consent import ConsentSeed
+
+# Choix tarteaucitron posé avant la première page : aucun bandeau à cliquer
+CONSENT = ConsentSeed("https://avocatsarras.com", frameworks=('tarteaucitron',))
+
 class ArrasLawyerScraperImproved:
     def __init__(self, headless=False):
         self.headless = headless
         self.driver = None
+        self.consent_seeded = False
         self.base_url = "https://avocatsarras.com/annuaire/"
         self.lawyers_data = []
         
@@ -43,6 +52,7 @@ class ArrasLawyerScraperImproved:
         self.driver.implicitly_wait(5)  # Timeout réduit
         self.driver.set_page_load_timeout(30)  # Timeout page load
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.consent_seeded = CONSENT.attach_selenium(self.driver)
         
     def accept_cookies(self):
         """Accepte les cookies avec timeout réduit"""
@@ -225,7 +235,8 @@ class ArrasLawyerScraperImproved:
             print(f"📂 Navigation vers: {self.base_url}")
             self.driver.get(self.base_url)
             
-            self.accept_cookies()
+            if not self.consent_seeded:
+                self.accept_cookies()
             
             # Analyse de la page
             self.get_page_source_info()
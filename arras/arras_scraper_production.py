@@ -6,12 +6,20 @@ Version sans interaction utilisateur pour lancement direct
 
 import requests
 import json
+import os
+import sys
 from datetime import datetime
 from bs4 import BeautifulSoup
 import re
 import time
 import csv
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.consent import ConsentSeed
+
+# Choix tarteaucitron envoyé dès la première requête, comme le navigateur après le bandeau
+CONSENT = ConsentSeed("https://avocatsarras.com", frameworks=('tarteaucitron',))
+
 class ArrasProductionScraper:
     def __init__(self, delay_between_requests=3):
         self.base_url = "https://avocatsarras.com"
@@ -30,6 +38,7 @@ class ArrasProductionScraper:
             'Accept-Encoding': 'gzip, deflate, br',
             'Connection': 'keep-alive'
         })
+        CONSENT.attach_session(self.session)
     
     def log(self, message, level="INFO"):
         """Logging avec timestamp"""
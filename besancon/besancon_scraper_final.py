@@ -4,10 +4,13 @@ Script de scraping pour extraire les informations des avocats du barreau de Besa
 Utilise Playwright pour gérer le JavaScript et la navigation dynamique
 """
 
+import argparse
 import asyncio
 import csv
 import json
+import os
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -15,6 +18,9 @@ from urllib.parse import urljoin, urlparse
 
 from playwright.async_api import async_playwright, Page, TimeoutError
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.lean_page import LeanMode
+
 
 class BesanconLawyerScraper:
     """Scraper pour les avocats du barreau de Besançon"""
@@ -22,9 +28,11 @@ class BesanconLawyerScraper:
     BASE_URL = "https://www.barreau-besancon-avocat.com"
     SEARCH_URL = f"{BASE_URL}/trouver-un-avocat/lannuaire-des-avocats.htm"
     
-    def __init__(self):
+    def __init__(self, headless: bool = False):
+        self.headless = headless
         self.lawyers_data: List[Dict] = []
         self.visited_urls = set()
+        self.lean = LeanMode(first_party=self.BASE_URL)
         
     async def accept_cookies(self, page: Page) -> None:
         """Accepte les cookies si la bannière est présente"""
@@ -324,7 +332,12 @@ class BesanconLawyerScraper:
         
         try:
             print(f"Visite du profil: {url}")
-            await page.goto(url, wait_until='networkidle')
+            if self.lean.stats.baseline is None:
+                # Première fiche chargée en entier : référence des fiches mesurées ensuite
+                await self.lean.calibrate(page, url, wait_until='networkidle')
+            else:
+                await page.goto(url, wait_until='networkidle')
+                await self.lean.measure(page)
             await page.wait_for_timeout(1000)
             
             info = {'url_profil': url}
@@ -430,9 +443,9 @@ class BesanconLawyerScraper:
     async def scrape(self):
         """Fonction principale de scraping"""
         async with async_playwright() as p:
-            # Lancer le navigateur avec interface graphique pour debug
+            # Interface graphique pour debug, sauf avec --headless
             browser = await p.chromium.launch(
-                headless=False,  # Mode visible pour debug
+                headless=self.headless,
                 args=['--disable-blink-features=AutomationControlled']
             )
             
@@ -441,6 +454,8 @@ class BesanconLawyerScraper:
                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             )
             
+            # Seul le texte nous intéresse : images, CSS, polices et traceurs bloqués
+            await self.lean.attach(context)
             page = await context.new_page()
             
             try:
@@ -491,6 +506,7 @@ class BesanconLawyerScraper:
                 
                 # 6. Sauvegarder les résultats
                 await self.save_results()
+                self.lean.stats.print_stats()
                 
             except Exception as e:
                 print(f"Erreur lors du scraping: {e}")
@@ -543,9 +559,13 @@ class BesanconLawyerScraper:
 
 async def main():
     """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description="Scraper des avocats du barreau de Besançon")
+    parser.add_argument('--headless', action='store_true', help="Navigateur sans interface (serveur, lancement groupé)")
+    args = parser.parse_args()
+    
     print("=== Scraper des avocats du barreau de Besançon ===\n")
     
-    scraper = BesanconLawyerScraper()
+    scraper = BesanconLawyerScraper(headless=args.headless)
     await scraper.scrape()
 
 
@@ -6,9 +6,13 @@ Nettoie les 166 avocats pour obtenir la liste finale propre
 
 import json
 import csv
+import os
 import re
+import sys
 from datetime import datetime
-from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.dedup import LONGEST_POLICIES, DedupIndex
 
 class BonnevilleCleaner:
     def __init__(self):
@@ -106,63 +110,11 @@ class BonnevilleCleaner:
         return True
     
     def deduplicate_by_email(self, lawyers):
-        """Déduplique par email en gardant la meilleure entrée"""
-        email_groups = defaultdict(list)
-        
-        # Grouper par email
-        for lawyer in lawyers:
-            email = lawyer['email'].lower().strip()
-            email_groups[email].append(lawyer)
-        
-        deduplicated = []
-        
-        for email, group in email_groups.items():
-            if len(group) == 1:
-                deduplicated.append(group[0])
-            else:
-                # Choisir la meilleure entrée du groupe
-                best = self.choose_best_entry(group)
-                deduplicated.append(best)
-                self.duplicates_removed += len(group) - 1
-                
-        return deduplicated
-    
-    def choose_best_entry(self, group):
-        """Choisit la meilleure entrée parmi les doublons"""
-        # Scorer chaque entrée
-        scored = []
-        
-        for entry in group:
-            score = 0
-            
-            # Points pour informations complètes
-            if entry.get('telephone') and len(entry['telephone']) > 8:
-                score += 10
-            if entry.get('ville') and len(entry['ville']) > 3:
-                score += 5
-            if entry.get('annee_inscription') and entry['annee_inscription'].isdigit():
-                score += 3
-                
-            # Points pour noms propres (pas tronqués)
-            nom = entry.get('nom', '')
-            prenom = entry.get('prenom', '')
-            
-            if len(nom) > 4:
-                score += 2
-            if len(prenom) > 4:
-                score += 2
-                
-            # Pénalités pour noms tronqués ou étranges
-            if nom.endswith('-'):
-                score -= 5
-            if len(nom) <= 3:
-                score -= 3
-                
-            scored.append((score, entry))
-        
-        # Retourner la meilleure
-        best = max(scored, key=lambda x: x[0])[1]
-        return best
+        """Déduplique par email en fusionnant les doublons champ par champ"""
+        index = DedupIndex(keys=('email',), policies=LONGEST_POLICIES, strict_names=False)
+        index.extend(lawyers)
+        self.duplicates_removed += index.stats['fusions']
+        return index.records()
     
     def enhance_with_common_names(self, lawyers):
         """Enrichit avec des noms d'avocats communs connus"""
@@ -6,10 +6,15 @@ Détecte et élimine les doublons, vérifie la validité des adresses
 
 import json
 import csv
+import os
 import re
+import sys
 from collections import defaultdict, Counter
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.dedup import LONGEST_POLICIES, DedupIndex
+
 class BonnevilleEmailVerifier:
     def __init__(self):
         self.duplicates_found = []
@@ -126,86 +131,23 @@ class BonnevilleEmailVerifier:
         return valid_emails, invalid_emails
     
     def deduplicate_by_email(self, lawyers):
-        """Supprime les doublons en gardant la meilleure entrée"""
+        """Supprime les doublons en fusionnant leurs champs (la valeur la plus complète l'emporte)"""
         print("\n🧹 SUPPRESSION DES DOUBLONS")
         print("=" * 35)
         
-        email_groups = defaultdict(list)
-        
-        # Grouper par email
-        for lawyer in lawyers:
-            email = lawyer.get('email', '').lower().strip()
-            if email:
-                email_groups[email].append(lawyer)
+        index = DedupIndex(keys=('email',), policies=LONGEST_POLICIES, strict_names=False)
+        index.extend(lawyer for lawyer in lawyers if lawyer.get('email', '').strip())
         
-        cleaned_lawyers = []
-        removed_count = 0
+        for lawyer, count in index.groups():
+            nom_complet = f"{lawyer.get('prenom', '')} {lawyer.get('nom', '')}".strip()
+            print(f"📧 {lawyer['email'].lower().strip()} : {count} doublons → 1 fusionné ({nom_complet})")
         
-        for email, group in email_groups.items():
-            if len(group) == 1:
-                # Pas de doublon
-                cleaned_lawyers.append(group[0])
-            else:
-                # Choisir la meilleure entrée
-                best_lawyer = self.choose_best_duplicate(group)
-                cleaned_lawyers.append(best_lawyer)
-                removed_count += len(group) - 1
-                
-                print(f"📧 {email} : {len(group)} doublons → 1 gardé")
-                for i, lawyer in enumerate(group):
-                    nom_complet = f"{lawyer.get('prenom', '')} {lawyer.get('nom', '')}".strip()
-                    status = "✅ GARDÉ" if lawyer == best_lawyer else "❌ supprimé"
-                    print(f"   {i+1}. {nom_complet} - {status}")
-        
-        print(f"\n✅ {removed_count} doublons supprimés")
+        cleaned_lawyers = index.records()
+        print(f"\n✅ {index.stats['fusions']} doublons supprimés")
         print(f"📊 {len(cleaned_lawyers)} avocats uniques dans la liste finale")
         
         return cleaned_lawyers
     
-    def choose_best_duplicate(self, duplicates):
-        """Choisit la meilleure entrée parmi les doublons"""
-        
-        # Scorer chaque entrée
-        scored_duplicates = []
-        
-        for lawyer in duplicates:
-            score = 0
-            
-            # Points pour informations complètes
-            if lawyer.get('telephone') and len(lawyer['telephone']) > 8:
-                score += 10
-            if lawyer.get('ville') and len(lawyer['ville']) > 3:
-                score += 8
-            if lawyer.get('adresse') and len(lawyer['adresse']) > 10:
-                score += 6
-            if lawyer.get('annee_inscription') and lawyer['annee_inscription'].strip():
-                score += 5
-            if lawyer.get('structure') and len(lawyer['structure']) > 5:
-                score += 4
-            if lawyer.get('specialisations') and len(lawyer['specialisations']) > 5:
-                score += 3
-            
-            # Points pour noms complets et corrects
-            nom = lawyer.get('nom', '').strip()
-            prenom = lawyer.get('prenom', '').strip()
-            
-            if len(nom) > 3:
-                score += 2
-            if len(prenom) > 3:
-                score += 2
-                
-            # Bonus pour noms qui semblent corrects (pas tronqués)
-            if nom and not nom.endswith('-') and len(nom) > 4:
-                score += 3
-            if prenom and not prenom.endswith('-') and len(prenom) > 4:
-                score += 3
-            
-            scored_duplicates.append((score, lawyer))
-        
-        # Retourner le meilleur
-        best = max(scored_duplicates, key=lambda x: x[0])[1]
-        return best
-    
     def verify_unique_emails(self, lawyers):
         """Vérification finale de l'unicité des emails"""
         print("\n🔍 VÉRIFICATION FINALE DE L'UNICITÉ")
@@ -4,11 +4,12 @@ Scraper exhaustif pour le Barreau de Bonneville
 Recense d'abord TOUTES les fiches d'avocats avant extraction
 """
 
+import os
+import sys
 import time
 import json
 import csv
 import requests
-import fitz  # PyMuPDF
 import re
 from datetime import datetime
 from selenium import webdriver
@@ -18,6 +19,12 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.pdf_engine import extract_text
+
+# PyMuPDF d'abord (plus précis), pypdf/PyPDF2 pour les pages où il ne donne rien
+PDF_BACKENDS = ('pymupdf', 'pypdf')
+
 class BonnevilleExhaustiveScraper:
     def __init__(self, headless=True):
         self.base_url = "https://www.ordre-avocats-bonneville.com/barreau-bonneville-pays-mont-blanc/annuaire-avocats/"
@@ -60,17 +67,9 @@ class BonnevilleExhaustiveScraper:
                 
             print(f"✅ PDF téléchargé : {pdf_filename}")
             
-            # Extraire le texte complet
-            doc = fitz.open(pdf_filename)
-            full_text = ""
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                page_text = page.get_text()
-                full_text += f"\n=== PAGE {page_num + 1} ===\n"
-                full_text += page_text
-                
-            doc.close()
+            # Extraire le texte complet (pages en parallèle, cache par contenu du PDF)
+            full_text = extract_text(pdf_filename, template="\n=== PAGE {page} ===\n{text}",
+                                     backends=PDF_BACKENDS)
             
             # Sauvegarder le texte complet pour analyse
             with open("bonneville_pdf_complet.txt", "w", encoding='utf-8') as f:
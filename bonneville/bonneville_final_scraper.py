@@ -5,12 +5,11 @@ Extrait toutes les données des avocats depuis le PDF du tableau
 """
 
 import os
+import sys
 import json
 import csv
 import time
 import requests
-import PyPDF2
-import fitz  # PyMuPDF
 import re
 from datetime import datetime
 from selenium import webdriver
@@ -19,6 +18,12 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.pdf_engine import extract_pages
+
+# PyMuPDF d'abord (plus précis), pypdf/PyPDF2 pour les pages où il ne donne rien
+PDF_BACKENDS = ('pymupdf', 'pypdf')
+
 class BonnevilleFinalScraper:
     def __init__(self, headless=True):
         self.base_url = "https://www.ordre-avocats-bonneville.com/barreau-bonneville-pays-mont-blanc/annuaire-avocats/"
@@ -73,33 +78,15 @@ class BonnevilleFinalScraper:
         text_content = ""
         
         try:
-            # Essayer avec PyMuPDF d'abord (plus précis)
-            doc = fitz.open(pdf_path)
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text_content += page.get_text()
-                
-            doc.close()
-            print(f"✅ Texte extrait avec PyMuPDF ({len(text_content)} caractères)")
+            # Moteur choisi page par page : PyPDF2 ne reprend que les pages où PyMuPDF échoue
+            pages = extract_pages(pdf_path, backends=PDF_BACKENDS)
+            text_content = "".join(page['text'] for page in pages)
+            engines = sorted({page['backend'] for page in pages if page['backend']})
+            print(f"✅ Texte extrait avec {', '.join(engines)} ({len(text_content)} caractères)")
             
         except Exception as e:
-            print(f"⚠️ Échec PyMuPDF : {e}, essai avec PyPDF2...")
-            
-            # Fallback avec PyPDF2
-            try:
-                with open(pdf_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    
-                    for page_num in range(len(pdf_reader.pages)):
-                        page = pdf_reader.pages[page_num]
-                        text_content += page.extract_text()
-                        
-                print(f"✅ Texte extrait avec PyPDF2 ({len(text_content)} caractères)")
-                
-            except Exception as e2:
-                print(f"❌ Erreur extraction PDF : {e2}")
-                return None
+            print(f"❌ Erreur extraction PDF : {e}")
+            return None
                 
         # Sauvegarder le texte brut pour debug
         with open("bonneville_pdf_text.txt", "w", encoding='utf-8') as f:
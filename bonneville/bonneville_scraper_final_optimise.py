@@ -9,11 +9,17 @@ import re
 import csv
 import json
 import time
+import sys
 import requests
-import fitz
 from datetime import datetime
 from collections import defaultdict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.pdf_engine import extract_text
+
+# PyMuPDF d'abord (plus précis), pypdf/PyPDF2 pour les pages où il ne donne rien
+PDF_BACKENDS = ('pymupdf', 'pypdf')
+
 class BonnevilleFinalOptimizedScraper:
     def __init__(self):
         self.pdf_url = "https://www.ordre-avocats-bonneville.com/wp-content/uploads/2025/04/TABLEAU-ORDRE-2025.pdf"
@@ -42,14 +48,7 @@ class BonnevilleFinalOptimizedScraper:
         print("📖 Extraction exhaustive du PDF...")
         
         try:
-            doc = fitz.open(pdf_path)
-            full_text = ""
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                full_text += page.get_text()
-                
-            doc.close()
+            full_text = extract_text(pdf_path, template='{text}', backends=PDF_BACKENDS)
             
             # Parser tous les avocats avec patterns multiples
             lawyers = self.parse_lawyers_exhaustive(full_text)
@@ -10,10 +10,16 @@ import re
 import csv
 import json
 import time
+import sys
 import requests
-import fitz  # PyMuPDF
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.pdf_engine import extract_text
+
+# PyMuPDF d'abord (plus précis), pypdf/PyPDF2 pour les pages où il ne donne rien
+PDF_BACKENDS = ('pymupdf', 'pypdf')
+
 class BonnevilleProductionScraper:
     def __init__(self):
         self.pdf_url = "https://www.ordre-avocats-bonneville.com/wp-content/uploads/2025/04/TABLEAU-ORDRE-2025.pdf"
@@ -43,18 +49,11 @@ class BonnevilleProductionScraper:
             return None
     
     def extract_text_from_pdf(self, pdf_path):
-        """Extrait le texte du PDF avec PyMuPDF"""
+        """Extrait le texte du PDF avec PyMuPDF (pages en parallèle, cache par contenu)"""
         print("📖 Extraction du texte...")
         
         try:
-            doc = fitz.open(pdf_path)
-            text_content = ""
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text_content += page.get_text()
-                
-            doc.close()
+            text_content = extract_text(pdf_path, template='{text}', backends=PDF_BACKENDS)
             print(f"✅ Texte extrait ({len(text_content)} caractères)")
             return text_content
             
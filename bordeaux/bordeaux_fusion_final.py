@@ -8,38 +8,24 @@ Croise les données principales avec les spécialisations
 
 import json
 import csv
+import os
+import sys
 import pandas as pd
 from datetime import datetime
 from collections import defaultdict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.linkage import DEFAULT_THRESHOLD, link, print_report
+from common.normalize import normalize_frame, to_records
+
 class BordeauxFusionFinal:
     def __init__(self):
         self.main_file = 'bordeaux_CORRIGÉ_COMPLET_20260210_165557.csv'
         self.specialisations_file = 'bordeaux_specialisations_relations_20260210_170101.csv'
+        # Score minimal (0-1) d'un rapprochement de noms approché
+        self.match_threshold = DEFAULT_THRESHOLD
+        self.match_report = None
         
-    def normalize_name(self, name):
-        """Normalise un nom pour la comparaison"""
-        # Enlever les espaces multiples, convertir en majuscules
-        normalized = ' '.join(name.strip().upper().split())
-        # Enlever les caractères spéciaux communs
-        normalized = normalized.replace('-', ' ').replace('\'', ' ').replace('.', ' ')
-        return normalized
-    
-    def extract_name_parts_from_concat(self, concat_name):
-        """Extrait nom et prénom d'un nom concaténé comme 'DURANDPierre' """
-        # Chercher où finit le nom (généralement avant une majuscule)
-        import re
-        
-        # Pattern : majuscules suivies d'au moins une majuscule + minuscule (= début prénom)
-        match = re.match(r'^([A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜÇ-]+)([A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜÇ][a-zàâäéèêëïîôöùûüç-]+.*)$', concat_name)
-        
-        if match:
-            nom_part = match.group(1)
-            prenom_part = match.group(2)
-            return nom_part.strip(), prenom_part.strip()
-        
-        return None, None
-    
     def load_main_data(self):
         """Charge les données principales"""
         print("Chargement des données principales...")
@@ -57,49 +43,17 @@ class BordeauxFusionFinal:
         """Charge les données de spécialisations"""
         print("Chargement des spécialisations...")
         
-        # Grouper par avocat
+        # Grouper par avocat, sous le nom tel qu'exporté ("DURANDPierre")
         specialisations_by_lawyer = defaultdict(list)
         
         with open(self.specialisations_file, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row in reader:
-                nom_complet_concat = row['nom_complet']
-                specialisation = row['specialisation']
-                
-                # Extraire nom et prénom du format concaténé
-                nom, prenom = self.extract_name_parts_from_concat(nom_complet_concat)
-                
-                if nom and prenom:
-                    # Créer plusieurs variantes normalisées pour la recherche
-                    variants = [
-                        self.normalize_name(f"{prenom} {nom}"),  # Pierre DURAND
-                        self.normalize_name(f"{nom} {prenom}"),  # DURAND Pierre  
-                        self.normalize_name(nom_complet_concat), # DURANDPierre
-                    ]
-                    
-                    for variant in variants:
-                        specialisations_by_lawyer[variant].append(specialisation)
+                specialisations_by_lawyer[row['nom_complet']].append(row['specialisation'])
         
-        print(f"  ✅ {len(specialisations_by_lawyer)} variantes de noms avec spécialisations")
+        print(f"  ✅ {len(specialisations_by_lawyer)} avocats avec spécialisations")
         return specialisations_by_lawyer
     
-    def find_matching_lawyer(self, main_lawyer, specialisations_data):
-        """Trouve les spécialisations d'un avocat"""
-        # Essayer plusieurs variantes du nom
-        nom_complet = main_lawyer['nom_complet']
-        
-        search_variants = [
-            self.normalize_name(nom_complet),
-            self.normalize_name(f"{main_lawyer['prenom']} {main_lawyer['nom']}"),
-            self.normalize_name(f"{main_lawyer['nom']} {main_lawyer['prenom']}"),
-        ]
-        
-        for variant in search_variants:
-            if variant in specialisations_data:
-                return specialisations_data[variant]
-        
-        return []
-    
     def merge_data(self):
         """Fusionne les données principales avec les spécialisations"""
         print("\n=== FUSION DES DONNÉES ===")
@@ -114,9 +68,15 @@ class BordeauxFusionFinal:
         matches_found = 0
         total_specialisations_added = 0
         
+        # Rapprochement approché des noms (fautes de frappe, accents, noms composés)
+        names = list(specialisations_data)
+        matches, self.match_report = link(
+            [(lawyer['prenom'], lawyer['nom']) for lawyer in main_data], names, self.match_threshold)
+        print_report(self.match_report)
+        
         # Fusionner
-        for lawyer in main_data:
-            specialisations = self.find_matching_lawyer(lawyer, specialisations_data)
+        for lawyer, (row, score) in zip(main_data, matches):
+            specialisations = specialisations_data[names[row]] if row is not None else []
             
             if specialisations:
                 matches_found += 1
@@ -128,6 +88,10 @@ class BordeauxFusionFinal:
         print(f"  ✅ {matches_found} avocats avec spécialisations trouvées")
         print(f"  ✅ {total_specialisations_added} spécialisations ajoutées au total")
         
+        # Téléphones, emails et codes postaux normalisés en une passe sur tout le jeu
+        main_data = to_records(normalize_frame(main_data, separator='.'))
+        print(f"  ✅ Coordonnées normalisées ({len(main_data)} fiches)")
+        
         return main_data, matches_found, total_specialisations_added
     
     def save_final_data(self, merged_data, matches_found, total_specialisations):
@@ -209,6 +173,12 @@ class BordeauxFusionFinal:
             for spec, count in top_specs:
                 f.write(f"- {spec}: {count} avocats\n")
             
+            if self.match_report and self.match_report['revue']:
+                f.write(f"\nRAPPROCHEMENTS APPROCHÉS À VÉRIFIER (seuil {self.match_report['seuil']}):\n")
+                f.write("-"*40 + "\n")
+                for (prenom, nom), exported, score in self.match_report['revue']:
+                    f.write(f"- {prenom} {nom} <- {exported} ({score})\n")
+            
             f.write(f"\n" + "="*70 + "\n")
             f.write("FICHIERS GÉNÉRÉS:\n")
             f.write(f"- {csv_filename} (données complètes CSV)\n")
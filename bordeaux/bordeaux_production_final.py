@@ -7,9 +7,10 @@ Basé sur la méthode qui fonctionne à 100%
 """
 
 import json
+import os
 import re
+import sys
 import time
-import requests
 from datetime import datetime
 from bs4 import BeautifulSoup
 import csv
@@ -17,6 +18,12 @@ import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.checkpoint import CheckpointStore
+from common.http_cache import ResponseCache, install_cache
+from common.http_client import PooledHttpClient
+from common.normalize import normalize_phone
+
 class BordeauxProductionScraper:
     def __init__(self, max_workers=10):
         self.base_url = "https://www.barreau-bordeaux.com"
@@ -26,6 +33,18 @@ class BordeauxProductionScraper:
         self.max_workers = max_workers
         self.processed = 0
         
+        # Session partagée : pool keep-alive dimensionné sur les workers
+        self.http = PooledHttpClient(max_workers=max_workers, headers={
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'fr-FR,fr;q=0.9'
+        })
+        # Les recherches déjà faites sont revalidées au lieu d'être retéléchargées
+        self.cache = install_cache(self.http, ResponseCache(ttl=0))
+        
+        # Reprise : une ligne JSONL par avocat trouvé
+        self.checkpoint = CheckpointStore('bordeaux_checkpoint.jsonl', key='nom_complet')
+        
     def extract_email(self, text):
         """Extrait un email du texte"""
         pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
@@ -36,29 +55,16 @@ class BordeauxProductionScraper:
         return None
         
     def extract_phone(self, text):
-        """Extrait un téléphone du texte"""
-        pattern = r'(?:0|\+33\s?)[1-9](?:[\s.-]?\d{2}){4}'
-        matches = re.findall(pattern, text)
-        if matches:
-            phone = re.sub(r'[^\d]', '', matches[0])
-            if phone.startswith('33'):
-                phone = '0' + phone[2:]
-            if len(phone) == 10:
-                return '.'.join([phone[i:i+2] for i in range(0, 10, 2)])
-        return None
+        """Extrait un téléphone du texte (format 01.23.45.67.89)"""
+        return normalize_phone(text, separator='.')
         
     def search_lawyer(self, lawyer_data):
         """Recherche un avocat"""
         nom = lawyer_data['nom']
         prenom = lawyer_data['prenom']
         
-        # Session avec headers
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'fr-FR,fr;q=0.9'
-        })
+        # Session partagée entre les workers
+        session = self.http.session
         
         results = {}
         
@@ -162,6 +168,7 @@ class BordeauxProductionScraper:
                         **info
                     }
                     self.results.append(result)
+                    self.checkpoint.append(result)
                     
                     # Affichage progression
                     if self.processed % 10 == 0:
@@ -170,9 +177,9 @@ class BordeauxProductionScraper:
                 else:
                     self.failed.append(lawyer_data)
                     
-                # Sauvegarde intermédiaire tous les 100
                 if self.processed % 100 == 0:
-                    self.save_intermediate()
+                    print(">>> Checkpoint: %d traités, %d trouvés" % 
+                         (self.processed, len(self.results)))
                     
         except Exception as e:
             with self.lock:
@@ -182,20 +189,6 @@ class BordeauxProductionScraper:
         # Petite pause aléatoire
         time.sleep(random.uniform(0.3, 1.0))
         
-    def save_intermediate(self):
-        """Sauvegarde intermédiaire"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        with open('bordeaux_intermediate_%s.json' % timestamp, 'w', encoding='utf-8') as f:
-            json.dump({
-                'processed': self.processed,
-                'found': len(self.results),
-                'results': self.results
-            }, f, ensure_ascii=False)
-            
-        print(">>> Sauvegarde intermédiaire: %d traités, %d trouvés" % 
-             (self.processed, len(self.results)))
-             
     def save_final(self):
         """Sauvegarde finale complète"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -294,6 +287,13 @@ class BordeauxProductionScraper:
         else:
             print("Mode complet: %d avocats" % len(all_lawyers))
             
+        # Reprise après interruption : on saute les avocats déjà trouvés
+        if len(self.checkpoint):
+            self.results = self.checkpoint.records()
+            all_lawyers = self.checkpoint.remaining(all_lawyers, key=lambda l: l['nom_complet'])
+            print("Reprise: %d avocats déjà en checkpoint, %d restants" % 
+                 (len(self.results), len(all_lawyers)))
+            
         print("Workers parallèles: %d" % self.max_workers)
         print("Démarrage...\n")
         
@@ -308,8 +308,9 @@ class BordeauxProductionScraper:
         # Temps total
         duration = time.time() - start_time
         
-        # Sauvegarder les résultats finaux
+        # Sauvegarder les résultats finaux puis repartir de zéro au prochain run
         timestamp = self.save_final()
+        self.checkpoint.clear()
         
         # Afficher le résumé
         print("\n" + "="*70)
@@ -324,6 +325,8 @@ class BordeauxProductionScraper:
         print("- Emails trouvés: %d" % sum(1 for r in self.results if r.get('email')))
         print("- Téléphones trouvés: %d" % sum(1 for r in self.results if r.get('telephone')))
         print("\nFichiers créés: bordeaux_*_%s.*" % timestamp)
+        self.http.print_stats()
+        self.cache.print_stats()
         print("="*70)
 
 if __name__ == "__main__":
@@ -20,7 +20,9 @@ Usage:
 import time
 import json
 import csv
+import os
 import re
+import sys
 import argparse
 from datetime import datetime
 from selenium import webdriver
@@ -31,6 +33,12 @@ from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.frontier import CrawlFrontier
+from common.waits import AdaptiveDelay, wait_for_any, wait_for_dom_stable, wait_for_selector
+
+PLUS_INFO_XPATH = "//a[contains(text(), \"Plus d'infos\")]"
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -43,6 +51,10 @@ class BrestLawyerScraper:
         self.base_url = "https://www.avocats-brest.fr/avocats/"
         self.all_lawyers = []
         self.test_mode = test_mode
+        # État des pages sur disque : un crash reprend à la première page non faite
+        self.frontier = CrawlFrontier("brest_%s_frontier.sqlite" % ('test' if test_mode else 'complet'))
+        # Pauses entre pages calées sur le temps de réponse réel du site
+        self.pacer = AdaptiveDelay(min_delay=0.5, max_delay=4)
         
     def setup_driver(self, headless=True):
         """Configure le driver Chrome avec options anti-détection"""
@@ -68,7 +80,6 @@ class BrestLawyerScraper:
         """Gère l'acceptation automatique des cookies"""
         try:
             logger.info("Vérification des cookies...")
-            time.sleep(3)
             
             cookie_buttons = [
                 "//button[contains(text(), 'Accepter')]",
@@ -78,22 +89,13 @@ class BrestLawyerScraper:
                 "#accept-cookies"
             ]
             
-            for selector in cookie_buttons:
-                try:
-                    if selector.startswith("//"):
-                        button = WebDriverWait(self.driver, 3).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                    else:
-                        button = WebDriverWait(self.driver, 3).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                        )
-                    button.click()
-                    logger.info("Cookies acceptés")
-                    time.sleep(2)
-                    return True
-                except TimeoutException:
-                    continue
+            # Une seule attente pour tous les sélecteurs (et non 3s par bouton absent)
+            _, button = wait_for_any(self.driver, cookie_buttons, timeout=5)
+            if button:
+                button.click()
+                logger.info("Cookies acceptés")
+                wait_for_dom_stable(self.driver, timeout=5)
+                return True
                     
             logger.info("Pas de banner de cookies détecté")
             return True
@@ -105,12 +107,11 @@ class BrestLawyerScraper:
     def extract_lawyer_data_from_page(self):
         """Extrait les données des avocats depuis la page courante"""
         try:
-            # Attendre le chargement
-            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(2)
+            # Attendre que la liste ne bouge plus
+            wait_for_dom_stable(self.driver, timeout=10)
             
             # Chercher tous les liens "Plus d'infos"
-            plus_info_links = self.driver.find_elements(By.XPATH, "//a[contains(text(), \"Plus d'infos\")]")
+            plus_info_links = self.driver.find_elements(By.XPATH, PLUS_INFO_XPATH)
             
             lawyers_data = []
             
@@ -187,15 +188,15 @@ class BrestLawyerScraper:
                 url = f"{self.base_url}?page_job={page_num}"
             
             logger.info(f"📖 Page {page_num}: {url}")
-            self.driver.get(url)
-            
-            # Attendre le chargement
-            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(3)
+            with self.pacer.timed():
+                self.driver.get(url)
+                # Attendre le premier avocat plutôt qu'une durée fixe
+                wait_for_selector(self.driver, PLUS_INFO_XPATH, timeout=20)
             
             # Vérifier qu'on a des avocats
-            plus_info_links = self.driver.find_elements(By.XPATH, "//a[contains(text(), \"Plus d'infos\")]")
+            plus_info_links = self.driver.find_elements(By.XPATH, PLUS_INFO_XPATH)
             if not plus_info_links:
+                self.pacer.penalize()
                 logger.warning(f"❌ Aucun avocat trouvé sur la page {page_num}")
                 return False
             
@@ -239,7 +240,7 @@ class BrestLawyerScraper:
             
             # Aller sur la première page
             self.driver.get(self.base_url)
-            time.sleep(3)
+            wait_for_dom_stable(self.driver, timeout=15)
             
             # Accepter les cookies
             self.accept_cookies()
@@ -247,27 +248,34 @@ class BrestLawyerScraper:
             # Déterminer le nombre total de pages
             total_pages = self.get_total_pages()
             
-            all_lawyers = []
+            self.frontier.add('page', range(1, total_pages + 1))
+            pages_todo = [int(page) for page in self.frontier.todo('page')]
+            if len(pages_todo) < total_pages:
+                logger.info(f"♻️  Reprise: {total_pages - len(pages_todo)} pages déjà extraites")
             
-            for page_num in range(1, total_pages + 1):
+            for page_num in pages_todo:
                 logger.info(f"\n📄 === PAGE {page_num}/{total_pages} ===")
+                self.frontier.start('page', page_num)
                 
                 # Naviguer vers la page
                 if not self.navigate_to_page(page_num):
                     logger.warning(f"⏭️  Impossible de charger la page {page_num} - passage à la suivante")
+                    self.frontier.failed('page', page_num, 'navigation')
                     continue
                 
                 # Extraire les données
                 page_lawyers = self.extract_lawyer_data_from_page()
-                all_lawyers.extend(page_lawyers)
+                self.frontier.done('page', page_num, page_lawyers)
                 
-                logger.info(f"📊 Total cumulé: {len(all_lawyers)} avocats")
+                logger.info(f"📊 Page {page_num}: {len(page_lawyers)} avocats")
                 
                 # Pause entre les pages pour respecter le serveur
-                time.sleep(2)
+                self.pacer.sleep()
             
+            all_lawyers = [lawyer for page in self.frontier.results('page') for lawyer in page]
             self.all_lawyers = all_lawyers
             logger.info(f"\n🎉 === SCRAPING TERMINÉ: {len(all_lawyers)} avocats extraits ===")
+            self.pacer.print_stats()
             return all_lawyers
             
         except Exception as e:
@@ -373,6 +381,10 @@ def main():
             prefix = "brest_test" if test_mode else "brest_complet"
             scraper.save_results(results, prefix)
             
+            # Crawl complet : le prochain run repart de la page 1
+            if not scraper.frontier.todo('page'):
+                scraper.frontier.reset()
+            
             print(f"\n🎉 === SCRAPING RÉUSSI ===")
             print(f"👥 {len(results)} avocats extraits")
             
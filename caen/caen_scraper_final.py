@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
+import os
+import sys
 import requests
-from bs4 import BeautifulSoup
 import csv
 import time
 import re
 from urllib.parse import urljoin
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.fast_html import make_soup
+
 def scrape_caen_lawyers_final():
     """
     Scraper final pour l'annuaire des avocats du barreau de Caen
@@ -110,7 +114,7 @@ def scrape_caen_lawyers_final():
         response = session.get(page_a_url)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         
         # Chercher les divs qui contiennent des avocats
         # 1. Par classe spécifique
@@ -156,7 +160,7 @@ def scrape_caen_lawyers_final():
                     response = session.get(page_url)
                     response.raise_for_status()
                     
-                    soup = BeautifulSoup(response.content, 'html.parser')
+                    soup = make_soup(response.content)
                     
                     # Utiliser la même méthode que pour la page A
                     lawyer_divs = soup.find_all('div', class_=lambda x: x and 'annuaire' in ' '.join(x) and 'listview' in ' '.join(x))
@@ -6,6 +6,8 @@ Version headless avec extraction complète et correction des noms
 
 import time
 import json
+import os
+import sys
 import csv
 import re
 from datetime import datetime
@@ -16,11 +18,18 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.consent import ConsentSeed
+
+# Choix tarteaucitron posé avant la première page : aucun bandeau à cliquer
+CONSENT = ConsentSeed("https://avocats-castres.fr", frameworks=('tarteaucitron',))
+
 class CastresScraperFinal:
     def __init__(self, headless=True, max_lawyers=None):
         self.headless = headless
         self.max_lawyers = max_lawyers  # Pour limiter si besoin
         self.driver = None
+        self.consent_seeded = False
         self.lawyers = []
         
     def setup_driver(self):
@@ -46,6 +55,7 @@ class CastresScraperFinal:
         
         self.driver = webdriver.Chrome(options=chrome_options)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.consent_seeded = CONSENT.attach_selenium(self.driver)
         
         # Timeouts optimisés
         self.driver.set_page_load_timeout(30)
@@ -360,8 +370,9 @@ class CastresScraperFinal:
             self.driver.get("https://avocats-castres.fr/annuaire-avocats/")
             time.sleep(3)
             
-            # Gestion cookies
-            self.accept_cookies()
+            # Gestion cookies (seulement si le consentement n'a pas pu être pré-posé)
+            if not self.consent_seeded:
+                self.accept_cookies()
             
             # Récupération des liens
             lawyer_links = self.get_lawyer_links()
@@ -6,6 +6,8 @@ Phase 2: Extraction complète des informations d'avocats
 
 import time
 import json
+import os
+import sys
 import csv
 import re
 from datetime import datetime
@@ -16,10 +18,17 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.consent import ConsentSeed
+
+# Choix tarteaucitron posé avant la première page : aucun bandeau à cliquer
+CONSENT = ConsentSeed("https://avocats-castres.fr", frameworks=('tarteaucitron',))
+
 class CastresScraperImproved:
     def __init__(self, headless=False):
         self.headless = headless
         self.driver = None
+        self.consent_seeded = False
         self.lawyers = []
         
     def setup_driver(self):
@@ -40,6 +49,7 @@ class CastresScraperImproved:
         
         self.driver = webdriver.Chrome(options=chrome_options)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.consent_seeded = CONSENT.attach_selenium(self.driver)
         
         return self.driver
         
@@ -347,8 +357,9 @@ class CastresScraperImproved:
             self.driver.get("https://avocats-castres.fr/annuaire-avocats/")
             time.sleep(5)
             
-            # Gestion cookies
-            self.accept_cookies()
+            # Gestion cookies (seulement si le consentement n'a pas pu être pré-posé)
+            if not self.consent_seeded:
+                self.accept_cookies()
             
             # Récupération des liens
             lawyer_links = self.get_lawyer_links()
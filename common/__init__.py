@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""
+Briques communes partagées par les scrapers des différents barreaux.
+
+Les scripts situés dans un sous-dossier (bordeaux/, angers/, ...) ajoutent
+le dossier racine du dépôt à sys.path avant d'importer ``common``.
+"""
@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Annuaires des barreaux publiés avec le CMS "annuaireFicheMini"
+Agen, Cambrai, l'Essonne, la Guyane, Mont-de-Marsan et Les Sables-d'Olonne
+partagent le même annuaire : formulaire frmAnnuaire, cartes
+.annuaireFicheMini, fiches /maitre-prenom-nom-ID.htm. Tout passe par HTTP
+simple, sans navigateur : soumission du formulaire, pages de la liste, puis
+fiches téléchargées en parallèle sur un pool de connexions pendant que la
+liste défile. Un barreau de plus sur ce CMS = une entrée de BARS.
+
+Usage:
+    python -m common.annuaire_cms list
+    python -m common.annuaire_cms scrape agen --limit 5
+"""
+
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+
+from common.dedup import DedupIndex
+from common.email_decoder import decode_email, find_email
+from common.fast_html import parse_html
+from common.http_client import PooledHttpClient
+
+DEFAULT_WORKERS = 6
+DEFAULT_TIMEOUT = 20
+DEFAULT_MAX_PAGES = 200
+
+# `split` : champ du formulaire dont chaque option est soumise à part
+# (l'annuaire de Cambrai n'affiche rien sans ville choisie)
+BARS = {
+    'agen': {
+        'name': "Barreau d'Agen",
+        'url': "https://www.barreau-agen.fr/annuaire-des-avocats/liste-et-recherche.htm",
+    },
+    'cambrai': {
+        'name': "Barreau de Cambrai",
+        'url': "https://www.avocats-cambrai.com/annuaire",
+        'split': 'ville',
+    },
+    'essonne': {
+        'name': "Barreau de l'Essonne",
+        'url': "https://www.avocats91.com/lordre-des-avocats/annuaire-des-avocats.htm",
+    },
+    'guyane': {
+        'name': "Barreau de la Guyane",
+        'url': "https://www.avocats-barreau-guyane.com/annuaire-des-avocats.htm",
+    },
+    'mont-de-marsan': {
+        'name': "Barreau de Mont-de-Marsan",
+        'url': "https://www.barreau-montdemarsan.org/barreau-de-mont-de-marsan/annuaire-des-avocats.htm",
+    },
+    'sables-d-olonne': {
+        'name': "Barreau des Sables-d'Olonne",
+        'url': "https://www.barreaudessablesdolonne.fr/annuaire-des-avocats/liste-des-avocats.htm",
+    },
+}
+
+FIELDS = ('civilite', 'prenom', 'nom', 'nom_complet', 'type', 'structure', 'adresse', 'code_postal', 'ville',
+          'cour_appel', 'telephone', 'fax', 'email', 'annee_inscription', 'specialisations', 'site_web',
+          'detail_url', 'contact_url')
+
+CARD_SELECTOR = '.annuaireFicheMini'
+PROFILE_LINK_RE = re.compile(r"/(?:maitre|monsieur|madame)-([a-z0-9-]+?)-\d+\.htm", re.IGNORECASE)
+OATH_RE = re.compile(r"Prestation\s*de\s*serment\s*:?\s*(?:</span>)?\s*(?:\d{1,2}/\d{1,2}/)?(\d{4})", re.IGNORECASE)
+YEAR_RE = re.compile(r"\b(19[5-9]\d|20[0-4]\d)\b")
+CPVILLE_RE = re.compile(r"\b(\d{5})\s+(.+)")
+TITLE_RE = re.compile(r"^(?:Ma[iî]tre|Me\.?|Monsieur|Madame|M\.|Mme)\s+", re.IGNORECASE)
+_PHONE_LABEL_RE = re.compile(r"^\s*(?:T[ée]l(?:[ée]phone)?|Fax)\s*\.?\s*:?\s*", re.IGNORECASE)
+_NEXT_TEXTS = ('suivant', 'suivante', '»', '›', '>')
+
+
+def clean(text):
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+def _text(node, selector):
+    found = node.select_one(selector)
+    return clean(found.get_text(' ')) if found is not None else ''
+
+
+def split_cpville(value):
+    """"40000 MONT DE MARSAN" -> ('40000', 'MONT DE MARSAN')"""
+    value = clean(value)
+    match = CPVILLE_RE.search(value)
+    return (match.group(1), match.group(2)) if match else ('', value)
+
+
+def split_name(full_name):
+    """
+    "Maître Jean-Paul DE LA TOUR" -> ('Jean-Paul', 'DE LA TOUR').
+
+    Le nom commence au premier mot en majuscules (noms composés "CHOW
+    CHINE", "EL ALLAOUI") ; sans mot en majuscules, le dernier mot.
+    """
+    words = TITLE_RE.sub('', clean(full_name)).split()
+    if not words:
+        return '', ''
+    upper = [i for i, word in enumerate(words) if word.isupper() and len(word.strip('.-')) > 1]
+    if upper and upper[0] > 0:
+        return ' '.join(words[:upper[0]]), ' '.join(words[upper[0]:])
+    if upper:
+        # "DUPONT Jean" : les majuscules en tête forment le nom
+        end = upper[0]
+        while end + 1 < len(words) and end + 1 in upper:
+            end += 1
+        return ' '.join(words[end + 1:]), ' '.join(words[:end + 1])
+    return ' '.join(words[:-1]), words[-1]
+
+
+def name_from_url(url):
+    """Secours : "maitre-jean-philippe-kurtek-15.htm" -> ('Jean-Philippe', 'KURTEK')"""
+    match = PROFILE_LINK_RE.search(url or '')
+    if not match:
+        return '', ''
+    parts = match.group(1).split('-')
+    return '-'.join(parts[:-1]).title(), parts[-1].upper()
+
+
+def clean_phone(value):
+    return clean(_PHONE_LABEL_RE.sub('', clean(value)))
+
+
+# --- Cartes de la liste ---------------------------------------------------
+
+def _href(node, selector, base_url):
+    link = node.select_one(selector)
+    href = link.get('href') if link is not None else None
+    return urljoin(base_url, href) if href and not href.startswith(('#', 'javascript:')) else ''
+
+
+def parse_card(card, base_url):
+    """Fiche d'une carte .annuaireFicheMini (champs de FIELDS, vides si absents)"""
+    record = dict.fromkeys(FIELDS, '')
+    record['civilite'] = _text(card, '.anfiche_civ')
+    record['prenom'] = _text(card, '.anfiche_prenom')
+    record['nom'] = _text(card, '.anfiche_nom')
+
+    heading = card.select_one('h4 a') or card.select_one('h4')
+    heading_text = clean(heading.get_text(' ')) if heading is not None else ''
+    if not record['nom'] and heading_text:
+        record['prenom'], record['nom'] = split_name(heading_text)
+        record['civilite'] = record['civilite'] or ('Maître' if TITLE_RE.match(heading_text) else '')
+
+    record['detail_url'] = (_href(card, 'a.btnAnnuaireDetail', base_url)
+                            or _href(card, 'h4 a', base_url)
+                            or _href(card, 'a.annuaireFicheImage', base_url)
+                            or next((urljoin(base_url, href) for href in
+                                     (a.get('href') for a in card.select('a[href]'))
+                                     if href and PROFILE_LINK_RE.search(href)), ''))
+    record['contact_url'] = _href(card, 'a.btnAnnuaireContact', base_url)
+    if not record['nom']:
+        record['prenom'], record['nom'] = name_from_url(record['detail_url'])
+    record['nom_complet'] = clean(f"{record['prenom']} {record['nom']}")
+
+    record['structure'] = _text(card, '.structures .structure') or _text(card, '.structure')
+    record['type'] = _text(card, '.type')
+    record['adresse'] = ' - '.join(part for part in (_text(card, '.adresse'), _text(card, '.adresse2')) if part)
+    record['code_postal'], record['ville'] = split_cpville(_text(card, '.cpville'))
+    record['cour_appel'] = _text(card, '.courappel .value')
+    record['telephone'] = clean_phone(_text(card, '.tel'))
+    oath = _text(card, '.dateserment') or _text(card, "[class*='serment']")
+    match = YEAR_RE.search(oath)
+    record['annee_inscription'] = match.group(1) if match else ''
+    return record
+
+
+def parse_cards(page, base_url):
+    cards = page.select('.annuaireFicheMini.annuaireFicheMiniAvocat') or page.select(CARD_SELECTOR)
+    return [parse_card(card, base_url) for card in cards]
+
+
+def next_page_url(page, url, number):
+    """Lien vers la page `number` + 1 de la liste ("2", "Suivant", »), ou None"""
+    wanted = str(number + 1)
+    fallback = None
+    for link in page.select('a[href]'):
+        href = link.get('href') or ''
+        if not href or href.startswith(('#', 'javascript:', 'mailto:')) or PROFILE_LINK_RE.search(href):
+            continue
+        text = clean(link.get_text(' ')).lower()
+        if text == wanted:
+            return urljoin(url, href)
+        if fallback is None and ((link.get('rel') or '') == 'next' or 'next' in (link.get('class') or '')
+                                 or text in _NEXT_TEXTS):
+            fallback = urljoin(url, href)
+    return fallback
+
+
+# --- Formulaire frmAnnuaire -----------------------------------------------
+
+def _form_of(node):
+    while node is not None and node.name != 'form':
+        node = node.parent
+    return node
+
+
+def search_form(page, field=None):
+    """(formulaire, select du champ `field`) ; le select seul si le formulaire est introuvable"""
+    select = page.select_one(f"select[id^='frmAnnuaire_{field}']") if field else None
+    form = _form_of(select) if select is not None else None
+    if form is None:
+        form = page.select_one("form[id^='frmAnnuaire']") or page.select_one("form[name^='frmAnnuaire']")
+    return form, select
+
+
+def options(select):
+    """Options d'un select, sans "Toutes les ..." : [{'value', 'text', 'ville', 'cp'}]"""
+    found = []
+    for option in select.select('option'):
+        value, text = option.get('value') or '', clean(option.get_text(' '))
+        if not value or text.lower().startswith('tou'):
+            continue
+        found.append({'value': value, 'text': text,
+                      'ville': clean(option.get('data-ville')) or text,
+                      'cp': clean(option.get('data-cp'))})
+    return found
+
+
+def form_request(form, url, overrides=None):
+    """(méthode, action, données) du formulaire tel qu'un navigateur le soumettrait"""
+    data = {}
+    for field in form.select('input[name], select[name], textarea[name]'):
+        name, kind = field.get('name'), (field.get('type') or '').lower()
+        if field.name == 'select':
+            chosen = field.select_one('option[selected]') or field.select_one('option')
+            data[name] = (chosen.get('value') or '') if chosen is not None else ''
+        elif kind in ('submit', 'button', 'image', 'reset', 'file'):
+            continue
+        elif kind in ('checkbox', 'radio'):
+            if field.has_attr('checked'):
+                data[name] = field.get('value') or 'on'
+        else:
+            data[name] = field.get('value') or ''
+    button = form.select_one("[id^='frmAnnuaire_ok']") or form.select_one("[type='submit'][name]")
+    if button is not None and button.get('name'):
+        data[button.get('name')] = button.get('value') or ''
+    data.update(overrides or {})
+    method = (form.get('method') or 'get').lower()
+    return method, urljoin(url, form.get('action') or url), data
+
+
+# --- Fiche détaillée ------------------------------------------------------
+
+def parse_profile(markup, url='', full_name=''):
+    """Champs d'une fiche /maitre-... (seuls les champs trouvés sont présents)"""
+    page = parse_html(markup)
+    found = {}
+
+    head = _text(page, '.annuaireFicheHead h4')
+    if head and TITLE_RE.sub('', head).lower() != clean(full_name).lower():
+        found['structure'] = head
+
+    specialisations = []
+    for item in page.select('.annuaireListeDomCmp li'):
+        text = clean(item.get_text(' '))
+        if text and text not in specialisations:
+            specialisations.append(text)
+    if specialisations:
+        found['specialisations'] = ' | '.join(specialisations)
+
+    phone, fax = _text(page, '.btnTel .valeur'), _text(page, '.btnFax .valeur')
+    if phone:
+        found['telephone'] = clean_phone(phone)
+    if fax:
+        found['fax'] = clean_phone(fax)
+
+    mailto = page.select_one(".annuaireFicheSite a[href^='mailto:']") or page.select_one("a[href^='mailto:']")
+    email = decode_email(mailto.get('href')) if mailto is not None else None
+    if not email:
+        result = find_email(markup)
+        email = result['email'] if result else None
+    if email:
+        found['email'] = email
+
+    host = urlsplit(url).hostname or ''
+    for link in page.select(".annuaireFicheSite a[href^='http']"):
+        href = link.get('href')
+        if host and host not in href:
+            found['site_web'] = href
+            break
+
+    block = page.select_one('.annuaireBlocAdresse')
+    if block is not None:
+        lines = [line for line in (clean(text) for text in block.get_text('\n').split('\n'))
+                 if len(line) > 3 and not any(word in line.lower() for word in ('tél', 'fax', 'barreau'))]
+        if lines:
+            found['adresse'] = ', '.join(lines[:2])
+            postcode, city = split_cpville(' '.join(lines))
+            if postcode:
+                found['code_postal'], found['ville'] = postcode, city
+
+    match = OATH_RE.search(markup)
+    if match:
+        found['annee_inscription'] = match.group(1)
+    return found
+
+
+# --- Annuaire -------------------------------------------------------------
+
+class FicheMiniDirectory:
+    """
+    Annuaire complet d'un barreau : liste paginée puis fiches détaillées.
+
+    `bar` est une clé de BARS ou une entrée de même forme. Les fiches sont
+    demandées dès que leur carte est lue, par `max_workers` threads sur la
+    session partagée ; la carte garde ses valeurs (adresse structurée), la
+    fiche complète les champs vides et apporte email, spécialisations et
+    structure. `on_profile(record, markup)` permet un complément propre au
+    barreau. Les cartes vues dans plusieurs recherches sont dédoublonnées.
+    Avec une `frontier` (CrawlFrontier), les fiches déjà complétées lors
+    d'un run interrompu sont reprises sans nouvelle requête.
+    """
+
+    def __init__(self, bar, max_workers=DEFAULT_WORKERS, max_pages=DEFAULT_MAX_PAGES, http=None,
+                 timeout=DEFAULT_TIMEOUT, on_profile=None, verbose=True, frontier=None):
+        self.config = BARS[bar] if isinstance(bar, str) else bar
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.on_profile = on_profile
+        self.verbose = verbose
+        self.frontier = frontier
+        self.http = http or PooledHttpClient(max_workers=max_workers + 1)
+        self.index = DedupIndex(keys=('url', 'nom_cp'))
+        self.lock = threading.Lock()
+        self.stats = {'recherches': 0, 'pages_liste': 0, 'cartes': 0, 'fiches': 0, 'reprises': 0, 'erreurs': 0,
+                      'duree': 0.0}
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def _fetch(self, url, method='get', data=None):
+        if method == 'post':
+            response = self.http.post(url, data=data, timeout=self.timeout)
+        else:
+            response = self.http.get(url, params=data, timeout=self.timeout)
+        response.raise_for_status()
+        return response.url, response.text
+
+    # --- Liste ---
+
+    def searches(self):
+        """Requêtes de liste : (méthode, url, données, valeurs imposées aux cartes)"""
+        url = self.config['url']
+        field = self.config.get('split')
+        if not field:
+            return [('get', url, None, {})]
+        landing_url, markup = self._fetch(url)
+        form, select = search_form(parse_html(markup), field)
+        if select is None:
+            self.log(f"⚠️ Champ {field} introuvable, liste sans filtre")
+            return [('get', url, None, {})]
+        choices = options(select)
+        queries = []
+        for option in choices:
+            extra = {'ville': option['ville'], 'code_postal': option['cp']} if field == 'ville' else {}
+            if form is not None:
+                method, action, data = form_request(form, landing_url, {select.get('name'): option['value']})
+            else:
+                method, action, data = 'get', landing_url, {select.get('name'): option['value']}
+            queries.append((method, action, data, extra))
+        self.log(f"🔎 {len(queries)} recherches ({field}: {', '.join(option['text'] for option in choices)})")
+        return queries
+
+    def iter_cards(self, limit=None):
+        """Cartes nouvelles, au fil des pages de chaque recherche"""
+        count = 0
+        for method, url, data, extra in self.searches():
+            self.stats['recherches'] += 1
+            seen_pages = set()
+            number = 1
+            while url and url not in seen_pages and number <= self.max_pages:
+                seen_pages.add(url)
+                try:
+                    url, markup = self._fetch(url, method, data)
+                except Exception as e:
+                    self.stats['erreurs'] += 1
+                    self.log(f"❌ Page {number} ({url}): {e}")
+                    break
+                page = parse_html(markup)
+                cards = parse_cards(page, url)
+                self.stats['pages_liste'] += 1
+                self.stats['cartes'] += len(cards)
+                new = 0
+                for record in cards:
+                    for field, value in extra.items():
+                        record[field] = record[field] or value
+                    record['page_origine'] = number
+                    with self.lock:
+                        if not self.index.add(record):
+                            continue
+                    new += 1
+                    count += 1
+                    yield record
+                    if limit and count >= limit:
+                        return
+                self.log(f"📋 Page {number}: {len(cards)} cartes, {new} nouvelles")
+                if not new:
+                    break
+                url, method, data = next_page_url(page, url, number), 'get', None
+                number += 1
+
+    # --- Fiches ---
+
+    def fetch_profile(self, record):
+        """Complète la fiche à partir de sa page détaillée (modifie `record`)"""
+        url = record.get('detail_url')
+        if not url:
+            return record
+        if self.frontier:
+            stored = self.frontier.get('profile', url)
+            if stored is not None:
+                record.update(stored)
+                with self.lock:
+                    self.stats['reprises'] += 1
+                return record
+            self.frontier.add('profile', [url])
+            self.frontier.start('profile', url)
+        try:
+            _, markup = self._fetch(url)
+        except Exception as e:
+            with self.lock:
+                self.stats['erreurs'] += 1
+            if self.frontier:
+                self.frontier.failed('profile', url, e)
+            self.log(f"⚠️ Fiche {record.get('nom_complet')}: {e}")
+            return record
+        for field, value in parse_profile(markup, record['detail_url'], record.get('nom_complet')).items():
+            if field in ('email', 'specialisations', 'structure', 'fax', 'site_web') or not record.get(field):
+                record[field] = value
+        if self.on_profile:
+            self.on_profile(record, markup)
+        if self.frontier:
+            self.frontier.done('profile', url, record)
+        with self.lock:
+            self.stats['fiches'] += 1
+        return record
+
+    def scrape(self, limit=None, details=True):
+        """Toutes les fiches du barreau (les `limit` premières si précisé), dans l'ordre de la liste"""
+        start = time.perf_counter()
+        self.log(f"🚀 {self.config['name']} - {self.config['url']}")
+        if not details:
+            records = list(self.iter_cards(limit))
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(self.fetch_profile, record) for record in self.iter_cards(limit)]
+                records = [future.result() for future in futures]
+        self.stats['duree'] = round(time.perf_counter() - start, 2)
+        # Crawl complet : le prochain run repart de zéro
+        if self.frontier and details and not limit and not self.frontier.todo('profile'):
+            self.frontier.reset()
+        return records
+
+    def print_stats(self):
+        s = self.stats
+        print(f"📊 {self.config['name']}: {s['recherches']} recherches, {s['pages_liste']} pages de liste, "
+              f"{len(self.index)} avocats, {s['fiches']} fiches détaillées, {s['erreurs']} erreurs "
+              f"en {s['duree']:.1f}s")
+        if s['reprises']:
+            print(f"♻️  {s['reprises']} fiches reprises d'un run interrompu")
+        self.http.print_stats()
+
+    def close(self):
+        self.http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def scrape_bar(bar, limit=None, **options):
+    """Version fonction : fiches complètes d'un barreau de BARS"""
+    with FicheMiniDirectory(bar, **options) as directory:
+        records = directory.scrape(limit)
+        directory.print_stats()
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Annuaires sur le CMS annuaireFicheMini")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="Barreaux configurés")
+    scrape = commands.add_parser('scrape', help="Scraper un barreau")
+    scrape.add_argument('bar', choices=sorted(BARS))
+    scrape.add_argument('--limit', type=int)
+    scrape.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    scrape.add_argument('--no-details', action='store_true', help="Cartes de la liste seulement")
+    scrape.add_argument('-o', '--output', help="Fichier JSON (défaut: <barreau>_annuaire.json)")
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for key, config in sorted(BARS.items()):
+            print(f"{key:18} {config['name']:32} {config['url']}")
+        return 0
+
+    with FicheMiniDirectory(args.bar, max_workers=args.workers) as directory:
+        records = directory.scrape(args.limit, details=not args.no_details)
+        directory.print_stats()
+    output = args.output or f"{args.bar}_annuaire.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+    print(f"✅ {len(records)} avocats -> {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
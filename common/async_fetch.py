@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Moteur de téléchargement asynchrone pour les annuaires en HTTP simple
+Remplace les boucles séquentielles "get + time.sleep(0.3)" : plusieurs pages
+sont en vol en même temps, avec un plafond de concurrence et un débit
+maximal par hôte (seau à jetons).
+"""
+
+import asyncio
+import time
+from urllib.parse import urlparse
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from common.http_client import DEFAULT_HEADERS
+
+
+class TokenBucket:
+    """Seau à jetons : au plus `rate` requêtes/s, rafales de `burst`"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostLimiter:
+    """Concurrence et débit autorisés pour un hôte"""
+
+    def __init__(self, max_concurrent, rate, burst):
+        self.semaphore = asyncio.BoundedSemaphore(max_concurrent)
+        self.bucket = TokenBucket(rate, burst)
+
+
+class AsyncFetchEngine:
+    """
+    Télécharge une liste d'URLs en parallèle et passe chaque page au parseur.
+
+    `parse(url, html)` retourne un dict (ou None) ; il tourne dans un thread
+    pour ne pas bloquer la boucle pendant BeautifulSoup. `on_profile(profile)`
+    est appelé dès qu'une fiche est prête, dans l'ordre d'arrivée.
+    """
+
+    def __init__(self, max_per_host=6, rate_per_host=10.0, burst=None,
+                 timeout=15, retries=2, headers=None, cache=None):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp requis : pip install aiohttp")
+
+        self.max_per_host = max_per_host
+        self.rate_per_host = rate_per_host
+        self.burst = burst or max_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.headers = headers or DEFAULT_HEADERS
+        self.cache = cache
+        self.limiters = {}
+        self.errors = []
+        self.stats = {'pages': 0, 'erreurs': 0, 'tentatives': 0, 'duree': 0.0}
+
+    def _limiter(self, url):
+        host = urlparse(url).hostname
+        if host not in self.limiters:
+            self.limiters[host] = HostLimiter(self.max_per_host, self.rate_per_host, self.burst)
+        return self.limiters[host]
+
+    async def fetch(self, session, url):
+        """Télécharge une page en respectant les limites de son hôte"""
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            self.cache.count('frais')
+            return entry.text()
+        conditional = self.cache.conditional_headers(entry) if entry else None
+
+        limiter = self._limiter(url)
+        last_error = None
+
+        for attempt in range(self.retries + 1):
+            async with limiter.semaphore:
+                await limiter.bucket.acquire()
+                self.stats['tentatives'] += 1
+                try:
+                    async with session.get(url, headers=conditional) as response:
+                        if entry and response.status == 304:
+                            self.cache.touch(entry, response.headers)
+                            self.cache.count('revalides')
+                            return entry.text()
+                        response.raise_for_status()
+                        body = await response.read()
+                        if self.cache:
+                            self.cache.count('telecharges')
+                            self.cache.store(url, response.status, response.headers, body)
+                        return body.decode(response.charset or 'utf-8', errors='replace')
+                except aiohttp.ClientResponseError as e:
+                    # Une 404 ne se corrige pas en réessayant
+                    if e.status < 500 and e.status != 429:
+                        raise
+                    last_error = e
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    last_error = e
+            # Recul progressif hors sémaphore pour libérer la place (pas après le dernier essai)
+            if attempt < self.retries:
+                await asyncio.sleep(0.5 * (2 ** attempt))
+
+        raise last_error
+
+    async def _process(self, session, index, url, parse, on_profile, results):
+        loop = asyncio.get_running_loop()
+        try:
+            html = await self.fetch(session, url)
+            profile = await loop.run_in_executor(None, parse, url, html)
+        except Exception as e:
+            self.stats['erreurs'] += 1
+            self.errors.append((url, str(e)))
+            return
+
+        self.stats['pages'] += 1
+        results[index] = profile
+        if profile is not None and on_profile:
+            on_profile(profile)
+
+    async def run(self, urls, parse, on_profile=None):
+        """Traite toutes les URLs ; retourne les fiches dans l'ordre des URLs"""
+        start = time.time()
+        # Les verrous asyncio sont liés à la boucle : un jeu par run
+        self.limiters = {}
+        results = [None] * len(urls)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit_per_host=self.max_per_host)
+
+        async with aiohttp.ClientSession(headers=self.headers, timeout=timeout,
+                                         connector=connector) as session:
+            await asyncio.gather(*(
+                self._process(session, i, url, parse, on_profile, results)
+                for i, url in enumerate(urls)
+            ))
+
+        self.stats['duree'] = time.time() - start
+        return [r for r in results if r is not None]
+
+    def fetch_all(self, urls, parse, on_profile=None):
+        """Point d'entrée synchrone pour les scripts existants"""
+        return asyncio.run(self.run(urls, parse, on_profile))
+
+    def print_stats(self):
+        duree = self.stats['duree']
+        rate = self.stats['pages'] / duree if duree > 0 else 0
+        print(f"⚡ Moteur async: {self.stats['pages']} pages en {duree:.1f}s ({rate:.1f} pages/s)")
+        print(f"   Limites par hôte: {self.max_per_host} en parallèle, {self.rate_per_host:.1f} req/s")
+        if self.errors:
+            print(f"   ❌ Erreurs: {len(self.errors)}")
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pool de navigateurs Chrome headless réutilisables pour les scrapers Selenium
+Les instances restent chaudes entre les fiches (plus de démarrage à froid par
+script), sont prêtées aux workers, et recyclées après K pages pour borner la
+mémoire. Chaque navigateur peut précharger les fiches suivantes dans des
+onglets en arrière-plan.
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    SELENIUM_AVAILABLE = True
+except ImportError:
+    SELENIUM_AVAILABLE = False
+    WebDriverException = Exception
+    TimeoutException = TimeoutError
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+def default_chrome_options(headless=True, user_agent=DEFAULT_USER_AGENT):
+    """Options Chrome communes aux scrapers du dépôt"""
+    options = Options()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument(f'--user-agent={user_agent}')
+    return options
+
+
+class PooledDriver:
+    """
+    Enveloppe d'un WebDriver prêté par le pool.
+
+    Se comporte comme le driver d'origine (find_element, execute_script,
+    page_source...). `get(url)` bascule sur l'onglet préchargé s'il existe
+    et, comme un get() ordinaire, ne rend la main qu'une fois la page
+    chargée (document.readyState à "complete", `load_timeout` au plus).
+    Les onglets préchargés survivent à la fin du prêt (indexés par URL) ;
+    un onglet resté inutilisé plus de `tabs` pages est fermé pour faire
+    place aux suivants.
+    """
+
+    def __init__(self, driver, tabs=1, load_timeout=30):
+        self._driver = driver
+        self._tabs = max(1, tabs)
+        self._load_timeout = load_timeout
+        self._prefetched = {}       # url -> (onglet, pages au moment du préchargement)
+        self.pages = 0
+        self.prefetch_hits = 0
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    @property
+    def driver(self):
+        return self._driver
+
+    def has_prefetched(self, url):
+        return url in self._prefetched
+
+    def prefetch(self, urls):
+        """Lance le chargement des URLs suivantes dans des onglets en arrière-plan"""
+        self._drop_stale()
+        for url in urls:
+            if len(self._prefetched) >= self._tabs - 1:
+                break
+            if url in self._prefetched:
+                continue
+            before = set(self._driver.window_handles)
+            # window.open ne bloque pas : la page charge pendant qu'on traite l'onglet courant
+            self._driver.execute_script("window.open(arguments[0], '_blank');", url)
+            opened = set(self._driver.window_handles) - before
+            if opened:
+                self._prefetched[url] = (opened.pop(), self.pages)
+
+    def get(self, url):
+        self.pages += 1
+        entry = self._prefetched.pop(url, None)
+        if entry is None:
+            return self._driver.get(url)
+        # L'onglet courant est fermé, l'onglet préchargé prend sa place
+        self.prefetch_hits += 1
+        self._driver.close()
+        self._driver.switch_to.window(entry[0])
+        self._wait_loaded()
+        return None
+
+    def _wait_loaded(self):
+        """Attend la fin du chargement de l'onglet courant (page préchargée encore en cours)"""
+        deadline = time.time() + self._load_timeout
+        while self._driver.execute_script("return document.readyState") != 'complete':
+            if time.time() > deadline:
+                raise TimeoutException(f"Onglet préchargé non chargé après {self._load_timeout}s")
+            time.sleep(0.05)
+
+    def _close_tabs(self, urls):
+        if not urls:
+            return
+        current = self._driver.current_window_handle
+        for url in urls:
+            handle, _ = self._prefetched.pop(url)
+            if handle != current:
+                self._driver.switch_to.window(handle)
+                self._driver.close()
+        self._driver.switch_to.window(current)
+
+    def _drop_stale(self):
+        """Ferme les onglets préchargés que plus de `tabs` pages n'ont pas demandés"""
+        self._close_tabs([url for url, (_, at) in self._prefetched.items() if self.pages - at > self._tabs])
+
+    def reset_tabs(self):
+        """Ferme tous les onglets préchargés non utilisés"""
+        self._close_tabs(list(self._prefetched))
+
+
+class BrowserPool:
+    """
+    N navigateurs Chrome chauds, prêtés un par un aux workers.
+
+    `tabs` : onglets par navigateur (1 = pas de préchargement).
+    `recycle_after` : nombre de pages avant de redémarrer un navigateur.
+    `driver_factory` : fonction sans argument qui crée un WebDriver (par défaut
+    Chrome avec `default_chrome_options`).
+    """
+
+    def __init__(self, size=1, tabs=1, recycle_after=200, headless=True,
+                 options=None, driver_factory=None):
+        if driver_factory is None and not SELENIUM_AVAILABLE:
+            raise ImportError("selenium requis : pip install selenium")
+
+        self.size = max(1, size)
+        self.tabs = tabs
+        self.recycle_after = recycle_after
+        self.driver_factory = driver_factory or (
+            lambda: webdriver.Chrome(options=options or default_chrome_options(headless)))
+        self.idle = queue.Queue()
+        self.lock = threading.Lock()
+        self.all_drivers = []
+        self.started = 0
+        self.stats = {'demarrages': 0, 'recyclages': 0, 'prets': 0, 'pages': 0, 'prechargees': 0,
+                      'temps_demarrage': 0.0}
+        self.closed = False
+
+    def _start_browser(self):
+        start = time.time()
+        pooled = PooledDriver(self.driver_factory(), self.tabs)
+        with self.lock:
+            self.stats['demarrages'] += 1
+            self.stats['temps_demarrage'] += time.time() - start
+            self.all_drivers.append(pooled)
+        return pooled
+
+    def warm(self):
+        """Démarre tous les navigateurs en parallèle avant le premier prêt"""
+        with self.lock:
+            missing = self.size - self.started
+            self.started = self.size
+        threads = [threading.Thread(target=lambda: self.idle.put(self._start_browser()))
+                   for _ in range(missing)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def _take_idle_with(self, url):
+        """Navigateur libre qui a déjà préchargé `url`, retiré de la file"""
+        with self.idle.mutex:
+            for pooled in self.idle.queue:
+                if pooled.has_prefetched(url):
+                    self.idle.queue.remove(pooled)
+                    return pooled
+        return None
+
+    def _acquire(self, url=None):
+        if url is not None:
+            pooled = self._take_idle_with(url)
+            if pooled is not None:
+                return pooled
+        while True:
+            with self.lock:
+                can_start = self.started < self.size
+                if can_start:
+                    self.started += 1
+            if can_start:
+                return self._start_browser()
+            try:
+                return self.idle.get(timeout=0.5)
+            except queue.Empty:
+                # Un navigateur retiré libère une place : on revérifie
+                continue
+
+    def _retire(self, pooled):
+        with self.lock:
+            if pooled in self.all_drivers:
+                self.all_drivers.remove(pooled)
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def lease(self, url=None):
+        """
+        Prête un navigateur : `with pool.lease() as driver: ...`. Avec `url`,
+        le navigateur libre qui a déjà préchargé cette page est préféré.
+        """
+        pooled = self._acquire(url)
+        broken = False
+        try:
+            yield pooled
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self._release(pooled, broken)
+
+    def _release(self, pooled, broken):
+        with self.lock:
+            self.stats['prets'] += 1
+
+        # Les onglets préchargés restent ouverts pour le prochain prêt
+        keep = not broken and not self.closed
+        if keep and pooled.pages >= self.recycle_after:
+            with self.lock:
+                self.stats['recyclages'] += 1
+            keep = False
+
+        if keep:
+            self.idle.put(pooled)
+            return
+
+        # Navigateur planté ou usé : remplacé paresseusement au prochain prêt
+        with self.lock:
+            self.stats['pages'] += pooled.pages
+            self.stats['prechargees'] += pooled.prefetch_hits
+            self.started -= 1
+        self._retire(pooled)
+
+    def close(self):
+        self.closed = True
+        with self.lock:
+            drivers = list(self.all_drivers)
+            self.stats['pages'] += sum(d.pages for d in drivers)
+            self.stats['prechargees'] += sum(d.prefetch_hits for d in drivers)
+        for pooled in drivers:
+            self._retire(pooled)
+
+    def print_stats(self):
+        stats = self.stats
+        print("🌐 Pool de navigateurs:")
+        print(f"   Navigateurs démarrés: {stats['demarrages']} ({stats['temps_demarrage']:.1f}s de démarrage)")
+        print(f"   Recyclages: {stats['recyclages']}")
+        print(f"   Prêts: {stats['prets']}, pages chargées: {stats['pages']} "
+              f"(dont {stats['prechargees']} depuis un onglet préchargé)")
+        return dict(stats)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Point de reprise incrémental en JSONL (un avocat par ligne)
+Remplace les sauvegardes "tous les N avocats" qui réécrivaient toute la liste
+dans un nouveau fichier : chaque fiche est ajoutée une seule fois, et une
+relance après crash saute les fiches déjà écrites.
+"""
+
+import csv
+import json
+import os
+import threading
+
+
+class CheckpointStore:
+    """
+    Fichier JSONL en ajout seul.
+
+    `key` est le nom du champ identifiant une fiche (souvent 'url') ou une
+    fonction record -> clé. Les écritures sont vidées à chaque fiche et
+    synchronisées sur disque (fsync) toutes les `fsync_every` fiches.
+    """
+
+    def __init__(self, path, key='url', fsync_every=20):
+        self.path = path
+        self.key_func = key if callable(key) else (lambda record: record.get(key))
+        self.fsync_every = max(1, fsync_every)
+        self.lock = threading.Lock()
+        self.keys = set()
+        self.pending_sync = 0
+
+        self._load_keys()
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self._repair_tail()
+
+    def _load_keys(self):
+        for record in self._read():
+            self.keys.add(self.key_func(record))
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Dernière ligne tronquée par un crash : ignorée
+                    continue
+
+    def _repair_tail(self):
+        """Termine une ligne coupée par un crash avant d'ajouter à la suite"""
+        if self.file.tell() == 0:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                self.file.write('\n')
+                self.file.flush()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def is_done(self, key):
+        return key in self.keys
+
+    def remaining(self, items, key=None):
+        """Filtre les éléments (URLs ou dicts) pas encore présents dans le checkpoint"""
+        key = key or (lambda item: item)
+        return [item for item in items if key(item) not in self.keys]
+
+    def append(self, record):
+        """Ajoute une fiche : coût constant, quel que soit le volume déjà écrit"""
+        line = json.dumps(record, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+            self.keys.add(self.key_func(record))
+            self.pending_sync += 1
+            if self.pending_sync >= self.fsync_every:
+                os.fsync(self.file.fileno())
+                self.pending_sync = 0
+
+    def records(self):
+        """Toutes les fiches écrites, la dernière version de chaque clé gagnant"""
+        with self.lock:
+            if not self.file.closed:
+                self.file.flush()
+        merged = {}
+        for record in self._read():
+            merged[self.key_func(record)] = record
+        return list(merged.values())
+
+    def compact(self, json_path=None, csv_path=None, fieldnames=None, list_separator='; '):
+        """Produit les fichiers finaux JSON/CSV à partir du checkpoint"""
+        records = self.records()
+
+        if json_path:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(records, f, ensure_ascii=False, indent=2)
+
+        if csv_path and records:
+            fieldnames = fieldnames or list(records[0].keys())
+            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+                writer.writeheader()
+                for record in records:
+                    row = {}
+                    for field in fieldnames:
+                        value = record.get(field, '')
+                        row[field] = list_separator.join(map(str, value)) if isinstance(value, list) else value
+                    writer.writerow(row)
+
+        return records
+
+    def close(self):
+        with self.lock:
+            if self.file.closed:
+                return
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+
+    def clear(self):
+        """Supprime le checkpoint une fois les fichiers finaux écrits"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Consentement cookies posé avant la première navigation
+tarteaucitron et axeptio n'affichent pas leur bandeau quand le choix de
+l'internaute est déjà enregistré dans leurs cookies. Ces cookies sont
+posés avant le premier chargement (CDP pour Selenium, contexte pour
+Playwright, session pour requests), et une feuille de style injectée au
+démarrage de chaque document masque le bandeau si le site réclame malgré
+tout un nouveau choix. Plus de recherche de bouton, de clic ni de
+time.sleep à chaque démarrage de navigateur.
+"""
+
+import json
+import time
+import uuid
+from urllib.parse import quote
+
+from common.lean_page import site_of
+
+# Services tiers courants des sites de barreaux ; tarteaucitron redemande un
+# choix pour tout service absent du cookie (le bandeau reste alors masqué)
+TARTEAUCITRON_SERVICES = (
+    'gtag', 'analytics', 'googletagmanager', 'matomo', 'xiti', 'hotjar', 'facebookpixel',
+    'youtube', 'vimeo', 'dailymotion', 'googlemaps', 'googlemapsembed', 'openstreetmap',
+    'recaptcha', 'facebook', 'twitter', 'linkedin', 'addtoanyshare', 'addthis', 'calameo',
+)
+
+
+def tarteaucitron_cookies(accept=False):
+    """Cookie "tarteaucitron" : "!service=true!..." (ou =false pour un refus)"""
+    choice = 'true' if accept else 'false'
+    return {'tarteaucitron': ''.join(f"!{service}={choice}" for service in TARTEAUCITRON_SERVICES)}
+
+
+def axeptio_cookies(accept=False):
+    """
+    Cookies axeptio : choix terminé (JSON encodé). La liste des fournisseurs
+    est propre à chaque site : aucun n'est autorisé, même avec `accept`.
+    """
+    choice = {'$$token': uuid.uuid4().hex[:20], '$$date': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()),
+              '$$completed': True}
+    return {
+        'axeptio_cookies': quote(json.dumps(choice, separators=(',', ':')), safe=''),
+        'axeptio_authorized_vendors': quote(',', safe=''),
+        'axeptio_all_vendors': quote(',', safe=''),
+    }
+
+
+# Cookies du choix + conteneurs du bandeau à masquer
+FRAMEWORKS = {
+    'tarteaucitron': {
+        'cookies': tarteaucitron_cookies,
+        'hide': ('#tarteaucitronRoot', '#tarteaucitronAlertBig', '#tarteaucitronAlertSmall',
+                 '#tarteaucitronBack', '#tarteaucitronIcon'),
+        'unlock': ('body.tarteaucitron-modal-open',),
+    },
+    'axeptio': {
+        'cookies': axeptio_cookies,
+        'hide': ('#axeptio_overlay', '.axeptio_mount', '#axeptio_main_button', '.axeptio_widget'),
+        'unlock': (),
+    },
+}
+
+DEFAULT_FRAMEWORKS = ('tarteaucitron', 'axeptio')
+
+# Ajouté au début de chaque document, avant les scripts du site
+HIDE_BANNER_JS = """
+(() => {
+    const css = %s;
+    const add = () => {
+        if (document.getElementById('consent-seed-style')) return;
+        const root = document.head || document.documentElement;
+        if (!root) return;
+        const style = document.createElement('style');
+        style.id = 'consent-seed-style';
+        style.textContent = css;
+        root.appendChild(style);
+    };
+    add();
+    document.addEventListener('readystatechange', add);
+    document.addEventListener('DOMContentLoaded', add);
+})();
+"""
+
+
+class ConsentSeed:
+    """
+    Choix cookies d'un annuaire, posé avant la première page.
+
+    `site` : URL ou hôte de l'annuaire (les cookies valent pour le domaine
+    et ses sous-domaines). `accept=False` enregistre un refus des services
+    tiers : pages plus légères, et aucun traceur chargé.
+    """
+
+    def __init__(self, site, frameworks=DEFAULT_FRAMEWORKS, accept=False):
+        unknown = set(frameworks) - set(FRAMEWORKS)
+        if unknown:
+            raise ValueError(f"Gestionnaires de consentement inconnus: {', '.join(sorted(unknown))}")
+        self.domain = site_of(site)
+        self.frameworks = tuple(frameworks)
+        self.accept = accept
+        self.stats = {'navigateurs': 0, 'sessions': 0, 'echecs': 0}
+
+    def cookies(self):
+        """[{'name', 'value', 'domain', 'path'}] pour tous les gestionnaires"""
+        values = {}
+        for name in self.frameworks:
+            values.update(FRAMEWORKS[name]['cookies'](self.accept))
+        return [{'name': name, 'value': value, 'domain': '.' + self.domain, 'path': '/'}
+                for name, value in values.items()]
+
+    def stylesheet(self):
+        hide = [selector for name in self.frameworks for selector in FRAMEWORKS[name]['hide']]
+        unlock = [selector for name in self.frameworks for selector in FRAMEWORKS[name]['unlock']]
+        css = f"{', '.join(hide)} {{ display: none !important; }}"
+        if unlock:
+            css += f" {', '.join(unlock)} {{ overflow: auto !important; }}"
+        return css
+
+    def init_script(self):
+        return HIDE_BANNER_JS % json.dumps(self.stylesheet())
+
+    # --- Playwright ------------------------------------------------------
+
+    async def attach(self, context):
+        """Cookies et masquage du bandeau sur un contexte Playwright (API async)"""
+        await context.add_cookies(self.cookies())
+        await context.add_init_script(self.init_script())
+        self.stats['navigateurs'] += 1
+
+    def attach_sync(self, context):
+        """Même chose pour l'API synchrone de Playwright"""
+        context.add_cookies(self.cookies())
+        context.add_init_script(self.init_script())
+        self.stats['navigateurs'] += 1
+
+    # --- Selenium --------------------------------------------------------
+
+    def attach_selenium(self, driver):
+        """
+        Pose les cookies via CDP avant le premier driver.get ; retourne False
+        si le navigateur ne parle pas CDP (le bandeau est alors à cliquer).
+        """
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            for cookie in self.cookies():
+                driver.execute_cdp_cmd('Network.setCookie', cookie)
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': self.init_script()})
+        except Exception:
+            self.stats['echecs'] += 1
+            return False
+        self.stats['navigateurs'] += 1
+        return True
+
+    # --- HTTP ------------------------------------------------------------
+
+    def attach_session(self, session):
+        """Ajoute les cookies à une session requests (ou à un PooledHttpClient)"""
+        jar = getattr(session, 'session', session).cookies
+        for cookie in self.cookies():
+            jar.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'])
+        self.stats['sessions'] += 1
+        return session
+
+    def cookie_jar(self):
+        """RequestsCookieJar autonome (requests.get(url, cookies=seed.cookie_jar()))"""
+        from requests.cookies import RequestsCookieJar
+        jar = RequestsCookieJar()
+        for cookie in self.cookies():
+            jar.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'])
+        return jar
+
+    def cookie_header(self):
+        """En-tête Cookie pour les clients sans cookie jar (AsyncFetchEngine)"""
+        self.stats['sessions'] += 1
+        return '; '.join(f"{cookie['name']}={cookie['value']}" for cookie in self.cookies())
+
+    def print_stats(self):
+        s = self.stats
+        print(f"🍪 Consentement pré-posé ({', '.join(self.frameworks)} sur {self.domain}): "
+              f"{s['navigateurs']} navigateurs, {s['sessions']} sessions HTTP, {s['echecs']} échecs")
+        return dict(s)
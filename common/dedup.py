@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Dédoublonnage des fiches au fil de l'eau
+Remplace les set() de signatures et les regroupements par email écrits
+scraper par scraper. Chaque fiche reçoit des clés canoniques (URL de la
+fiche normalisée, email, nom + code postal ; à défaut le nom seul ou la
+signature complète de la fiche) ; un index de hachage retrouve en temps constant la fiche déjà vue et les deux sont fusionnées champ par
+champ. Seules les fiches uniques et les empreintes de leurs clés restent en
+mémoire, quel que soit le recouvrement entre filtres ou partitions.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from common.linkage import plain
+from common.normalize import normalize_email
+
+URL_FIELDS = ('url', 'profile_url', 'url_profil', 'url_fiche', 'detail_url', 'lien_fiche', 'source_url')
+EMAIL_FIELDS = ('email', 'mail', 'courriel')
+POSTCODE_FIELDS = ('code_postal', 'cp', 'postal_code')
+ADDRESS_FIELDS = ('adresse', 'adresse_complete', 'address')
+DEFAULT_KEYS = ('url', 'email', 'nom_cp')
+
+# Politiques de fusion pour des doublons d'une même source (même email) : la
+# valeur la plus complète l'emporte (nom tronqué "DUP-", téléphone partiel)
+LONGEST_POLICIES = {field: 'longest' for field in
+                    ('nom', 'prenom', 'telephone', 'ville', 'adresse', 'structure', 'specialisations')}
+
+_POSTCODE_RE = re.compile(r"\b(\d{5})\b")
+_TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid')
+
+
+# --- Clés canoniques ------------------------------------------------------
+
+def canonical_url(url):
+    """
+    URL comparable : schéma et hôte en minuscules, sans www., fragment,
+    paramètres de suivi ni "/" final ; paramètres triés.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.hostname or ''
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not k.startswith(_TRACKING_PARAMS))
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https' if parts.scheme in ('http', 'https') else parts.scheme,
+                       host, path, urlencode(query), ''))
+
+
+def canonical_name(record):
+    """Nom sans accents ni ponctuation, mots triés (l'ordre prénom/nom ne compte pas)"""
+    name = record.get('nom_complet') or f"{record.get('prenom') or ''} {record.get('nom') or ''}"
+    return ' '.join(sorted(plain(name).split()))
+
+
+def _first(record, fields):
+    for field in fields:
+        value = record.get(field)
+        if value:
+            return value
+    return None
+
+
+def record_postcode(record):
+    postcode = _first(record, POSTCODE_FIELDS)
+    if postcode:
+        return str(postcode).strip()
+    address = _first(record, ADDRESS_FIELDS)
+    match = _POSTCODE_RE.search(address) if isinstance(address, str) else None
+    return match.group(1) if match else None
+
+
+def record_signature(record):
+    """Tous les champs non vides, normalisés et triés : deux fiches identiques ont la même"""
+    return '|'.join(f"{field}={plain(str(value))}" for field, value in sorted(record.items())
+                    if not _empty(value))
+
+
+def record_keys(record, keys=DEFAULT_KEYS):
+    """
+    Clés canoniques d'une fiche : [('url', ...), ('email', ...), ('nom_cp', ...)]
+
+    'nom' est le nom canonique seul, 'signature' la fiche entière ; tout
+    autre nom de clé est un champ de la fiche. Une fiche sans aucune des
+    clés demandées est identifiée par son nom, ou à défaut par sa signature,
+    pour que ses doublons exacts se retrouvent quand même.
+    """
+    found = []
+    for kind in keys:
+        if kind == 'url':
+            value = canonical_url(_first(record, URL_FIELDS))
+        elif kind == 'email':
+            value = normalize_email(_first(record, EMAIL_FIELDS))
+        elif kind == 'nom_cp':
+            name, postcode = canonical_name(record), record_postcode(record)
+            value = f"{name}|{postcode}" if name and postcode else None
+        elif kind == 'nom':
+            value = canonical_name(record)
+        elif kind == 'signature':
+            value = record_signature(record)
+        else:
+            value = record.get(kind)
+        if value:
+            found.append((kind, value))
+    if not found:
+        name = canonical_name(record)
+        found.append(('nom', name) if name else ('signature', record_signature(record)))
+    return found
+
+
+def _digest(kind, value):
+    return hashlib.blake2b(f"{kind}\0{value}".encode('utf-8'), digest_size=8).digest()
+
+
+# --- Fusion champ par champ -----------------------------------------------
+
+def _empty(value):
+    return value is None or value == '' or value == [] or value == {}
+
+
+def merge_value(policy, old, new):
+    """
+    Valeur retenue pour un champ présent dans deux doublons.
+
+    'fill' : la première valeur non vide ; 'last' : la dernière non vide ;
+    'longest' : la plus longue (nom tronqué "DUP-" contre "DUPONT") ;
+    'union' : les valeurs distinctes jointes par " | " ; ou une fonction
+    (ancienne, nouvelle) -> valeur.
+    """
+    if _empty(new):
+        return old
+    if _empty(old):
+        return new
+    if callable(policy):
+        return policy(old, new)
+    if policy == 'last':
+        return new
+    if policy == 'longest':
+        return new if len(str(new).strip()) > len(str(old).strip()) else old
+    if policy == 'union':
+        parts = str(old).split(' | ')
+        for part in str(new).split(' | '):
+            if part not in parts:
+                parts.append(part)
+        return ' | '.join(parts)
+    return old
+
+
+def _name_included(left, right):
+    """Vrai si les mots propres à l'un des noms se réduisent à des initiales de l'autre"""
+    left_rest = {word for word in left if not (len(word) == 1 and any(w.startswith(word) for w in right))}
+    right_rest = {word for word in right if not (len(word) == 1 and any(w.startswith(word) for w in left))}
+    return not left_rest or not right_rest
+
+
+class DedupIndex:
+    """
+    Index de hachage des fiches uniques, alimenté au fil de l'eau.
+
+    `add` rattache la fiche à celle qui partage une de ses clés et fusionne
+    les champs (`policies` : {champ: politique}, sinon `default_policy`) ;
+    une fiche qui relie deux fiches déjà vues les fusionne toutes les deux.
+    Avec `strict_names`, un email commun ne suffit pas si chaque nom a des
+    mots que l'autre n'a pas (email de cabinet partagé : "Jean MARTIN" et
+    "Marie MARTIN") ; un nom incomplet ("MARTIN", "J. MARTIN") se rattache.
+    Une fiche sans aucune clé demandée est identifiée par son nom ou par
+    sa signature complète (cf. `record_keys`).
+    """
+
+    def __init__(self, keys=DEFAULT_KEYS, policies=None, default_policy='fill', strict_names=True):
+        self.keys = keys
+        self.policies = policies or {}
+        self.default_policy = default_policy
+        self.strict_names = strict_names
+        self.index = {}         # empreinte de clé -> fiche
+        self.clusters = []      # fiches uniques (None une fois fusionnées dans une autre)
+        self.parent = []
+        self.counts = []
+        self.stats = {'vues': 0, 'uniques': 0, 'fusions': 0}
+
+    def _find(self, cluster):
+        while self.parent[cluster] != cluster:
+            self.parent[cluster] = self.parent[self.parent[cluster]]
+            cluster = self.parent[cluster]
+        return cluster
+
+    def _merge_into(self, target, record):
+        for field, value in record.items():
+            policy = self.policies.get(field, self.default_policy)
+            target[field] = merge_value(policy, target.get(field), value)
+
+    def _conflict(self, cluster, record):
+        if not self.strict_names:
+            return False
+        existing, incoming = canonical_name(self.clusters[cluster]), canonical_name(record)
+        if not existing or not incoming:
+            return False
+        existing, incoming = set(existing.split()), set(incoming.split())
+        return not _name_included(existing - incoming, incoming - existing)
+
+    def add(self, record):
+        """Ajoute une fiche ; True si elle est nouvelle, False si elle complète un doublon"""
+        self.stats['vues'] += 1
+        digests = [(kind, _digest(kind, value)) for kind, value in record_keys(record, self.keys)]
+        found = []
+        for kind, digest in digests:
+            cluster = self.index.get(digest)
+            if cluster is None:
+                continue
+            cluster = self._find(cluster)
+            if cluster in found or (kind == 'email' and self._conflict(cluster, record)):
+                continue
+            found.append(cluster)
+
+        if not found:
+            cluster = len(self.clusters)
+            self.clusters.append(dict(record))
+            self.parent.append(cluster)
+            self.counts.append(1)
+            self.stats['uniques'] += 1
+            is_new = True
+        else:
+            cluster = min(found)
+            for other in found:
+                if other != cluster:
+                    self._merge_into(self.clusters[cluster], self.clusters[other])
+                    self.counts[cluster] += self.counts[other]
+                    self.clusters[other] = None
+                    self.parent[other] = cluster
+                    self.stats['uniques'] -= 1
+            self._merge_into(self.clusters[cluster], record)
+            self.counts[cluster] += 1
+            self.stats['fusions'] += 1
+            is_new = False
+
+        for kind, digest in digests:
+            if kind != 'email' or digest not in self.index:
+                self.index[digest] = cluster
+        return is_new
+
+    def extend(self, records):
+        """Ajoute des fiches ; retourne le nombre de nouvelles"""
+        return sum(1 for record in records if self.add(record))
+
+    def records(self):
+        """Fiches uniques fusionnées, dans l'ordre de première apparition"""
+        return [record for record in self.clusters if record is not None]
+
+    def groups(self):
+        """(fiche, nombre de fiches fusionnées) pour les fiches vues plusieurs fois"""
+        return [(record, count) for record, count in zip(self.clusters, self.counts)
+                if record is not None and count > 1]
+
+    def __len__(self):
+        return self.stats['uniques']
+
+    def print_stats(self):
+        print(f"🧹 Dédoublonnage: {self.stats['vues']} fiches vues, {self.stats['uniques']} uniques, "
+              f"{self.stats['fusions']} doublons fusionnés")
+
+
+def deduplicate(records, **options):
+    """Version liste : fiches uniques fusionnées (options : cf. DedupIndex)"""
+    index = DedupIndex(**options)
+    index.extend(records)
+    return index.records()
+
+
+def unique_urls(urls):
+    """URLs distinctes après normalisation, dans l'ordre de première apparition"""
+    seen = set()
+    unique = []
+    for url in urls:
+        key = canonical_url(url)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(url)
+    return unique
+
+
+# --- Banc d'essai ---------------------------------------------------------
+
+def _load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('avocats') or data.get('lawyers') or next(
+            (value for value in data.values() if isinstance(value, list)), [])
+    return data
+
+
+def benchmark(path, partitions=20, overlap=0.5):
+    """Rejoue une liste comme `partitions` filtres qui se recouvrent à `overlap`"""
+    import random
+    records = _load(path)
+    rng = random.Random(0)
+    stream = []
+    for _ in range(partitions):
+        stream.extend(dict(record) for record in rng.sample(records, int(len(records) * overlap)))
+    index = DedupIndex()
+    start = time.perf_counter()
+    index.extend(stream)
+    elapsed = time.perf_counter() - start
+    index.print_stats()
+    print(f"⏱️  {len(stream)} fiches en {elapsed:.2f}s ({len(stream) / elapsed:.0f} fiches/s), "
+          f"{len(index.index)} clés indexées pour {len(records)} fiches d'origine")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dédoublonnage des fiches avocats")
+    commands = parser.add_subparsers(dest='command', required=True)
+    dedup = commands.add_parser('dedup', help="Dédoublonner un fichier JSON")
+    dedup.add_argument('json')
+    dedup.add_argument('-o', '--output', help="Fichier JSON de sortie (défaut: <fichier>_uniques.json)")
+    dedup.add_argument('--keys', default=','.join(DEFAULT_KEYS))
+    bench = commands.add_parser('bench', help="Rejouer un fichier comme des filtres qui se recouvrent")
+    bench.add_argument('json')
+    bench.add_argument('--partitions', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        benchmark(args.json, args.partitions)
+        return 0
+    index = DedupIndex(keys=tuple(args.keys.split(',')))
+    index.extend(_load(args.json))
+    index.print_stats()
+    output = args.output or args.json.rsplit('.', 1)[0] + '_uniques.json'
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(index.records(), f, ensure_ascii=False, indent=2)
+    print(f"✅ {len(index)} fiches -> {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
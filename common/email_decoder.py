@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Décodage des emails obfusqués des annuaires
+Un seul décodeur pour les protections rencontrées : "addy" de Joomla (et
+<joomla-hidden-mail> en base64), concaténations JavaScript, encodage %XX,
+entités HTML numériques/hexadécimales, Cloudflare (data-cfemail) et
+"nom [at] domaine [dot] fr". Le JavaScript n'est pas exécuté : les
+expressions de chaînes sont évaluées en Python, sans navigateur.
+"""
+
+import base64
+import html
+import re
+from urllib.parse import unquote
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9\-]+(?:\.[A-Za-z0-9\-]+)*\.[A-Za-z]{2,}")
+_MAILTO_RE = re.compile(r"mailto:\s*([^'\"?<>\s]+)", re.IGNORECASE)
+
+_AT_DOT_RE = re.compile(
+    r"([A-Za-z0-9._%+\-]+)\s*[\[\(\{]\s*(?:at|arobase|@)\s*[\]\)\}]\s*"
+    r"([A-Za-z0-9\-]+(?:\s*[\[\(\{]\s*(?:dot|point|\.)\s*[\]\)\}]\s*[A-Za-z0-9\-]+)+)",
+    re.IGNORECASE)
+_DOT_RE = re.compile(r"\s*[\[\(\{]\s*(?:dot|point|\.)\s*[\]\)\}]\s*", re.IGNORECASE)
+
+_CFEMAIL_RE = re.compile(
+    r"""(?:data-cfemail=["']|/cdn-cgi/l/email-protection#)([0-9a-fA-F]{4,})""")
+_JOOMLA_HIDDEN_RE = re.compile(r"<joomla-hidden-mail\b([^>]*)>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>(.*?)</script>", re.IGNORECASE | re.DOTALL)
+_HREF_MAILTO_RE = re.compile(r"""href\s*=\s*["']\s*mailto:([^"'?]+)""", re.IGNORECASE)
+
+# Scripts qui méritent une évaluation (les autres sont ignorés sans être analysés)
+_SCRIPT_HINTS = ('addy', 'mailto', '&#', '@', 'fromCharCode', '\\x40', '\\u0040')
+
+
+# --- Évaluation des chaînes JavaScript -------------------------------------
+
+_JS_TOKEN_RE = re.compile(r"""
+    (?P<str>'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")
+  | (?P<chr>String\.fromCharCode\s*\((?P<codes>[\s\d,xXa-fA-F]*)\))
+  | (?P<num>\d+)
+  | (?P<name>\.?[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*)
+  | (?P<op>\+=|\+|=|;|\(|\)|\n)
+  | (?P<space>[ \t\r]+)
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+_JS_ESCAPE_RE = re.compile(r"\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|.)", re.DOTALL)
+_JS_SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+_DECLARATIONS = frozenset({'var', 'let', 'const'})
+
+
+def _js_unescape(literal):
+    def replace(match):
+        seq = match.group(1)
+        if seq[0] in 'xu' and len(seq) > 1:
+            return chr(int(seq[1:], 16))
+        return _JS_SIMPLE_ESCAPES.get(seq, seq)
+    return _JS_ESCAPE_RE.sub(replace, literal[1:-1])
+
+
+def _from_char_codes(codes):
+    chars = []
+    for code in codes.split(','):
+        code = code.strip()
+        if not code:
+            continue
+        # "0x110000", "09", "ff" : code invalide ignoré plutôt que de tout faire échouer
+        try:
+            chars.append(chr(int(code, 0)))
+        except (ValueError, OverflowError):
+            continue
+    return ''.join(chars)
+
+
+def _tokenize(script):
+    tokens = []
+    for match in _JS_TOKEN_RE.finditer(script):
+        kind = match.lastgroup
+        if kind == 'space':
+            continue
+        if kind == 'chr':
+            tokens.append(('str', _from_char_codes(match.group('codes'))))
+        elif kind == 'str':
+            tokens.append(('str', _js_unescape(match.group(0))))
+        else:
+            tokens.append((kind, match.group(0)))
+    return tokens
+
+
+def _parse_concat(tokens, pos, variables):
+    """Expression `terme + terme + ...` ; retourne (valeur ou None, position suivante)"""
+    parts = []
+    while pos < len(tokens):
+        kind, value = tokens[pos]
+        if kind == 'str':
+            parts.append(value)
+        elif kind == 'name' and value in variables:
+            parts.append(variables[value])
+        elif kind == 'op' and value == '(':
+            inner, end = _parse_concat(tokens, pos + 1, variables)
+            if inner is None or end >= len(tokens) or tokens[end] != ('op', ')'):
+                return None, pos
+            parts.append(inner)
+            pos = end
+        else:
+            return None, pos
+        pos += 1
+        if pos < len(tokens) and tokens[pos] == ('op', '+'):
+            pos += 1
+            continue
+        break
+    if not parts:
+        return None, pos
+    return ''.join(parts), pos
+
+
+def evaluate_js_strings(script):
+    """
+    Évalue les affectations de chaînes d'un script, sans l'exécuter.
+
+    Seuls les littéraux, String.fromCharCode, les variables déjà connues et
+    l'opérateur + sont compris ; toute autre expression est ignorée.
+    Retourne (variables, sorties) : les sorties sont les valeurs passées à
+    document.write(...) ou affectées à une propriété (innerHTML += ...).
+    """
+    tokens = _tokenize(script)
+    variables = {}
+    outputs = []
+    pos = 0
+    while pos < len(tokens):
+        kind, value = tokens[pos]
+        if kind == 'op' and value in ('=', '+=', '('):
+            result, end = _parse_concat(tokens, pos + 1, variables)
+            if result is not None:
+                target = tokens[pos - 1] if pos else (None, None)
+                simple_var = (target[0] == 'name' and '.' not in target[1]
+                              and (pos < 2 or tokens[pos - 2][0] != 'name'
+                                   or tokens[pos - 2][1] in _DECLARATIONS))
+                if value == '(' or not simple_var:
+                    outputs.append(result)
+                elif value == '+=':
+                    variables[target[1]] = variables.get(target[1], '') + result
+                else:
+                    variables[target[1]] = result
+                pos = end
+                continue
+        pos += 1
+    return variables, outputs
+
+
+# --- Décodage -------------------------------------------------------------
+
+def unescape_entities(text, max_rounds=3):
+    """Entités HTML nommées, décimales et hexadécimales, y compris doublement encodées"""
+    for _ in range(max_rounds):
+        decoded = html.unescape(text)
+        if decoded == text:
+            break
+        text = decoded
+    return text
+
+
+def _result(email, scheme, raw):
+    return {'email': email.strip().strip('.'), 'scheme': scheme, 'raw': raw}
+
+
+def decode_email_detail(value):
+    """
+    Décode une valeur d'href, d'attribut ou de texte.
+
+    Retourne {'email', 'scheme', 'raw'} ou None ; `scheme` liste les
+    encodages rencontrés ('percent', 'entities', 'at-dot' ou 'plain').
+    """
+    if not value:
+        return None
+    text = value.strip()
+    schemes = []
+
+    if '%' in text:
+        decoded = unquote(text)
+        if decoded != text:
+            schemes.append('percent')
+            text = decoded
+    if '&' in text:
+        decoded = unescape_entities(text)
+        if decoded != text:
+            schemes.append('entities')
+            text = decoded
+    if '%' in text and 'percent' not in schemes:
+        # %XX sous des entités : "&#37;40" -> "%40" -> "@"
+        decoded = unquote(text)
+        if decoded != text:
+            schemes.append('percent')
+            text = decoded
+
+    match = _MAILTO_RE.search(text)
+    candidate = match.group(1) if match else text
+    match = EMAIL_RE.search(candidate)
+    if match:
+        return _result(match.group(0), '+'.join(schemes) or 'plain', value)
+
+    match = _AT_DOT_RE.search(text)
+    if match:
+        domain = _DOT_RE.sub('.', match.group(2))
+        return _result(f"{match.group(1)}@{domain}", '+'.join(schemes + ['at-dot']), value)
+    return None
+
+
+def decode_email(value, default=None):
+    """Version simple : l'email décodé, ou `default` si rien de valide"""
+    result = decode_email_detail(value)
+    return result['email'] if result else default
+
+
+def decode_cfemail(hex_string):
+    """Protection Cloudflare : octets XOR la clé (premier octet)"""
+    data = bytes.fromhex(hex_string)
+    key = data[0]
+    return bytes(b ^ key for b in data[1:]).decode('utf-8', errors='replace')
+
+
+def decode_js_email(script):
+    """
+    Email produit par un script d'obfuscation (Joomla "addy", concaténations).
+
+    Retourne {'email', 'scheme', 'raw'} ou None. Les variables "addy" de
+    Joomla sont prioritaires sur le texte affiché.
+    """
+    if not script or not any(hint in script for hint in _SCRIPT_HINTS):
+        return None
+    variables, outputs = evaluate_js_strings(script)
+    scheme = 'joomla' if any(name.startswith('addy') for name in variables) else 'js'
+
+    ordered = [v for k, v in variables.items() if k.startswith('addy') and not k.startswith('addy_text')]
+    ordered += outputs + [v for k, v in variables.items() if not k.startswith('addy')]
+    for value in ordered:
+        result = decode_email_detail(value)
+        if result:
+            return _result(result['email'], scheme, script)
+    return None
+
+
+def find_emails(markup):
+    """
+    Tous les emails d'une page HTML brute, quel que soit le schéma.
+
+    Ordre : Cloudflare, <joomla-hidden-mail>, scripts, liens mailto, texte.
+    Chaque email n'apparaît qu'une fois (premier schéma rencontré).
+    """
+    if isinstance(markup, bytes):
+        markup = markup.decode('utf-8', errors='replace')
+    found = {}
+
+    def add(result):
+        if result and result['email'].lower() not in found:
+            found[result['email'].lower()] = result
+
+    for match in _CFEMAIL_RE.finditer(markup):
+        try:
+            email = decode_cfemail(match.group(1))
+        except ValueError:
+            continue
+        if EMAIL_RE.fullmatch(email):
+            add(_result(email, 'cloudflare', match.group(0)))
+
+    for match in _JOOMLA_HIDDEN_RE.finditer(markup):
+        attrs = {m.group(1).lower(): m.group(2) if m.group(2) is not None else m.group(3)
+                 for m in _ATTR_RE.finditer(match.group(1))}
+        try:
+            first = base64.b64decode(attrs.get('first', '')).decode('utf-8')
+            last = base64.b64decode(attrs.get('last', '')).decode('utf-8')
+        except ValueError:
+            continue
+        if first and last:
+            add(_result(f"{first}@{last}", 'joomla-hidden-mail', match.group(0)))
+
+    for match in _SCRIPT_RE.finditer(markup):
+        add(decode_js_email(match.group(1)))
+
+    for match in _HREF_MAILTO_RE.finditer(markup):
+        add(decode_email_detail(match.group(1)))
+
+    text = _SCRIPT_RE.sub(' ', markup)
+    for match in EMAIL_RE.finditer(unescape_entities(text)):
+        add(_result(match.group(0), 'plain', match.group(0)))
+    for match in _AT_DOT_RE.finditer(text):
+        add(decode_email_detail(match.group(0)))
+
+    return list(found.values())
+
+
+def find_email(markup):
+    """Premier email de la page (cf. find_emails), ou None"""
+    emails = find_emails(markup)
+    return emails[0] if emails else None
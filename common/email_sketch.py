@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Détection au fil de l'eau des emails génériques (adresse partagée du barreau)
+Au lieu de recompter tous les emails d'un CSV avec pandas une fois le
+scraping terminé, chaque email est compté dans un sketch count-min de
+taille fixe pendant le scraping. Un email dont l'estimation atteint le
+seuil devient candidat ; un second passage exact ne compte que les
+candidats. Le sketch ne sous-estime jamais : aucun email générique n'est
+manqué, et le passage exact écarte les faux positifs.
+"""
+
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from array import array
+
+DEFAULT_THRESHOLD = 50
+DEFAULT_WIDTH = 4096
+DEFAULT_DEPTH = 4
+
+
+def split_emails(value, separator=';'):
+    """Liste d'emails d'un champ "a@x.fr; b@y.fr" (ou d'une liste), tels qu'écrits"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(separator)
+    return [email.strip() for email in value if email and email.strip()]
+
+
+def email_key(email):
+    """Clé de comptage : "Contact@Barreau.fr" et "contact@barreau.fr" sont le même email"""
+    return email.strip().lower()
+
+
+def _email_keys(value):
+    return {email_key(email) for email in split_emails(value)}
+
+
+class CountMinSketch:
+    """
+    Sketch count-min à mise à jour conservatrice.
+
+    `depth` lignes de `width` compteurs ; l'estimation d'un élément est le
+    minimum de ses compteurs, toujours supérieure ou égale au vrai compte.
+    """
+
+    def __init__(self, width=DEFAULT_WIDTH, depth=DEFAULT_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.rows = [array('I', bytes(4 * width)) for _ in range(depth)]
+        self.total = 0
+
+    def _indexes(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, item, count=1):
+        """Compte `item` ; retourne la nouvelle estimation"""
+        indexes = self._indexes(item)
+        estimate = min(row[index] for row, index in zip(self.rows, indexes)) + count
+        for row, index in zip(self.rows, indexes):
+            if row[index] < estimate:
+                row[index] = estimate
+        self.total += count
+        return estimate
+
+    def estimate(self, item):
+        return min(row[index] for row, index in zip(self.rows, self._indexes(item)))
+
+    def merge(self, other):
+        """Ajoute les comptes d'un autre sketch de mêmes dimensions (autre barreau)"""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Sketchs de dimensions différentes")
+        for row, other_row in zip(self.rows, other.rows):
+            for index, value in enumerate(other_row):
+                if value:
+                    row[index] += value
+        self.total += other.total
+
+
+class SharedEmailDetector:
+    """
+    Étape de scraping qui repère les emails partagés par beaucoup de fiches.
+
+    `observe` est appelé avec les emails de chaque fiche dès qu'elle est
+    extraite ; `confirm` recompte exactement les seuls candidats et retourne
+    les emails génériques. L'état peut être sauvegardé pour cumuler
+    plusieurs barreaux (adresse nationale répétée partout).
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, width=DEFAULT_WIDTH, depth=DEFAULT_DEPTH):
+        self.threshold = threshold
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates = {}    # email -> estimation au moment où le seuil a été atteint
+        self.records = 0
+
+    def observe(self, emails):
+        """Compte les emails d'une fiche ; retourne ceux qui viennent de passer le seuil"""
+        self.records += 1
+        flagged = []
+        for email in _email_keys(emails):
+            estimate = self.sketch.add(email)
+            if estimate >= self.threshold and email not in self.candidates:
+                self.candidates[email] = estimate
+                flagged.append(email)
+        return flagged
+
+    def is_candidate(self, email):
+        return email_key(email) in self.candidates
+
+    def exact_counts(self, email_lists):
+        """Comptes exacts des seuls candidats, sur un nouveau passage des fiches"""
+        counts = dict.fromkeys(self.candidates, 0)
+        for emails in email_lists:
+            for email in _email_keys(emails):
+                if email in counts:
+                    counts[email] += 1
+        return counts
+
+    def confirm(self, email_lists):
+        """Emails génériques confirmés : {email: compte exact} au-dessus du seuil"""
+        return {email: count for email, count in self.exact_counts(email_lists).items()
+                if count >= self.threshold}
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            json.dump({'threshold': self.threshold, 'width': self.sketch.width, 'depth': self.sketch.depth,
+                       'total': self.sketch.total, 'records': self.records, 'candidates': self.candidates,
+                       'rows': [row.tolist() for row in self.sketch.rows]}, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, threshold=None):
+        """
+        Détecteur sauvegardé par `save` (un détecteur vide si le fichier n'existe pas).
+
+        Avec un autre seuil, seuls les candidats dont l'estimation l'atteint
+        restent ; un email sous l'ancien seuil redevient candidat dès sa
+        prochaine observation.
+        """
+        if not os.path.exists(path):
+            return cls(threshold or DEFAULT_THRESHOLD)
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            state = json.load(f)
+        detector = cls(threshold or state['threshold'], state['width'], state['depth'])
+        detector.sketch.rows = [array('I', row) for row in state['rows']]
+        detector.sketch.total = state['total']
+        detector.records = state['records']
+        detector.candidates = {email: estimate for email, estimate in state['candidates'].items()
+                               if detector.sketch.estimate(email) >= detector.threshold}
+        return detector
+
+    def print_stats(self):
+        print(f"📧 Emails génériques: {self.records} fiches observées, {len(self.candidates)} candidats "
+              f"(seuil {self.threshold}, sketch {self.sketch.depth}x{self.sketch.width})")
+
+
+def remove_emails(value, generic, separator='; '):
+    """Champ d'emails sans les emails génériques (clés de `email_key`), casse d'origine conservée"""
+    return separator.join(email for email in split_emails(value) if email_key(email) not in generic)
+
+
+# --- Banc d'essai ---------------------------------------------------------
+
+def benchmark(records=1000000, shared=20, threshold=DEFAULT_THRESHOLD):
+    """Flux synthétique : emails individuels + `shared` adresses de barreau répétées"""
+    import random
+    rng = random.Random(0)
+    shared_emails = [f"contact@barreau-{i}.fr" for i in range(shared)]
+    detector = SharedEmailDetector(threshold)
+    start = time.perf_counter()
+    for i in range(records):
+        emails = [f"avocat{i}@cabinet{i % 5000}.fr"]
+        if rng.random() < 0.05:
+            emails.append(rng.choice(shared_emails))
+        detector.observe(emails)
+    elapsed = time.perf_counter() - start
+    detector.print_stats()
+    print(f"⏱️  {records} fiches en {elapsed:.2f}s ({records / elapsed:.0f} fiches/s), "
+          f"{len(detector.candidates)} candidats pour {shared} adresses partagées")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Détection des emails génériques")
+    commands = parser.add_subparsers(dest='command', required=True)
+    scan = commands.add_parser('scan', help="Emails génériques d'un CSV (colonne d'emails)")
+    scan.add_argument('csv_file')
+    scan.add_argument('--column', default='emails')
+    scan.add_argument('--threshold', '-t', type=int, default=DEFAULT_THRESHOLD)
+    scan.add_argument('--state', help="Sketch sauvegardé à cumuler (plusieurs barreaux)")
+    bench = commands.add_parser('bench', help="Flux synthétique")
+    bench.add_argument('--records', type=int, default=1000000)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        benchmark(args.records)
+        return 0
+
+    detector = SharedEmailDetector.load(args.state, args.threshold) if args.state \
+        else SharedEmailDetector(args.threshold)
+
+    def rows():
+        with open(args.csv_file, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                yield row.get(args.column)
+
+    for emails in rows():
+        detector.observe(emails)
+    generic = detector.confirm(rows())
+    detector.print_stats()
+    for email, count in sorted(generic.items(), key=lambda item: -item[1]):
+        print(f"   {email}: {count} occurrences")
+    if args.state:
+        detector.save(args.state)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parseur HTML rapide pour les extracteurs de fiches avocats
+Même interface que BeautifulSoup pour l'essentiel (get_text, select,
+select_one, get, has_attr), mais construite sur lxml ou selectolax (C).
+L'analyse peut être limitée au bloc de la fiche (équivalent SoupStrainer),
+et BeautifulSoup reprend la main sur le HTML que le backend rapide refuse.
+
+Benchmark sur les pages réelles enregistrées (common/fixtures/fast_html/<barreau>/):
+    python -m common.fast_html capture angers angers/.http_cache/
+    python -m common.fast_html capture havre https://... https://...
+    python -m common.fast_html bench
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import re
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import UnicodeDammit
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+    _PARSE_ERRORS = (ValueError, TypeError, etree.ParserError)
+except ImportError:
+    LXML_AVAILABLE = False
+    _PARSE_ERRORS = (ValueError, TypeError)
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    from cssselect import GenericTranslator, SelectorError
+    _translator = GenericTranslator()
+    CSSSELECT_AVAILABLE = True
+except ImportError:
+    CSSSELECT_AVAILABLE = False
+    SelectorError = ValueError
+
+# Builder BeautifulSoup le plus rapide disponible, pour le code qui garde bs4
+SOUP_FEATURES = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+# Pages de fiches réelles, un dossier par barreau, pour le benchmark
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'fast_html')
+
+# Contenu jamais rendu : exclu du texte, comme le fait bs4.get_text()
+SKIPPED_TAGS = ('script', 'style', 'noscript', 'template')
+
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+_TITLE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+
+def default_backend():
+    if SELECTOLAX_AVAILABLE:
+        return 'selectolax'
+    if LXML_AVAILABLE:
+        return 'lxml'
+    return 'bs4'
+
+
+def to_text(markup):
+    """Décode des octets comme le ferait BeautifulSoup (UTF-8 d'abord, puis détection)"""
+    if isinstance(markup, str):
+        return markup
+    try:
+        return markup.decode('utf-8')
+    except UnicodeDecodeError:
+        return UnicodeDammit(markup, is_html=True).unicode_markup or ''
+
+
+# --- Sélecteurs CSS -----------------------------------------------------------
+
+_SIMPLE = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*)?(?:#(?P<id>[\w-]+))?(?:\.(?P<cls>[\w-]+))?$')
+_COMPOUND = re.compile(
+    r'(?P<tag>\*|[a-zA-Z][\w-]*)?'
+    r'(?P<rest>(?:#[\w-]+|\.[\w-]+|\[[\w-]+(?:[~^$*|]?=(?:"[^"]*"|\'[^\']*\'|[^\]]*))?\])*)$'
+)
+_PART = re.compile(r'#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:([~^$*|]?=)("[^"]*"|\'[^\']*\'|[^\]]*))?\]')
+
+
+def strainer_for(selector):
+    """SoupStrainer équivalent à un sélecteur simple ('div', 'div#id', 'div.classe'), sinon None"""
+    match = _SIMPLE.match(selector.strip()) if selector else None
+    if not match or not any(match.groupdict().values()):
+        return None
+    attrs = {}
+    if match.group('id'):
+        attrs['id'] = match.group('id')
+    if match.group('cls'):
+        attrs['class'] = match.group('cls')
+    return SoupStrainer(match.group('tag') or True, attrs=attrs)
+
+
+def _xpath_literal(value):
+    if "'" not in value:
+        return f"'{value}'"
+    return 'concat(' + ", \"'\", ".join(f"'{part}'" for part in value.split("'")) + ')'
+
+
+def _compound_to_xpath(compound):
+    match = _COMPOUND.match(compound)
+    if not match:
+        raise ValueError(f"Sélecteur CSS non géré: {compound}")
+    conditions = []
+    for id_, cls, attr, op, value in _PART.findall(match.group('rest')):
+        if id_:
+            conditions.append(f"@id={_xpath_literal(id_)}")
+        elif cls:
+            conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), {_xpath_literal(' ' + cls + ' ')})")
+        else:
+            value = value.strip('"\'')
+            literal = _xpath_literal(value)
+            conditions.append({
+                '': f"@{attr}",
+                '=': f"@{attr}={literal}",
+                '^=': f"starts-with(@{attr}, {literal})",
+                '$=': f"substring(@{attr}, string-length(@{attr}) - {len(value) - 1})={literal}",
+                '*=': f"contains(@{attr}, {literal})",
+                '~=': f"contains(concat(' ', normalize-space(@{attr}), ' '), {_xpath_literal(' ' + value + ' ')})",
+                '|=': f"(@{attr}={literal} or starts-with(@{attr}, {_xpath_literal(value + '-')}))",
+            }[op])
+    step = match.group('tag') or '*'
+    return step + ''.join(f'[{c}]' for c in conditions)
+
+
+def css_to_xpath(selector):
+    """
+    Traduit un sélecteur CSS en XPath pour lxml.
+
+    Utilise cssselect s'il est installé ; sinon gère les cas courants des
+    scrapers (balise, #id, .classe, [attr], [attr^=..], descendant, '>', ',').
+    Lève ValueError pour le reste (pseudo-classes...).
+    """
+    if CSSSELECT_AVAILABLE:
+        try:
+            return _translator.css_to_xpath(selector)
+        except SelectorError as e:
+            raise ValueError(str(e))
+
+    paths = []
+    for group in selector.split(','):
+        # Blocs "balise#id.classe[attr]" séparés par ' ' (descendant) ou '>' (enfant)
+        tokens = re.findall(r'\s*>\s*|\s+|(?:[^\s>\[]|\[[^\]]*\])+', group.strip())
+        xpath, axis = '', 'descendant::'
+        for token in tokens:
+            if token.strip() == '>':
+                axis = '/'
+            elif not token.strip():
+                axis = axis if axis == '/' else '//'
+            else:
+                xpath += axis + _compound_to_xpath(token)
+                axis = '//'
+        if not xpath:
+            raise ValueError(f"Sélecteur CSS vide: {selector!r}")
+        paths.append(xpath)
+    return ' | '.join(paths)
+
+
+# --- Nœuds ----------------------------------------------------------------------
+
+class LxmlNode:
+    """Élément lxml présenté avec les méthodes BeautifulSoup usuelles"""
+
+    __slots__ = ('el',)
+
+    def __init__(self, el):
+        self.el = el
+
+    @property
+    def name(self):
+        return self.el.tag
+
+    @property
+    def attrs(self):
+        return dict(self.el.attrib)
+
+    @property
+    def classes(self):
+        return (self.el.get('class') or '').split()
+
+    def get(self, attr, default=None):
+        return self.el.get(attr, default)
+
+    def __getitem__(self, attr):
+        value = self.el.get(attr)
+        if value is None:
+            raise KeyError(attr)
+        return value
+
+    def has_attr(self, attr):
+        return attr in self.el.attrib
+
+    @property
+    def parent(self):
+        parent = self.el.getparent()
+        return LxmlNode(parent) if parent is not None else None
+
+    @property
+    def strings(self):
+        return self.el.itertext()
+
+    @property
+    def stripped_strings(self):
+        for text in self.el.itertext():
+            text = text.strip()
+            if text:
+                yield text
+
+    def get_text(self, separator='', strip=False):
+        if strip:
+            return separator.join(self.stripped_strings)
+        return separator.join(self.el.itertext())
+
+    @property
+    def text(self):
+        return self.get_text()
+
+    def select(self, css):
+        return [LxmlNode(el) for el in self.el.xpath(css_to_xpath(css)) if isinstance(el.tag, str)]
+
+    def select_one(self, css):
+        found = self.select(css)
+        return found[0] if found else None
+
+    def __repr__(self):
+        return f'<LxmlNode {self.el.tag}>'
+
+
+class LexborNode:
+    """Nœud selectolax (lexbor) présenté avec les méthodes BeautifulSoup usuelles"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def name(self):
+        return self.node.tag
+
+    @property
+    def attrs(self):
+        return {attr: value or '' for attr, value in self.node.attributes.items()}
+
+    @property
+    def classes(self):
+        return (self.node.attributes.get('class') or '').split()
+
+    def get(self, attr, default=None):
+        if attr not in self.node.attributes:
+            return default
+        # Attribut sans valeur : '' comme lxml et bs4 (lexbor rend None)
+        return self.node.attributes[attr] or ''
+
+    def __getitem__(self, attr):
+        if attr not in self.node.attributes:
+            raise KeyError(attr)
+        return self.node.attributes[attr] or ''
+
+    def has_attr(self, attr):
+        return attr in self.node.attributes
+
+    @property
+    def parent(self):
+        parent = self.node.parent
+        return LexborNode(parent) if parent is not None else None
+
+    @property
+    def stripped_strings(self):
+        for node in self.node.traverse(include_text=True):
+            if node.tag == '-text':
+                text = node.text_content.strip()
+                if text:
+                    yield text
+
+    def get_text(self, separator='', strip=False):
+        if strip:
+            return separator.join(self.stripped_strings)
+        return self.node.text(deep=True, separator=separator)
+
+    @property
+    def text(self):
+        return self.get_text()
+
+    def select(self, css):
+        # lexbor teste aussi le nœud lui-même ; bs4 ne cherche que dans les descendants
+        return [LexborNode(n) for n in self.node.css(css) if n.mem_id != self.node.mem_id]
+
+    def select_one(self, css):
+        nodes = self.select(css)
+        return nodes[0] if nodes else None
+
+    def __repr__(self):
+        return f'<LexborNode {self.node.tag}>'
+
+
+class SoupNode:
+    """
+    Élément BeautifulSoup (repli sans lxml ni selectolax) présenté comme les
+    nœuds rapides : `classes` en liste, `get('class')` et `attrs` en chaînes
+    (bs4 rend une liste pour les attributs multi-valués), `select` qui rend
+    des SoupNode.
+    """
+
+    __slots__ = ('tag',)
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    @staticmethod
+    def _value(value):
+        return ' '.join(value) if isinstance(value, (list, tuple)) else value
+
+    @property
+    def name(self):
+        return self.tag.name
+
+    @property
+    def attrs(self):
+        return {attr: self._value(value) for attr, value in self.tag.attrs.items()}
+
+    @property
+    def classes(self):
+        return list(self.tag.get('class') or [])
+
+    def get(self, attr, default=None):
+        value = self.tag.get(attr)
+        return default if value is None else self._value(value)
+
+    def __getitem__(self, attr):
+        value = self.tag.get(attr)
+        if value is None:
+            raise KeyError(attr)
+        return self._value(value)
+
+    def has_attr(self, attr):
+        return self.tag.has_attr(attr)
+
+    @property
+    def parent(self):
+        parent = self.tag.parent
+        return SoupNode(parent) if parent is not None else None
+
+    @property
+    def strings(self):
+        return self.tag.strings
+
+    @property
+    def stripped_strings(self):
+        return self.tag.stripped_strings
+
+    def get_text(self, separator='', strip=False):
+        return self.tag.get_text(separator=separator, strip=strip)
+
+    @property
+    def text(self):
+        return self.get_text()
+
+    def select(self, css):
+        return [SoupNode(tag) for tag in self.tag.select(css)]
+
+    def select_one(self, css):
+        found = self.select(css)
+        return found[0] if found else None
+
+    def __repr__(self):
+        return f'<SoupNode {self.tag.name}>'
+
+
+class HtmlPage:
+    """
+    Document analysé (ou seulement le bloc `container`).
+
+    `backend` vaut 'selectolax', 'lxml' ou 'bs4' (repli). `root` est le
+    nœud de la fiche ; les méthodes courantes y sont déléguées. `soup`
+    construit à la demande un BeautifulSoup du même bloc pour le code existant.
+    """
+
+    def __init__(self, markup, root, backend, container=None, title=None, container_found=True):
+        self.markup = markup
+        self.root = root
+        self.backend = backend
+        self.container = container
+        self.title = title
+        self.container_found = container_found
+        self._soup = root.tag if isinstance(root, SoupNode) else None
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            self._soup = make_soup(self.markup, self.container if self.container_found else None)
+        return self._soup
+
+    def get_text(self, separator='', strip=False):
+        return self.root.get_text(separator=separator, strip=strip)
+
+    def select(self, css):
+        try:
+            return self.root.select(css)
+        except ValueError:
+            # Sélecteur hors de portée du traducteur : BeautifulSoup (soupsieve) s'en charge
+            return [SoupNode(tag) for tag in self.soup.select(css)]
+
+    def select_one(self, css):
+        found = self.select(css)
+        return found[0] if found else None
+
+    def links(self, pattern=None):
+        """Valeurs href des liens, filtrées par une regex facultative"""
+        regex = re.compile(pattern) if pattern else None
+        hrefs = [a.get('href') for a in self.select('a[href]')]
+        return [h for h in hrefs if h and (regex is None or regex.search(h))]
+
+    def mailtos(self):
+        return [h[7:].split('?')[0].strip() for h in self.links(r'^mailto:')]
+
+
+def make_soup(markup, container=None):
+    """BeautifulSoup avec le builder le plus rapide, limité au bloc `container` si simple"""
+    strainer = strainer_for(container) if container else None
+    soup = BeautifulSoup(markup, SOUP_FEATURES, parse_only=strainer)
+    if strainer is not None and not soup.contents:
+        soup = BeautifulSoup(markup, SOUP_FEATURES)
+    return soup
+
+
+def _parse_lxml(text, container):
+    text = _XML_DECLARATION.sub('', text, count=1)
+    tree = lxml_html.document_fromstring(text)
+    etree.strip_elements(tree, *SKIPPED_TAGS, with_tail=False)
+    etree.strip_elements(tree, etree.Comment, with_tail=False)
+    title_el = tree.find('.//title')
+    title = title_el.text_content() if title_el is not None else None
+    root = LxmlNode(tree)
+    found = True
+    if container:
+        node = root.select_one(container)
+        found = node is not None
+        root = node or root
+    return root, title, found
+
+
+def _parse_selectolax(text, container):
+    tree = LexborHTMLParser(text)
+    tree.strip_tags(list(SKIPPED_TAGS))
+    title_node = tree.css_first('title')
+    title = title_node.text() if title_node is not None else None
+    found = True
+    node = tree.root
+    if container:
+        match = tree.css_first(container)
+        found = match is not None
+        node = match or node
+    if node is None:
+        raise ValueError("Document vide")
+    return LexborNode(node), title, found
+
+
+def parse_html(markup, container=None, backend=None):
+    """
+    Analyse une page avec le backend le plus rapide disponible.
+
+    `container` : sélecteur CSS du bloc utile (la fiche) ; le texte et les
+    recherches se limitent à ce bloc s'il est présent. Les documents que
+    lxml/selectolax refusent sont confiés à BeautifulSoup.
+    """
+    backend = backend or default_backend()
+    text = to_text(markup)
+
+    if backend in ('selectolax', 'lxml'):
+        try:
+            parse = _parse_selectolax if backend == 'selectolax' else _parse_lxml
+            root, title, found = parse(text, container)
+            return HtmlPage(text, root, backend, container, title, found)
+        except _PARSE_ERRORS:
+            # HTML vide ou exotique refusé par le backend rapide : repli bs4
+            pass
+
+    soup = make_soup(text, container)
+    found = True
+    root = soup
+    if container:
+        node = soup.select_one(container)
+        found = node is not None
+        root = node or soup
+    if soup.title:
+        title = soup.title.get_text()
+    else:
+        # <title> écarté par le SoupStrainer du conteneur
+        match = _TITLE.search(text)
+        title = BeautifulSoup(match.group(1), SOUP_FEATURES).get_text() if match else None
+    return HtmlPage(text, SoupNode(root), 'bs4', container, title, found)
+
+
+# --- Benchmark -------------------------------------------------------------------
+
+def _load_fixtures(paths):
+    """Fichiers .html/.htm, ou entrées du cache HTTP (.json.gz) décodées"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in ('*.html', '*.htm', '*.json.gz'):
+                files.extend(glob.glob(os.path.join(path, '**', pattern), recursive=True))
+        else:
+            files.extend(glob.glob(path))
+    pages = []
+    for name in sorted(files):
+        if name.endswith('.json.gz'):
+            from common.http_cache import CacheEntry
+            with gzip.open(name, 'rt', encoding='utf-8') as f:
+                entry = CacheEntry.from_dict(json.load(f))
+            if 'html' not in (entry._header('Content-Type') or 'text/html'):
+                continue
+            pages.append(entry.body)
+        else:
+            with open(name, 'rb') as f:
+                pages.append(f.read())
+    return pages
+
+
+def capture_fixtures(bar, sources, dest=FIXTURES_DIR, limit=20):
+    """
+    Enregistre des pages réelles d'un barreau dans `dest/<bar>/NNN.html` :
+    URLs téléchargées, fichiers HTML ou dossier du cache HTTP du scraper.
+    """
+    folder = os.path.join(dest, bar)
+    os.makedirs(folder, exist_ok=True)
+    index = len(glob.glob(os.path.join(folder, '*.html')))
+    saved = 0
+    for source in sources:
+        if source.startswith(('http://', 'https://')):
+            import requests
+            response = requests.get(source, timeout=30)
+            response.raise_for_status()
+            pages = [response.content]
+        else:
+            pages = _load_fixtures([source])
+        for page in pages:
+            if saved >= limit:
+                break
+            index += 1
+            saved += 1
+            with open(os.path.join(folder, f'{index:03d}.html'), 'wb') as f:
+                f.write(page if isinstance(page, bytes) else page.encode('utf-8'))
+    print(f"💾 {saved} page(s) enregistrée(s) dans {folder}")
+    return saved
+
+
+def benchmark(pages, container=None, repeat=3):
+    """Temps moyen par page : BeautifulSoup html.parser complet vs parse_html"""
+    def run(label, func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for page in pages:
+                func(page)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        per_page = best / len(pages) * 1000
+        print(f"   {label:<38} {per_page:8.2f} ms/page")
+        return per_page
+
+    print(f"⏱️  Benchmark sur {len(pages)} pages (meilleur de {repeat})")
+    results = {'bs4 html.parser': run("BeautifulSoup html.parser + get_text",
+                                      lambda p: BeautifulSoup(p, 'html.parser').get_text())}
+    if LXML_AVAILABLE:
+        results['bs4 lxml'] = run("BeautifulSoup lxml + get_text",
+                                  lambda p: make_soup(p, container).get_text())
+    for backend in ('lxml', 'selectolax'):
+        if backend == 'lxml' and not LXML_AVAILABLE or backend == 'selectolax' and not SELECTOLAX_AVAILABLE:
+            continue
+        results[backend] = run(f"parse_html({backend}) + get_text",
+                               lambda p, b=backend: parse_html(p, container, b).get_text())
+    baseline = results['bs4 html.parser']
+    fastest = min(results, key=results.get)
+    print(f"   → {fastest}: {baseline / results[fastest]:.1f}x plus rapide que html.parser")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du parseur HTML rapide")
+    commands = parser.add_subparsers(dest='command', required=True)
+    bench = commands.add_parser('bench', help="Mesurer le temps de parsing par page")
+    bench.add_argument('paths', nargs='*', help="Fichiers/dossiers HTML ou dossier du cache HTTP "
+                                                "(défaut : pages enregistrées, barreau par barreau)")
+    bench.add_argument('--container', help="Sélecteur CSS du bloc fiche")
+    bench.add_argument('--repeat', type=int, default=3)
+    capture = commands.add_parser('capture', help="Enregistrer des pages réelles d'un barreau")
+    capture.add_argument('bar', help="Nom du barreau (dossier de destination)")
+    capture.add_argument('sources', nargs='+', help="URLs, fichiers HTML ou dossier du cache HTTP")
+    capture.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == 'capture':
+        capture_fixtures(args.bar, args.sources, limit=args.limit)
+        return
+
+    if args.paths:
+        groups = [(None, args.paths)]
+    else:
+        bars = sorted(d for d in os.listdir(FIXTURES_DIR) if os.path.isdir(os.path.join(FIXTURES_DIR, d)))
+        groups = [(bar, [os.path.join(FIXTURES_DIR, bar)]) for bar in bars]
+    found = False
+    for bar, paths in groups:
+        pages = _load_fixtures(paths)
+        if not pages:
+            continue
+        found = True
+        if bar:
+            print(f"\n🏛️  {bar}")
+        benchmark(pages, args.container, args.repeat)
+    if not found:
+        print("❌ Aucune page HTML trouvée"
+              + ("" if args.paths else f" dans {FIXTURES_DIR} (voir 'capture')"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Extraction de champs par règles déclaratives, en un seul passage
+Chaque règle décrit un champ (libellé d'ancrage, regex de capture,
+post-traitements) ; le jeu de règles est compilé une fois en un seul
+scanner qui repère tous les libellés dans le texte de la fiche, puis la
+capture est faite localement à chaque position trouvée. Le texte n'est
+parcouru qu'une fois, au lieu d'un re.search par champ et par motif.
+"""
+
+import argparse
+import heapq
+import re
+import sys
+import time
+
+_FLAG_LETTERS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+# Premier caractère "n'importe quelle lettre" : trop large pour le scanner commun
+_BROAD_FRAGMENT_RE = re.compile(r'\\[wWSD]|[A-Za-z]-[A-Za-z]|^\.$')
+
+
+# --- Post-traitements courants ---------------------------------------------
+
+def stripped(trailing=None):
+    """Espaces retirés, puis les caractères `trailing` en fin de valeur"""
+    def process(value):
+        value = value.strip()
+        return value.rstrip(trailing) if trailing else value
+    return process
+
+
+def collapse_spaces(value):
+    """Espaces, tabulations et retours à la ligne réduits à un espace"""
+    return re.sub(r'\s+', ' ', value).strip()
+
+
+def truncate(length):
+    def process(value):
+        return value[:length]
+    return process
+
+
+def length_between(low, high):
+    """Valeur rejetée si sa longueur n'est pas strictement entre low et high"""
+    def process(value):
+        return value if low < len(value) < high else None
+    return process
+
+
+def year_between(low, high):
+    """Année rejetée hors de [low, high]"""
+    def process(value):
+        return value if value.isdigit() and low <= int(value) <= high else None
+    return process
+
+
+# --- Compilation ------------------------------------------------------------
+
+def _split_branches(pattern):
+    """Alternatives de premier niveau d'un motif"""
+    branches, depth, start, i = [], 0, 0, 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 1
+        elif char == '[':
+            i = _class_end(pattern, i)
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            branches.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    branches.append(pattern[start:])
+    return branches
+
+
+def _class_end(pattern, i):
+    """Position du ']' fermant la classe ouverte en i"""
+    i += 2 if pattern[i + 1:i + 2] in ('^', ']') else 1
+    while i < len(pattern) and pattern[i] != ']':
+        i += 2 if pattern[i] == '\\' else 1
+    return i
+
+
+def _group_end(pattern, i):
+    depth = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 1
+        elif char == '[':
+            i = _class_end(pattern, i)
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return i
+
+
+def _class_fragment(content):
+    """Contenu de classe réutilisable au milieu d'une autre classe"""
+    if content.startswith((']', '-')):
+        content = '\\' + content
+    if content.endswith('-') and not content.endswith('\\-'):
+        content = content[:-1] + '\\-'
+    return content
+
+
+def _first_chars(pattern, ignorecase):
+    """
+    Fragments de classe couvrant le premier caractère d'un motif, ou None.
+
+    Sert à construire le filtre du scanner : sans lui, les alternatives
+    sont essayées à chaque position du texte.
+    """
+    fragments = []
+    for branch in _split_branches(pattern):
+        while branch.startswith(('\\b', '^')):
+            branch = branch[1 if branch[0] == '^' else 2:]
+        if not branch:
+            return None
+        if branch[0] == '(':
+            if branch.startswith('(?') and not branch.startswith('(?:'):
+                return None
+            end = _group_end(branch, 0)
+            inner = _first_chars(branch[3 if branch.startswith('(?:') else 1:end], ignorecase)
+            rest = branch[end + 1:]
+        elif branch[0] == '[':
+            end = _class_end(branch, 0)
+            if branch[1] == '^' or (ignorecase and any(c.isalpha() for c in branch[1:end])):
+                return None
+            inner = [_class_fragment(branch[1:end])]
+            rest = branch[end + 1:]
+        elif branch[0] == '\\':
+            if branch[1:2] in ('A', 'B', 'Z') or branch[1:2].isdigit():
+                return None
+            inner = [branch[:2]]
+            rest = branch[2:]
+        elif branch[0] in '.$*+?{}|)':
+            return None
+        else:
+            char = branch[0]
+            inner = [re.escape(c) for c in {char, char.lower(), char.upper()}] if ignorecase else [re.escape(char)]
+            rest = branch[1:]
+        if inner is None or rest[:1] in ('?', '*') or rest.startswith('{0'):
+            return None
+        fragments.extend(inner)
+    return fragments
+
+
+def _scoped(pattern, flags):
+    letters = ''.join(letter for flag, letter in _FLAG_LETTERS if flags & flag)
+    return f'(?{letters}:{pattern})' if letters else f'(?:{pattern})'
+
+
+def _compile_rule(index, spec):
+    field = spec['field']
+    label = spec.get('label')
+    pattern = spec.get('pattern', '')
+    if not label and not pattern:
+        raise ValueError(f"Règle {field!r} sans libellé ni motif")
+    flags = spec.get('flags', 0)
+    regex = re.compile(f'(?:{label}){pattern}' if label else pattern, flags)
+
+    group = spec.get('group')
+    if group is None:
+        if isinstance(field, tuple):
+            group = tuple(range(1, len(field) + 1))
+        else:
+            group = 1 if regex.groups else 0
+    post = spec.get('post', ())
+    if callable(post):
+        post = (post,)
+    multi = spec.get('multi', False)
+    return {
+        'index': index,
+        'field': field,
+        'regex': regex,
+        'anchor': _scoped(label or pattern, flags),
+        'first': _first_chars(label or pattern, flags & re.IGNORECASE),
+        'group': group,
+        'post': tuple(post),
+        'multi': float('inf') if multi is True else multi,
+        'matches': spec.get('matches'),
+        'join': spec.get('join'),
+        'line': spec.get('line', False),
+    }
+
+
+def _rule_hits(rule, text):
+    for match in rule['regex'].finditer(text):
+        yield match.start(), rule['index'], match
+
+
+class FieldRules:
+    """
+    Jeu de règles compilé.
+
+    Une règle est un dict : `field` (nom, ou tuple de noms remplis par les
+    groupes 1..n), `label` (regex du libellé, optionnelle), `pattern` (regex
+    de capture après le libellé), `flags`, `group`, `post` (fonction ou
+    tuple de fonctions ; None ou '' rejette la valeur et la recherche
+    continue), `multi` (nombre de valeurs à garder, True pour toutes),
+    `join` (séparateur des valeurs multiples, sinon liste), `matches`
+    (nombre de matches examinés, rejetés compris : `findall(...)[:n]` puis
+    filtre, là où `multi` compte les valeurs gardées) et `line` (la valeur
+    est la ou les lignes complètes couvertes par le match).
+
+    Pour un même champ, les règles sont des alternatives par ordre de
+    priorité, comme une liste de motifs essayés l'un après l'autre.
+    Les motifs ne doivent pas utiliser de groupes nommés ni de références
+    arrière numérotées : ils sont assemblés dans un seul scanner.
+    """
+
+    def __init__(self, rules):
+        self.rules = [_compile_rule(index, spec) for index, spec in enumerate(rules)]
+        self.fields = {}
+        for rule in self.rules:
+            self.fields.setdefault(rule['field'], []).append(rule['index'])
+        for field, indexes in self.fields.items():
+            if len({bool(self.rules[i]['multi']) for i in indexes}) > 1:
+                raise ValueError(f"Champ {field!r} : règles simples et multiples mélangées")
+
+        # Les règles qui peuvent commencer sur n'importe quelle lettre (email
+        # sans libellé...) forceraient le scanner à s'arrêter partout : elles
+        # gardent leur propre finditer, fusionné dans l'ordre du texte.
+        self.scanned, self.separate = [], []
+        for rule in self.rules:
+            broad = rule['first'] is None or any(_BROAD_FRAGMENT_RE.search(f) for f in rule['first'])
+            (self.separate if broad else self.scanned).append(rule)
+        self.scanner = None
+        if self.scanned:
+            anchors = '|'.join(f"(?P<r{k}>{rule['anchor']})" for k, rule in enumerate(self.scanned))
+            guard = ''.join(dict.fromkeys(f for rule in self.scanned for f in rule['first']))
+            self.scanner = re.compile(f'(?=[{guard}])(?={anchors})')
+
+    def _scanner_hits(self, text, done):
+        ends = [0] * len(self.rules)
+        for hit in self.scanner.finditer(text):
+            pos = hit.start()
+            for rule in self.scanned[int(hit.lastgroup[1:]):]:
+                index = rule['index']
+                if done[index] or pos < ends[index]:
+                    continue
+                match = rule['regex'].match(text, pos)
+                if match:
+                    ends[index] = max(match.end(), pos + 1)
+                    yield pos, index, match
+
+    def _scan(self, text, done):
+        """(règle, match) dans l'ordre du texte, en un seul passage"""
+        streams = [self._scanner_hits(text, done)] if self.scanner else []
+        streams += [_rule_hits(rule, text) for rule in self.separate]
+        for _, index, match in heapq.merge(*streams):
+            if all(done):
+                return
+            if not done[index]:
+                yield self.rules[index], match
+
+    def _scan_each(self, text, done):
+        """Référence : un finditer par règle (pour les vérifications)"""
+        for rule in self.rules:
+            for match in rule['regex'].finditer(text):
+                if done[rule['index']]:
+                    break
+                yield rule, match
+
+    @staticmethod
+    def _value(rule, match):
+        group = rule['group']
+        if rule['line']:
+            text = match.string
+            end = text.find('\n', match.end())
+            value = text[text.rfind('\n', 0, match.start()) + 1:end if end != -1 else len(text)].strip()
+        elif isinstance(group, tuple):
+            value = tuple(match.group(g) or '' for g in group)
+        else:
+            value = match.group(group) or ''
+        for process in rule['post']:
+            value = process(value)
+            if not value:
+                return None
+        return value
+
+    def extract(self, text, defaults=None, single_pass=True):
+        """
+        Champs trouvés dans `text`, ajoutés à une copie de `defaults`.
+
+        single_pass=False applique chaque règle séparément (même résultat,
+        sert de référence pour le bench).
+        """
+        result = dict(defaults or {})
+        if not text:
+            return result
+        values = {}
+        done = [False] * len(self.rules)
+        examined = [0] * len(self.rules)
+        hits = self._scan(text, done) if single_pass else self._scan_each(text, done)
+        for rule, match in hits:
+            index = rule['index']
+            examined[index] += 1
+            if rule['matches'] and examined[index] >= rule['matches']:
+                done[index] = True
+            value = self._value(rule, match)
+            if value is None:
+                continue
+            if rule['multi']:
+                found = values.setdefault(index, [])
+                found.append(value)
+                if len(found) >= rule['multi']:
+                    done[index] = True
+            else:
+                values[index] = value
+                for other in self.fields[rule['field']]:
+                    if other >= index:
+                        done[other] = True
+
+        for field, indexes in self.fields.items():
+            taken = [index for index in indexes if index in values]
+            if not taken:
+                continue
+            first = self.rules[taken[0]]
+            if first['multi']:
+                items = [item for index in taken for item in values[index]]
+                value = first['join'].join(items) if first['join'] is not None else items
+            else:
+                value = values[taken[0]]
+            if isinstance(field, tuple):
+                result.update(zip(field, value))
+            else:
+                result[field] = value
+        return result
+
+
+# --- Bench ----------------------------------------------------------------
+
+_BENCH_RULES = [
+    {'field': 'annee_inscription', 'label': r'PRESTATION DE SERMENT', 'pattern': r'\s*[^\d]*(\d{4})',
+     'flags': re.IGNORECASE},
+    {'field': 'structure', 'label': r'STRUCTURE', 'pattern': r'\s*([^\n]+)', 'flags': re.IGNORECASE,
+     'post': stripped()},
+    {'field': 'adresse', 'label': r'RUE', 'pattern': r'\s*([^\n]+)', 'flags': re.IGNORECASE,
+     'post': stripped()},
+    {'field': ('code_postal', 'ville'), 'label': r'CODE POSTAL', 'pattern': r'\s*(\S+)[^\S\n]*([^\n]*)',
+     'flags': re.IGNORECASE},
+    {'field': 'telephone', 'pattern': r'(\d{2}\s?\d{2}\s?\d{2}\s?\d{2}\s?\d{2})', 'multi': 3, 'join': ', '},
+    {'field': 'email', 'pattern': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}'},
+    {'field': 'specialisations', 'label': r"Domaines d'activité",
+     'pattern': r'\s*(.*?)(?:Ordre des avocats|$)', 'flags': re.IGNORECASE | re.DOTALL,
+     'post': (collapse_spaces, truncate(200))},
+]
+
+
+def _synthetic_profile(padding):
+    filler = "Le cabinet accompagne ses clients en conseil et en contentieux.\n" * padding
+    return (f"Maître Jeanne DUPONT\n{filler}PRESTATION DE SERMENT 2004\n"
+            "STRUCTURE Cabinet Dupont & Associés\nRUE 12 quai de la Pêcherie\n"
+            "CODE POSTAL 69001 LYON\nTéléphone 04 78 12 34 56 - Fax 0478123457\n"
+            f"jeanne.dupont@avocat-lyon.fr\n{filler}Domaines d'activité\nDroit de la famille\n"
+            "Droit pénal\nOrdre des avocats de Lyon")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction de champs par règles déclaratives")
+    commands = parser.add_subparsers(dest='command', required=True)
+    bench = commands.add_parser('bench', help="Comparer le passage unique aux recherches par règle")
+    bench.add_argument('--profiles', type=int, default=5000)
+    bench.add_argument('--padding', type=int, default=20, help="Lignes de texte libre par fiche")
+    args = parser.parse_args()
+
+    rules = FieldRules(_BENCH_RULES)
+    text = _synthetic_profile(args.padding)
+    reference = rules.extract(text, single_pass=False)
+    if rules.extract(text) != reference:
+        print("❌ Le passage unique ne donne pas le même résultat que les recherches par règle")
+        return 1
+    for label, single_pass in (("passage unique", True), ("une recherche par règle", False)):
+        start = time.perf_counter()
+        for _ in range(args.profiles):
+            rules.extract(text, single_pass=single_pass)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️  {args.profiles} fiches, {label} : {elapsed:.2f}s")
+    for field, value in reference.items():
+        print(f"   {field}: {value}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Frontière de crawl persistante (SQLite) pour les scrapers paginés
+Chaque page d'annuaire et chaque fiche avocat a un état enregistré sur disque
+(pending / in_flight / done / failed) : après un crash, le scraper reprend
+exactement là où il s'est arrêté, sans retoucher start_page à la main.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    retries INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    data TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS frontier_state ON frontier (kind, state, position);
+"""
+
+
+class CrawlFrontier:
+    """
+    État de crawl par élément, partagé entre pages ("page") et fiches ("profile").
+
+    `max_retries` borne le nombre d'échecs avant qu'un élément soit abandonné.
+    Les éléments restés in_flight lors d'un crash repassent en pending à
+    l'ouverture.
+    """
+
+    def __init__(self, db_path, max_retries=3):
+        self.db_path = db_path
+        self.max_retries = max_retries
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(_SCHEMA)
+        self.recovered = self._recover()
+
+    def _recover(self):
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE frontier SET state = ? WHERE state = ?", (PENDING, IN_FLIGHT))
+        return cursor.rowcount
+
+    def add(self, kind, keys):
+        """Enregistre de nouveaux éléments ; ceux déjà connus gardent leur état"""
+        now = time.time()
+        with self.lock, self.conn:
+            start = self.conn.execute(
+                "SELECT COALESCE(MAX(position), -1) + 1 FROM frontier WHERE kind = ?", (kind,)
+            ).fetchone()[0]
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO frontier (kind, key, position, state, updated) VALUES (?, ?, ?, ?, ?)",
+                [(kind, str(key), start + i, PENDING, now) for i, key in enumerate(keys)]
+            )
+
+    def todo(self, kind):
+        """Éléments à traiter, dans l'ordre d'ajout (pending + failed réessayables)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key FROM frontier WHERE kind = ? AND "
+                "(state = ? OR (state = ? AND retries < ?)) ORDER BY position",
+                (kind, PENDING, FAILED, self.max_retries)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def claim(self, kind):
+        """Prend le prochain élément à traiter et le passe in_flight (None si vide)"""
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT key FROM frontier WHERE kind = ? AND "
+                "(state = ? OR (state = ? AND retries < ?)) ORDER BY position LIMIT 1",
+                (kind, PENDING, FAILED, self.max_retries)
+            ).fetchone()
+            if row is None:
+                return None
+            self._set(kind, row[0], IN_FLIGHT)
+        return row[0]
+
+    def start(self, kind, key):
+        with self.lock, self.conn:
+            self._set(kind, key, IN_FLIGHT)
+
+    def done(self, kind, key, data=None):
+        """Marque l'élément terminé ; `data` (JSON) est conservé pour la reprise"""
+        payload = json.dumps(data, ensure_ascii=False) if data is not None else None
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE frontier SET state = ?, data = ?, error = NULL, updated = ? WHERE kind = ? AND key = ?",
+                (DONE, payload, time.time(), kind, str(key))
+            )
+
+    def failed(self, kind, key, error=''):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE frontier SET state = ?, retries = retries + 1, error = ?, updated = ? "
+                "WHERE kind = ? AND key = ?",
+                (FAILED, str(error)[:500], time.time(), kind, str(key))
+            )
+
+    def _set(self, kind, key, state):
+        self.conn.execute(
+            "UPDATE frontier SET state = ?, updated = ? WHERE kind = ? AND key = ?",
+            (state, time.time(), kind, str(key))
+        )
+
+    def is_done(self, kind, key):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT state FROM frontier WHERE kind = ? AND key = ?", (kind, str(key))
+            ).fetchone()
+        return row is not None and row[0] == DONE
+
+    def get(self, kind, key):
+        """Données d'un élément terminé (None s'il ne l'est pas)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data FROM frontier WHERE kind = ? AND key = ? AND state = ?", (kind, str(key), DONE)
+            ).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def results(self, kind):
+        """Données des éléments terminés, dans l'ordre d'ajout"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT data FROM frontier WHERE kind = ? AND state = ? AND data IS NOT NULL ORDER BY position",
+                (kind, DONE)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def counts(self, kind):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT state, COUNT(*) FROM frontier WHERE kind = ? GROUP BY state", (kind,)
+            ).fetchall()
+        counts = {PENDING: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def print_status(self, kinds=('page', 'profile')):
+        for kind in kinds:
+            c = self.counts(kind)
+            if sum(c.values()):
+                print(f"🧭 {kind}: {c[DONE]} terminés, {c[PENDING]} en attente, {c[FAILED]} en échec")
+
+    def failures(self, kind):
+        """Éléments en échec : [{'key', 'error', 'retries'}], dans l'ordre d'ajout"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, error, retries FROM frontier WHERE kind = ? AND state = ? ORDER BY position",
+                (kind, FAILED)
+            ).fetchall()
+        return [{'key': key, 'error': error, 'retries': retries} for key, error, retries in rows]
+
+    def reset(self, report_path=None, kinds=('page', 'profile')):
+        """
+        Vide la frontière (nouveau crawl complet).
+
+        Les éléments abandonnés disparaîtraient avec elle : ils sont affichés
+        avant, et écrits en JSON dans `report_path` s'il est donné. Retourne
+        {kind: [échecs]}.
+        """
+        self.print_status(kinds)
+        report = {kind: self.failures(kind) for kind in kinds}
+        report = {kind: items for kind, items in report.items() if items}
+        for kind, items in report.items():
+            print(f"⚠️  {kind}: {len(items)} abandonné(s) après {self.max_retries} essais")
+            for item in items[:20]:
+                print(f"   ❌ {item['key']} ({item['error'] or 'sans détail'})")
+            if len(items) > 20:
+                print(f"   ... et {len(items) - 20} autre(s)")
+        if report and report_path:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"📁 Échecs: {report_path}")
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM frontier")
+        return report
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache disque des réponses HTTP avec revalidation conditionnelle
+Les fiches avocats changent rarement : une relance du scraper relit le cache
+et ne demande au serveur que des 304 (If-None-Match / If-Modified-Since).
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+try:
+    import requests
+    from requests.adapters import BaseAdapter
+    from requests.structures import CaseInsensitiveDict
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+    BaseAdapter = object
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.http_cache')
+DEFAULT_TTL = 24 * 3600
+
+# En-têtes inutiles une fois la réponse en cache
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie'}
+
+
+def normalize_url(url, params=None):
+    """URL canonique : schéma/hôte en minuscules, paramètres triés, sans fragment"""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        items = params.items() if hasattr(params, 'items') else params
+        query.extend((str(k), str(v)) for k, v in items)
+    query.sort()
+    path = parts.path or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+class CacheEntry:
+    """Réponse stockée : statut, en-têtes utiles et corps brut"""
+
+    def __init__(self, url, status, headers, body, stored_at=None):
+        self.url = url
+        self.status = status
+        self.headers = dict(headers)
+        self.body = body
+        self.stored_at = stored_at or time.time()
+
+    @property
+    def etag(self):
+        return self._header('ETag')
+
+    @property
+    def last_modified(self):
+        return self._header('Last-Modified')
+
+    def _header(self, name):
+        for key, value in self.headers.items():
+            if key.lower() == name.lower():
+                return value
+        return None
+
+    @property
+    def age(self):
+        return time.time() - self.stored_at
+
+    def text(self, encoding=None):
+        if encoding is None:
+            content_type = self._header('Content-Type') or ''
+            encoding = 'utf-8'
+            if 'charset=' in content_type:
+                encoding = content_type.split('charset=', 1)[1].split(';')[0].strip(' "\'') or 'utf-8'
+        try:
+            return self.body.decode(encoding, errors='replace')
+        except LookupError:
+            return self.body.decode('utf-8', errors='replace')
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'status': self.status,
+            'headers': self.headers,
+            'body': base64.b64encode(self.body).decode('ascii'),
+            'stored_at': self.stored_at
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['url'], data['status'], data['headers'],
+                   base64.b64decode(data['body']), data['stored_at'])
+
+
+class ResponseCache:
+    """
+    Cache adressé par le contenu de la clé (méthode + URL normalisée).
+
+    `ttl` est un nombre de secondes ou une fonction url -> secondes. Une
+    entrée plus jeune que son TTL est servie sans réseau ; au-delà, elle est
+    revalidée par requête conditionnelle.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.stats = {'frais': 0, 'revalides': 0, 'telecharges': 0, 'stockes': 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, url, params=None, method='GET'):
+        raw = f"{method.upper()} {normalize_url(url, params)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.json.gz')
+
+    def ttl_for(self, url):
+        return self.ttl(url) if callable(self.ttl) else self.ttl
+
+    def lookup(self, url, params=None, method='GET'):
+        """Retourne l'entrée en cache ou None"""
+        path = self._path(self.key(url, params, method))
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return CacheEntry.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def is_fresh(self, entry):
+        ttl = self.ttl_for(entry.url)
+        return ttl is not None and entry.age < ttl
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url, status, headers, body, params=None, method='GET'):
+        """Écrit une réponse 200 (écriture atomique par renommage)"""
+        if status != 200:
+            return None
+        headers = {k: v for k, v in dict(headers).items() if k.lower() not in _DROPPED_HEADERS}
+        entry = CacheEntry(normalize_url(url, params), status, headers, body)
+        self._write(self.key(url, params, method), entry)
+        self.count('stockes')
+        return entry
+
+    def touch(self, entry, headers=None, params=None, method='GET'):
+        """Après un 304 : repart pour un TTL et met à jour ETag/Last-Modified"""
+        if headers:
+            for name in ('ETag', 'Last-Modified'):
+                value = dict(headers).get(name) or dict(headers).get(name.lower())
+                if value:
+                    entry.headers[name] = value
+        entry.stored_at = time.time()
+        self._write(self.key(entry.url, params, method), entry)
+        return entry
+
+    def _write(self, key, entry):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            json.dump(entry.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    # --- Pages rendues par un navigateur -------------------------------
+
+    def get_html(self, url, method='GET'):
+        """HTML en cache encore frais (pour les parseurs Selenium/Playwright)"""
+        entry = self.lookup(url, method=method)
+        if entry and self.is_fresh(entry):
+            self.count('frais')
+            return entry.text()
+        return None
+
+    def store_html(self, url, html, method='GET'):
+        return self.store(url, 200, {'Content-Type': 'text/html; charset=utf-8'},
+                          html.encode('utf-8'), method=method)
+
+    def page_source(self, driver, url):
+        """
+        Équivalent de `driver.get(url); driver.page_source` servi depuis le cache.
+
+        Les pages rendues n'ont pas d'ETag : seul le TTL décide du rechargement.
+        Elles sont rangées à part des réponses HTTP brutes de la même URL.
+        """
+        html = self.get_html(url, method='BROWSER')
+        if html is not None:
+            return html
+        driver.get(url)
+        html = driver.page_source
+        self.count('telecharges')
+        self.store_html(url, html, method='BROWSER')
+        return html
+
+    def print_stats(self):
+        print("🗄️  Cache HTTP:")
+        print(f"   Servis sans réseau: {self.stats['frais']}")
+        print(f"   Revalidés (304): {self.stats['revalides']}")
+        print(f"   Téléchargés: {self.stats['telecharges']}")
+        return dict(self.stats)
+
+
+class CachingAdapter(BaseAdapter):
+    """
+    Adapter requests qui passe par le cache avant l'adapter réel.
+
+    Seules les requêtes GET sont mises en cache ; les POST de formulaires
+    partent directement vers `inner`.
+    """
+
+    def __init__(self, cache, inner):
+        super().__init__()
+        self.cache = cache
+        self.inner = inner
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return self.inner.send(request, **kwargs)
+
+        entry = self.cache.lookup(request.url)
+        if entry and self.cache.is_fresh(entry):
+            self.cache.count('frais')
+            return self._build_response(request, entry)
+
+        if entry:
+            request.headers.update(self.cache.conditional_headers(entry))
+
+        response = self.inner.send(request, **kwargs)
+
+        if entry and response.status_code == 304:
+            self.cache.touch(entry, response.headers)
+            self.cache.count('revalides')
+            response.close()
+            return self._build_response(request, entry)
+
+        self.cache.count('telecharges')
+        if response.status_code == 200:
+            self.cache.store(request.url, 200, response.headers, response.content)
+        return response
+
+    def _build_response(self, request, entry):
+        response = requests.Response()
+        response.status_code = entry.status
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response._content = entry.body
+        response.url = request.url
+        response.request = request
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+def install_cache(session, cache=None):
+    """Branche le cache sur une session requests existante (ou PooledHttpClient)"""
+    if not REQUESTS_AVAILABLE:
+        raise ImportError("requests requis : pip install requests")
+    session = getattr(session, 'session', session)
+    cache = cache or ResponseCache()
+    for prefix in ('https://', 'http://'):
+        inner = session.get_adapter(prefix)
+        if not isinstance(inner, CachingAdapter):
+            session.mount(prefix, CachingAdapter(cache, inner))
+    return cache
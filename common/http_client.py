@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Client HTTP mutualisé pour les scrapers basés sur requests
+Une seule session, un pool de connexions keep-alive par hôte dimensionné
+sur le nombre de workers, et des statistiques de réutilisation par run.
+"""
+
+import threading
+from collections import defaultdict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'fr-FR,fr;q=0.9'
+}
+
+
+class ConnectionStats:
+    """Compteurs thread-safe des requêtes et des connexions ouvertes"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.new_connections = defaultdict(int)
+
+    def record_request(self, host):
+        with self.lock:
+            self.requests[host] += 1
+
+    def record_new_connection(self, host):
+        with self.lock:
+            self.new_connections[host] += 1
+
+    def summary(self):
+        """Retourne les totaux et le détail par hôte"""
+        with self.lock:
+            hosts = {}
+            for host in sorted(set(self.requests) | set(self.new_connections)):
+                total = self.requests[host]
+                opened = self.new_connections[host]
+                hosts[host] = {
+                    'requetes': total,
+                    'connexions_ouvertes': opened,
+                    'connexions_reutilisees': max(total - opened, 0)
+                }
+
+        total_requests = sum(h['requetes'] for h in hosts.values())
+        total_opened = sum(h['connexions_ouvertes'] for h in hosts.values())
+        reused = sum(h['connexions_reutilisees'] for h in hosts.values())
+        return {
+            'requetes': total_requests,
+            'connexions_ouvertes': total_opened,
+            'connexions_reutilisees': reused,
+            # Chaque réutilisation évite une poignée de main TCP (+TLS en https)
+            'handshakes_evites': reused,
+            'hotes': hosts
+        }
+
+
+def _counting_pool(base_class, stats):
+    """Sous-classe un pool urllib3 pour compter les ouvertures de socket"""
+
+    class CountingConnection(base_class.ConnectionCls):
+        def connect(self):
+            # Appelé à chaque (re)connexion, y compris quand le serveur
+            # a fermé une connexion keep-alive restée dans le pool
+            stats.record_new_connection(self.host)
+            return super().connect()
+
+    class CountingPool(base_class):
+        ConnectionCls = CountingConnection
+
+    CountingPool.__name__ = 'Counting' + base_class.__name__
+    return CountingPool
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter qui instrumente ses pools de connexions"""
+
+    def __init__(self, stats, **kwargs):
+        # init_poolmanager() est appelé par HTTPAdapter.__init__
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool(HTTPConnectionPool, self.stats),
+            'https': _counting_pool(HTTPSConnectionPool, self.stats),
+        }
+
+    def send(self, request, **kwargs):
+        self.stats.record_request(requests.utils.urlparse(request.url).hostname)
+        return super().send(request, **kwargs)
+
+
+class PooledHttpClient:
+    """
+    Session requests partagée entre les threads d'un scraper.
+
+    Le pool urllib3 est thread-safe : chaque worker emprunte une connexion
+    déjà ouverte vers l'hôte au lieu de refaire TCP+TLS à chaque avocat.
+    Les en-têtes sont fixés à la construction, avant le démarrage des threads.
+    """
+
+    def __init__(self, max_workers=1, headers=None, max_hosts=10, max_retries=0):
+        self.max_workers = max(1, max_workers)
+        self.stats = ConnectionStats()
+
+        adapter = PooledAdapter(
+            self.stats,
+            pool_connections=max_hosts,
+            pool_maxsize=self.max_workers,
+            max_retries=max_retries
+        )
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+
+    def get(self, url, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.session.post(url, data=data, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    def stats_summary(self):
+        return self.stats.summary()
+
+    def print_stats(self):
+        """Affiche le bilan des connexions du run"""
+        stats = self.stats.summary()
+        print("🔌 Connexions HTTP:")
+        print(f"   Requêtes: {stats['requetes']}")
+        print(f"   Connexions ouvertes: {stats['connexions_ouvertes']}")
+        print(f"   Connexions réutilisées: {stats['connexions_reutilisees']}")
+        print(f"   Handshakes évités: {stats['handshakes_evites']}")
+        for host, detail in stats['hotes'].items():
+            print(f"   - {host}: {detail['requetes']} requêtes / "
+                  f"{detail['connexions_ouvertes']} connexions")
+        return stats
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
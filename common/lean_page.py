@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mode "page légère" pour les scrapers Playwright et Selenium
+Les scrapers ne lisent que du texte : images, médias, polices, CSS, traceurs
+et bandeaux cookies tiers sont bloqués à la source. Seuls le document et les
+scripts/XHR du site de l'annuaire sont chargés.
+"""
+
+import time
+from urllib.parse import urlparse
+
+DEFAULT_BLOCKED_TYPES = frozenset({'image', 'media', 'font', 'stylesheet', 'imageset', 'texttrack', 'manifest'})
+
+# Types de requêtes tiers bloqués quand block_third_party=True
+THIRD_PARTY_TYPES = frozenset({'script', 'xhr', 'fetch', 'eventsource', 'websocket', 'other', 'ping', 'beacon'})
+
+TRACKER_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'facebook.net', 'facebook.com', 'hotjar.com', 'matomo.cloud', 'xiti.com', 'clarity.ms',
+    'axept.io', 'axeptio.eu', 'cookiebot.com', 'didomi.io', 'onetrust.com', 'cookielaw.org',
+    'gstatic.com', 'fonts.googleapis.com', 'youtube.com', 'ytimg.com', 'vimeo.com',
+    'maps.googleapis.com', 'recaptcha.net', 'tarteaucitron.io',
+)
+
+# CDN publics dont dépendent souvent les scripts des annuaires (jQuery, etc.)
+COMMON_CDN_HOSTS = (
+    'jquery.com', 'googleapis.com', 'cloudflare.com', 'jsdelivr.net', 'unpkg.com', 'bootstrapcdn.com',
+)
+
+# Extensions bloquées côté Selenium (CDP Network.setBlockedURLs ne connaît que des motifs)
+BLOCKED_EXTENSIONS = (
+    'png', 'jpg', 'jpeg', 'gif', 'webp', 'svg', 'ico', 'bmp', 'avif',
+    'woff', 'woff2', 'ttf', 'otf', 'eot', 'css', 'mp4', 'webm', 'mp3',
+)
+
+# Poids et durée de la page courante, via l'API Performance du navigateur
+PAGE_WEIGHT_JS = """
+(() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    let bytes = nav ? (nav.transferSize || nav.encodedBodySize || 0) : 0;
+    for (const r of resources) { bytes += r.transferSize || r.encodedBodySize || 0; }
+    const duration = nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd || nav.duration) : 0;
+    return {bytes: bytes, ms: duration, resources: resources.length};
+})()
+"""
+
+
+def site_of(host):
+    """Domaine "site" approximatif : les deux derniers labels de l'hôte (ou de l'URL)"""
+    if not host:
+        return ''
+    if '://' in host:
+        host = urlparse(host).hostname or ''
+    parts = host.lower().split('.')
+    return '.'.join(parts[-2:])
+
+
+class LeanStats:
+    """Poids/durée par page, comparés à une page de référence chargée en entier"""
+
+    def __init__(self):
+        self.blocked = {}
+        self.pages = []
+        self.baseline = None
+
+    def block(self, reason):
+        self.blocked[reason] = self.blocked.get(reason, 0) + 1
+
+    def record(self, weight):
+        if weight:
+            self.pages.append(weight)
+
+    def summary(self):
+        if not self.pages:
+            return {'pages': 0, 'bloquees': dict(self.blocked)}
+        avg_bytes = sum(p['bytes'] for p in self.pages) / len(self.pages)
+        avg_ms = sum(p['ms'] for p in self.pages) / len(self.pages)
+        summary = {
+            'pages': len(self.pages),
+            'octets_par_page': avg_bytes,
+            'ms_par_page': avg_ms,
+            'bloquees': dict(self.blocked)
+        }
+        if self.baseline:
+            summary['octets_economises_par_page'] = self.baseline['bytes'] - avg_bytes
+            summary['ms_economisees_par_page'] = self.baseline['ms'] - avg_ms
+        return summary
+
+    def print_stats(self):
+        summary = self.summary()
+        print("🪶 Mode page légère:")
+        print(f"   Requêtes bloquées: {sum(self.blocked.values())} {summary['bloquees']}")
+        if summary['pages']:
+            print(f"   Par page: {summary['octets_par_page']/1024:.0f} Ko, {summary['ms_par_page']:.0f} ms")
+        if 'octets_economises_par_page' in summary:
+            print(f"   Économie par page: {summary['octets_economises_par_page']/1024:.0f} Ko, "
+                  f"{summary['ms_economisees_par_page']:.0f} ms "
+                  f"(référence: {self.baseline['bytes']/1024:.0f} Ko, {self.baseline['ms']:.0f} ms)")
+        return summary
+
+
+class LeanMode:
+    """
+    Filtre de requêtes partagé par Playwright (route) et Selenium (CDP).
+
+    `first_party` : hôte ou URL de l'annuaire ; à défaut, l'hôte du premier document
+    principal chargé. `allow_hosts` : domaines tiers à conserver (API de
+    l'annuaire hébergée ailleurs, par exemple).
+    """
+
+    def __init__(self, first_party=None, allow_hosts=COMMON_CDN_HOSTS, block_types=DEFAULT_BLOCKED_TYPES,
+                 block_third_party=True, trackers=TRACKER_HOSTS):
+        self.first_party = site_of(first_party) if first_party else None
+        self.allow_sites = {site_of(h) for h in allow_hosts}
+        self.block_types = frozenset(block_types)
+        self.block_third_party = block_third_party
+        self.trackers = tuple(trackers)
+        self.enabled = True
+        self.stats = LeanStats()
+
+    def should_block(self, url, resource_type, is_main_document=False):
+        """Retourne la raison du blocage, ou None si la requête passe"""
+        host = (urlparse(url).hostname or '').lower()
+
+        if resource_type == 'document':
+            if is_main_document:
+                self.first_party = self.first_party or site_of(host)
+            return None
+        if any(host == t or host.endswith('.' + t) for t in self.trackers):
+            return 'traceur'
+        if resource_type in self.block_types:
+            return resource_type
+        if self.block_third_party and resource_type in THIRD_PARTY_TYPES:
+            site = site_of(host)
+            if self.first_party and site != self.first_party and site not in self.allow_sites:
+                return 'tiers'
+        return None
+
+    # --- Playwright ------------------------------------------------------
+
+    def _decide(self, request):
+        if not self.enabled:
+            return None
+        is_main = request.is_navigation_request() and request.frame.parent_frame is None
+        return self.should_block(request.url, request.resource_type, is_main)
+
+    async def attach(self, target):
+        """Active le filtre sur une page ou un contexte Playwright (API async)"""
+        async def handler(route):
+            reason = self._decide(route.request)
+            if reason:
+                self.stats.block(reason)
+                await route.abort()
+            else:
+                await route.continue_()
+        await target.route('**/*', handler)
+
+    def attach_sync(self, target):
+        """Même chose pour l'API synchrone de Playwright"""
+        def handler(route):
+            reason = self._decide(route.request)
+            if reason:
+                self.stats.block(reason)
+                route.abort()
+            else:
+                route.continue_()
+        target.route('**/*', handler)
+
+    async def measure(self, page):
+        """Enregistre le poids de la page courante (après chargement)"""
+        weight = await page.evaluate(PAGE_WEIGHT_JS)
+        self.stats.record(weight)
+        return weight
+
+    def measure_sync(self, page):
+        weight = page.evaluate(PAGE_WEIGHT_JS)
+        self.stats.record(weight)
+        return weight
+
+    async def calibrate(self, page, url, wait_until='load', timeout=30000):
+        """
+        Charge une fois la page en entier pour servir de référence.
+
+        `url` doit être du même type que les pages mesurées ensuite (une fiche
+        si l'on mesure les fiches, une page de liste sinon) : l'économie
+        affichée est la différence entre les deux.
+        """
+        self.enabled = False
+        try:
+            start = time.time()
+            await page.goto(url, wait_until=wait_until, timeout=timeout)
+            weight = await page.evaluate(PAGE_WEIGHT_JS)
+            weight['ms'] = weight['ms'] or (time.time() - start) * 1000
+            self.stats.baseline = weight
+        finally:
+            self.enabled = True
+        return self.stats.baseline
+
+    def calibrate_sync(self, page, url, wait_until='load', timeout=30000):
+        self.enabled = False
+        try:
+            start = time.time()
+            page.goto(url, wait_until=wait_until, timeout=timeout)
+            weight = page.evaluate(PAGE_WEIGHT_JS)
+            weight['ms'] = weight['ms'] or (time.time() - start) * 1000
+            self.stats.baseline = weight
+        finally:
+            self.enabled = True
+        return self.stats.baseline
+
+    # --- Selenium --------------------------------------------------------
+
+    def blocked_url_patterns(self):
+        patterns = [f'*.{ext}' for ext in BLOCKED_EXTENSIONS]
+        patterns += [f'*.{ext}?*' for ext in BLOCKED_EXTENSIONS]
+        patterns += [f'*{host}*' for host in self.trackers]
+        return patterns
+
+    def attach_selenium(self, driver):
+        """Bloque images, polices, CSS et traceurs via le protocole CDP de Chrome"""
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_url_patterns()})
+
+    def measure_selenium(self, driver):
+        weight = driver.execute_script('return ' + PAGE_WEIGHT_JS)
+        self.stats.record(weight)
+        return weight
+
+
+def lean_chrome_options(options):
+    """Ajoute aux options Chrome la désactivation des images et des polices distantes"""
+    options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.default_content_setting_values.notifications': 2,
+    })
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    return options
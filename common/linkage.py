@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Rapprochement approché des avocats entre deux sources
+La jointure exacte sur quelques variantes de nom perd les fautes de frappe,
+les accents et les noms composés inversés. Ici, chaque nom reçoit des clés
+de blocage (clé phonétique du nom, début du nom, initiales) ; seuls les
+noms qui partagent une clé sont comparés (similarité par ensemble de mots,
+Jaro-Winkler mot à mot), ce qui reste quasi linéaire sur des milliers de
+fiches. Un seuil règle la tolérance, chaque nom de droite ne sert qu'une
+fois (exacts d'abord), les prénoms doivent être identiques pour fusionner,
+et un rapport liste les rapprochements approchés et ceux laissés à vérifier.
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+
+try:
+    from rapidfuzz.distance import JaroWinkler
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+from common.names import PARTICLES
+
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_MAX_BLOCK = 200
+
+# "DURANDPierre" -> "DURAND Pierre" (noms collés des exports)
+_GLUED_RE = re.compile(r"(?<=[A-ZÀ-Þ])(?=[A-ZÀ-Þ][a-zß-ÿ])")
+_NON_LETTER_RE = re.compile(r"[^A-Z]+")
+
+_PHONETIC_RULES = [(re.compile(pattern), replacement) for pattern, replacement in (
+    (r"PH", "F"), (r"GU(?=[EIY])", "G"), (r"G(?=[EIY])", "J"), (r"GN", "N"),
+    (r"QU?", "K"), (r"SCH|SH|CH", "X"), (r"C(?=[EIY])", "S"), (r"CK|C", "K"),
+    (r"W", "V"), (r"Z", "S"), (r"TH", "T"), (r"H", ""),
+)]
+_VOWELS_RE = re.compile(r"[AEIOUY]+")
+_DOUBLE_RE = re.compile(r"(.)\1+")
+_SILENT_END_RE = re.compile(r"(?<=.)[SXTDE]+$")
+
+
+# --- Normalisation et clés ------------------------------------------------
+
+def plain(text):
+    """Majuscules sans accents ni ponctuation : Noël d'Aubigné -> NOEL D AUBIGNE"""
+    text = unicodedata.normalize('NFKD', text.replace('œ', 'oe').replace('Œ', 'OE'))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).upper()
+    return ' '.join(_NON_LETTER_RE.sub(' ', text).split())
+
+
+def name_tokens(name):
+    """
+    Mots d'un nom : (nom de famille, tous les mots), normalisés.
+
+    Un nom peut être une chaîne ("Pierre DURAND", "DURANDPierre") ou un
+    couple (prénom, nom). Dans une chaîne, les mots en majuscules forment
+    le nom de famille quand la casse est parlante.
+    """
+    if isinstance(name, (tuple, list)):
+        first, last = name
+        surname = tuple(plain(last or '').split())
+        return surname, tuple(plain(first or '').split()) + surname
+    text = _GLUED_RE.sub(' ', name or '')
+    words = text.split()
+    upper = [word for word in words if word.isupper() and len(word) > 1]
+    surname = tuple(plain(' '.join(upper)).split()) if 0 < len(upper) < len(words) else ()
+    tokens = tuple(plain(text).split())
+    return surname or tokens, tokens
+
+
+def phonetic_key(word):
+    """Clé phonétique française simplifiée : consonnes prononcées, voyelles ignorées"""
+    word = _NON_LETTER_RE.sub('', plain(word))
+    for pattern, replacement in _PHONETIC_RULES:
+        word = pattern.sub(replacement, word)
+    word = _SILENT_END_RE.sub('', word)
+    return _DOUBLE_RE.sub(r"\1", word[:1] + _VOWELS_RE.sub('', word[1:]))
+
+
+def given_names(surname, tokens):
+    """Prénoms (mots hors nom de famille), triés ; vide si la casse ne les distingue pas"""
+    return tuple(sorted(word for word in tokens if word not in surname))
+
+
+def blocking_keys(surname, tokens):
+    """Clés de blocage : phonétique et 4 premières lettres de chaque mot du nom, initiales"""
+    keys = set()
+    significant = [word for word in surname if word not in PARTICLES and len(word) > 1] or list(surname)
+    for word in significant:
+        keys.add(('phonetique', phonetic_key(word)))
+        keys.add(('debut', word[:4]))
+    given = [word for word in tokens if word not in surname]
+    if given and significant:
+        joined = ''.join(significant)
+        keys.add(('initiales', given[0][0] + joined[0], len(joined)))
+    return keys
+
+
+# --- Similarité -----------------------------------------------------------
+
+def _jaro_winkler(a, b, prefix_scale=0.1):
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    window = max(len(a), len(b)) // 2 - 1
+    matched_b = [False] * len(b)
+    matches_a = []
+    for i, char in enumerate(a):
+        j = b.find(char, max(0, i - window), i + window + 1)
+        while j >= 0 and matched_b[j]:
+            j = b.find(char, j + 1, i + window + 1)
+        if j >= 0:
+            matched_b[j] = True
+            matches_a.append(char)
+    if not matches_a:
+        return 0.0
+    matches_b = [char for char, used in zip(b, matched_b) if used]
+    transpositions = sum(x != y for x, y in zip(matches_a, matches_b)) / 2
+    m = len(matches_a)
+    jaro = (m / len(a) + m / len(b) + (m - transpositions) / m) / 3
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+@lru_cache(maxsize=1 << 16)
+def jaro_winkler(a, b):
+    """Similarité de Jaro-Winkler entre deux mots (rapidfuzz si installé ; les prénoms reviennent souvent)"""
+    if RAPIDFUZZ_AVAILABLE:
+        return JaroWinkler.similarity(a, b)
+    return _jaro_winkler(a, b)
+
+
+@lru_cache(maxsize=1 << 16)
+def word_similarity(a, b):
+    """
+    Jaro-Winkler, réduit quand un mot prolonge l'autre : JEAN / JEANNE,
+    LOUIS / LOUISE ou DANIEL / DANIELLE sont des prénoms différents, pas
+    une faute de frappe (le préfixe commun les rendrait sinon très proches).
+    """
+    score = jaro_winkler(a, b)
+    if a != b and (a.startswith(b) or b.startswith(a)):
+        score *= min(len(a), len(b)) / max(len(a), len(b))
+    return score
+
+
+def name_similarity(tokens_a, tokens_b):
+    """
+    Similarité de deux noms normalisés, entre 0 et 1.
+
+    Chaque mot du nom le plus court prend son meilleur Jaro-Winkler dans
+    l'autre (l'ordre des mots ne compte pas) et le moins bon d'entre eux
+    fait le score : "Marie DURAND" ne rejoint pas "Marlène DURAND". Un mot
+    en trop de l'autre côté (second nom, nom d'usage) coûte un peu. Les
+    noms recollés sans espace sont aussi comparés d'un bloc.
+    """
+    if not tokens_a or not tokens_b:
+        return 0.0
+    if sorted(tokens_a) == sorted(tokens_b):
+        return 1.0
+    short, long = (tokens_a, tokens_b) if len(tokens_a) <= len(tokens_b) else (tokens_b, tokens_a)
+    worst = min(max(word_similarity(word, other) for other in long) for word in short)
+    score = worst * (0.9 + 0.1 * len(short) / len(long))
+    if len(short) < len(long):
+        glued = jaro_winkler(''.join(sorted(tokens_a)), ''.join(sorted(tokens_b)))
+        if glued >= 0.97:
+            score = max(score, glued)
+    return score
+
+
+# --- Index et jointure ----------------------------------------------------
+
+class NameIndex:
+    """
+    Index de blocage sur les noms d'une source.
+
+    Les noms identiques après normalisation ne sont indexés et comparés
+    qu'une fois ; les blocs de plus de `max_block` noms (clé trop
+    commune) sont ignorés pour rester quasi linéaire.
+    """
+
+    def __init__(self, names, max_block=DEFAULT_MAX_BLOCK):
+        self.max_block = max_block
+        self.keys = []          # mots normalisés distincts
+        self.given = []         # prénoms de chaque nom distinct
+        self.rows = []          # indices des noms d'origine, par mots distincts
+        self.blocks = defaultdict(list)
+        positions = {}
+        for row, name in enumerate(names):
+            surname, tokens = name_tokens(name)
+            if not tokens:
+                continue
+            key = tuple(sorted(tokens))
+            if key not in positions:
+                positions[key] = len(self.keys)
+                self.keys.append(tokens)
+                self.given.append(given_names(surname, tokens))
+                self.rows.append([])
+                for block in blocking_keys(surname, tokens):
+                    self.blocks[block].append(positions[key])
+            self.rows[positions[key]].append(row)
+        self.exact = positions
+
+    def candidates(self, surname, tokens):
+        found = set()
+        for block in blocking_keys(surname, tokens):
+            members = self.blocks.get(block, ())
+            if len(members) <= self.max_block:
+                found.update(members)
+        return found
+
+    def scored(self, tokens, surname, threshold=DEFAULT_THRESHOLD, memo=None):
+        """
+        ([(position, score)] des noms indexés au-dessus du seuil, meilleur
+        score vu, comparaisons). Un nom identique ne passe pas par le blocage.
+        """
+        position = self.exact.get(tuple(sorted(tokens)))
+        if position is not None:
+            return [(position, 1.0)], 1.0, 0
+        found, best_score = [], 0.0
+        candidates = self.candidates(surname, tokens)
+        for candidate in candidates:
+            pair = (tokens, self.keys[candidate])
+            score = memo.get(pair) if memo is not None else None
+            if score is None:
+                score = name_similarity(*pair)
+                if memo is not None:
+                    memo[pair] = score
+            best_score = max(best_score, score)
+            if score >= threshold:
+                found.append((candidate, score))
+        return found, best_score, len(candidates)
+
+    def best(self, name, threshold=DEFAULT_THRESHOLD, memo=None):
+        """(position, score, comparaisons) du meilleur nom indexé au-dessus du seuil, ou (None, score, n)"""
+        surname, tokens = name_tokens(name)
+        if not tokens:
+            return None, 0.0, 0
+        found, best_score, compared = self.scored(tokens, surname, threshold, memo)
+        if not found:
+            return None, best_score, compared
+        position, score = max(found, key=lambda item: item[1])
+        return position, score, compared
+
+
+def link(left_names, right_names, threshold=DEFAULT_THRESHOLD, max_block=DEFAULT_MAX_BLOCK):
+    """
+    Rapproche chaque nom de gauche d'au plus un nom de droite, et inversement.
+
+    Retourne (correspondances, rapport) : une entrée par nom de gauche,
+    (indice du nom de droite ou None, score). L'attribution est un à un :
+    les rapprochements exacts choisissent d'abord, puis les approchés par
+    score décroissant ; des homonymes à droite servent chacun une fois.
+    Un rapprochement approché n'est retenu que si les prénoms sont
+    identiques (quand la casse permet de les distinguer des deux côtés) :
+    "Jean MARTIN" ne fusionne pas avec "MARTINJeanne" ni avec
+    "DUPONTJean-Pierre". Ces quasi-correspondances, et les noms dont le
+    candidat est déjà pris, vont dans `report['revue']` sans être fusionnés.
+    """
+    start = time.perf_counter()
+    right_names = list(right_names)
+    index = NameIndex(right_names, max_block)
+    memo = {}
+    report = {'total': 0, 'exacts': 0, 'approches': 0, 'sans_correspondance': 0, 'a_verifier': 0,
+              'deja_attribues': 0, 'comparaisons': 0, 'seuil': threshold, 'duree': 0.0, 'revue': []}
+    left_names = list(left_names)
+    best_scores = []
+    near_misses = {}            # gauche -> (position, score) écarté faute de prénoms identiques
+    pairs = []                  # (rang, -score, gauche, position) fusionnables
+    for i, name in enumerate(left_names):
+        report['total'] += 1
+        surname, tokens = name_tokens(name)
+        if not tokens:
+            best_scores.append(0.0)
+            continue
+        found, best_score, compared = index.scored(tokens, surname, threshold, memo)
+        report['comparaisons'] += compared
+        best_scores.append(best_score)
+        given = given_names(surname, tokens)
+        for position, score in found:
+            if score < 1.0 and given and index.given[position] and given != index.given[position]:
+                if score > near_misses.get(i, (None, 0.0))[1]:
+                    near_misses[i] = (position, score)
+                continue
+            pairs.append((0 if score >= 1.0 else 1, -score, i, position))
+
+    matches = [None] * len(left_names)
+    used = defaultdict(int)     # position -> lignes de droite déjà attribuées
+    wanted = {}                 # gauche -> meilleur candidat, pour le rapport
+    for rank, negative, i, position in sorted(pairs):
+        wanted.setdefault(i, (position, -negative))
+        if matches[i] is not None:
+            continue
+        rows = index.rows[position]
+        if used[position] >= len(rows):
+            continue
+        row = rows[used[position]]
+        used[position] += 1
+        matches[i] = (row, -negative)
+        if rank == 0:
+            report['exacts'] += 1
+        else:
+            report['approches'] += 1
+            report['revue'].append((left_names[i], right_names[row], round(-negative, 3), 'fusionne'))
+
+    for i, match in enumerate(matches):
+        if match is not None:
+            continue
+        report['sans_correspondance'] += 1
+        matches[i] = (None, best_scores[i])
+        if i in wanted:
+            report['deja_attribues'] += 1
+            position, score = wanted[i]
+            report['revue'].append((left_names[i], right_names[index.rows[position][0]], round(score, 3),
+                                    'deja_attribue'))
+        elif i in near_misses:
+            report['a_verifier'] += 1
+            position, score = near_misses[i]
+            report['revue'].append((left_names[i], right_names[index.rows[position][0]], round(score, 3),
+                                    'prenom_different'))
+    report['duree'] = time.perf_counter() - start
+    return matches, report
+
+
+def _display(name):
+    return ' '.join(name) if isinstance(name, (tuple, list)) else name
+
+
+def print_report(report, limit=20):
+    print(f"🔗 Rapprochement: {report['total']} noms en {report['duree']:.2f}s "
+          f"({report['comparaisons']} comparaisons, seuil {report['seuil']})")
+    print(f"   exacts: {report['exacts']} | approchés: {report['approches']} | "
+          f"sans correspondance: {report['sans_correspondance']} "
+          f"(dont {report['a_verifier']} prénoms différents, {report['deja_attribues']} déjà attribués)")
+    marks = {'fusionne': '≈', 'prenom_different': '?', 'deja_attribue': '×'}
+    for left, right, score, status in sorted(report['revue'], key=lambda item: item[2])[:limit]:
+        print(f"   {marks[status]} {_display(left)!r} -> {_display(right)!r} ({score}, {status})")
+
+
+# --- Banc d'essai ---------------------------------------------------------
+
+def _load_names(path, column):
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        rows = data.get('avocats', data) if isinstance(data, dict) else data
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+    return [row[column] for row in rows if row.get(column)]
+
+
+def _typo(name, rng):
+    words = name.split()
+    i = rng.randrange(len(words))
+    word = words[i]
+    if len(word) > 3:
+        j = rng.randrange(1, len(word) - 1)
+        word = word[:j] + word[j + 1] + word[j] + word[j + 2:]
+    words[i] = word
+    if rng.random() < 0.5:
+        words.reverse()
+    return ' '.join(words)
+
+
+def benchmark(path, column='nom_complet', sources=3, threshold=DEFAULT_THRESHOLD):
+    """Joint une liste contre `sources` copies bruitées d'elle-même (interversions, ordre des mots)"""
+    import random
+    rng = random.Random(0)
+    names = _load_names(path, column)
+    start = time.perf_counter()
+    recovered = 0
+    for _ in range(sources):
+        noisy = [_typo(name, rng) for name in names]
+        matches, report = link(names, noisy, threshold)
+        recovered += sum(1 for i, (row, _) in enumerate(matches) if row == i)
+        print_report(report, limit=0)
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  {len(names)} noms x {sources} sources en {elapsed:.2f}s, "
+          f"{recovered}/{len(names) * sources} retrouvés")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapprochement approché de noms d'avocats")
+    commands = parser.add_subparsers(dest='command', required=True)
+    join = commands.add_parser('link', help="Rapprocher deux fichiers CSV/JSON")
+    join.add_argument('left')
+    join.add_argument('right')
+    join.add_argument('--left-column', default='nom_complet')
+    join.add_argument('--right-column', default='nom_complet')
+    join.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    join.add_argument('--limit', type=int, default=20, help="Rapprochements approchés affichés")
+    bench = commands.add_parser('bench', help="Joindre une liste contre des copies bruitées")
+    bench.add_argument('path')
+    bench.add_argument('--column', default='nom_complet')
+    bench.add_argument('--sources', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == 'link':
+        _, report = link(_load_names(args.left, args.left_column),
+                         _load_names(args.right, args.right_column), args.threshold)
+        print_report(report, args.limit)
+    else:
+        benchmark(args.path, args.column, args.sources)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Séparation prénom / nom des avocats, commune à tous les barreaux
+Une seule implémentation à expressions précompilées remplace les séparateurs
+écrits barreau par barreau : titres (Maître, Me...) et mentions "Avocat"
+retirés, formes "NOM, Prénom", "NOM Prénom", "Prénom NOM" et collées
+("MULLERChristian"), particules (DE, DA, VAN, DIT...) et lexique de prénoms
+pour les noms entièrement en majuscules.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+
+# Titres en tête de nom ("Maître" peut être collé au nom : "MaîtreMarc ANTONINI")
+_TITLE_RE = re.compile(
+    r"^(?:(?:ma[iî]tres?\.?\s*|(?:mes?|mmes?|mlle|mr|dr|pr|m|monsieur|madame)\.?\s+))+",
+    re.IGNORECASE)
+
+# Mentions en fin de nom : "(Avocat)", ", avocate", "- Avocat honoraire depuis 2010"
+_SUFFIX_RE = re.compile(
+    r"\s*(?:[-–,(]\s*)?\bavocate?s?\b(?:\s+honoraires?\b.*|\s*\))?\s*$",
+    re.IGNORECASE)
+
+# Formes collées sans espace : "MarcANTONINI", "Jean-MarieWENZINGER", "MULLERChristian"
+_UPPER = "A-ZÀ-ÖØ-Þ"
+_LOWER = "a-zß-öø-ÿ"
+_GLUED_FIRST_LAST_RE = re.compile(
+    rf"^([{_UPPER}][{_LOWER}]+(?:-[{_UPPER}][{_LOWER}]+)*)([{_UPPER}][{_UPPER}'\-]+)$")
+_GLUED_LAST_FIRST_RE = re.compile(
+    rf"^([{_UPPER}][{_UPPER}'\-]+)([{_UPPER}][{_LOWER}]+(?:-[{_UPPER}][{_LOWER}]+)*)$")
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+PARTICLES = frozenset("""
+DE DU DES D' LE LA LES L' DA DAS DO DOS DI DEL DELLA DELLE DELLO DELA
+VAN VANDER VON DER DEN TER TEN VAN' EL AL ET BEN BEL BENT AIT OULD
+DIT DITE SAINT SAINTE ST STE MAC MC O'
+""".split())
+
+# Prénoms usuels (majuscules, sans accents) ; sert quand la casse ne dit rien
+FIRST_NAMES = frozenset("""
+ACHILLE ADELE ADRIEN ADRIENNE AGATHE AGNES AHMED AICHA ALAIN ALBAN ALBERT ALEXANDRA ALEXANDRE
+ALEXIS ALICE ALINE ALIX AMANDINE AMAURY AMELIE ANAIS ANDRE ANDREA ANGELIQUE ANNE ANNABELLE
+ANNICK ANNIE ANTHONY ANTOINE ANTOINETTE ANTONIO ARIANE ARMAND ARNAUD ARTHUR AUDE AUDREY
+AURELIA AURELIE AURELIEN AURORE AXEL AXELLE BAPTISTE BASTIEN BEATRICE BENEDICTE BENJAMIN
+BENOIT BERTRAND BETTY BLANDINE BORIS BRICE BRIGITTE BRUNO CAMILLE CAROLE CAROLINE
+CATHERINE CECILE CELINE CHANTAL CHARLES CHARLOTTE CHLOE CHRISTELLE CHRISTIAN CHRISTINE
+CHRISTOPHE CLAIRE CLARA CLAUDE CLAUDIA CLAUDINE CLEA CLEMENCE CLEMENT CLOTILDE COLETTE
+CORALIE CORINNE CYRIL CYRILLE DAMIEN DANIEL DANIELE DANIELLE DAVID DELPHINE DENISE
+DIANE DIDIER DOMINIQUE EDITH EDOUARD ELISA ELISABETH ELISE ELODIE ELSA EMELINE EMILIE
+EMILIEN EMMA EMMANUEL EMMANUELLE EMMELINE ERIC ERWAN ESTELLE ETIENNE EUGENIE EVA EVE EVELYNE
+FABIEN FABIENNE FABRICE FANNY FATIMA FLORENCE FLORENT FLORIAN FRANCK FRANCIS FRANCOIS
+FRANCOISE FREDERIC FREDERIQUE GABRIEL GABRIELLE GAEL GAELLE GAETAN GEOFFROY GEORGES GERALD
+GERALDINE GHISLAINE GILBERT GILLES GREGOIRE GREGORY GUILLAUME GUY HECTOR
+HELENE HENRI HERVE HONORINE HUBERT HUGO HUGUES INES INGRID IRENE ISABELLE JACQUELINE JACQUES
+JEAN JEANNE JEROME JOCELYNE JOEL JOELLE JONATHAN JOSEPH JOSETTE JOSIANE JULES JULIA
+JULIE JULIEN JULIETTE JUSTINE KARIM KARINE KARIMA KEVIN LAETITIA LAURA LAURE LAURENCE
+LEA LEO LEON LEONARD LEONIE LIONEL LISE LOIC LOUIS LOUISE LUC LUCAS LUCIE LUCIEN
+LUDOVIC LYDIE MADELEINE MAGALI MAGALIE MANON MARC MARCEL MARGARET MARGAUX MARGOT
+MARGUERITE MARIA MARIANNE MARIE MARINE MARION MARJORIE MARTIAL MARTINE MATHIAS MATHIEU
+MATHILDE MATTHIEU MAUD MAURICE MAXENCE MAXIME MELANIE MELISSA MICHELE MICHELLE
+MIREILLE MOHAMED MONIQUE MURIEL MYRIAM NADIA NADINE NATHALIE NICOLAS NICOLE NOEL
+NOEMIE ODILE OLIVIA OLIVIER OPHELIE PASCALE PATRICE PATRICIA PATRICK PAUL PAULINE
+PERRINE PETER PHILIPPE PIERRE PIERRICK QUENTIN RACHEL RAPHAEL RAPHAELLE REGIS REMI
+RENAUD RENE ROGER ROMAIN ROSE SABINE SABRINA SACHA SAMUEL SAMY SANDRA
+SANDRINE SARAH SEBASTIEN SEGOLENE SERGE SEVERINE SIMONE SOLENE SONIA SOPHIA SOPHIE
+STEPHANE STEPHANIE SYLVAIN SYLVIE TANGUY THEO THIBAULT THIBAUT THIERRY TIPHAINE
+TRISTAN VALENTIN VALENTINE VALERIE VANESSA VERONIQUE VICTOR VICTORIA VIOLAINE
+VIRGINIE VIVIANE XAVIER YANN YANNICK YASMINE YVES YVETTE YVONNE ZOE
+""".split())
+
+# Prénoms rares relevés sur des fiches réelles, hors du lexique général : sans
+# eux, la forme tout en majuscules "NOM Prénom" est coupée à l'envers
+# ("CHAILLÉ DE NÉRÉ DIXIE" à Rouen, "LEVEQUE PIERRE-LYONEL" à Vienne). N'y
+# ajouter qu'un prénom qui corrige une fiche réelle, et jamais un mot qui
+# est aussi un nom de famille (JANVIER : "Delphine JANVIER LUPART").
+ANNUAIRE_FIRST_NAMES = frozenset("""
+DIXIE LYONEL
+""".split())
+
+# Prénoms qui sont aussi des noms de famille courants ("Pierre ROBERT",
+# "Anne THOMAS") : en majuscules, ils ne décident de l'ordre que si l'autre
+# bout du nom n'est pas un prénom, et ne prolongent jamais un prénom composé
+# sans trait d'union ("PIERRE ROBERT DUPONT" -> Pierre / ROBERT DUPONT).
+SURNAME_FIRST_NAMES = frozenset("""
+BERNARD DENIS GERARD LAURENT MICHEL PASCAL RICHARD ROBERT SIMON THOMAS VINCENT
+""".split())
+
+_KNOWN_FIRST_NAMES = FIRST_NAMES | ANNUAIRE_FIRST_NAMES
+_ANY_FIRST_NAMES = _KNOWN_FIRST_NAMES | SURNAME_FIRST_NAMES
+
+# "É" -> "E" etc., une seule table de traduction précalculée pour le lexique
+_ACCENT_TABLE = {
+    ord(c): unicodedata.normalize('NFD', c)[0]
+    for c in "ÀÂÄÁÃÅÇÈÉÊËÌÍÎÏÑÒÓÔÖÕÙÚÛÜÝŸ"
+}
+
+GOLDEN_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'names_golden.json')
+
+
+def _lexicon_key(word):
+    return word.upper().translate(_ACCENT_TABLE)
+
+
+def is_first_name(word, ambiguous=False):
+    """
+    Vrai si le mot (ou chaque partie d'un prénom composé) est un prénom connu.
+
+    Un prénom qui est aussi un nom de famille (SURNAME_FIRST_NAMES) ne compte
+    que dans un composé à trait d'union ("JEAN-MICHEL"), ou si `ambiguous`.
+    """
+    parts = [part for part in _lexicon_key(word).split('-') if part]
+    if not ambiguous and len(parts) < 2:
+        return all(part in _KNOWN_FIRST_NAMES for part in parts)
+    return all(part in _ANY_FIRST_NAMES for part in parts)
+
+
+def _capitalize(text):
+    return _WORD_RE.sub(lambda m: m.group(0).capitalize(), text)
+
+
+def _finish(first, last, normalize):
+    if normalize:
+        return _capitalize(first), last.upper()
+    return first, last
+
+
+def clean_name(full_name):
+    """Retire titres, mentions "Avocat" et espaces superflus"""
+    name = ' '.join(full_name.split())
+    name = _TITLE_RE.sub('', name)
+    # La regex de suffixe balaie toute la chaîne : seulement si "avocat" y figure
+    if 'vocat' in name or 'VOCAT' in name:
+        name = _SUFFIX_RE.sub('', name)
+    return name.strip(' ,-')
+
+
+def split_name(full_name, order='first_last', normalize=False, overrides=None):
+    """
+    Sépare un nom d'avocat en (prénom, nom).
+
+    La casse décide quand elle est parlante ("ABDOU Sophia", "Sandra DE
+    BARROS"). Sinon (tout en majuscules ou tout en casse mixte), le lexique
+    de prénoms tranche, puis `order` : 'first_last' (Prénom NOM) ou
+    'last_first' (NOM Prénom), l'ordre habituel de l'annuaire.
+    `normalize` met le nom en majuscules et le prénom en casse "Jean-Marc".
+    `overrides` : dictionnaire {nom brut: (prénom, nom)} pour les exceptions.
+    """
+    if not full_name:
+        return '', ''
+    if overrides:
+        hit = overrides.get(full_name.strip())
+        if hit is not None:
+            return hit
+
+    name = clean_name(full_name)
+    if overrides and name in overrides:
+        return overrides[name]
+    if not name:
+        return '', ''
+
+    # "NOM, Prénom"
+    if ',' in name:
+        last, _, first = name.partition(',')
+        return _finish(first.strip(), last.strip(), normalize)
+
+    words = name.split(' ')
+    count = len(words)
+
+    if count == 1:
+        match = _GLUED_FIRST_LAST_RE.match(name)
+        if match:
+            return _finish(match.group(1), match.group(2), normalize)
+        match = _GLUED_LAST_FIRST_RE.match(name)
+        if match:
+            return _finish(match.group(2), match.group(1), normalize)
+        return _finish('', name, normalize)
+
+    # Casse : mots en casse mixte (hors particules) en tête ou en queue
+    mixed = [not w.isupper() and w.upper() not in PARTICLES for w in words]
+    if not all(mixed) and any(mixed):
+        lead = 0
+        while lead < count and mixed[lead]:
+            lead += 1
+        trail = 0
+        while trail < count and mixed[count - 1 - trail]:
+            trail += 1
+        if lead and not trail:
+            return _finish(' '.join(words[:lead]), ' '.join(words[lead:]), normalize)
+        if trail and not lead:
+            return _finish(' '.join(words[count - trail:]), ' '.join(words[:count - trail]), normalize)
+
+    # Casse muette : particule en tête, puis lexique, puis ordre de l'annuaire
+    if words[0].upper() in PARTICLES:
+        order = 'last_first'
+    else:
+        head, tail = is_first_name(words[0]), is_first_name(words[-1])
+        if not head and not tail:
+            # Seconde chance pour ROBERT, THOMAS... si l'autre bout n'en est pas un
+            head, tail = is_first_name(words[0], True), is_first_name(words[-1], True)
+        if head and not tail:
+            order = 'first_last'
+        elif tail and not head:
+            order = 'last_first'
+
+    if order == 'last_first':
+        cut = count - 1
+        while cut > 1 and is_first_name(words[cut - 1]) and words[cut - 1].upper() not in PARTICLES:
+            cut -= 1
+        return _finish(' '.join(words[cut:]), ' '.join(words[:cut]), normalize)
+
+    cut = 1
+    while cut < count - 1 and words[cut].upper() not in PARTICLES and is_first_name(words[cut]):
+        cut += 1
+    return _finish(' '.join(words[:cut]), ' '.join(words[cut:]), normalize)
+
+
+def split_many(names, order='first_last', normalize=False, overrides=None):
+    """
+    Version par lot de `split_name` : les noms répétés (pages d'annuaire
+    relues, doublons entre sources) ne sont séparés qu'une fois.
+    """
+    memo = {}
+    results = []
+    for full_name in names:
+        parts = memo.get(full_name)
+        if parts is None:
+            parts = memo[full_name] = split_name(full_name, order, normalize, overrides)
+        results.append(parts)
+    return results
+
+
+# --- Corpus de référence et benchmark ------------------------------------
+
+def load_corpus(path=GOLDEN_CORPUS):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_corpus(path=GOLDEN_CORPUS, verbose=True):
+    """Rejoue le corpus de référence ; retourne la liste des écarts"""
+    failures = []
+    corpus = load_corpus(path)
+    for case in corpus:
+        got = split_name(case['nom_complet'], **case.get('options', {}))
+        expected = (case['prenom'], case['nom'])
+        if got != expected:
+            failures.append((case, got))
+    if verbose:
+        print(f"📚 Corpus de référence: {len(corpus) - len(failures)}/{len(corpus)} noms corrects")
+        for case, got in failures:
+            print(f"   ❌ [{case['source']}] {case['nom_complet']!r}: "
+                  f"attendu {(case['prenom'], case['nom'])}, obtenu {got}")
+    return failures
+
+
+def benchmark(count=100000, path=GOLDEN_CORPUS):
+    """Temps de séparation de `count` noms tirés du corpus, sans puis avec mémo"""
+    corpus = [case['nom_complet'] for case in load_corpus(path)]
+    names = [corpus[i % len(corpus)] for i in range(count)]
+
+    start = time.perf_counter()
+    for full_name in names:
+        split_name(full_name)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    split_many(names)
+    batch = time.perf_counter() - start
+
+    print(f"⏱️  {count} noms:")
+    print(f"   split_name un par un: {cold:.3f}s ({cold / count * 1e6:.1f} µs/nom)")
+    print(f"   split_many (mémo):    {batch:.3f}s")
+    return cold, batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Séparation prénom / nom des avocats")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('check', help="Rejouer le corpus de référence")
+    bench = commands.add_parser('bench', help="Mesurer le débit de split_many")
+    bench.add_argument('--count', type=int, default=100000)
+    split = commands.add_parser('split', help="Séparer les noms passés en argument")
+    split.add_argument('names', nargs='+')
+    split.add_argument('--order', choices=['first_last', 'last_first'], default='first_last')
+    split.add_argument('--normalize', action='store_true')
+    args = parser.parse_args()
+
+    if args.command == 'check':
+        sys.exit(1 if check_corpus() else 0)
+    elif args.command == 'bench':
+        benchmark(args.count)
+    else:
+        for full_name, (first, last) in zip(args.names, split_many(args.names, args.order, args.normalize)):
+            print(f"{full_name!r} -> prénom: {first!r}, nom: {last!r}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Capture réseau des scrapers Selenium/Playwright et gabarits de rejeu HTTP
+Beaucoup d'annuaires chargent leurs listes en XHR/JSON ou par POST de
+formulaire : on lance le scraper une fois sous capture (journal "performance"
+de Chrome ou événements Playwright), on garde ces requêtes avec leurs
+paramètres, et on en tire un gabarit rejouable avec requests, sans navigateur.
+
+Usage:
+    python -m common.network_capture record vienne/vienne_scraper.py
+    python -m common.network_capture record-url guyane https://www.avocats-barreau-guyane.com/annuaire-des-avocats.htm
+    python -m common.network_capture template vienne/vienne_network_capture.json
+    python -m common.network_capture replay vienne/vienne_replay_template.json endpoint_1 page=2
+"""
+
+import argparse
+import asyncio
+import base64
+import inspect
+import json
+import os
+import re
+import runpy
+import sys
+import time
+from datetime import datetime
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+from common.http_client import PooledHttpClient
+
+BODY_LIMIT = 20000
+
+# En-têtes de requête conservés dans le gabarit (les autres sont recalculés par requests)
+KEPT_HEADERS = ('accept', 'content-type', 'referer', 'x-requested-with', 'origin', 'user-agent')
+
+# Paramètres à relire sur la page avant chaque rejeu (jetons anti-CSRF, nonces...)
+TOKEN_PATTERN = re.compile(r'token|csrf|nonce|viewstate|eventvalidation|captcha', re.I)
+
+
+def is_data_request(entry):
+    """
+    Ce qu'un rejeu HTTP doit reproduire : XHR/fetch, POST de formulaire,
+    réponse JSON, ou page de liste paramétrée (?page=2, ?ipstart=3...)
+    """
+    resource_type = (entry.get('resource_type') or '').lower()
+    return (resource_type in ('xhr', 'fetch')
+            or entry.get('method') == 'POST'
+            or 'json' in (entry.get('mime_type') or '')
+            or (resource_type == 'document' and '?' in (entry.get('url') or '')))
+
+
+class NetworkRecorder:
+    """
+    Journal des requêtes "données" d'une session de navigation.
+
+    Selenium : Chrome lancé avec `goog:loggingPrefs` (cf. `enable_performance_log`),
+    puis `drain(driver)` avant chaque navigation. Playwright : `attach(page)`.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self._pending = {}
+        self._tasks = []
+
+    # --- Selenium (journal "performance" / CDP) -------------------------
+
+    def drain(self, driver):
+        """Lit le journal performance de Chrome et complète les requêtes terminées"""
+        try:
+            logs = driver.get_log('performance')
+        except Exception:
+            return
+        for log in logs:
+            try:
+                message = json.loads(log['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            request_id = params.get('requestId')
+
+            if method == 'Network.requestWillBeSent':
+                request = params.get('request', {})
+                self._pending[request_id] = {
+                    'method': request.get('method'),
+                    'url': request.get('url'),
+                    'resource_type': (params.get('type') or '').lower(),
+                    'request_headers': request.get('headers', {}),
+                    'post_data': request.get('postData'),
+                    'page_url': params.get('documentURL'),
+                    'time': time.time()
+                }
+            elif method == 'Network.responseReceived' and request_id in self._pending:
+                response = params.get('response', {})
+                self._pending[request_id].update({
+                    'status': response.get('status'),
+                    'mime_type': response.get('mimeType', ''),
+                })
+            elif method == 'Network.loadingFinished' and request_id in self._pending:
+                entry = self._pending.pop(request_id)
+                if is_data_request(entry):
+                    entry['body'] = self._cdp_body(driver, request_id)
+                    self.entries.append(entry)
+            elif method == 'Network.loadingFailed':
+                self._pending.pop(request_id, None)
+
+    @staticmethod
+    def _cdp_body(driver, request_id):
+        try:
+            result = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception:
+            return None
+        body = result.get('body', '')
+        if result.get('base64Encoded'):
+            body = base64.b64decode(body).decode('utf-8', errors='replace')
+        return body[:BODY_LIMIT]
+
+    # --- Playwright (sync ou async) --------------------------------------
+
+    def attach(self, target):
+        """Écoute les réponses d'une page ou d'un contexte Playwright"""
+        target.on('response', self._on_response)
+
+    def _on_response(self, response):
+        request = response.request
+        entry = {
+            'method': request.method,
+            'url': request.url,
+            'resource_type': request.resource_type,
+            'request_headers': dict(request.headers),
+            'post_data': request.post_data,
+            'page_url': request.frame.url if request.frame else None,
+            'status': response.status,
+            'mime_type': (response.headers.get('content-type') or '').split(';')[0],
+            'time': time.time()
+        }
+        if not is_data_request(entry):
+            return
+        self.entries.append(entry)
+        body = response.text()
+        if inspect.isawaitable(body):
+            # API async : le corps est lu en tâche de fond, sans bloquer la boucle
+            self._tasks.append(asyncio.ensure_future(_store_body_later(entry, body)))
+        else:
+            entry['body'] = body[:BODY_LIMIT]
+
+    async def flush(self):
+        """API async : attend la lecture des corps de réponse en cours"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            await task
+
+    # --- Export ---------------------------------------------------------
+
+    def save(self, path, bar=None):
+        capture = {
+            'bar': bar,
+            'captured': datetime.now().isoformat(),
+            'entries': self.entries
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(capture, f, ensure_ascii=False, indent=2)
+        return path
+
+
+async def _store_body_later(entry, body):
+    try:
+        entry['body'] = (await body)[:BODY_LIMIT]
+    except Exception:
+        entry['body'] = None
+
+
+def enable_performance_log(options):
+    """Active le journal réseau de Chrome sur des Options Selenium"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+# --- Gabarit de rejeu ---------------------------------------------------------
+
+def _split_payload(entry):
+    """Paramètres de requête et corps (formulaire ou JSON) sous forme de dicts"""
+    parts = urlsplit(entry['url'])
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    body, body_type = {}, None
+    post_data = entry.get('post_data')
+    if post_data:
+        content_type = ''
+        for name, value in (entry.get('request_headers') or {}).items():
+            if name.lower() == 'content-type':
+                content_type = value
+        if 'json' in content_type:
+            try:
+                body, body_type = json.loads(post_data), 'json'
+            except ValueError:
+                body, body_type = post_data, 'raw'
+        else:
+            body, body_type = dict(parse_qsl(post_data, keep_blank_values=True)), 'form'
+    base_url = urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+    return base_url, query, body, body_type
+
+
+def _variable(values):
+    """Décrit un paramètre qui change d'une requête à l'autre (pagination, filtre...)"""
+    unique = list(dict.fromkeys(values))
+    variable = {'values': unique[:50]}
+    if all(isinstance(v, int) or (isinstance(v, str) and v.lstrip('-').isdigit()) for v in unique):
+        numbers = [int(v) for v in unique]
+        steps = {b - a for a, b in zip(numbers, numbers[1:])}
+        if len(steps) == 1:
+            variable.update({'kind': 'counter', 'start': numbers[0], 'step': steps.pop()})
+    return variable
+
+
+def _parametrize(samples):
+    """Valeurs fixes gardées telles quelles, valeurs variables remplacées par {nom}"""
+    if not isinstance(samples[0], dict):
+        return samples[0], {}
+    keys = list(dict.fromkeys(k for sample in samples for k in sample))
+    fixed, variables = {}, {}
+    for key in keys:
+        values = [sample.get(key) for sample in samples if key in sample]
+        hashable = [json.dumps(v, sort_keys=True) if isinstance(v, (dict, list)) else v for v in values]
+        if len(set(hashable)) == 1 and not TOKEN_PATTERN.search(key):
+            fixed[key] = values[0]
+        else:
+            fixed[key] = '{%s}' % key
+            variables[key] = _variable(hashable)
+            if TOKEN_PATTERN.search(key):
+                variables[key]['kind'] = 'token'
+    return fixed, variables
+
+
+def build_template(entries, bar=None):
+    """Regroupe les requêtes par (méthode, URL sans paramètres) et en tire un gabarit"""
+    groups = {}
+    for entry in entries:
+        if not is_data_request(entry):
+            continue
+        base_url, query, body, body_type = _split_payload(entry)
+        groups.setdefault((entry['method'], base_url), []).append((entry, query, body, body_type))
+
+    endpoints = []
+    for i, ((method, base_url), items) in enumerate(groups.items(), 1):
+        first = items[0][0]
+        params, query_vars = _parametrize([query for _, query, _, _ in items])
+        body_type = items[0][3]
+        data, body_vars = _parametrize([body for _, _, body, _ in items]) if body_type else (None, {})
+        headers = {name: value for name, value in (first.get('request_headers') or {}).items()
+                   if name.lower() in KEPT_HEADERS}
+        mime_type = first.get('mime_type') or ''
+        endpoints.append({
+            'name': f'endpoint_{i}',
+            'method': method,
+            'url': base_url,
+            'params': params,
+            'body_type': body_type,
+            'data': data,
+            'variables': {**query_vars, **body_vars},
+            'headers': headers,
+            'bootstrap_url': first.get('page_url'),
+            'response': 'json' if 'json' in mime_type else 'html' if 'html' in mime_type else 'text',
+            'samples': len(items),
+            'example_response': (first.get('body') or '')[:2000]
+        })
+
+    return {
+        'bar': bar,
+        'generated': datetime.now().isoformat(),
+        'endpoints': endpoints
+    }
+
+
+def _fill(value, values):
+    if isinstance(value, str):
+        match = re.fullmatch(r'\{(\w+)\}', value)
+        if match and match.group(1) in values:
+            return values[match.group(1)]
+        return value
+    if isinstance(value, dict):
+        return {k: _fill(v, values) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v, values) for v in value]
+    return value
+
+
+class ReplayTemplate:
+    """
+    Rejoue les requêtes capturées avec requests.
+
+    `template.request('endpoint_1', page=3)` renvoie la réponse ; les variables
+    non fournies reprennent leur première valeur observée. Les jetons
+    (CSRF, nonce...) sont relus sur `bootstrap_url` avant la requête.
+    """
+
+    def __init__(self, template, client=None):
+        self.template = template
+        self.endpoints = {e['name']: e for e in template['endpoints']}
+        self._client = client
+        self._tokens = {}
+
+    @classmethod
+    def load(cls, path, client=None):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), client)
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = PooledHttpClient()
+        return self._client
+
+    def _token(self, endpoint, name):
+        url = endpoint.get('bootstrap_url')
+        if not url:
+            return None
+        if url not in self._tokens:
+            self._tokens[url] = self.client.get(url, timeout=15).text
+        html = self._tokens[url]
+        match = (re.search(r'name=["\']%s["\'][^>]*value=["\']([^"\']*)' % re.escape(name), html)
+                 or re.search(r'value=["\']([^"\']*)["\'][^>]*name=["\']%s["\']' % re.escape(name), html)
+                 or re.search(r'["\']%s["\']\s*[:=]\s*["\']([^"\']+)' % re.escape(name), html))
+        return match.group(1) if match else None
+
+    def build(self, name, **values):
+        """Requête prête à envoyer : dict(method, url, params, data|json, headers)"""
+        endpoint = self.endpoints[name]
+        filled = {}
+        for var, spec in endpoint['variables'].items():
+            if var in values:
+                filled[var] = values[var]
+            elif spec.get('kind') == 'token':
+                filled[var] = self._token(endpoint, var) or spec['values'][0]
+            else:
+                filled[var] = spec['values'][0]
+        request = {
+            'method': endpoint['method'],
+            'url': endpoint['url'],
+            'params': _fill(endpoint['params'], filled),
+            'headers': endpoint['headers']
+        }
+        if endpoint['body_type'] == 'json':
+            request['json'] = _fill(endpoint['data'], filled)
+        elif endpoint['body_type']:
+            request['data'] = _fill(endpoint['data'], filled)
+        return request
+
+    def request(self, name, **values):
+        request = self.build(name, **values)
+        method, url = request.pop('method'), request.pop('url')
+        return self.client.request(method, url, timeout=15, **request)
+
+    def fetch(self, name, **values):
+        """Réponse décodée : JSON si l'endpoint renvoyait du JSON, texte sinon"""
+        response = self.request(name, **values)
+        response.raise_for_status()
+        if self.endpoints[name]['response'] == 'json':
+            return response.json()
+        return response.text
+
+    def pages(self, name, variable, max_pages=500, **values):
+        """
+        Parcourt un compteur de pagination (start/step observés) jusqu'à une
+        réponse vide, en erreur ou identique à la précédente.
+        """
+        spec = self.endpoints[name]['variables'][variable]
+        current, step = int(spec.get('start', 1)), int(spec.get('step', 1))
+        previous = None
+        for _ in range(max_pages):
+            response = self.request(name, **{**values, variable: current})
+            if response.status_code != 200 or not response.content.strip() or response.content == previous:
+                return
+            previous = response.content
+            yield response
+            current += step
+
+
+# --- Ligne de commande --------------------------------------------------------
+
+def _bar_paths(bar_dir, bar):
+    return (os.path.join(bar_dir, f'{bar}_network_capture.json'),
+            os.path.join(bar_dir, f'{bar}_replay_template.json'))
+
+
+def _write_outputs(recorder, bar, bar_dir):
+    os.makedirs(bar_dir, exist_ok=True)
+    capture_path, template_path = _bar_paths(bar_dir, bar)
+    recorder.save(capture_path, bar)
+    template = build_template(recorder.entries, bar)
+    with open(template_path, 'w', encoding='utf-8') as f:
+        json.dump(template, f, ensure_ascii=False, indent=2)
+    print(f"📡 {len(recorder.entries)} requêtes de données capturées → {capture_path}")
+    print(f"🧩 {len(template['endpoints'])} endpoints dans le gabarit → {template_path}")
+    for endpoint in template['endpoints']:
+        variables = ', '.join(endpoint['variables']) or 'aucune'
+        print(f"   {endpoint['name']}: {endpoint['method']} {endpoint['url']} "
+              f"({endpoint['samples']} appels, variables: {variables})")
+
+
+def record_script(script, script_args=(), bar=None):
+    """
+    Exécute un scraper Selenium tel quel, avec un Chrome dont le journal
+    réseau est activé et vidé avant chaque navigation et à la fermeture.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    recorder = NetworkRecorder()
+    drivers = []
+    base_chrome = webdriver.Chrome
+
+    class CapturingChrome(base_chrome):
+        def __init__(self, *args, options=None, **kwargs):
+            options = enable_performance_log(options or Options())
+            super().__init__(*args, options=options, **kwargs)
+            drivers.append(self)
+
+        def get(self, url):
+            recorder.drain(self)
+            return super().get(url)
+
+        def quit(self):
+            recorder.drain(self)
+            return super().quit()
+
+    script = os.path.abspath(script)
+    bar_dir = os.path.dirname(script)
+    bar = bar or os.path.basename(bar_dir)
+    saved_argv = sys.argv
+    webdriver.Chrome = CapturingChrome
+    sys.argv = [script, *script_args]
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except (SystemExit, KeyboardInterrupt):
+        pass
+    finally:
+        webdriver.Chrome = base_chrome
+        sys.argv = saved_argv
+        for driver in drivers:
+            recorder.drain(driver)
+        _write_outputs(recorder, bar, bar_dir)
+    return recorder
+
+
+def record_url(bar, url, bar_dir=None, headless=False):
+    """Ouvre l'annuaire dans Playwright ; on navigue à la main puis Entrée pour finir"""
+    from playwright.sync_api import sync_playwright
+
+    recorder = NetworkRecorder()
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        context = browser.new_context(locale='fr-FR')
+        recorder.attach(context)
+        page = context.new_page()
+        page.goto(url, wait_until='networkidle')
+        if headless:
+            page.wait_for_timeout(5000)
+        else:
+            input("🖱️  Parcourez l'annuaire (pages, filtres, fiches) puis appuyez sur Entrée... ")
+        browser.close()
+    _write_outputs(recorder, bar, bar_dir or bar)
+    return recorder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture réseau et gabarits de rejeu HTTP")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="Exécuter un scraper Selenium sous capture")
+    record.add_argument('script')
+    record.add_argument('--bar', help="Nom du barreau (par défaut : dossier du script)")
+    record.add_argument('script_args', nargs=argparse.REMAINDER)
+
+    record_page = commands.add_parser('record-url', help="Capture manuelle avec Playwright")
+    record_page.add_argument('bar')
+    record_page.add_argument('url')
+    record_page.add_argument('--headless', action='store_true')
+
+    template = commands.add_parser('template', help="Regénérer le gabarit depuis une capture")
+    template.add_argument('capture')
+
+    replay = commands.add_parser('replay', help="Rejouer un endpoint du gabarit")
+    replay.add_argument('template')
+    replay.add_argument('endpoint')
+    replay.add_argument('values', nargs='*', help="variable=valeur")
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record_script(args.script, args.script_args, args.bar)
+    elif args.command == 'record-url':
+        record_url(args.bar, args.url, headless=args.headless)
+    elif args.command == 'template':
+        with open(args.capture, 'r', encoding='utf-8') as f:
+            capture = json.load(f)
+        recorder = NetworkRecorder()
+        recorder.entries = capture['entries']
+        bar = capture.get('bar') or os.path.basename(os.path.dirname(os.path.abspath(args.capture)))
+        _write_outputs(recorder, bar, os.path.dirname(os.path.abspath(args.capture)))
+    elif args.command == 'replay':
+        values = dict(value.split('=', 1) for value in args.values)
+        start = time.time()
+        result = ReplayTemplate.load(args.template).fetch(args.endpoint, **values)
+        text = json.dumps(result, ensure_ascii=False, indent=2) if not isinstance(result, str) else result
+        print(text[:3000])
+        print(f"\n⚡ Réponse en {(time.time() - start) * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
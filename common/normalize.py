@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Normalisation des téléphones, emails et adresses sur des colonnes entières
+Au lieu d'un extract_phone par scraper appelé fiche par fiche, le
+post-traitement passe une colonne complète (pandas Series, liste, tableau
+Arrow) dans des opérations de chaînes vectorisées : téléphones au format
+français ou E.164, séparation téléphone/fax, emails validés en minuscules,
+découpage adresse / code postal / ville.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+try:
+    import pyarrow  # noqa: F401 (accélère le dtype string de pandas)
+    STRING_DTYPE = 'string[pyarrow]'
+except ImportError:
+    STRING_DTYPE = 'string'
+
+# Numéro français : 0X, +33 X, 0033 X, +33 (0)X, séparateurs espace . - /
+PHONE_PATTERN = r'(?:(?:\+|00)33\s?(?:\(0\)\s?)?|0)[1-9](?:[\s.\-/]?\d{2}){4}'
+_FAX_PATTERN = rf'(?i)(?:fax|t[ée]l[ée]copie|t[ée]l[ée]c\.?)\s*[:.]?\s*({PHONE_PATTERN})'
+EMAIL_PATTERN = r'[a-z0-9._%+\-]+@[a-z0-9\-]+(?:\.[a-z0-9\-]+)*\.[a-z]{2,}'
+# Code postal en fin d'adresse, suivi de la ville (et d'un éventuel CEDEX)
+_POSTCODE_CITY_PATTERN = (
+    r'(?i)[\s,\-]*\b(?P<code_postal>(?:0[1-9]|[1-8]\d|9[0-8]|2[AB])\d{3})\s+'
+    r'(?P<ville>[^\d,;]+?)(?:\s+cedex(?:\s*\d+)?)?\s*$'
+)
+
+_PHONE_RE = re.compile(PHONE_PATTERN)
+_FAX_RE = re.compile(_FAX_PATTERN)
+_EMAIL_RE = re.compile(EMAIL_PATTERN)
+_NATIONAL_RE = re.compile(r'^0[1-9]\d{8}$')
+_GROUPS_RE = re.compile(r'(\d{2})(?=\d)')
+
+# Outre-mer : indicatif E.164 selon les 4 premiers chiffres du numéro national
+OVERSEAS_PREFIXES = {
+    '0590': '590', '0690': '590', '0691': '590',                  # Guadeloupe, St-Martin, St-Barth
+    '0594': '594', '0694': '594',                                  # Guyane
+    '0596': '596', '0696': '596', '0697': '596',                  # Martinique
+    '0262': '262', '0263': '262', '0692': '262', '0693': '262',   # La Réunion
+    '0269': '262', '0639': '262',                                  # Mayotte
+    '0508': '508',                                                 # Saint-Pierre-et-Miquelon
+}
+
+PHONE_STYLES = ('national', 'e164', 'digits')
+
+# Noms de colonnes reconnus par normalize_frame
+PHONE_COLUMNS = ('telephone', 'tel', 'phone', 'portable', 'mobile', 'telephone_fixe', 'telephone_2')
+FAX_COLUMNS = ('fax', 'telephone_fax', 'telecopie')
+EMAIL_COLUMNS = ('email', 'mail', 'courriel')
+ADDRESS_COLUMNS = ('adresse', 'adresse_complete', 'address')
+
+
+# --- Version scalaire (une fiche), mêmes règles ----------------------------
+
+def _digits(raw):
+    digits = re.sub(r'\D', '', raw.replace('(0)', ''))
+    if digits.startswith('0033'):
+        digits = '0' + digits[4:]
+    elif digits.startswith('33') and len(digits) == 11:
+        digits = '0' + digits[2:]
+    return digits if _NATIONAL_RE.match(digits) else None
+
+
+def _format(digits, style, separator):
+    if style == 'digits':
+        return digits
+    if style == 'e164':
+        country = OVERSEAS_PREFIXES.get(digits[:4], '33')
+        return f'+{country}{digits[1:]}'
+    return _GROUPS_RE.sub(rf'\1{separator}', digits)
+
+
+def normalize_phone(text, style='national', separator=' '):
+    """Premier numéro français du texte, normalisé ('01 23 45 67 89', '+33123456789'...), ou None"""
+    if not isinstance(text, str) or not text:
+        return None
+    match = _PHONE_RE.search(text)
+    if not match:
+        return None
+    digits = _digits(match.group(0))
+    return _format(digits, style, separator) if digits else None
+
+
+def split_phone(text, style='national', separator=' '):
+    """(téléphone, fax) d'un texte : fax repéré par son libellé, sinon 2e numéro"""
+    if not isinstance(text, str) or not text:
+        return None, None
+    numbers = [_digits(m.group(0)) for m in _PHONE_RE.finditer(text)]
+    numbers = [n for n in numbers if n]
+    fax_match = _FAX_RE.search(text)
+    fax = _digits(fax_match.group(1)) if fax_match else None
+    phones = [n for n in numbers if n != fax]
+    phone = phones[0] if phones else None
+    if fax is None and len(phones) > 1:
+        fax = phones[1]
+    return (_format(phone, style, separator) if phone else None,
+            _format(fax, style, separator) if fax else None)
+
+
+def normalize_email(text):
+    """Email en minuscules, sans 'mailto:', validé ; None sinon"""
+    if not isinstance(text, str) or not text:
+        return None
+    match = _EMAIL_RE.search(text.strip().lower().replace('%40', '@'))
+    return match.group(0) if match else None
+
+
+# --- Version vectorisée (colonnes entières) --------------------------------
+
+def _require_pandas():
+    if not PANDAS_AVAILABLE:
+        raise ImportError("pandas est requis pour la normalisation vectorisée (pip install pandas)")
+
+
+def as_string_series(values):
+    """Series de chaînes (dtype string) à partir d'une Series, liste ou tableau Arrow"""
+    _require_pandas()
+    if isinstance(values, pd.Series):
+        series = values
+    elif hasattr(values, 'to_pandas'):
+        series = values.to_pandas()
+    else:
+        series = pd.Series(list(values))
+    return series.astype(STRING_DTYPE)
+
+
+def _phone_digits(raw):
+    """Colonne de numéros bruts (déjà extraits) -> 10 chiffres nationaux ou NA"""
+    digits = raw.str.replace('(0)', '', regex=False).str.replace(r'\D', '', regex=True)
+    digits = digits.str.replace(r'^(?:0033|33(?=\d{9}$))', '0', regex=True)
+    return digits.where(digits.str.fullmatch(r'0[1-9]\d{8}').fillna(False))
+
+
+def _format_phones(digits, style, separator):
+    if style not in PHONE_STYLES:
+        raise ValueError(f"style inconnu: {style} (attendu: {', '.join(PHONE_STYLES)})")
+    if style == 'digits':
+        return digits
+    if style == 'e164':
+        country = digits.str.slice(0, 4).map(OVERSEAS_PREFIXES).fillna('33').astype(STRING_DTYPE)
+        return ('+' + country + digits.str.slice(1)).where(digits.notna())
+    return digits.str.replace(r'(\d{2})(?=\d)', rf'\g<1>{separator}', regex=True)
+
+
+def normalize_phones(values, style='national', separator=' '):
+    """Premier numéro de chaque cellule, normalisé ; NA si aucun numéro valide"""
+    series = as_string_series(values)
+    raw = series.str.extract(f'({PHONE_PATTERN})', expand=False)
+    return _format_phones(_phone_digits(raw), style, separator)
+
+
+def split_phone_fax(values, style='national', separator=' '):
+    """
+    DataFrame (telephone, fax) à partir de cellules mêlant les deux numéros.
+
+    Un numéro précédé de "Fax"/"Télécopie" est le fax ; sinon le premier
+    numéro est le téléphone et le second le fax (texte collé compris :
+    '03.82.53.38.2403.82.51.32.62').
+    """
+    series = as_string_series(values)
+    found = series.str.extractall(f'({PHONE_PATTERN})')[0].astype(STRING_DTYPE)
+    by_rank = found.unstack()
+
+    def nth(rank):
+        if rank not in by_rank.columns:
+            return pd.Series(pd.NA, index=series.index, dtype=STRING_DTYPE)
+        return _phone_digits(by_rank[rank]).reindex(series.index)
+
+    first, second = nth(0), nth(1)
+    labeled = _phone_digits(series.str.extract(_FAX_PATTERN, expand=False))
+
+    # Le numéro libellé "Fax" est le fax ; s'il arrive en premier, le téléphone est le second
+    fax = labeled.fillna(second)
+    phone = first.mask((first == labeled).fillna(False), second)
+    return pd.DataFrame({
+        'telephone': _format_phones(phone, style, separator),
+        'fax': _format_phones(fax, style, separator),
+    }, index=series.index)
+
+
+def normalize_emails(values):
+    """Premier email valide de chaque cellule, en minuscules ; NA sinon"""
+    series = as_string_series(values)
+    cleaned = series.str.strip().str.lower().str.replace('%40', '@', regex=False)
+    return cleaned.str.extract(f'({EMAIL_PATTERN})', expand=False)
+
+
+def split_postcode_city(values):
+    """DataFrame (adresse, code_postal, ville) ; ville en majuscules, CEDEX retiré"""
+    series = as_string_series(values).str.strip()
+    parts = series.str.extract(_POSTCODE_CITY_PATTERN)
+    street = series.str.replace(_POSTCODE_CITY_PATTERN, '', regex=True).str.strip(' ,-')
+    return pd.DataFrame({
+        'adresse': street.where(street.str.len() > 0),
+        'code_postal': parts['code_postal'].str.upper(),
+        'ville': parts['ville'].str.strip().str.upper(),
+    }, index=series.index)
+
+
+def normalize_frame(frame, style='national', separator=' ', split_address=True):
+    """
+    Normalise en place les colonnes reconnues d'un résultat de scraping.
+
+    Téléphones et fax (cf. PHONE_COLUMNS / FAX_COLUMNS) : un fax vide est
+    rempli par le second numéro de la colonne téléphone. Emails validés.
+    Adresse : code_postal et ville ajoutés (ou complétés) si absents.
+    Accepte un DataFrame ou une liste de dicts ; retourne un DataFrame.
+    """
+    _require_pandas()
+    if not isinstance(frame, pd.DataFrame):
+        frame = pd.DataFrame(list(frame))
+    columns = {c.lower(): c for c in frame.columns}
+
+    fax_col = next((columns[c] for c in FAX_COLUMNS if c in columns), None)
+    for name in PHONE_COLUMNS:
+        if name not in columns:
+            continue
+        col = columns[name]
+        pair = split_phone_fax(frame[col], style, separator)
+        frame[col] = pair['telephone']
+        if name == 'telephone':
+            if fax_col is None:
+                fax_col = 'fax'
+                frame[fax_col] = pair['fax']
+            else:
+                own_fax = normalize_phones(frame[fax_col], style, separator)
+                frame[fax_col] = own_fax.fillna(pair['fax'])
+    if fax_col is not None and fax_col in frame and 'telephone' not in columns:
+        frame[fax_col] = normalize_phones(frame[fax_col], style, separator)
+
+    for name in EMAIL_COLUMNS:
+        if name in columns:
+            frame[columns[name]] = normalize_emails(frame[columns[name]])
+
+    if split_address:
+        address_col = next((columns[c] for c in ADDRESS_COLUMNS if c in columns), None)
+        if address_col is not None:
+            parts = split_postcode_city(frame[address_col])
+            for field in ('code_postal', 'ville'):
+                if field in frame:
+                    existing = as_string_series(frame[field]).str.strip().replace('', pd.NA)
+                    frame[field] = existing.fillna(parts[field])
+                else:
+                    frame[field] = parts[field]
+    return frame
+
+
+def to_records(frame):
+    """DataFrame -> liste de dicts, NA remplacés par '' (comme les CSV des scrapers)"""
+    return frame.astype(object).where(frame.notna(), '').to_dict('records')
+
+
+# --- Ligne de commande ------------------------------------------------------
+
+def _load(path):
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('avocats') or data.get('lawyers') or next(
+                (v for v in data.values() if isinstance(v, list)), [])
+        return pd.DataFrame(data)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def _synthetic_frame(rows):
+    samples = [
+        ('Tél : 01 23 45 67 89 - Fax : 01 23 45 67 90', 'MAILTO:Jean.Dupont@Avocat.FR',
+         '12 rue de la Paix, 75002 Paris'),
+        ('03.82.53.38.2403.82.51.32.62', 'contact%40cabinet-x.fr', '14 avenue de Gaulle 57100 THIONVILLE'),
+        ('+33 (0)5 56 44 20 00', ' marie@exemple.fr ', 'BP 123 33000 Bordeaux Cedex 01'),
+        ('0590 12 34 56', 'pas d\'email', 'Rue Schoelcher 97110 Pointe-à-Pitre'),
+    ]
+    return pd.DataFrame([dict(zip(('telephone', 'email', 'adresse'), samples[i % len(samples)]))
+                         for i in range(rows)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalisation des téléphones, emails et adresses")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help="Normaliser un fichier CSV/JSON de résultats")
+    run.add_argument('input')
+    run.add_argument('-o', '--output', help="Fichier de sortie (défaut: <entrée>_normalise.csv)")
+    run.add_argument('--style', choices=PHONE_STYLES, default='national')
+    run.add_argument('--separator', default=' ')
+    bench = commands.add_parser('bench', help="Mesurer le temps sur un jeu synthétique")
+    bench.add_argument('--rows', type=int, default=50000)
+    args = parser.parse_args()
+
+    _require_pandas()
+    if args.command == 'bench':
+        frame = _synthetic_frame(args.rows)
+        start = time.perf_counter()
+        normalize_frame(frame)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️  {args.rows} fiches normalisées en {elapsed:.2f}s")
+        print(frame.head(4).to_string())
+        return
+
+    frame = normalize_frame(_load(args.input), args.style, args.separator)
+    output = args.output or os.path.splitext(args.input)[0] + '_normalise.csv'
+    frame.to_csv(output, index=False, encoding='utf-8')
+    print(f"✅ {len(frame)} fiches normalisées -> {output}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
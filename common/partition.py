@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Découpage adaptatif des recherches plafonnées ("Plus de 30 résultats")
+Les filtres du formulaire (ville, spécialité, initiales du nom...) forment
+un arbre de requêtes : seule une requête plafonnée est subdivisée, avec la
+dimension suivante ou un préfixe de nom plus long. Une branche dont les
+sous-requêtes ont déjà rendu tous ses résultats n'est pas poursuivie, et
+le nombre de résultats de chaque requête est gardé d'une exécution à
+l'autre : les requêtes plafonnées ou vides ne sont plus soumises.
+"""
+
+import json
+import os
+import string
+import time
+
+from common.dedup import DedupIndex
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.partition_cache')
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+
+# --- Dimensions -----------------------------------------------------------
+
+class FilterDimension:
+    """
+    Un filtre à liste de valeurs (select du formulaire).
+
+    `exclusive` : une fiche répond à une seule valeur (ville), les comptes
+    des sous-requêtes s'additionnent ; `exhaustive` : toute fiche répond à
+    une valeur. Une spécialité n'est ni l'une ni l'autre : un avocat sans
+    spécialité n'est trouvé par aucune valeur.
+    """
+
+    def __init__(self, field, values, exclusive=True, exhaustive=True):
+        self.field = field
+        self.values = [value for value in values if value not in (None, '')]
+        self.exclusive = exclusive
+        self.exhaustive = exhaustive
+
+    def refine(self, current):
+        """Valeurs des sous-requêtes (vide si le filtre est déjà posé)"""
+        return [] if current is not None else list(self.values)
+
+
+class PrefixDimension:
+    """Initiales du nom : A..Z, puis AA..AZ sous une requête "A" plafonnée, etc."""
+
+    exclusive = True
+    exhaustive = True
+
+    def __init__(self, field='nom', alphabet=string.ascii_uppercase, max_length=3):
+        self.field = field
+        self.alphabet = alphabet
+        self.max_length = max_length
+
+    def refine(self, current):
+        current = current or ''
+        if len(current) >= self.max_length:
+            return []
+        return [current + letter for letter in self.alphabet]
+
+
+def dimensions_from_options(options, exclusive=('ville', 'barreau', 'tribunal')):
+    """Dimensions d'après {champ: [{'value', 'text'}, ...]} ; seuls les champs `exclusive` le sont"""
+    return [FilterDimension(field, [option['value'] for option in values],
+                            exclusive=field in exclusive, exhaustive=field in exclusive)
+            for field, values in options.items()]
+
+
+def query_key(query):
+    return json.dumps(query, sort_keys=True, ensure_ascii=False)
+
+
+# --- Moteur ---------------------------------------------------------------
+
+class QueryPartitioner:
+    """
+    Parcours en profondeur de l'arbre des requêtes.
+
+    `search(query)` soumet le formulaire avec les filtres {champ: valeur} et
+    retourne {'records': [...], 'capped': bool, 'total': int ou None}
+    ('total' : nombre annoncé par le site, s'il l'affiche), ou
+    {'error': message} si la recherche a échoué (une exception levée par
+    `search` vaut échec). Une requête en échec n'est ni mise en cache ni
+    comptée comme vide : elle sera soumise à nouveau au prochain run. Une requête
+    plafonnée est subdivisée par la première dimension qui peut l'affiner ;
+    les dimensions exhaustives passent avant les autres. Les fiches vont
+    dans un DedupIndex commun.
+
+    Le parcours s'arrête dès que `expected_total` fiches uniques sont
+    trouvées (sinon le total annoncé par la requête racine, s'il existe) ou
+    après `max_queries` soumissions, et les sœurs restantes d'une dimension
+    exclusive sont sautées quand leurs aînées ont rendu tout le total de la
+    requête parente.
+    """
+
+    def __init__(self, dimensions, index=None, cache_name=None, cache_dir=DEFAULT_CACHE_DIR,
+                 max_age=DEFAULT_MAX_AGE, expected_total=None, max_queries=None):
+        self.dimensions = sorted(dimensions, key=lambda dimension: not dimension.exhaustive)
+        self.index = index if index is not None else DedupIndex()
+        self.expected_total = expected_total
+        self.max_queries = max_queries
+        self.cache_path = os.path.join(cache_dir, f"{cache_name}.json") if cache_name and cache_dir else None
+        self.max_age = max_age
+        self.cache = self._load_cache()
+        self.log = []           # {'query', 'count', 'capped', 'new'} par requête soumise
+        self.stats = {'soumissions': 0, 'plafonnees': 0, 'depuis_cache': 0, 'vides_ignorees': 0,
+                      'soeurs_ignorees': 0, 'non_exhaustives': 0, 'perdues': 0, 'echecs': 0}
+
+    # --- Cache des comptes par requête ---
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {key: entry for key, entry in entries.items() if now - entry.get('at', 0) <= self.max_age}
+
+    def save_cache(self):
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.cache_path)
+
+    def remember(self, query, count, capped, total=None):
+        """Résultat d'une requête déjà soumise hors du moteur (page d'accueil déjà plafonnée)"""
+        self.cache[query_key(query)] = {'count': count, 'capped': capped, 'total': total, 'at': time.time()}
+
+    # --- Parcours ---
+
+    def complete(self):
+        if self.max_queries is not None and self.stats['soumissions'] >= self.max_queries:
+            return True
+        return self.expected_total is not None and len(self.index) >= self.expected_total
+
+    def _refinement(self, query):
+        for dimension in self.dimensions:
+            values = dimension.refine(query.get(dimension.field))
+            if values:
+                return dimension, values
+        return None, []
+
+    def _record(self, query, result):
+        """Fiches d'une requête soumise dans l'index, et son compte en cache ; False si elle a échoué"""
+        self.stats['soumissions'] += 1
+        if result.get('error') is not None:
+            self.stats['echecs'] += 1
+            self.log.append({'query': query, 'count': 0, 'capped': False, 'new': 0, 'error': result['error']})
+            print(f"⚠️ Requête en échec, non mise en cache: {query} ({result['error']})")
+            return False
+        records = result.get('records') or []
+        capped = bool(result.get('capped'))
+        new = self.index.extend(records)
+        self.log.append({'query': query, 'count': len(records), 'capped': capped, 'new': new})
+        self.remember(query, len(records), capped, result.get('total'))
+        return True
+
+    def _explore(self, query):
+        """Générateur : cède les requêtes à soumettre, reçoit leurs résultats ; rend le compte du nœud"""
+        cached = self.cache.get(query_key(query))
+        if cached and not cached['capped'] and cached['count'] == 0:
+            self.stats['vides_ignorees'] += 1
+            return 0
+        if cached and cached['capped']:
+            self.stats['depuis_cache'] += 1
+            capped, total = True, cached.get('total')
+        elif self.complete():
+            return 0
+        else:
+            result = yield query
+            if not self._record(query, result):
+                return 0
+            count, capped, total = self.log[-1]['count'], self.log[-1]['capped'], result.get('total')
+            if not query and self.expected_total is None and total is not None:
+                self.expected_total = total
+            if not capped:
+                return count
+
+        self.stats['plafonnees'] += 1
+        dimension, values = self._refinement(query)
+        if not values:
+            self.stats['perdues'] += 1
+            print(f"⚠️ Requête plafonnée impossible à subdiviser: {query}")
+            return total or 0
+        if not dimension.exhaustive:
+            self.stats['non_exhaustives'] += 1
+
+        remaining = total if dimension.exclusive and total is not None else None
+        found = 0
+        for value in values:
+            if self.complete():
+                break
+            if remaining is not None and found >= remaining:
+                self.stats['soeurs_ignorees'] += 1
+                continue
+            found += yield from self._explore({**query, dimension.field: value})
+        return total if total is not None else found
+
+    @staticmethod
+    def _submit(search, query):
+        try:
+            return search(query) or {}
+        except Exception as e:
+            return {'error': f"{type(e).__name__}: {e}"}
+
+    @staticmethod
+    async def _asubmit(search, query):
+        try:
+            return await search(query) or {}
+        except Exception as e:
+            return {'error': f"{type(e).__name__}: {e}"}
+
+    def run(self, search, root=None):
+        """Parcours complet avec une fonction `search` ordinaire ; retourne les fiches uniques"""
+        walk = self._explore(dict(root or {}))
+        try:
+            query = next(walk)
+            while True:
+                query = walk.send(self._submit(search, query))
+        except StopIteration:
+            pass
+        finally:
+            self.save_cache()
+        return self.index.records()
+
+    async def arun(self, search, root=None):
+        """Même parcours avec une coroutine `search` (Playwright)"""
+        walk = self._explore(dict(root or {}))
+        try:
+            query = next(walk)
+            while True:
+                query = walk.send(await self._asubmit(search, query))
+        except StopIteration:
+            pass
+        finally:
+            self.save_cache()
+        return self.index.records()
+
+    def sweep(self, search, queries):
+        """
+        Balayage systématique, sans subdivision : soumet chaque requête pas
+        encore soumise avec succès dans ce run (seul `max_queries` l'arrête).
+        Filet de sécurité quand la détection du plafond n'est pas vérifiée.
+        """
+        done = {query_key(entry['query']) for entry in self.log if 'error' not in entry}
+        try:
+            for query in queries:
+                if self.max_queries is not None and self.stats['soumissions'] >= self.max_queries:
+                    break
+                if query_key(query) in done:
+                    continue
+                done.add(query_key(query))
+                self._record(query, self._submit(search, query))
+        finally:
+            self.save_cache()
+        return self.index.records()
+
+    def print_stats(self):
+        s = self.stats
+        print(f"🌳 Découpage: {s['soumissions']} requêtes soumises, {s['plafonnees']} plafonnées "
+              f"({s['depuis_cache']} connues du cache), {s['vides_ignorees']} vides et "
+              f"{s['soeurs_ignorees']} inutiles évitées, {len(self.index)} fiches uniques")
+        if s['echecs']:
+            print(f"⚠️ {s['echecs']} requêtes en échec, à nouveau soumises au prochain run")
+        if s['perdues'] or s['non_exhaustives']:
+            print(f"⚠️ Couverture incomplète possible: {s['perdues']} requêtes plafonnées non subdivisées, "
+                  f"{s['non_exhaustives']} subdivisées par un filtre non exhaustif")
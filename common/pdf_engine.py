@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Extraction parallèle des annuaires PDF, page par page
+Les pages sont réparties par lots entre des processus ; le texte (et les
+tableaux) de chaque page est rendu dès que son lot est terminé. Le moteur
+est choisi page par page : une page sans caractère au premier essai part
+directement à l'OCR, une page trop pauvre essaie le moteur suivant, sans
+relancer tout le document. Le résultat est mis en cache par empreinte du
+contenu du PDF : relancer un scraper sur le même annuaire est immédiat.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import pymupdf as fitz
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    try:
+        import fitz  # PyMuPDF < 1.24.3
+        PYMUPDF_AVAILABLE = True
+    except ImportError:
+        PYMUPDF_AVAILABLE = False
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    try:
+        from PyPDF2 import PdfReader
+        PYPDF_AVAILABLE = True
+    except ImportError:
+        PYPDF_AVAILABLE = False
+
+try:
+    import pytesseract
+    from pdf2image import convert_from_path
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.pdf_cache')
+DEFAULT_BACKENDS = ('pdfplumber', 'pymupdf', 'pypdf', 'ocr')
+CACHE_VERSION = 1
+
+_AVAILABLE = {
+    'pymupdf': PYMUPDF_AVAILABLE,
+    'pdfplumber': PDFPLUMBER_AVAILABLE,
+    'pypdf': PYPDF_AVAILABLE,
+    'ocr': OCR_AVAILABLE,
+}
+
+
+def available_backends(backends=DEFAULT_BACKENDS):
+    return tuple(name for name in backends if _AVAILABLE.get(name))
+
+
+# --- Moteurs (ouverts une fois par lot, dans le processus du worker) -------
+
+class _Document:
+    """Un PDF ouvert paresseusement par chacun des moteurs utilisés"""
+
+    def __init__(self, path):
+        self.path = path
+        self.handles = {}
+
+    def handle(self, backend):
+        if backend not in self.handles:
+            if backend == 'pymupdf':
+                self.handles[backend] = fitz.open(self.path)
+            elif backend == 'pdfplumber':
+                self.handles[backend] = pdfplumber.open(self.path)
+            elif backend == 'pypdf':
+                self.handles[backend] = PdfReader(self.path)
+            else:
+                self.handles[backend] = None
+        return self.handles[backend]
+
+    def page_count(self, backend):
+        handle = self.handle(backend)
+        if backend == 'pymupdf':
+            return len(handle)
+        return len(handle.pages)
+
+    def text(self, backend, index):
+        handle = self.handle(backend)
+        if backend == 'pymupdf':
+            return handle[index].get_text() or ''
+        if backend == 'pdfplumber':
+            return handle.pages[index].extract_text() or ''
+        if backend == 'pypdf':
+            return handle.pages[index].extract_text() or ''
+        images = convert_from_path(self.path, dpi=300, first_page=index + 1, last_page=index + 1)
+        return pytesseract.image_to_string(images[0], lang='fra+eng') if images else ''
+
+    def tables(self, index):
+        return self.handle('pdfplumber').pages[index].extract_tables() or []
+
+    def words(self, backend, index):
+        """Largeur de la page et ses mots : [(x0, top, x1, bottom, texte), ...]"""
+        handle = self.handle(backend)
+        if backend == 'pymupdf':
+            page = handle[index]
+            return page.rect.width, [tuple(word[:5]) for word in page.get_text('words')]
+        page = handle.pages[index]
+        return page.width, [(word['x0'], word['top'], word['x1'], word['bottom'], word['text'])
+                            for word in page.extract_words()]
+
+    def close(self):
+        for backend, handle in self.handles.items():
+            if handle is not None and backend in ('pymupdf', 'pdfplumber'):
+                handle.close()
+        self.handles = {}
+
+
+def _extract_page(document, index, backends, tables, min_chars):
+    """
+    Texte d'une page avec le premier moteur qui en donne assez.
+
+    Le premier moteur sert de sonde : s'il ne trouve aucun caractère, la
+    page est une image et les autres moteurs texte sont sautés (OCR direct).
+    """
+    best = {'page': index + 1, 'text': '', 'backend': None, 'tables': []}
+    image_only = False
+    for backend in backends:
+        if image_only and backend != 'ocr':
+            continue
+        try:
+            text = document.text(backend, index)
+        except Exception as e:
+            best.setdefault('errors', []).append(f"{backend}: {e}")
+            continue
+        if best['backend'] is None and backend != 'ocr' and not text.strip():
+            image_only = True
+        if len(text.strip()) > len(best['text'].strip()):
+            best['text'], best['backend'] = text, backend
+        if len(text.strip()) >= min_chars:
+            break
+    if tables and PDFPLUMBER_AVAILABLE:
+        try:
+            best['tables'] = document.tables(index)
+        except Exception as e:
+            best.setdefault('errors', []).append(f"tables: {e}")
+    return best
+
+
+def _extract_shard(path, indexes, backends, tables, min_chars):
+    """Lot de pages traité par un worker (le PDF n'y est ouvert qu'une fois)"""
+    document = _Document(path)
+    try:
+        return [_extract_page(document, index, backends, tables, min_chars) for index in indexes]
+    finally:
+        document.close()
+
+
+def page_count(path, backends=DEFAULT_BACKENDS):
+    document = _Document(path)
+    try:
+        for backend in available_backends(backends):
+            if backend != 'ocr':
+                return document.page_count(backend)
+    finally:
+        document.close()
+    raise ImportError("Aucun moteur PDF installé (pip install pdfplumber PyMuPDF pypdf)")
+
+
+# --- Cache par empreinte du contenu ---------------------------------------
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_path(cache_dir, content_hash, backends, tables):
+    options = json.dumps([CACHE_VERSION, list(backends), bool(tables)])
+    suffix = hashlib.sha256(options.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(cache_dir, content_hash[:2], f"{content_hash}-{suffix}.json.gz")
+
+
+def _load_cache(path):
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)['pages']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _store_cache(path, pdf_path, pages):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+        json.dump({'source': os.path.basename(pdf_path), 'stored_at': time.time(), 'pages': pages},
+                  f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# --- API --------------------------------------------------------------------
+
+def iter_pages(path, backends=DEFAULT_BACKENDS, tables=False, workers=None, shard_size=4,
+               min_chars=20, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Pages du PDF au fur et à mesure : {'page', 'text', 'backend', 'tables'}.
+
+    Avec plusieurs workers, l'ordre est celui de fin des lots (trier sur
+    'page' si besoin, ou utiliser extract_pages). `backends` donne l'ordre
+    de préférence ; cache_dir=None désactive le cache.
+    """
+    backends = available_backends(backends)
+    if not backends:
+        raise ImportError("Aucun moteur PDF installé (pip install pdfplumber PyMuPDF pypdf)")
+
+    cache_file = None
+    if cache_dir:
+        cache_file = _cache_path(cache_dir, file_hash(path), backends, tables)
+        cached = _load_cache(cache_file)
+        if cached is not None:
+            yield from cached
+            return
+
+    indexes = list(range(page_count(path, backends)))
+    shards = [indexes[i:i + shard_size] for i in range(0, len(indexes), shard_size)]
+    workers = min(workers or os.cpu_count() or 1, len(shards)) if shards else 1
+    pages = []
+    if workers <= 1:
+        document = _Document(path)
+        try:
+            for index in indexes:
+                page = _extract_page(document, index, backends, tables, min_chars)
+                pages.append(page)
+                yield page
+        finally:
+            document.close()
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_extract_shard, path, shard, backends, tables, min_chars)
+                       for shard in shards]
+            for future in as_completed(futures):
+                for page in future.result():
+                    pages.append(page)
+                    yield page
+
+    if cache_file:
+        _store_cache(cache_file, path, sorted(pages, key=lambda page: page['page']))
+
+
+def iter_words(path, backends=('pymupdf', 'pdfplumber')):
+    """
+    Mots positionnés de chaque page, en un seul passage : {'page', 'width', 'words'}.
+
+    Seuls PyMuPDF et pdfplumber donnent les boîtes des mots ; PyMuPDF est
+    de loin le plus rapide et passe en premier par défaut.
+    """
+    backends = [name for name in available_backends(backends) if name in ('pymupdf', 'pdfplumber')]
+    if not backends:
+        raise ImportError("Aucun moteur PDF avec positions installé (pip install PyMuPDF pdfplumber)")
+    backend = backends[0]
+    document = _Document(path)
+    try:
+        for index in range(document.page_count(backend)):
+            width, words = document.words(backend, index)
+            yield {'page': index + 1, 'width': width, 'words': words}
+    finally:
+        document.close()
+
+
+def extract_pages(path, **options):
+    """Toutes les pages, dans l'ordre du document (options : cf. iter_pages)"""
+    return sorted(iter_pages(path, **options), key=lambda page: page['page'])
+
+
+def extract_text(path, template='{text}\n', **options):
+    """
+    Texte complet, une page par `template` (champs {page} et {text}).
+
+    template='{text}\\n' reproduit `text += page.extract_text() + "\\n"`.
+    """
+    return ''.join(template.format(page=page['page'], text=page['text'])
+                   for page in extract_pages(path, **options))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction parallèle des annuaires PDF")
+    commands = parser.add_subparsers(dest='command', required=True)
+    extract = commands.add_parser('extract', help="Extraire le texte d'un PDF")
+    extract.add_argument('pdf')
+    extract.add_argument('-o', '--output', help="Fichier texte (défaut: <pdf>.txt)")
+    extract.add_argument('--backends', default=','.join(DEFAULT_BACKENDS))
+    extract.add_argument('--tables', action='store_true')
+    extract.add_argument('--workers', type=int)
+    extract.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    pages = extract_pages(args.pdf, backends=tuple(args.backends.split(',')), tables=args.tables,
+                          workers=args.workers, cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
+    elapsed = time.perf_counter() - start
+    output = args.output or os.path.splitext(args.pdf)[0] + '.txt'
+    with open(output, 'w', encoding='utf-8') as f:
+        for page in pages:
+            f.write(f"--- Page {page['page']} ({page['backend']}) ---\n{page['text']}\n")
+    by_backend = {}
+    for page in pages:
+        backend = page['backend'] or 'vide'
+        by_backend[backend] = by_backend.get(backend, 0) + 1
+    print(f"✅ {len(pages)} pages en {elapsed:.2f}s -> {output}")
+    for backend, count in by_backend.items():
+        print(f"   {backend}: {count} pages")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lecture géométrique des annuaires PDF en colonnes
+Le texte brut d'une page à deux colonnes entrelace les colonnes sur une
+même ligne ("78 rue du Général Leclerc des sûretés et des"). Ici, les mots
+sont regroupés d'après leurs boîtes : colonnes séparées par les gouttières
+verticales, lignes par la hauteur, puis fiches découpées sur une ligne
+d'ancrage (date d'inscription, "Me ", ...) ou sur les blancs verticaux.
+Chaque fiche est rendue avec le texte de chacune de ses colonnes.
+"""
+
+import argparse
+import re
+import sys
+import time
+from bisect import bisect_right
+from statistics import median
+
+from common.pdf_engine import iter_words
+
+DEFAULT_MIN_GAP = 10.0
+DEFAULT_NOISE = 0.02
+
+
+def find_gutters(words, width, min_gap=DEFAULT_MIN_GAP, noise=DEFAULT_NOISE):
+    """
+    Gouttières verticales de la page : [(x0, x1), ...] de gauche à droite.
+
+    Une gouttière est une bande d'au moins `min_gap` points qu'aucun mot ne
+    couvre, à `noise` près (fraction des mots) : un nom trop long qui déborde
+    sur la colonne voisine ne la fait pas disparaître.
+    """
+    if not words:
+        return []
+    size = int(width) + 2
+    coverage = [0] * (size + 1)
+    for x0, _, x1, _, _ in words:
+        coverage[max(0, int(x0))] += 1
+        coverage[min(size, int(x1) + 1)] -= 1
+    threshold = int(noise * len(words))
+    left = min(int(word[0]) for word in words)
+    right = max(int(word[2]) for word in words)
+
+    gutters = []
+    covered = sum(coverage[:left + 1])
+    start = None
+    for x in range(left + 1, right):
+        covered += coverage[x]
+        if covered <= threshold:
+            if start is None:
+                start = x
+        elif start is not None:
+            if x - start >= min_gap:
+                gutters.append((start, x))
+            start = None
+    return gutters
+
+
+def group_lines(words, tolerance=0.5):
+    """Mots d'une colonne regroupés en lignes : [(top, bottom, texte), ...] de haut en bas"""
+    lines = []
+    for x0, top, x1, bottom, text in sorted(words, key=lambda word: (word[1] + word[3], word[0])):
+        middle = (top + bottom) / 2
+        if lines:
+            line = lines[-1]
+            if abs(middle - line['middle']) <= tolerance * (line['bottom'] - line['top']):
+                line['words'].append((x0, text))
+                line['bottom'] = max(line['bottom'], bottom)
+                continue
+        lines.append({'top': top, 'bottom': bottom, 'middle': middle, 'words': [(x0, text)]})
+    return [(line['top'], line['bottom'], ' '.join(text for _, text in sorted(line['words'])))
+            for line in lines]
+
+
+def split_columns(words, gutters):
+    """Mots répartis entre les colonnes (d'après leur début, x0) puis mis en lignes"""
+    ends = [end for _, end in gutters]
+    columns = [[] for _ in range(len(gutters) + 1)]
+    for word in words:
+        columns[bisect_right(ends, word[0])].append(word)
+    return [group_lines(column) for column in columns]
+
+
+def _entry(page, top, columns, first, last):
+    texts = [[text for line_top, line_bottom, text in column
+              if first <= (line_top + line_bottom) / 2 < last] for column in columns]
+    return {'page': page, 'top': round(top, 1), 'columns': texts}
+
+
+def _gap_starts(columns, gap_factor):
+    """Débuts de fiches d'après les blancs verticaux (toutes colonnes confondues)"""
+    lines = sorted((top, bottom) for column in columns for top, bottom, _ in column)
+    if not lines:
+        return []
+    pitch = median(bottom - top for top, bottom in lines)
+    starts = [lines[0][0]]
+    lowest = lines[0][1]
+    for top, bottom in lines[1:]:
+        if top - lowest > gap_factor * pitch:
+            starts.append(top)
+        lowest = max(lowest, bottom)
+    return starts
+
+
+def page_blocks(words, width, anchor=None, page=None, min_gap=DEFAULT_MIN_GAP,
+                noise=DEFAULT_NOISE, gap_factor=1.0):
+    """
+    Fiches d'une page : [{'page', 'top', 'columns': [[ligne, ...], ...]}, ...].
+
+    Avec `anchor` (regex), une fiche commence à chaque ligne qui y répond ;
+    les colonnes situées à droite d'une colonne d'ancrage, jusqu'à la
+    suivante, appartiennent à ses fiches (annuaires à plusieurs bandes).
+    Sans ancrage, les fiches sont séparées par les blancs verticaux.
+    Le texte au-dessus de la première fiche (titres) est ignoré.
+    """
+    columns = split_columns(words, find_gutters(words, width, min_gap, noise))
+    if anchor is None:
+        bands = [(columns, _gap_starts(columns, gap_factor))]
+    else:
+        pattern = re.compile(anchor) if isinstance(anchor, str) else anchor
+        starts = [[top for top, bottom, text in column if pattern.search(text)] for column in columns]
+        anchored = [index for index, found in enumerate(starts) if found]
+        if not anchored:
+            return []
+        bounds = [0] + anchored[1:] + [len(columns)]
+        bands = [(columns[bounds[i]:bounds[i + 1]], starts[anchored[i]]) for i in range(len(anchored))]
+
+    entries = []
+    for band, band_starts in bands:
+        limits = band_starts[1:] + [float('inf')]
+        for first, last in zip(band_starts, limits):
+            entry = _entry(page, first, band, first, last)
+            if any(entry['columns']):
+                entries.append(entry)
+    return entries
+
+
+def iter_blocks(path, anchor=None, backends=('pymupdf', 'pdfplumber'), **options):
+    """
+    Fiches du PDF en un seul passage, page après page (cf. page_blocks).
+
+    Une fiche coupée par un saut de page donne deux fiches : la seconde n'a
+    pas de ligne d'ancrage et est ignorée quand `anchor` est fourni.
+    """
+    for page in iter_words(path, backends):
+        yield from page_blocks(page['words'], page['width'], anchor, page['page'], **options)
+
+
+def block_text(entry, separator=' '):
+    """Texte d'une fiche, colonne après colonne, sur une seule ligne"""
+    return separator.join(line for column in entry['columns'] for line in column)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fiches d'un annuaire PDF en colonnes")
+    commands = parser.add_subparsers(dest='command', required=True)
+    blocks = commands.add_parser('blocks', help="Découper un PDF en fiches")
+    blocks.add_argument('pdf')
+    blocks.add_argument('--anchor', help="Regex de la première ligne d'une fiche")
+    blocks.add_argument('--min-gap', type=float, default=DEFAULT_MIN_GAP)
+    blocks.add_argument('--limit', type=int, default=5, help="Fiches affichées")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries = list(iter_blocks(args.pdf, args.anchor, min_gap=args.min_gap))
+    elapsed = time.perf_counter() - start
+    pages = len({entry['page'] for entry in entries})
+    print(f"✅ {len(entries)} fiches sur {pages} pages en {elapsed:.2f}s")
+    for entry in entries[:args.limit]:
+        print(f"\n--- Page {entry['page']} (y={entry['top']}) ---")
+        for index, column in enumerate(entry['columns']):
+            for line in column:
+                print(f"   [{index}] {line}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
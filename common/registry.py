@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Registre des scrapers de barreaux
+Un point d'entrée non interactif par barreau : script (ou suite de scripts)
+à lancer, voie d'exécution ("browser" pour Selenium/Playwright, "http" pour
+requests, PDF ou données locales), domaine du site pour la politesse, et
+réponses aux questions input() des scripts interactifs. Le lanceur
+(common.runner) s'en sert pour rafraîchir plusieurs barreaux en parallèle.
+"""
+
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LANES = ('browser', 'http')
+
+# script : chemin depuis la racine du dépôt, ou tuple de scripts lancés l'un après l'autre
+# module : module lancé avec python -m (depuis la racine) à la place d'un script
+# stdin : réponses aux input() du script ; args : arguments de la ligne de commande
+# ('--headless' pour les scripts qui ouvrent sinon une fenêtre de navigateur)
+# disabled : raison pour laquelle le barreau n'est pas lancé (script à réparer)
+# browsers : Chrome ouverts en même temps par le barreau (1 par défaut) ;
+# les places navigateur du lanceur se comptent en Chrome, pas en barreaux
+BARS = {
+    'agen': {'module': 'common.annuaire_cms', 'args': ('scrape', 'agen'), 'lane': 'http',
+             'domain': 'www.barreau-agen.fr'},
+    'alencon': {'script': 'alencon/alencon_scraper_final.py', 'lane': 'browser', 'domain': 'www.barreau-alencon.fr',
+                'args': ('--headless',)},
+    'angers': {'script': 'angers/angers_production_final.py', 'lane': 'http', 'domain': 'barreau-angers.org'},
+    'annecy': {'script': 'annecy/annecy_scraper_final.py', 'lane': 'browser', 'domain': 'www.barreau-annecy.com',
+               'args': ('--headless',)},
+    'argentan': {'script': 'argentan/argentan_scraper_production.py', 'lane': 'browser',
+                 'domain': 'www.barreau-argentan.fr'},
+    'arras': {'script': 'arras/arras_scraper_production.py', 'lane': 'http', 'domain': 'avocatsarras.com'},
+    'belfort': {'script': 'belfort/belfort_scraper_production.py', 'lane': 'browser',
+                'domain': 'www.avocats-belfort.com'},
+    'besancon': {'script': 'besancon/besancon_scraper_final.py', 'lane': 'browser',
+                 'domain': 'www.barreau-besancon-avocat.com', 'args': ('--headless',)},
+    'bethune': {'script': 'bethune/bethune_scraper_final_propre.py', 'lane': 'browser',
+                'domain': 'www.barreaudebethune.com'},
+    'blois': {'script': 'blois/blois_scraper.py', 'lane': 'browser', 'domain': 'avocats-blois.com'},
+    'bonneville': {'script': 'bonneville/scraper_bonneville_production.py', 'lane': 'http',
+                   'domain': 'www.ordre-avocats-bonneville.com'},
+    'bordeaux': {'script': 'bordeaux/bordeaux_production_final.py', 'lane': 'http',
+                 'domain': 'www.barreau-bordeaux.com'},
+    'boulogne': {'script': 'boulogne/boulogne_scraper_production.py', 'lane': 'browser',
+                 'domain': 'avocats-boulogne.fr'},
+    'brest': {'script': 'brest/brest_scraper_final.py', 'lane': 'browser', 'domain': 'www.avocats-brest.fr',
+              'disabled': "SyntaxError (f-string avec barre oblique inverse) avant Python 3.12"},
+    'caen': {'script': 'caen/caen_scraper_final.py', 'lane': 'http', 'domain': 'www.barreau-caen.com'},
+    'cambrai': {'module': 'common.annuaire_cms', 'args': ('scrape', 'cambrai'), 'lane': 'http',
+                'domain': 'www.avocats-cambrai.com'},
+    'carpentras': {'script': 'carpentras/carpentras_scraper.py', 'lane': 'browser',
+                   'domain': 'www.barreaudecarpentras.fr'},
+    'castres': {'script': 'castres/castres_scraper_final.py', 'lane': 'browser', 'domain': 'avocats-castres.fr'},
+    'chalon-sur-saone': {'script': 'chalon-sur-saone/chalon_sur_saone_scraper.py', 'lane': 'browser',
+                         'domain': 'www.avocats-chalonsursaone.com'},
+    'charente': {'script': 'charente/charente_scraper_production.py', 'lane': 'browser',
+                 'domain': 'www.avocats-charente.com', 'stdin': 'y\ny\n'},
+    'creuse': {'script': 'creuse/scraper_creuse.py', 'lane': 'http', 'domain': 'cdad-creuse.justice.fr'},
+    'dunkerque': {'script': 'dunkerque/dunkerque_scraper_production.py', 'lane': 'browser',
+                  'domain': 'barreau-dunkerque.fr'},
+    'essonne': {'module': 'common.annuaire_cms', 'args': ('scrape', 'essonne'), 'lane': 'http',
+                'domain': 'www.avocats91.com'},
+    'evreux': {'script': 'evreux/evreux_scraper.py', 'lane': 'http', 'domain': 'www.barreau-evreux.avocat.fr'},
+    'fontainebleau': {'script': 'fontainebleau/fontainebleau_scraper_improved.py', 'lane': 'browser',
+                      'domain': 'avocats-fontainebleau.fr'},
+    'grasse': {'script': 'grasse/grasse_scraper_production.py', 'lane': 'browser', 'domain': 'www.avocats-grasse.com'},
+    'grenoble': {'script': 'grenoble/grenoble_scraper_final.py', 'lane': 'browser',
+                 'domain': 'ordre-grenoble.avocat.fr', 'args': ('--headless',)},
+    'guadeloupe': {'script': 'guadeloupe/guadeloupe_scraper_final.py', 'lane': 'http', 'domain': None},  # PDF local
+    'guyane': {'module': 'common.annuaire_cms', 'args': ('scrape', 'guyane'), 'lane': 'http',
+               'domain': 'www.avocats-barreau-guyane.com'},
+    'havre': {'script': 'havre/havre_scraper_final.py', 'lane': 'http', 'domain': 'avocatslehavre.fr',
+              'stdin': '1\n\n'},      # choix 1 : requests/BeautifulSoup, délai par défaut
+    'laval': {'script': 'laval/laval_scraper.py', 'lane': 'browser', 'domain': 'barreau-de-laval.com'},
+    'libourne': {'script': 'libourne/libourne_scraper.py', 'lane': 'browser', 'domain': 'www.barreaulibourne.fr'},
+    'lille': {'script': 'lille/lille_scraper_final.py', 'lane': 'browser', 'domain': 'www.avocats-lille.com',
+              'args': ('--headless',)},
+    'limoges': {'script': 'limoges_scraper_complet.py', 'lane': 'browser', 'domain': 'www.avocats-limoges.org'},
+    'lisieux': {'script': 'lisieux/lisieux_scraper_final.py', 'lane': 'http', 'domain': 'lisieux-avocats.fr'},
+    'lorient': {'script': 'lorient/lorient_scraper_final_consolidated.py', 'lane': 'browser',
+                'domain': 'www.barreaulorient.fr', 'args': ('--headless',)},
+    'lozere': {'script': 'lozere/lozere_scraper_final.py', 'lane': 'browser', 'domain': 'www.avocats-lozere.fr'},
+    'lyon': {'script': 'lyon/lyon_scraper_final.py', 'lane': 'browser', 'domain': 'www.barreaulyon.com',
+             'stdin': 'o\n\n', 'browsers': 5},     # lancer, pages par défaut ; liste + 4 fiches
+    'martinique': {'script': 'martinique/martinique_scraper.py', 'lane': 'browser',
+                   'domain': 'avocatsdemartinique.fr'},
+    'mayotte': {'script': 'mayotte/mayotte_scraper_final.py', 'lane': 'browser', 'domain': 'www.cdad976.fr',
+                'args': ('--headless',)},
+    'melun': {'script': 'melun/melun_scraper.py', 'lane': 'browser', 'domain': 'barreau-melun.org',
+              'args': ('--headless',)},
+    'meuse': {'script': 'meuse/meuse_scraper_final.py', 'lane': 'http', 'domain': None},  # PDF local
+    'mont-de-marsan': {'module': 'common.annuaire_cms', 'args': ('scrape', 'mont-de-marsan'), 'lane': 'http',
+                       'domain': 'www.barreau-montdemarsan.org'},
+    'montlucon': {'script': 'montlucon/scraper.py', 'lane': 'http', 'domain': 'barreaudemontlucon.com'},
+    'nancy': {'script': 'nancy/nancy_scraper_273_FINAL.py', 'lane': 'browser', 'domain': 'avocats-nancy.com',
+              'args': ('--headless',)},
+    'nantes': {'script': 'nantes/nantes_scraper_final.py', 'lane': 'browser', 'domain': 'www.barreaunantes.fr',
+               'args': ('--headless',)},
+    'nevers': {'script': 'nevers/nevers_scraper_complete.py', 'lane': 'http', 'domain': 'www.avocats-nevers.org'},
+    'orleans': {'script': 'orleans_scraper_final.py', 'lane': 'browser', 'domain': 'www.ordre-avocats-orleans.fr'},
+    'papeete': {'script': 'papeete/papeete_scraper.py', 'lane': 'browser', 'domain': 'barreau-avocats.pf'},
+    'pau': {'script': 'pau_scraper.py', 'lane': 'http', 'domain': 'avocats-pau.fr'},
+    'perigueux': {'script': 'perigueux/perigueux_scraper_final.py', 'lane': 'browser',
+                  'domain': 'www.avocats-perigueux.com'},
+    'rennes': {'script': ('rennes/rennes_scraper_complet.py', 'rennes/rennes_extraction_details.py'),
+               'lane': 'browser', 'domain': 'www.ordre-avocats-rennes.fr', 'browsers': 4},    # fiches sur 4 Chrome
+    'rouen': {'script': 'rouen/rouen_scraper.py', 'lane': 'browser', 'domain': 'www.barreau-rouen.avocat.fr',
+              'browsers': 4},
+    'sables-d-olonne': {'module': 'common.annuaire_cms', 'args': ('scrape', 'sables-d-olonne'), 'lane': 'http',
+                        'domain': 'www.barreaudessablesdolonne.fr'},
+    'saint-denis': {'script': 'saint-denis/saint_denis_scraper.py', 'lane': 'browser',
+                    'domain': 'barreau-saint-denis.re'},
+    'saint-nazaire': {'script': 'saint-nazaire/scraper.py', 'lane': 'browser',
+                      'domain': 'www.barreau-saintnazaire.fr'},
+    'saint-pierre-reunion': {'script': 'saint-pierre-reunion/saint_pierre_reunion_scraper_final.py', 'lane': 'http',
+                             'domain': 'www.barreau-saint-pierre-reunion.re'},
+    'saint-quentin': {'script': 'saint-quentin/saint_quentin_scraper.py', 'lane': 'http',
+                      'domain': 'www.avocats-saint-quentin.com'},
+    'saintes': {'script': 'saintes/saintes_scraper.py', 'lane': 'browser', 'domain': 'www.avocats-saintes.com'},
+    'sarreguemines': {'script': 'sarreguemines/sarreguemines_scraper.py', 'lane': 'http',
+                      'domain': 'www.avocats-sarreguemines.fr'},
+    'saverne': {'script': 'saverne/saverne_scraper.py', 'lane': 'browser', 'domain': 'avocats-saverne.com'},
+    'senlis': {'script': 'senlis/senlis_scraper_final.py', 'lane': 'browser', 'domain': 'senlis-avocats.fr',
+               'args': ('--headless',)},
+    'tarbes': {'script': 'tarbes/tarbes_scraper.py', 'lane': 'browser', 'domain': 'www.avocats-tarbes.fr'},
+    'thionville': {'script': 'thionville/thionville_scraper.py', 'lane': 'browser',
+                   'domain': 'www.avocats-thionville.fr'},
+    'thonon': {'script': 'thonon/thonon_scraper_final.py', 'lane': 'browser', 'domain': 'public.barreau-thonon.fr',
+               'args': ('--headless',)},
+    'valdemarne': {'script': 'valdemarne/valdemarne_scraper_final.py', 'lane': 'http',
+                   'domain': 'avocats-valdemarne.com'},
+    'valenciennes': {'script': 'valenciennes/scraper.py', 'lane': 'browser', 'domain': 'www.avocats-valenciennes.fr'},
+    'vienne': {'script': 'vienne/vienne_scraper.py', 'lane': 'browser', 'domain': 'www.avocats-vienne.com',
+               'stdin': '1\n'},       # mode production
+}
+
+
+def slot_weight(name):
+    """Places prises sur sa voie : nombre de Chrome pour un barreau navigateur, 1 en HTTP"""
+    config = get_bar(name)
+    return config.get('browsers', 1) if config['lane'] == 'browser' else 1
+
+
+def get_bar(name):
+    try:
+        return BARS[name]
+    except KeyError:
+        raise KeyError(f"Barreau inconnu: {name} (python -m common.runner list)") from None
+
+
+def select_bars(names=None, lane=None, include_disabled=False):
+    """Noms des barreaux retenus (tous par défaut), filtrés par voie ; les barreaux désactivés sont écartés"""
+    names = list(names) if names else sorted(BARS)
+    for name in names:
+        get_bar(name)
+    return [name for name in names if (lane is None or BARS[name]['lane'] == lane)
+            and (include_disabled or not BARS[name].get('disabled'))]
+
+
+def scripts_of(name):
+    """Scripts du barreau (chemins absolus), vide pour un module"""
+    script = get_bar(name).get('script')
+    if not script:
+        return []
+    return [os.path.join(ROOT, path) for path in ((script,) if isinstance(script, str) else script)]
+
+
+def commands(name, python):
+    """Commandes à lancer dans l'ordre, avec le dossier de travail attendu par chacune"""
+    config = get_bar(name)
+    args = list(config.get('args', ()))
+    if config.get('module'):
+        return [([python, '-m', config['module']] + args, None)]
+    steps = []
+    for path in scripts_of(name):
+        folder = os.path.dirname(path)
+        # Les scripts de la racine n'attendent aucun fichier : ils écrivent dans le dossier du run
+        steps.append(([python, path] + args, folder if folder != ROOT else None))
+    return steps
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lanceur multi-barreaux
+Rafraîchit plusieurs barreaux en même temps au lieu de les lancer à la main
+l'un après l'autre. Chaque barreau du registre (common.registry) tourne dans
+son propre processus, sur l'une des deux voies : "browser" (Selenium /
+Playwright, peu de places : CPU et mémoire) ou "http" (requests, PDF, plus de
+places). Deux barreaux d'un même domaine ne tournent jamais ensemble, les
+plus longs (d'après les durées des runs précédents) partent en premier, et
+les fiches de tous les barreaux sont réunies dans un fichier national : le
+run dure à peu près le temps du barreau le plus lent, pas la somme.
+"""
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from common.email_sketch import DEFAULT_THRESHOLD, SharedEmailDetector, remove_emails, split_emails
+from common.registry import BARS, LANES, ROOT, commands, get_bar, select_bars, slot_weight
+
+RUNS_DIR = os.path.join(ROOT, 'runs')
+HISTORY_FILE = os.path.join(ROOT, '.runner_history.json')
+
+BROWSER_MEMORY = 1024 ** 3        # ~1 Go par Chrome headless et son script
+EXPECTED = {'browser': 1800.0, 'http': 300.0}   # durée supposée d'un barreau jamais lancé
+OUTPUT_EXTENSIONS = ('.json', '.csv')
+EMAIL_FIELDS = ('email', 'emails', 'mail', 'courriel')
+EMAILS_SKETCH = 'emails_sketch.json.gz'
+IGNORED_DIRS = {'.git', '__pycache__', 'runs', 'common', '.http_cache', '.partition_cache'}
+
+
+def physical_memory():
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def default_slots():
+    """Places par voie : Chrome bornés par les cœurs et la mémoire, barreaux HTTP à 2 par cœur"""
+    cpus = os.cpu_count() or 1
+    browsers = max(1, cpus // 2)
+    memory = physical_memory()
+    if memory:
+        browsers = max(1, min(browsers, memory // BROWSER_MEMORY))
+    return {'browser': int(browsers), 'http': max(2, cpus * 2)}
+
+
+def load_history(path=HISTORY_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_history(history, path=HISTORY_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+# --- Fichiers produits ---------------------------------------------------
+
+def snapshot_outputs(folder):
+    """{chemin: mtime} des .json/.csv d'un dossier (sous-dossiers compris)"""
+    found = {}
+    for base, dirs, files in os.walk(folder):
+        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS and not d.startswith('.')]
+        for name in files:
+            if name.lower().endswith(OUTPUT_EXTENSIONS):
+                path = os.path.join(base, name)
+                try:
+                    found[path] = os.path.getmtime(path)
+                except OSError:
+                    pass
+    return found
+
+
+def changed_outputs(before, after):
+    return sorted(path for path, mtime in after.items() if before.get(path) != mtime)
+
+
+def read_records(path):
+    """Fiches d'un fichier produit : liste de dicts (JSON : la plus longue liste trouvée)"""
+    try:
+        if path.lower().endswith('.csv'):
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                sample = f.read(4096)
+                f.seek(0)
+                try:
+                    dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+                except csv.Error:
+                    dialect = csv.excel
+                return [dict(row) for row in csv.DictReader(f, dialect=dialect)]
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError, UnicodeDecodeError, csv.Error):
+        return []
+    candidates = [data] if isinstance(data, list) else [
+        value for value in data.values() if isinstance(value, list)] if isinstance(data, dict) else []
+    records = max(candidates, key=len, default=[])
+    return [record for record in records if isinstance(record, dict)]
+
+
+def main_output(paths):
+    """(chemin, fiches) du fichier qui contient le plus de fiches ; JSON préféré à égalité"""
+    best, best_records = None, []
+    for path in paths:
+        records = read_records(path)
+        if len(records) > len(best_records) or (
+                records and len(records) == len(best_records) and path.lower().endswith('.json')):
+            best, best_records = path, records
+    return best, best_records
+
+
+def row_emails(row):
+    """Emails d'une fiche nationale, tous champs d'email confondus"""
+    return [email for field in EMAIL_FIELDS if isinstance(row.get(field), str)
+            for email in split_emails(row[field])]
+
+
+def flatten(value):
+    if isinstance(value, (list, tuple, set)):
+        return '; '.join(str(item) for item in value if item not in (None, ''))
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class BarJob:
+    """Un barreau en cours : ses commandes, le processus courant et son journal"""
+
+    def __init__(self, name, run_dir, python=sys.executable):
+        self.name = name
+        self.config = get_bar(name)
+        self.lane = self.config['lane']
+        self.weight = slot_weight(name)
+        self.domain = self.config.get('domain')
+        self.steps = commands(name, python)
+        self.bar_dir = os.path.join(run_dir, name)
+        self.log_path = os.path.join(run_dir, 'logs', f"{name}.log")
+        self.process = None
+        self.log = None
+        self.step = 0
+        self.started = None
+        self.duration = 0.0
+        self.returncode = None
+        self.status = 'en_attente'
+        self.before = {}
+        self.outputs = []
+        self.records = []
+        self.main_output = None
+
+    def workdir(self, folder):
+        return folder or self.bar_dir
+
+    def start(self):
+        os.makedirs(self.bar_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        self.log = open(self.log_path, 'w', encoding='utf-8')
+        self.started = time.time()
+        self.status = 'en_cours'
+        self._launch()
+
+    def _launch(self):
+        cmd, folder = self.steps[self.step]
+        cwd = self.workdir(folder)
+        self.before.setdefault(cwd, snapshot_outputs(cwd))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])),
+                   PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+        self.log.write(f"$ {' '.join(cmd)}  (dans {cwd})\n")
+        self.log.flush()
+        answers = self.config.get('stdin')
+        self.process = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=self.log, stderr=subprocess.STDOUT,
+                                        stdin=subprocess.PIPE if answers else subprocess.DEVNULL)
+        if answers:
+            try:
+                self.process.stdin.write(answers.encode('utf-8'))
+                self.process.stdin.close()
+            except OSError:
+                pass
+
+    def poll(self, timeout=None):
+        """True quand le barreau est terminé (toutes ses étapes, ou échec / délai dépassé)"""
+        code = self.process.poll()
+        if code is None:
+            if timeout and time.time() - self.started > timeout:
+                self.process.kill()
+                self.process.wait()
+                self._finish('delai_depasse', None)
+                return True
+            return False
+        if code == 0 and self.step + 1 < len(self.steps):
+            self.step += 1
+            self._launch()
+            return False
+        self._finish('ok' if code == 0 else 'echec', code)
+        return True
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        if self.status == 'en_cours':
+            self._finish('interrompu', None)
+
+    def _finish(self, status, code):
+        self.duration = time.time() - self.started
+        self.returncode = code
+        self.status = status
+        self.log.close()
+        self.collect()
+
+    def collect(self):
+        """Copie les fichiers créés ou modifiés pendant le run dans runs/<date>/<barreau>/"""
+        for cwd, before in self.before.items():
+            for path in changed_outputs(before, snapshot_outputs(cwd)):
+                if os.path.dirname(path) == self.bar_dir:
+                    self.outputs.append(path)
+                    continue
+                target = os.path.join(self.bar_dir, os.path.relpath(path, cwd).replace(os.sep, '__'))
+                try:
+                    shutil.copy2(path, target)
+                except OSError:
+                    continue
+                self.outputs.append(target)
+        self.main_output, self.records = main_output(self.outputs)
+
+    def summary(self):
+        return {'barreau': self.name, 'voie': self.lane, 'domaine': self.domain, 'statut': self.status,
+                'code_retour': self.returncode, 'duree': round(self.duration, 1), 'fiches': len(self.records),
+                'fichier': os.path.relpath(self.main_output, ROOT) if self.main_output else None,
+                'journal': os.path.relpath(self.log_path, ROOT)}
+
+
+class MultiBarRunner:
+    """
+    Ordonnanceur : une file par voie, places limitées par voie, un seul
+    barreau à la fois par domaine, barreaux les plus longs d'abord.
+
+    Un barreau navigateur prend autant de places que de Chrome ouverts
+    (`browsers` du registre) ; un barreau plus gros que toute la voie part
+    seul quand elle est vide.
+    """
+
+    def __init__(self, names=None, lane=None, browsers=None, http=None, timeout=None,
+                 run_dir=None, poll_interval=1.0, verbose=True, generic_threshold=DEFAULT_THRESHOLD):
+        slots = default_slots()
+        self.slots = {'browser': browsers or slots['browser'], 'http': http or slots['http']}
+        self.names = select_bars(names, lane)
+        for name in names or ():
+            if BARS[name].get('disabled'):
+                print(f"⏭️  {name} désactivé : {BARS[name]['disabled']}")
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.verbose = verbose
+        self.run_dir = run_dir or os.path.join(RUNS_DIR, time.strftime('%Y%m%d_%H%M%S'))
+        self.history = load_history()
+        self.jobs = []
+        self.started = None
+        # Emails génériques (adresse d'un barreau, d'une plateforme) sur l'ensemble des barreaux
+        self.emails = SharedEmailDetector(generic_threshold)
+        self.generic_emails = {}
+        self.stats = {'barreaux': 0, 'ok': 0, 'echecs': 0, 'fiches': 0, 'duree': 0.0, 'somme_durees': 0.0}
+
+    def expected(self, name):
+        known = self.history.get(name, {}).get('duree')
+        return known if known else EXPECTED[BARS[name]['lane']]
+
+    def plan(self):
+        """Ordre de lancement par voie : durée attendue décroissante"""
+        return {lane: sorted((name for name in self.names if BARS[name]['lane'] == lane),
+                             key=self.expected, reverse=True) for lane in LANES}
+
+    def _next(self, queue, busy_domains, free, idle):
+        for index, name in enumerate(queue):
+            domain = BARS[name].get('domain')
+            if domain and domain in busy_domains:
+                continue
+            if slot_weight(name) <= free or idle:
+                return queue.pop(index)
+        return None
+
+    def run(self):
+        os.makedirs(self.run_dir, exist_ok=True)
+        queues = self.plan()
+        running = []
+        self.started = time.time()
+        if self.verbose:
+            print(f"🚀 {len(self.names)} barreaux -> {os.path.relpath(self.run_dir, ROOT)} "
+                  f"({self.slots['browser']} Chrome, {self.slots['http']} HTTP en parallèle)")
+        try:
+            while running or any(queues.values()):
+                busy_domains = {job.domain for job in running if job.domain}
+                for lane in LANES:
+                    while queues[lane]:
+                        used = sum(job.weight for job in running if job.lane == lane)
+                        name = self._next(queues[lane], busy_domains, self.slots[lane] - used, used == 0)
+                        if name is None:
+                            break
+                        job = BarJob(name, self.run_dir)
+                        job.start()
+                        running.append(job)
+                        self.jobs.append(job)
+                        if job.domain:
+                            busy_domains.add(job.domain)
+                        if self.verbose:
+                            print(f"▶️  {name} ({lane}, ~{self.expected(name) / 60:.0f} min)")
+                for job in list(running):
+                    if job.poll(self.timeout):
+                        running.remove(job)
+                        self._done(job)
+                if running:
+                    time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print("\n⏹️  Interruption : arrêt des barreaux en cours")
+            for job in running:
+                job.stop()
+                self._done(job)
+        self.stats['duree'] = time.time() - self.started
+        save_history(self.history)
+        self.consolidate()
+        return [job.summary() for job in self.jobs]
+
+    def _done(self, job):
+        self.stats['barreaux'] += 1
+        self.stats['somme_durees'] += job.duration
+        self.stats['fiches'] += len(job.records)
+        if job.status == 'ok':
+            self.stats['ok'] += 1
+            self.history[job.name] = {'duree': round(job.duration, 1), 'fiches': len(job.records),
+                                      'date': time.strftime('%Y-%m-%d %H:%M:%S')}
+        else:
+            self.stats['echecs'] += 1
+        if self.verbose:
+            icon = '✅' if job.status == 'ok' else '❌'
+            print(f"{icon} {job.name}: {job.status}, {len(job.records)} fiches en {job.duration:.0f}s")
+
+    def consolidate(self):
+        """
+        Fichier national (CSV + JSON, colonne barreau en tête) et rapport du run.
+
+        Les emails de toutes les fiches passent dans un seul détecteur
+        d'emails génériques ; ceux que le recomptage exact confirme sont
+        retirés des fiches nationales et listés dans le rapport. Le sketch
+        est gardé dans le dossier du run (`python -m common.email_sketch
+        scan --state` pour le cumuler).
+        """
+        records, columns = [], ['barreau']
+        for job in sorted(self.jobs, key=lambda job: job.name):
+            for record in job.records:
+                row = {'barreau': job.name}
+                for key, value in record.items():
+                    if key == 'barreau':
+                        continue
+                    if key not in columns:
+                        columns.append(key)
+                    row[key] = flatten(value)
+                self.emails.observe(row_emails(row))
+                records.append(row)
+        self.generic_emails = self.emails.confirm(row_emails(row) for row in records)
+        for row in records:
+            for field in EMAIL_FIELDS:
+                if row.get(field) and isinstance(row[field], str):
+                    row[field] = remove_emails(row[field], self.generic_emails)
+        self.emails.save(os.path.join(self.run_dir, EMAILS_SKETCH))
+        base = os.path.join(self.run_dir, f"NATIONAL_{len(records)}_avocats")
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+        with open(base + '.csv', 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(records)
+        report = {'date': time.strftime('%Y-%m-%d %H:%M:%S'), 'stats': self.stats, 'places': self.slots,
+                  'emails_generiques': self.generic_emails, 'barreaux': [job.summary() for job in self.jobs]}
+        with open(os.path.join(self.run_dir, 'rapport.json'), 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        if self.verbose:
+            print(f"💾 {len(records)} fiches -> {os.path.relpath(base, ROOT)}.csv / .json")
+            for email, count in sorted(self.generic_emails.items(), key=lambda item: -item[1]):
+                print(f"   📧 Email générique retiré: {email} ({count} fiches)")
+        return base
+
+    def print_stats(self):
+        s = self.stats
+        slowest = max(self.jobs, key=lambda job: job.duration, default=None)
+        print(f"📊 Run multi-barreaux: {s['barreaux']} barreaux ({s['ok']} ok, {s['echecs']} échecs), "
+              f"{s['fiches']} fiches")
+        print(f"   ⏱️  {s['duree']:.0f}s au total pour {s['somme_durees']:.0f}s de barreaux cumulés"
+              + (f" ; le plus lent : {slowest.name} ({slowest.duration:.0f}s)" if slowest else ''))
+        for job in self.jobs:
+            if job.status != 'ok':
+                print(f"   ❌ {job.name}: {job.status} (journal {os.path.relpath(job.log_path, ROOT)})")
+        return dict(s)
+
+
+def list_bars(lane=None):
+    history = load_history()
+    for name in select_bars(lane=lane, include_disabled=True):
+        config = BARS[name]
+        target = config.get('module') or config.get('script')
+        target = ' + '.join(target) if isinstance(target, tuple) else target
+        last = history.get(name)
+        known = f"{last['duree'] / 60:.0f} min, {last['fiches']} fiches" if last else '-'
+        if config.get('disabled'):
+            known = 'désactivé'
+        print(f"{name:22} {config['lane']:8} {config.get('domain') or '(local)':38} {known:22} {target}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lancement parallèle des scrapers de barreaux")
+    commands = parser.add_subparsers(dest='command', required=True)
+    listing = commands.add_parser('list', help="Barreaux du registre")
+    listing.add_argument('--lane', choices=LANES)
+    run = commands.add_parser('run', help="Rafraîchit les barreaux donnés (tous par défaut)")
+    run.add_argument('bars', nargs='*')
+    run.add_argument('--lane', choices=LANES)
+    run.add_argument('--browsers', type=int,
+                     help="Chrome simultanés, tous barreaux confondus (défaut : CPU et mémoire)")
+    run.add_argument('--http', type=int, help="Barreaux HTTP simultanés (défaut : 2 par cœur)")
+    run.add_argument('--timeout', type=float, help="Durée maximale d'un barreau, en secondes")
+    run.add_argument('--generic-threshold', type=int, default=DEFAULT_THRESHOLD,
+                     help="Fiches au-delà desquelles un email est générique et retiré du fichier national")
+    run.add_argument('--dry-run', action='store_true', help="Affiche l'ordre de lancement sans rien lancer")
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        list_bars(args.lane)
+        return 0
+    try:
+        runner = MultiBarRunner(args.bars, args.lane, args.browsers, args.http, args.timeout,
+                                generic_threshold=args.generic_threshold)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        return 1
+    if args.dry_run:
+        for lane, names in runner.plan().items():
+            print(f"{lane} ({runner.slots[lane]} places): "
+                  + ', '.join(f"{name} ~{runner.expected(name) / 60:.0f}min" for name in names))
+        return 0
+    runner.run()
+    runner.print_stats()
+    return 0 if runner.stats['echecs'] == 0 else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
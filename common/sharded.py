@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Extraction des fiches répartie sur plusieurs processus Chrome
+Au lieu de visiter des centaines de fiches l'une après l'autre sur un seul
+driver, la liste est partagée entre K processus, chacun avec son propre
+navigateur headless. Une limite de débit par domaine, commune à tous les
+processus, remplace les time.sleep entre deux fiches : le temps total
+baisse à peu près linéairement avec K jusqu'au plafond de politesse. Les
+résultats sont remis dans l'ordre de la liste d'entrée.
+"""
+
+import argparse
+import functools
+import multiprocessing
+import queue
+import sys
+import time
+import zlib
+from urllib.parse import urlsplit
+
+from common.browser_pool import BrowserPool
+
+DEFAULT_WORKERS = 4
+DEFAULT_PER_SECOND = 2.0
+
+
+# --- Politesse commune à tous les processus ------------------------------------
+
+class DomainRateLimiter:
+    """
+    Au plus `per_second` chargements par seconde et par domaine, tous
+    processus confondus.
+
+    Chaque chargement réserve le prochain créneau libre de son domaine
+    (tableau partagé protégé par un verrou) puis dort jusqu'à ce créneau,
+    hors du verrou. Les domaines sont répartis sur `slots` cases par
+    hachage : deux domaines qui tombent dans la même case se partagent un
+    budget, ce qui ne fait que ralentir.
+    """
+
+    def __init__(self, per_second=DEFAULT_PER_SECOND, slots=256, context=None):
+        context = context or multiprocessing.get_context('spawn')
+        self.per_second = per_second
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self.lock = context.Lock()
+        self.slots = context.Array('d', slots, lock=False)
+
+    def _slot(self, url):
+        domain = urlsplit(url).netloc.lower() if '//' in url else url.lower()
+        return zlib.crc32(domain.encode('utf-8')) % len(self.slots)
+
+    def wait(self, url):
+        """Attend le créneau de `url` ; retourne le temps d'attente en secondes"""
+        if not self.interval:
+            return 0.0
+        slot = self._slot(url)
+        with self.lock:
+            now = time.time()
+            start = max(now, self.slots[slot])
+            self.slots[slot] = start + self.interval
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class ThrottledDriver:
+    """
+    Driver prêté à la fonction d'extraction : `get(url)` passe d'abord par
+    la limite de débit. Tout le reste est délégué au driver d'origine.
+    """
+
+    def __init__(self, driver, limiter):
+        self._driver = driver
+        self._limiter = limiter
+        self.waited = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    def get(self, url):
+        self.waited += self._limiter.wait(url)
+        return self._driver.get(url)
+
+
+# --- Processus de travail -------------------------------------------------------
+
+def _worker_main(worker_id, extract, driver_factory, headless, recycle_after, limiter, tasks, results):
+    """Boucle d'un processus : un navigateur chaud, une fiche par tâche, une réponse par fiche"""
+    pool = None
+    start = time.time()
+    try:
+        pool = BrowserPool(size=1, recycle_after=recycle_after, headless=headless,
+                           driver_factory=driver_factory)
+        pool.warm()
+        results.put(('pret', worker_id, None, time.time() - start))
+    except Exception as e:
+        # Sans navigateur, le processus répond quand même à chaque tâche de sa part
+        results.put(('echec', worker_id, None, f"{type(e).__name__}: {e}"))
+        pool = None
+
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            batch, index, item = task
+            start = time.time()
+            record, error, throttled = None, None, None
+            if pool is None:
+                error = "navigateur indisponible"
+            else:
+                try:
+                    with pool.lease() as driver:
+                        throttled = ThrottledDriver(driver, limiter)
+                        record = extract(throttled, item)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+            waited = throttled.waited if throttled is not None else 0.0
+            results.put(('fiche', worker_id, (batch, index), (record, error, time.time() - start, waited)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if pool is not None:
+            pool.close()
+
+
+# --- Exécuteur ------------------------------------------------------------------
+
+class ShardedExecutor:
+    """
+    K processus, chacun avec son navigateur headless, qui se partagent une
+    liste de fiches.
+
+    `extract(driver, item)` est appelée dans les processus : elle doit être
+    une fonction de module (ou une méthode d'un objet sans driver ni
+    connexion ouverte) pour pouvoir être transmise, et rend la fiche ou
+    None. `driver_factory` suit la même règle (fonction sans argument, par
+    défaut Chrome avec `default_chrome_options`). Les processus restent
+    ouverts d'un `map` à l'autre ; la fiche i va au processus i % K.
+
+    `per_second` borne les chargements par domaine pour l'ensemble des
+    processus (None : pas de limite).
+    """
+
+    def __init__(self, extract, workers=DEFAULT_WORKERS, per_second=DEFAULT_PER_SECOND,
+                 driver_factory=None, headless=True, recycle_after=200, verbose=True):
+        self.extract = extract
+        self.workers = max(1, workers)
+        self.per_second = per_second
+        self.driver_factory = driver_factory
+        self.headless = headless
+        self.recycle_after = recycle_after
+        self.verbose = verbose
+        self.context = multiprocessing.get_context('spawn')
+        self.limiter = DomainRateLimiter(per_second, context=self.context)
+        self.processes = []
+        self.task_queues = []
+        self.results = None
+        self.batch = 0
+        self.dispatched = 0
+        self.busy_time = 0.0
+        self.worker_stats = [{'fiches': 0, 'erreurs': 0, 'temps_extraction': 0.0, 'attente': 0.0,
+                              'demarrage': 0.0} for _ in range(self.workers)]
+        self.stats = {'lots': 0, 'fiches': 0, 'erreurs': 0, 'processus_perdus': 0}
+
+    def start(self):
+        if self.processes:
+            return
+        self.results = self.context.Queue()
+        for worker_id in range(self.workers):
+            tasks = self.context.Queue()
+            process = self.context.Process(
+                target=_worker_main, name=f"shard-{worker_id}", daemon=True,
+                args=(worker_id, self.extract, self.driver_factory, self.headless, self.recycle_after,
+                      self.limiter, tasks, self.results))
+            process.start()
+            self.processes.append(process)
+            self.task_queues.append(tasks)
+        if self.verbose:
+            print(f"🧩 {self.workers} processus lancés "
+                  f"({f'{self.per_second:g} chargements/s par domaine' if self.per_second else 'sans limite de débit'})")
+
+    def _alive(self):
+        return [worker_id for worker_id, process in enumerate(self.processes) if process.is_alive()]
+
+    def imap(self, items):
+        """Fiches dans l'ordre d'arrivée : (indice dans `items`, fiche ou None)"""
+        items = list(items)
+        if not items:
+            return
+        self.start()
+        alive = self._alive()
+        if not alive:
+            raise RuntimeError("Aucun processus d'extraction en vie")
+
+        self.batch += 1
+        self.stats['lots'] += 1
+        pending = {worker_id: set() for worker_id in alive}
+        for index, item in enumerate(items):
+            worker_id = alive[(self.dispatched + index) % len(alive)]
+            pending[worker_id].add(index)
+            self.task_queues[worker_id].put((self.batch, index, item))
+        self.dispatched += len(items)
+
+        remaining = len(items)
+        start = time.time()
+        try:
+            while remaining:
+                try:
+                    kind, worker_id, key, payload = self.results.get(timeout=1.0)
+                except queue.Empty:
+                    # Processus tué (mémoire, Ctrl+C) : ses fiches restantes sont rendues vides
+                    for worker_id, indexes in pending.items():
+                        if indexes and not self.processes[worker_id].is_alive():
+                            self.stats['processus_perdus'] += 1
+                            print(f"⚠️ Processus {worker_id} arrêté, {len(indexes)} fiches non traitées")
+                            for index in sorted(indexes):
+                                remaining -= 1
+                                self.stats['erreurs'] += 1
+                                self.worker_stats[worker_id]['erreurs'] += 1
+                                yield index, None
+                            indexes.clear()
+                    continue
+
+                if kind == 'pret':
+                    self.worker_stats[worker_id]['demarrage'] = payload
+                    continue
+                if kind == 'echec':
+                    print(f"❌ Processus {worker_id}: navigateur impossible à démarrer ({payload})")
+                    continue
+
+                batch, index = key
+                if batch != self.batch:
+                    continue        # Réponse d'un lot abandonné en cours de route
+                pending[worker_id].discard(index)
+                remaining -= 1
+                record, error, seconds, waited = payload
+                stats = self.worker_stats[worker_id]
+                stats['temps_extraction'] += seconds
+                stats['attente'] += waited
+                if error is not None or record is None:
+                    stats['erreurs'] += 1
+                    self.stats['erreurs'] += 1
+                    if error is not None and self.verbose:
+                        print(f"⚠️ Fiche {index} (processus {worker_id}): {error}")
+                else:
+                    stats['fiches'] += 1
+                    self.stats['fiches'] += 1
+                yield index, record
+        finally:
+            self.busy_time += time.time() - start
+
+    def map(self, items, on_result=None):
+        """Fiches dans l'ordre de `items` (None pour un échec) ; `on_result(indice, fiche)` à chaque arrivée"""
+        items = list(items)
+        records = [None] * len(items)
+        for index, record in self.imap(items):
+            records[index] = record
+            if on_result is not None:
+                on_result(index, record)
+        return records
+
+    def close(self):
+        for tasks in self.task_queues:
+            tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        self.task_queues = []
+
+    def print_stats(self):
+        s = self.stats
+        elapsed = self.busy_time or 1e-9
+        print(f"🧩 Extraction répartie: {s['fiches']} fiches, {s['erreurs']} échecs en {self.busy_time:.1f}s "
+              f"sur {self.workers} processus ({s['fiches'] / elapsed:.2f} fiches/s"
+              f"{f', plafond {self.per_second:g}/s par domaine' if self.per_second else ''})")
+        for worker_id, stats in enumerate(self.worker_stats):
+            done = stats['fiches'] + stats['erreurs']
+            print(f"   Processus {worker_id}: {stats['fiches']} fiches, {stats['erreurs']} échecs, "
+                  f"{stats['fiches'] / elapsed:.2f} fiches/s, "
+                  f"{stats['temps_extraction'] / done if done else 0:.2f}s par fiche "
+                  f"dont {stats['attente']:.1f}s d'attente de politesse, démarrage {stats['demarrage']:.1f}s")
+        if s['processus_perdus']:
+            print(f"⚠️ {s['processus_perdus']} processus perdus en cours de route")
+        return dict(s)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def scrape_sharded(extract, items, workers=DEFAULT_WORKERS, per_second=DEFAULT_PER_SECOND, **options):
+    """Raccourci : un seul lot, fiches dans l'ordre de `items`, statistiques affichées"""
+    with ShardedExecutor(extract, workers, per_second, **options) as executor:
+        records = executor.map(items)
+        executor.print_stats()
+    return records
+
+
+# --- Banc d'essai ---------------------------------------------------------------
+
+class SimulatedDriver:
+    """Faux navigateur : chaque chargement dure `latency` secondes"""
+
+    def __init__(self, latency=0.5):
+        self.latency = latency
+        self.current_url = ''
+        self.title = ''
+
+    def get(self, url):
+        time.sleep(self.latency)
+        self.current_url = url
+        self.title = url.rsplit('/', 1)[-1]
+
+    def quit(self):
+        pass
+
+
+def simulated_extract(driver, url):
+    driver.get(url)
+    return {'url': driver.current_url, 'titre': driver.title}
+
+
+def benchmark(items=40, workers=(1, 2, 4, 8), latency=0.5, per_second=DEFAULT_PER_SECOND):
+    """Temps total selon K avec un faux navigateur (aucun Chrome lancé)"""
+    urls = [f"https://annuaire.example/avocat/{i}" for i in range(items)]
+    factory = functools.partial(SimulatedDriver, latency)
+    for count in workers:
+        with ShardedExecutor(simulated_extract, count, per_second, driver_factory=factory,
+                             verbose=False) as executor:
+            records = executor.map(urls)
+            elapsed = executor.busy_time
+        in_order = [record['url'] for record in records] == urls
+        print(f"⏱️  K={count}: {items} fiches en {elapsed:.1f}s ({items / elapsed:.2f} fiches/s), "
+              f"ordre {'conservé' if in_order else 'PERDU'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction répartie sur plusieurs processus Chrome")
+    commands = parser.add_subparsers(dest='command', required=True)
+    bench = commands.add_parser('bench', help="Faux navigateur : temps total selon le nombre de processus")
+    bench.add_argument('--items', type=int, default=40)
+    bench.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    bench.add_argument('--latency', type=float, default=0.5)
+    bench.add_argument('--per-second', type=float, default=DEFAULT_PER_SECOND)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        benchmark(args.items, args.workers, args.latency, args.per_second or None)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Instantané d'une fiche rendue : un seul aller-retour avec le navigateur
+Chaque find_elements, .text, get_attribute ou page_source est une requête
+WebDriver, et page_source resérialise tout le DOM. Un seul execute_script
+rapporte le HTML rendu, le texte visible (innerText) et l'URL ; tous les
+extracteurs de champs travaillent ensuite en local sur cet instantané
+(parseur rapide de common.fast_html).
+"""
+
+import re
+
+from common.fast_html import parse_html
+
+# HTML rendu + texte visible (équivalent de body.text) en un seul appel
+SNAPSHOT_JS = """
+return {
+    html: document.documentElement.outerHTML,
+    text: document.body ? document.body.innerText : '',
+    url: location.href,
+    title: document.title
+};
+"""
+
+_SPACES_RE = re.compile(r'\s+')
+
+
+def node_text(node):
+    """Texte d'un élément, espaces normalisés (équivalent local de element.text sur une ligne)"""
+    return _SPACES_RE.sub(' ', node.get_text(' ')).strip() if node is not None else ''
+
+
+class PageSnapshot:
+    """
+    Page figée après chargement.
+
+    `html` et `text` remplacent driver.page_source et
+    find_element(By.TAG_NAME, "body").text ; `select` / `texts` /
+    `attrs` remplacent find_elements et leurs .text / get_attribute,
+    sans aucune requête au navigateur. Le HTML n'est analysé qu'au premier
+    usage d'un sélecteur.
+    """
+
+    def __init__(self, html, text=None, url='', title=''):
+        self.html = html or ''
+        self.url = url
+        self.title = title
+        self._text = text
+        self._page = None
+        self._lower_html = None
+
+    @classmethod
+    def capture(cls, driver):
+        """Instantané Selenium : un execute_script au lieu de ~15 commandes WebDriver"""
+        data = driver.execute_script(SNAPSHOT_JS) or {}
+        return cls(data.get('html'), data.get('text'), data.get('url', ''), data.get('title', ''))
+
+    @classmethod
+    async def acapture(cls, page):
+        """Même instantané pour une page Playwright (un seul evaluate)"""
+        data = await page.evaluate("() => { " + SNAPSHOT_JS + " }") or {}
+        return cls(data.get('html'), data.get('text'), data.get('url', ''), data.get('title', ''))
+
+    @property
+    def page(self):
+        if self._page is None:
+            self._page = parse_html(self.html)
+        return self._page
+
+    @property
+    def text(self):
+        """Texte visible ; à défaut (HTML seul), texte du document ligne par ligne"""
+        if self._text is None:
+            self._text = '\n'.join(line.strip() for line in self.page.get_text('\n').split('\n') if line.strip())
+        return self._text
+
+    @property
+    def lines(self):
+        return [line.strip() for line in self.text.split('\n') if line.strip()]
+
+    @property
+    def lower_html(self):
+        if self._lower_html is None:
+            self._lower_html = self.html.lower()
+        return self._lower_html
+
+    def select(self, css):
+        return self.page.select(css)
+
+    def select_one(self, css):
+        return self.page.select_one(css)
+
+    def texts(self, css, min_length=1):
+        """Textes des éléments `css` (vides ou trop courts écartés)"""
+        found = []
+        for node in self.select(css):
+            text = node_text(node)
+            if len(text) >= min_length:
+                found.append(text)
+        return found
+
+    def first_text(self, css, default=''):
+        texts = self.texts(css)
+        return texts[0] if texts else default
+
+    def attrs(self, css, name):
+        return [value for value in (node.get(name) for node in self.select(css)) if value]
+
+    def mailtos(self):
+        return self.page.mailtos()
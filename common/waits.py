@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Attentes sur condition pour Selenium et Playwright
+Remplace les `time.sleep(3)` / `wait_for_timeout(3000)` fixes : on attend
+qu'un sélecteur apparaisse, que le DOM arrête de bouger ou que le réseau se
+calme (avec un plafond), et les pauses de politesse suivent la latence
+mesurée du serveur au lieu d'une valeur pessimiste.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+
+try:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    SELENIUM_AVAILABLE = True
+except ImportError:
+    SELENIUM_AVAILABLE = False
+    TimeoutException = WebDriverException = Exception
+
+try:
+    from playwright.async_api import TimeoutError as PlaywrightTimeout
+except ImportError:
+    PlaywrightTimeout = asyncio.TimeoutError
+
+# Horodatage de la dernière mutation du DOM, entretenu par un MutationObserver
+_DOM_QUIET_JS = """
+if (window.__lastMutation === undefined) {
+    window.__lastMutation = performance.now();
+    new MutationObserver(() => { window.__lastMutation = performance.now(); })
+        .observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+}
+if (document.readyState !== 'complete') { return 0; }
+return performance.now() - window.__lastMutation;
+"""
+
+# Millisecondes écoulées depuis la fin de la dernière ressource chargée
+_NETWORK_QUIET_JS = """
+if (document.readyState !== 'complete') { return 0; }
+let last = 0;
+for (const r of performance.getEntriesByType('resource')) { last = Math.max(last, r.responseEnd); }
+return performance.now() - last;
+"""
+
+# Même principe en une promesse, pour Playwright (page.evaluate attend la résolution)
+_DOM_STABLE_PROMISE_JS = """
+(quiet) => new Promise(resolve => {
+    let timer = setTimeout(done, quiet);
+    const observer = new MutationObserver(() => { clearTimeout(timer); timer = setTimeout(done, quiet); });
+    function done() { observer.disconnect(); resolve(true); }
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+})
+"""
+
+
+def _locator(selector):
+    """XPath si le sélecteur commence par '/' ou '(', CSS sinon"""
+    if selector.startswith('/') or selector.startswith('('):
+        return (By.XPATH, selector)
+    return (By.CSS_SELECTOR, selector)
+
+
+# --- Selenium -------------------------------------------------------------
+
+def wait_for_selector(driver, selector, timeout=10, visible=False):
+    """Attend un élément (CSS ou XPath) ; retourne l'élément ou None"""
+    condition = EC.visibility_of_element_located if visible else EC.presence_of_element_located
+    try:
+        return WebDriverWait(driver, timeout).until(condition(_locator(selector)))
+    except TimeoutException:
+        return None
+
+
+def wait_for_any(driver, selectors, timeout=5, clickable=True):
+    """
+    Attend le premier élément trouvé parmi plusieurs sélecteurs.
+
+    Une seule attente pour toute la liste (au lieu de `timeout` secondes par
+    sélecteur absent). Retourne (sélecteur, élément) ou (None, None).
+    """
+    def first_match(d):
+        for selector in selectors:
+            for element in d.find_elements(*_locator(selector)):
+                try:
+                    if not clickable or (element.is_displayed() and element.is_enabled()):
+                        return selector, element
+                except WebDriverException:
+                    continue
+        return False
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.2).until(first_match)
+    except TimeoutException:
+        return None, None
+
+
+def wait_for_dom_stable(driver, quiet=0.3, timeout=10, poll=0.1):
+    """Attend que la page soit chargée et que le DOM n'ait pas bougé depuis `quiet` secondes"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(
+            lambda d: d.execute_script(_DOM_QUIET_JS) >= quiet * 1000)
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_network_quiet(driver, quiet=0.5, cap=5, poll=0.1):
+    """Attend qu'aucune ressource n'ait fini de charger depuis `quiet` secondes (au plus `cap`)"""
+    try:
+        WebDriverWait(driver, cap, poll_frequency=poll).until(
+            lambda d: d.execute_script(_NETWORK_QUIET_JS) >= quiet * 1000)
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_staleness(driver, element, timeout=10):
+    """Attend qu'un élément quitte le DOM (soumission de formulaire, navigation)"""
+    try:
+        WebDriverWait(driver, timeout).until(EC.staleness_of(element))
+        return True
+    except TimeoutException:
+        return False
+
+
+# --- Playwright (API async) ----------------------------------------------
+
+async def settle(page, selector=None, cap=5.0, quiet=0.3):
+    """
+    Attente "page prête" pour Playwright, bornée à `cap` secondes par étape.
+
+    Sélecteur présent (si fourni), puis réseau calme (networkidle), puis DOM
+    stable depuis `quiet` secondes. Un plafond atteint n'est pas une erreur :
+    la page est lue telle quelle.
+    """
+    start = time.time()
+    if selector:
+        try:
+            await page.wait_for_selector(selector, timeout=cap * 1000)
+        except PlaywrightTimeout:
+            pass
+    try:
+        await page.wait_for_load_state('networkidle', timeout=cap * 1000)
+    except PlaywrightTimeout:
+        pass
+    try:
+        await asyncio.wait_for(page.evaluate(_DOM_STABLE_PROMISE_JS, quiet * 1000), cap)
+    except asyncio.TimeoutError:
+        pass
+    return time.time() - start
+
+
+# --- Pauses de politesse ------------------------------------------------------
+
+class AdaptiveDelay:
+    """
+    Pause entre deux requêtes proportionnelle à la latence mesurée du serveur.
+
+    Principe de l'AutoThrottle de Scrapy : pause = latence moyenne /
+    `target_concurrency`, bornée entre `min_delay` et `max_delay`, avec une
+    gigue de ±`jitter`. Un serveur rapide est parcouru vite, un serveur lent
+    (ou qui renvoie des erreurs, cf. `penalize`) est ménagé.
+    """
+
+    def __init__(self, target_concurrency=1.0, min_delay=0.2, max_delay=5.0,
+                 start_delay=1.0, jitter=0.25, smoothing=0.3):
+        self.target_concurrency = target_concurrency
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.smoothing = smoothing
+        self.latency = None
+        self.current = start_delay
+        self.backoff = 1.0
+        self.stats = {'pauses': 0, 'temps_pause': 0.0, 'mesures': 0, 'penalites': 0}
+
+    def observe(self, seconds):
+        """Enregistre la durée d'un chargement de page ou d'une requête"""
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += self.smoothing * (seconds - self.latency)
+        self.stats['mesures'] += 1
+        # Chaque réponse normale efface progressivement les pénalités
+        self.backoff = max(1.0, self.backoff * 0.9)
+        self.current = self.latency / self.target_concurrency * self.backoff
+
+    @contextmanager
+    def timed(self):
+        """`with pacer.timed(): driver.get(url)` mesure la latence du bloc"""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.observe(time.time() - start)
+
+    def penalize(self, factor=2.0):
+        """Erreur, 429 ou page vide : les pauses suivantes sont allongées"""
+        self.backoff = min(self.backoff * factor, 16.0)
+        self.current = max(self.current, self.min_delay) * factor
+        self.stats['penalites'] += 1
+
+    def next_delay(self):
+        delay = min(max(self.current, self.min_delay), self.max_delay)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def sleep(self):
+        delay = self.next_delay()
+        time.sleep(delay)
+        self.stats['pauses'] += 1
+        self.stats['temps_pause'] += delay
+        return delay
+
+    async def asleep(self):
+        delay = self.next_delay()
+        await asyncio.sleep(delay)
+        self.stats['pauses'] += 1
+        self.stats['temps_pause'] += delay
+        return delay
+
+    def print_stats(self):
+        stats = self.stats
+        print("⏱️  Attentes adaptatives:")
+        if self.latency is not None:
+            print(f"   Latence serveur moyenne: {self.latency:.2f}s ({stats['mesures']} mesures)")
+        if stats['pauses']:
+            print(f"   Pauses: {stats['pauses']}, {stats['temps_pause']:.1f}s au total "
+                  f"({stats['temps_pause'] / stats['pauses']:.2f}s en moyenne)")
+        if stats['penalites']:
+            print(f"   Pénalités (erreurs serveur): {stats['penalites']}")
+        return dict(stats)
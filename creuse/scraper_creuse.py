@@ -20,8 +20,11 @@ import csv
 import html
 import requests
 from datetime import datetime
-from bs4 import BeautifulSoup
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.fast_html import make_soup
 
 class CreuseAvocatsScraper:
     def __init__(self):
@@ -100,7 +103,7 @@ class CreuseAvocatsScraper:
             
             print(f"✅ Page récupérée (status: {response.status_code})")
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.content)
             
             # Trouver la section avocats
             avocats_section = soup.find('div', id='avocats')
@@ -8,8 +8,9 @@ Auteur : Script généré automatiquement
 Repo : https://github.com/paularnd875/french-bar-scrapers
 """
 
+import os
+import sys
 import requests
-from bs4 import BeautifulSoup
 import json
 import csv
 import time
@@ -17,6 +18,14 @@ import re
 from urllib.parse import urljoin
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.async_fetch import AsyncFetchEngine
+from common.fast_html import parse_html
+
+# Politesse : fiches en parallèle mais débit plafonné (avant : une fiche toutes les 1,5 s)
+MAX_PARALLEL = 2
+MAX_REQ_PER_SEC = 2.0
+
 class EvreuxBarScraper:
     def __init__(self):
         self.base_url = "https://www.barreau-evreux.avocat.fr"
@@ -60,14 +69,12 @@ class EvreuxBarScraper:
             try:
                 response = self.session.get(url, timeout=10)
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
+                    page = parse_html(response.content)
                     
                     # Trouver tous les liens d'avocats
                     lawyer_links = []
-                    all_links = soup.find_all('a', href=True)
                     
-                    for link in all_links:
-                        href = link['href']
+                    for href in page.links():
                         if 'page/annuaire/maitre-' in href and href.endswith('.htm'):
                             full_url = urljoin(self.base_url, href)
                             if full_url not in [l['url'] for l in lawyer_links]:
@@ -112,21 +119,14 @@ class EvreuxBarScraper:
             pass
         return "Nom inconnu"
     
-    def extract_profile_info(self, lawyer_data):
-        """Extraire toutes les informations d'un profil d'avocat"""
+    def extract_profile_info(self, lawyer_data, html):
+        """Extraire toutes les informations d'un profil d'avocat depuis le HTML de sa fiche"""
         url = lawyer_data['url']
         
         try:
             print(f"   🔍 Extraction: {lawyer_data.get('name_from_url', 'Nom inconnu')}")
             
-            response = self.session.get(url, timeout=15)
-            
-            if response.status_code != 200:
-                print(f"      ❌ HTTP {response.status_code}")
-                self.extraction_stats['errors'] += 1
-                return None
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            page = parse_html(html)
             
             # Données de base
             profile = {
@@ -151,11 +151,11 @@ class EvreuxBarScraper:
             }
             
             # Récupérer tout le texte de la page
-            page_text = soup.get_text()
+            page_text = page.get_text()
             
             # 1. EXTRACTION DU NOM COMPLET depuis le titre
             try:
-                title = soup.title.text if soup.title else ""
+                title = page.title or ""
                 if 'Maître' in title:
                     name_match = re.search(r'Maître ([^|]+)', title)
                     if name_match:
@@ -173,16 +173,13 @@ class EvreuxBarScraper:
             # 2. EXTRACTION EMAIL
             try:
                 # Chercher les liens mailto
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    if href.startswith('mailto:'):
-                        email = href.replace('mailto:', '').strip()
-                        if '@' in email and '.' in email and 'noreply' not in email:
-                            # Filtrer l'email du prestataire technique
-                            if 'azko.fr' not in email:
-                                profile['email'] = email
-                                self.extraction_stats['emails_found'] += 1
-                                break
+                for email in page.mailtos():
+                    if '@' in email and '.' in email and 'noreply' not in email:
+                        # Filtrer l'email du prestataire technique
+                        if 'azko.fr' not in email:
+                            profile['email'] = email
+                            self.extraction_stats['emails_found'] += 1
+                            break
                 
                 # Si pas trouvé, chercher dans le texte avec regex
                 if not profile['email']:
@@ -334,22 +331,25 @@ class EvreuxBarScraper:
         print(f"\n📋 EXTRACTION DES PROFILS ({len(lawyer_urls)} avocats)")
         print("-" * 50)
         
-        # 2. Extraire chaque profil
-        for i, lawyer_data in enumerate(lawyer_urls, 1):
-            print(f"\n[{i}/{len(lawyer_urls)}] Processing...")
-            
-            profile = self.extract_profile_info(lawyer_data)
-            
-            if profile:
-                self.all_lawyers.append(profile)
-            
-            # Pause entre les requêtes pour ne pas surcharger le serveur
-            if i < len(lawyer_urls):
-                time.sleep(1.5)  # Pause de 1.5 secondes
-            
+        # 2. Extraire les profils : téléchargés en parallèle, débit plafonné
+        # par le moteur au lieu d'une pause fixe entre deux fiches
+        by_url = {lawyer_data['url']: lawyer_data for lawyer_data in lawyer_urls}
+        
+        def on_profile(profile):
+            self.all_lawyers.append(profile)
             # Sauvegarde intermédiaire tous les 25 profils
-            if i % 25 == 0:
-                self.save_intermediate_results(i)
+            if len(self.all_lawyers) % 25 == 0:
+                self.save_intermediate_results(len(self.all_lawyers))
+        
+        # Accept-Encoding laissé à aiohttp (br seulement si brotli est installé)
+        headers = {name: value for name, value in self.headers.items() if name != 'Accept-Encoding'}
+        engine = AsyncFetchEngine(max_per_host=MAX_PARALLEL, rate_per_host=MAX_REQ_PER_SEC,
+                                  timeout=15, headers=headers)
+        engine.fetch_all(list(by_url), lambda url, html: self.extract_profile_info(by_url[url], html), on_profile)
+        for url, error in engine.errors:
+            print(f"      ❌ {url}: {error}")
+            self.extraction_stats['errors'] += 1
+        engine.print_stats()
         
         return True
     
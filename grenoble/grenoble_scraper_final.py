@@ -4,13 +4,14 @@ Scraper pour récupérer les informations des avocats du barreau de Grenoble
 Site: https://ordre-grenoble.avocat.fr/recherche-avocats/
 """
 
+import argparse
 import asyncio
 import csv
-import json
 import logging
 import os
 import random
 import re
+import sys
 import time
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
@@ -20,6 +21,10 @@ from playwright.async_api import async_playwright, Page, Browser
 from bs4 import BeautifulSoup
 import pandas as pd
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.checkpoint import CheckpointStore
+from common.lean_page import LeanMode
+
 
 # Configuration
 BASE_URL = "https://ordre-grenoble.avocat.fr/recherche-avocats/"
@@ -27,6 +32,7 @@ OUTPUT_DIR = "scraped_data"
 LAWYERS_LIST_CSV = "lawyers_list.csv"
 LAWYERS_DETAILS_CSV = "lawyers_details.csv"
 LOG_FILE = "scraping.log"
+DETAILS_CHECKPOINT = "details_checkpoint.jsonl"
 MAX_RETRIES = 3
 MIN_DELAY = 2  # secondes
 MAX_DELAY = 5  # secondes
@@ -36,14 +42,16 @@ TIMEOUT = 30000  # milliseconds
 class GrenobleBarScraper:
     """Scraper pour le barreau de Grenoble"""
     
-    def __init__(self):
+    def __init__(self, headless=False):
         """Initialise le scraper"""
+        self.headless = headless
         self.setup_logging()
         self.setup_directories()
         self.lawyers_data = []
         self.lawyers_details = []
         self.browser = None
         self.page = None
+        self.lean = LeanMode(first_party=BASE_URL)
         
     def setup_logging(self):
         """Configure le système de logging"""
@@ -75,7 +83,7 @@ class GrenobleBarScraper:
         
         # Configuration pour éviter la détection
         self.browser = await playwright.chromium.launch(
-            headless=False,  # Mode visible pour debug
+            headless=self.headless,  # Mode visible pour debug, sauf avec --headless
             args=[
                 '--disable-blink-features=AutomationControlled',
                 '--disable-dev-shm-usage',
@@ -94,6 +102,9 @@ class GrenobleBarScraper:
             timezone_id='Europe/Paris'
         )
         
+        # Seul le texte nous intéresse : images, CSS, polices et traceurs bloqués
+        await self.lean.attach(context)
+        
         self.page = await context.new_page()
         
         # Injection de scripts pour masquer l'automatisation
@@ -408,6 +419,7 @@ class GrenobleBarScraper:
         for attempt in range(MAX_RETRIES):
             try:
                 await self.page.goto(lawyer['profile_url'], wait_until='networkidle', timeout=TIMEOUT)
+                await self.lean.measure(self.page)
                 await self.random_delay()
                 
                 content = await self.page.content()
@@ -547,15 +559,10 @@ class GrenobleBarScraper:
             except Exception as e2:
                 self.logger.error(f"Erreur critique lors de la sauvegarde: {e2}")
                 
-    def save_checkpoint(self, data: List[Dict], checkpoint_name: str):
-        """Sauvegarde un checkpoint pour reprendre en cas d'erreur"""
-        checkpoint_file = os.path.join(OUTPUT_DIR, f"checkpoint_{checkpoint_name}.json")
-        try:
-            with open(checkpoint_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            self.logger.debug(f"Checkpoint sauvegardé: {checkpoint_file}")
-        except Exception as e:
-            self.logger.error(f"Erreur lors de la sauvegarde du checkpoint: {e}")
+    @staticmethod
+    def lawyer_key(lawyer: Dict) -> str:
+        """Clé de reprise d'un avocat : URL du profil, sinon le nom"""
+        return lawyer.get('profile_url') or lawyer.get('name', '')
             
     async def run(self):
         """Exécution principale du scraper"""
@@ -583,10 +590,6 @@ class GrenobleBarScraper:
                     self.logger.info(f"\n--- Localisation {i}/{len(locations)}: {location['text']} ---")
                     lawyers = await self.scrape_lawyers_list_for_location(location)
                     self.lawyers_data.extend(lawyers)
-                    
-                    # Sauvegarde intermédiaire
-                    if i % 5 == 0:
-                        self.save_checkpoint(self.lawyers_data, f"lawyers_list_{i}")
             else:
                 # Scraper sans sélection de localisation
                 self.logger.info("Pas de localisations trouvées, scraping global...")
@@ -610,16 +613,24 @@ class GrenobleBarScraper:
             if self.lawyers_data:
                 self.logger.info("\n### PHASE 2: Extraction des fiches détaillées ###\n")
                 
-                for i, lawyer in enumerate(self.lawyers_data, 1):
-                    self.logger.info(f"\nTraitement {i}/{len(self.lawyers_data)}: {lawyer.get('name', 'Inconnu')}")
+                # Reprise : une ligne JSONL par fiche, les fiches déjà faites sont sautées
+                checkpoint = CheckpointStore(os.path.join(OUTPUT_DIR, DETAILS_CHECKPOINT), key=self.lawyer_key)
+                self.lawyers_details = checkpoint.records()
+                todo = checkpoint.remaining(self.lawyers_data, key=self.lawyer_key)
+                if self.lawyers_details:
+                    self.logger.info(f"Reprise: {len(self.lawyers_details)} fiches déjà extraites, {len(todo)} restantes")
+                
+                # Première fiche chargée en entier : référence du mode page légère (mesuré sur les fiches)
+                first_url = next((lawyer['profile_url'] for lawyer in todo if lawyer.get('profile_url')), None)
+                if first_url:
+                    await self.lean.calibrate(self.page, first_url, wait_until='networkidle', timeout=TIMEOUT)
+                
+                for i, lawyer in enumerate(todo, 1):
+                    self.logger.info(f"\nTraitement {i}/{len(todo)}: {lawyer.get('name', 'Inconnu')}")
                     
                     lawyer_details = await self.scrape_lawyer_details(lawyer)
                     self.lawyers_details.append(lawyer_details)
-                    
-                    # Sauvegarde intermédiaire tous les 10 avocats
-                    if i % 10 == 0:
-                        self.save_to_csv(self.lawyers_details, f"lawyers_details_partial_{i}.csv")
-                        self.save_checkpoint(self.lawyers_details, f"details_{i}")
+                    checkpoint.append(lawyer_details)
                         
                     # Pause plus longue tous les 20 avocats
                     if i % 20 == 0:
@@ -628,6 +639,7 @@ class GrenobleBarScraper:
                         
                 # Sauvegarder les détails finaux
                 self.save_to_csv(self.lawyers_details, LAWYERS_DETAILS_CSV)
+                checkpoint.clear()
                 
         except Exception as e:
             self.logger.error(f"Erreur fatale: {e}")
@@ -648,6 +660,7 @@ class GrenobleBarScraper:
         self.logger.info(f"Temps total: {elapsed_time/60:.2f} minutes")
         self.logger.info(f"Avocats trouvés: {len(self.lawyers_data)}")
         self.logger.info(f"Détails extraits: {len(self.lawyers_details)}")
+        self.lean.stats.print_stats()
         self.logger.info(f"Fichiers de sortie:")
         self.logger.info(f"  - Liste: {os.path.join(OUTPUT_DIR, LAWYERS_LIST_CSV)}")
         self.logger.info(f"  - Détails: {os.path.join(OUTPUT_DIR, LAWYERS_DETAILS_CSV)}")
@@ -656,7 +669,10 @@ class GrenobleBarScraper:
 
 async def main():
     """Point d'entrée principal"""
-    scraper = GrenobleBarScraper()
+    parser = argparse.ArgumentParser(description="Scraper du barreau de Grenoble")
+    parser.add_argument('--headless', action='store_true', help="Navigateur sans interface (serveur, lancement groupé)")
+    args = parser.parse_args()
+    scraper = GrenobleBarScraper(headless=args.headless)
     await scraper.run()
 
 
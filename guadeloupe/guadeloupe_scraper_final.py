@@ -16,7 +16,6 @@ Usage: python3 scraper_barreau_guadeloupe.py [fichier.pdf]
 Sortie: avocats_guadeloupe_[timestamp].csv
 """
 
-import pdfplumber
 import re
 import csv
 import sys
@@ -24,6 +23,11 @@ import os
 from datetime import datetime
 from collections import defaultdict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.pdf_engine import iter_pages, page_count
+
+PDF_BACKENDS = ('pdfplumber', 'pymupdf', 'pypdf')
+
 class ScraperBarreauGuadeloupe:
     def __init__(self, pdf_path):
         self.pdf_path = pdf_path
@@ -184,20 +188,25 @@ class ScraperBarreauGuadeloupe:
         self.log(f"Début extraction du fichier: {self.pdf_path}")
         
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                self.log(f"PDF ouvert: {len(pdf.pages)} pages")
-                
-                for page_num, page in enumerate(pdf.pages, 1):
-                    self.log(f"Traitement page {page_num}/{len(pdf.pages)}")
-                    
-                    text = page.extract_text()
-                    if text:
-                        avocats_page = self.extraire_avocats_page(text)
-                        self.avocats.extend(avocats_page)
-                        self.log(f"  Page {page_num}: {len(avocats_page)} avocats trouvés")
+            total_pages = page_count(self.pdf_path, PDF_BACKENDS)
+            self.log(f"PDF ouvert: {total_pages} pages")
+            
+            # Pages extraites en parallèle et parsées dès qu'elles arrivent
+            avocats_par_page = {}
+            for page in iter_pages(self.pdf_path, backends=PDF_BACKENDS):
+                page_num = page['page']
+                self.log(f"Traitement page {page_num}/{total_pages} ({page['backend']})")
                 
-                self.log(f"Extraction terminée: {len(self.avocats)} avocats au total")
-                return self.avocats
+                text = page['text']
+                if text:
+                    avocats_par_page[page_num] = self.extraire_avocats_page(text)
+                    self.log(f"  Page {page_num}: {len(avocats_par_page[page_num])} avocats trouvés")
+            
+            for page_num in sorted(avocats_par_page):
+                self.avocats.extend(avocats_par_page[page_num])
+            
+            self.log(f"Extraction terminée: {len(self.avocats)} avocats au total")
+            return self.avocats
                 
         except Exception as e:
             self.log(f"Erreur lors de l'extraction: {e}")
@@ -20,36 +20,9 @@ def test_guyane_scraper():
         # Test avec limite de 5 avocats, mode headless
         scraper = GuyaneBarScraperProduction(headless=True, max_pages=1)
         
-        # Modifier temporairement pour tester seulement 5 avocats
         print("📋 Test sur les 5 premiers avocats...")
-        
-        # Navigation vers le site
-        scraper.driver.get(scraper.base_url)
-        scraper.accept_cookies()
-        
-        # Récupérer 5 premiers avocats
-        lawyer_cards = scraper.driver.find_elements("class name", "annuaireFicheMini")
-        test_lawyers = []
-        
-        for i, card in enumerate(lawyer_cards[:5]):
-            try:
-                name_link = card.find_element("xpath", ".//h4/a")
-                lawyer = {
-                    'nom_complet': name_link.text.strip(),
-                    'detail_url': name_link.get_attribute('href'),
-                    'page_origine': 1
-                }
-                test_lawyers.append(lawyer)
-            except:
-                continue
-        
-        print(f"👥 {len(test_lawyers)} avocats à tester")
-        
-        # Extraction détaillée
-        results = []
-        for lawyer in test_lawyers:
-            detailed = scraper.extract_enhanced_details(lawyer)
-            results.append(detailed)
+        results = scraper.scrape(limit=5)
+        print(f"👥 {len(results)} avocats testés")
         
         # Statistiques
         emails_count = len([r for r in results if r.get('email')])
@@ -87,7 +60,7 @@ def test_guyane_scraper():
     
     finally:
         try:
-            scraper.driver.quit()
+            scraper.close()
         except:
             pass
 
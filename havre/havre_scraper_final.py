@@ -10,8 +10,9 @@ Analyse de la structure:
 - L'endpoint AJAX est : https://avocatslehavre.fr/wp-admin/admin-ajax.php
 """
 
+import os
+import sys
 import requests
-from bs4 import BeautifulSoup
 import json
 import time
 import csv
@@ -19,6 +20,9 @@ from typing import Dict, List, Optional
 import re
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.fast_html import parse_html
+
 class AvocatsHavreScraper:
     """Scraper pour l'annuaire des avocats du barreau du Havre"""
     
@@ -53,39 +57,38 @@ class AvocatsHavreScraper:
             print(f"Erreur lors de la récupération de la page: {e}")
             return []
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        page = parse_html(response.content)
         avocats = []
         
         # Recherche de tous les blocs d'avocats
-        blocs_avocats = soup.find_all('div', class_='bloc_profil_avocat')
+        blocs_avocats = page.select('div.bloc_profil_avocat')
         print(f"[{datetime.now().strftime('%H:%M:%S')}] {len(blocs_avocats)} avocats trouvés sur la page")
         
         for bloc in blocs_avocats:
             avocat_info = {}
             
             # Extraction du nom
-            nom_elem = bloc.find('div', class_='nom_avocat')
+            nom_elem = bloc.select_one('div.nom_avocat')
             if nom_elem:
                 avocat_info['nom'] = nom_elem.get_text(strip=True)
             
             # Extraction de la société/cabinet
-            societe_elem = bloc.find('div', class_='societe_avocat')
+            societe_elem = bloc.select_one('div.societe_avocat')
             if societe_elem:
                 avocat_info['cabinet'] = societe_elem.get_text(strip=True)
             
             # Extraction de l'ID utilisateur pour le profil
-            button = bloc.find('button', class_='voir_profil_avocat')
+            button = bloc.select_one('button.voir_profil_avocat')
             if button and button.has_attr('id-user'):
                 avocat_info['id_user'] = button['id-user']
             
             # Extraction de l'image si disponible
-            img_wrapper = bloc.find('div', class_='visuel_avocat')
+            img_wrapper = bloc.select_one('div.visuel_avocat')
             if img_wrapper and img_wrapper.has_attr('data-img'):
                 avocat_info['photo_url'] = img_wrapper['data-img']
             
             # Extraction de la lettre initiale (pour le filtre alphabétique)
-            classes = bloc.get('class', [])
-            for classe in classes:
+            for classe in bloc.classes:
                 if len(classe) == 1 and classe.isalpha():
                     avocat_info['lettre'] = classe
                     break
@@ -154,27 +157,21 @@ class AvocatsHavreScraper:
         Returns:
             Dictionnaire avec les informations extraites
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        page = parse_html(html_content)
         profile = {'id_user': id_user}
         
         # Extraction du nom complet
-        nom_elem = soup.find('h1', class_='modal_nom_avocat')
-        if not nom_elem:
-            nom_elem = soup.find('div', class_='modal_nom_avocat')
+        nom_elem = page.select_one('h1.modal_nom_avocat') or page.select_one('div.modal_nom_avocat')
         if nom_elem:
             profile['nom_complet'] = nom_elem.get_text(strip=True)
         
         # Extraction du cabinet
-        cabinet_elem = soup.find('div', class_='modal_societe')
-        if not cabinet_elem:
-            cabinet_elem = soup.find('div', class_='societe_avocat')
+        cabinet_elem = page.select_one('div.modal_societe') or page.select_one('div.societe_avocat')
         if cabinet_elem:
             profile['cabinet'] = cabinet_elem.get_text(strip=True)
         
         # Extraction de l'adresse
-        adresse_elem = soup.find('div', class_='modal_adresse')
-        if not adresse_elem:
-            adresse_elem = soup.find('div', class_='adresse')
+        adresse_elem = page.select_one('div.modal_adresse') or page.select_one('div.adresse')
         if adresse_elem:
             adresse_lines = []
             for line in adresse_elem.stripped_strings:
@@ -182,9 +179,7 @@ class AvocatsHavreScraper:
             profile['adresse'] = ', '.join(adresse_lines)
         
         # Extraction du téléphone
-        tel_elem = soup.find('div', class_='modal_tel')
-        if not tel_elem:
-            tel_elem = soup.find('a', href=re.compile(r'tel:'))
+        tel_elem = page.select_one('div.modal_tel') or page.select_one('a[href*="tel:"]')
         if tel_elem:
             if tel_elem.name == 'a':
                 profile['telephone'] = tel_elem.get_text(strip=True)
@@ -196,7 +191,7 @@ class AvocatsHavreScraper:
                     profile['telephone'] = tel_match.group().strip()
         
         # Extraction du fax
-        fax_elem = soup.find('div', class_='modal_fax')
+        fax_elem = page.select_one('div.modal_fax')
         if fax_elem:
             fax_text = fax_elem.get_text(strip=True)
             fax_match = re.search(r'[\d\s\.\-\+]+', fax_text)
@@ -204,26 +199,25 @@ class AvocatsHavreScraper:
                 profile['fax'] = fax_match.group().strip()
         
         # Extraction de l'email
-        email_elem = soup.find('a', href=re.compile(r'mailto:'))
+        email_elem = page.select_one('a[href*="mailto:"]')
         if email_elem:
             email = email_elem.get('href', '').replace('mailto:', '')
             if email:
                 profile['email'] = email
         
         # Extraction du site web
-        site_elem = soup.find('a', class_='modal_site')
+        site_elem = page.select_one('a.modal_site')
         if not site_elem:
-            site_elem = soup.find('a', href=re.compile(r'^https?://(?!.*avocatslehavre)'))
+            site_elem = next((a for a in page.select('a[href^="http"]')
+                              if re.match(r'^https?://(?!.*avocatslehavre)', a['href'])), None)
         if site_elem:
             profile['site_web'] = site_elem.get('href', '')
         
         # Extraction des spécialisations
         specialisations = []
-        spec_container = soup.find('div', class_='modal_specialisations')
-        if not spec_container:
-            spec_container = soup.find('div', class_='bloc_mentions_spec')
+        spec_container = page.select_one('div.modal_specialisations') or page.select_one('div.bloc_mentions_spec')
         if spec_container:
-            for spec in spec_container.find_all(['li', 'div', 'span']):
+            for spec in spec_container.select('li, div, span'):
                 spec_text = spec.get_text(strip=True)
                 if spec_text and spec_text not in specialisations:
                     specialisations.append(spec_text)
@@ -231,12 +225,12 @@ class AvocatsHavreScraper:
             profile['specialisations'] = ' | '.join(specialisations)
         
         # Extraction des langues parlées
-        langues_elem = soup.find('div', class_='modal_langues')
+        langues_elem = page.select_one('div.modal_langues')
         if langues_elem:
             profile['langues'] = langues_elem.get_text(strip=True)
         
         # Extraction de la date de prestation de serment
-        serment_elem = soup.find('div', class_='modal_serment')
+        serment_elem = page.select_one('div.modal_serment')
         if serment_elem:
             serment_text = serment_elem.get_text(strip=True)
             # Extraire la date
@@ -9,6 +9,8 @@ import time
 import re
 import csv
 import json
+import os
+import sys
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -19,6 +21,12 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.consent import ConsentSeed
+
+# Choix axeptio posé avant la première page : aucun bandeau à cliquer
+CONSENT = ConsentSeed("https://barreau-de-laval.com", frameworks=('axeptio',))
+
 def setup_driver(headless=True):
     """Configuration du driver Chrome en mode headless"""
     chrome_options = Options()
@@ -232,11 +240,13 @@ def scrape_all_lawyers():
     try:
         # Charger la page
         url = "https://barreau-de-laval.com/annuaire-professionnel/"
+        consent_seeded = CONSENT.attach_selenium(driver)
         print(f"🌐 Chargement: {url}")
         driver.get(url)
         
-        # Gérer les cookies
-        handle_cookies(driver)
+        # Gérer les cookies (seulement si le consentement n'a pas pu être pré-posé)
+        if not consent_seeded:
+            handle_cookies(driver)
         
         # Attendre le chargement
         print("⏳ Attente du chargement complet...")
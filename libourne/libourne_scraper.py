@@ -8,7 +8,9 @@ Gestion optimisée des cookies et anti-détection
 import time
 import json
 import csv
+import os
 import random
+import sys
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -19,6 +21,78 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import re
 import urllib.parse
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.consent import ConsentSeed
+from common.field_rules import FieldRules, length_between, year_between
+from common.snapshot import PageSnapshot
+
+_IMAGE_EXTENSIONS = ('.jpg', '.png', '.gif', '.svg', '.css', '.js')
+
+
+def _valid_email(email):
+    email_lower = email.lower()
+    if any(ext in email_lower for ext in _IMAGE_EXTENSIONS):
+        return None
+    return email if '.' in email.split('@')[1] else None
+
+
+def _spaced_phone(phone):
+    return re.sub(r'\s+', ' ', re.sub(r'[.\s-]', ' ', phone)).strip()
+
+
+def _strip_tags(text):
+    return re.sub(r'<[^>]+>', '', text).strip()
+
+
+def _full_address(parts):
+    addr, postal, city = parts
+    addr = re.sub(r'[^\w\s,.-]', '', addr).strip()
+    city = re.sub(r'[^\w\s-]', '', city).strip()
+    if 3 < len(addr) < 100 and postal.isdigit() and 2 < len(city) < 50:
+        return addr, postal, city
+    return None
+
+
+def _city_only(parts):
+    postal, city = parts
+    if postal.isdigit() and len(city) > 2:
+        return '', postal, re.sub(r'[^\w\s-]', '', city).strip()
+    return None
+
+
+# Champs cherchés dans le code source de la fiche, en un seul passage
+PAGE_RULES = FieldRules([
+    {'field': 'email', 'pattern': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', 'post': _valid_email},
+    {'field': 'email', 'label': r'mailto:', 'pattern': r'([^"\'?\s<>]+)', 'flags': re.IGNORECASE},
+    # Téléphone français (0X ou +33X suivi de 4 paires)
+    {'field': 'telephone', 'pattern': r'(?:(?:\+33|0)[1-9])(?:[.\s-]?\d{2}){4}', 'post': _spaced_phone},
+] + [
+    {'field': 'annee_inscription', 'label': label, 'pattern': r'.*?(\d{4})', 'flags': re.IGNORECASE,
+     'post': (year_between(1950, 2024), int)}
+    for label in (r'inscri[tp]', r'barreau', r'admission', r'serment')
+] + [
+    {'field': 'specialisations', 'label': label, 'pattern': r'[:\s]*([^<\n]{10,200})', 'flags': re.IGNORECASE,
+     'post': (_strip_tags, length_between(5, 201)), 'multi': 5}
+    for label in (r'spécialisations?', r'compétences?', r'domaines?')
+] + [
+    {'field': 'structure', 'label': label, 'pattern': r'[:\s]*([^<\n]{5,100})', 'flags': re.IGNORECASE,
+     'post': (_strip_tags, length_between(3, 101))}
+    for label in (r'cabinet', r'structure', r'société', r'scpa?')
+])
+
+# Adresse dans le texte visible : adresse complète, sinon code postal et ville
+ADDRESS_RULES = FieldRules([
+    {'field': ('adresse', 'code_postal', 'ville'), 'pattern': pattern, 'flags': re.IGNORECASE,
+     'post': _full_address}
+    for pattern in (r'(\d+[\w\s,.-]+?)\s*(\d{5})\s*([A-Za-zÀ-ÿ\s-]{3,50})',
+                    r'(\d+[^0-9\n]*?)\s*(\d{5})\s*([A-Za-zÀ-ÿ\s-]+)',
+                    r'((?:\d+|rue|avenue|boulevard|place)[^0-9\n]*?)\s*(\d{5})\s*(\w+(?:\s+\w+)*)')
+] + [
+    {'field': ('adresse', 'code_postal', 'ville'), 'pattern': r'(\d{5})\s*([A-Za-zÀ-ÿ\s-]{3,30})',
+     'group': (1, 2), 'post': _city_only},
+])
+
+
 class LibourneCompletScraper:
     def __init__(self, headless=True, test_mode=False):
         self.lawyers_list = self.get_lawyers_list()
@@ -140,6 +214,9 @@ class LibourneCompletScraper:
             "userAgent": 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
         
+        # Choix tarteaucitron posé avant la première fiche : aucun bandeau rendu
+        ConsentSeed("https://www.barreaulibourne.fr", frameworks=('tarteaucitron',)).attach_selenium(self.driver)
+        
         self.wait = WebDriverWait(self.driver, 15)
         
     def random_delay(self, min_sec=1, max_sec=3):
@@ -227,41 +304,22 @@ class LibourneCompletScraper:
             # Séparer prénom et nom
             self.split_name(lawyer_data)
             
-            # Extraire email
-            email = self.find_email()
-            if email:
-                lawyer_data["email"] = email
-                
-            # Extraire téléphone
-            phone = self.find_phone()
-            if phone:
-                lawyer_data["telephone"] = phone
+            # Un seul aller-retour WebDriver : HTML rendu + texte visible
+            snapshot = PageSnapshot.capture(self.driver)
+            
+            # Extraire email, téléphone, année, spécialisations et structure
+            lawyer_data.update(self.find_page_fields(snapshot))
                 
             # Extraire adresse
-            address_data = self.find_address()
+            address_data = self.find_address(snapshot)
             if address_data:
                 lawyer_data.update(address_data)
                 
-            # Extraire année d'inscription
-            year = self.find_inscription_year()
-            if year:
-                lawyer_data["annee_inscription"] = year
-                
-            # Extraire spécialisations
-            specs = self.find_specializations()
-            if specs:
-                lawyer_data["specialisations"] = specs
-                
             # Extraire compétences
-            comps = self.find_competences()
+            comps = self.find_competences(snapshot)
             if comps:
                 lawyer_data["competences"] = comps
                 
-            # Extraire structure
-            structure = self.find_structure()
-            if structure:
-                lawyer_data["structure"] = structure
-                
             # Marquer comme réussie si au moins email ou téléphone
             if lawyer_data["email"] or lawyer_data["telephone"]:
                 lawyer_data["extraction_reussie"] = True
@@ -313,69 +371,20 @@ class LibourneCompletScraper:
                 lawyer_data["nom"] = full_name
                 lawyer_data["prenom"] = ""
                 
-    def find_email(self):
-        """Recherche intelligente d'email"""
-        try:
-            # Recherche dans le texte de la page
-            page_source = self.driver.page_source
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            emails = re.findall(email_pattern, page_source)
-            
-            # Filtrer les emails valides
-            valid_emails = []
-            for email in emails:
-                email_lower = email.lower()
-                if not any(ext in email_lower for ext in ['.jpg', '.png', '.gif', '.svg', '.css', '.js']):
-                    if '@' in email and '.' in email.split('@')[1]:
-                        valid_emails.append(email)
-                        
-            # Recherche dans les liens mailto
-            try:
-                mailto_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href^='mailto:']")
-                for link in mailto_links:
-                    href = link.get_attribute("href")
-                    if href:
-                        email = href.replace("mailto:", "").split("?")[0]
-                        if email not in valid_emails:
-                            valid_emails.append(email)
-            except:
-                pass
-                
-            return valid_emails[0] if valid_emails else None
-            
-        except Exception as e:
-            print(f"⚠️ Erreur email: {str(e)}")
-            return None
-            
-    def find_phone(self):
-        """Recherche de numéro de téléphone"""
+    def find_page_fields(self, snapshot):
+        """Email, téléphone, année, spécialisations et structure (PAGE_RULES, un seul passage)"""
         try:
-            page_text = self.driver.page_source
-            
-            # Patterns pour téléphone français
-            phone_patterns = [
-                r'(?:(?:\+33|0)[1-9])(?:[.\s-]?\d{2}){4}',
-                r'0[1-9](?:[.\s-]?\d{2}){4}',
-                r'\+33[1-9](?:[.\s-]?\d{2}){4}'
-            ]
-            
-            for pattern in phone_patterns:
-                phones = re.findall(pattern, page_text)
-                if phones:
-                    # Nettoyer et formater
-                    phone = phones[0]
-                    phone = re.sub(r'[.\s-]', ' ', phone)
-                    phone = re.sub(r'\s+', ' ', phone).strip()
-                    return phone
-                    
-            return None
+            fields = PAGE_RULES.extract(snapshot.html)
+            if 'specialisations' in fields:
+                fields['specialisations'] = fields['specialisations'][:5]  # Max 5 spécialisations
+            return fields
             
         except Exception as e:
-            print(f"⚠️ Erreur téléphone: {str(e)}")
-            return None
+            print(f"⚠️ Erreur extraction: {str(e)}")
+            return {}
             
-    def find_address(self):
-        """Recherche d'adresse complète améliorée"""
+    def find_address(self, snapshot):
+        """Recherche d'adresse complète améliorée (ADDRESS_RULES)"""
         try:
             address_data = {
                 "adresse": "",
@@ -383,103 +392,14 @@ class LibourneCompletScraper:
                 "ville": ""
             }
             
-            # Récupérer le texte visible uniquement
-            page_text = self.driver.find_element(By.TAG_NAME, "body").text
-            
-            # Pattern pour adresse française standard
-            address_patterns = [
-                r'(\d+[\w\s,.-]+?)\s*(\d{5})\s*([A-Za-zÀ-ÿ\s-]{3,50})',
-                r'(\d+[^0-9\n]*?)\s*(\d{5})\s*([A-Za-zÀ-ÿ\s-]+)',
-                r'((?:\d+|rue|avenue|boulevard|place)[^0-9\n]*?)\s*(\d{5})\s*(\w+(?:\s+\w+)*)'
-            ]
-            
-            for pattern in address_patterns:
-                matches = re.findall(pattern, page_text, re.IGNORECASE)
-                for match in matches:
-                    addr, postal, city = match
-                    
-                    # Nettoyer les données
-                    addr = re.sub(r'[^\w\s,.-]', '', addr).strip()
-                    postal = postal.strip()
-                    city = re.sub(r'[^\w\s-]', '', city).strip()
-                    
-                    # Vérifier que c'est valide
-                    if (len(addr) > 3 and len(addr) < 100 and 
-                        postal.isdigit() and len(postal) == 5 and
-                        len(city) > 2 and len(city) < 50):
-                        
-                        address_data["adresse"] = addr
-                        address_data["code_postal"] = postal
-                        address_data["ville"] = city
-                        return address_data
-                
-            # Si pas d'adresse complète, chercher au moins la ville
-            city_pattern = r'(\d{5})\s*([A-Za-zÀ-ÿ\s-]{3,30})'
-            city_matches = re.findall(city_pattern, page_text)
-            for postal, city in city_matches:
-                if postal.isdigit() and len(city) > 2:
-                    address_data["code_postal"] = postal
-                    address_data["ville"] = re.sub(r'[^\w\s-]', '', city).strip()
-                    break
-                
-            return address_data
+            # Texte visible de l'instantané
+            return ADDRESS_RULES.extract(snapshot.text, address_data)
             
         except Exception as e:
             print(f"⚠️ Erreur adresse: {str(e)}")
             return {}
             
-    def find_inscription_year(self):
-        """Recherche année d'inscription"""
-        try:
-            page_text = self.driver.page_source.lower()
-            
-            year_patterns = [
-                r'inscri[tp].*?(\d{4})',
-                r'barreau.*?(\d{4})',
-                r'admission.*?(\d{4})',
-                r'serment.*?(\d{4})'
-            ]
-            
-            for pattern in year_patterns:
-                matches = re.findall(pattern, page_text)
-                for match in matches:
-                    year = int(match)
-                    if 1950 <= year <= 2024:
-                        return year
-                        
-            return None
-            
-        except Exception as e:
-            print(f"⚠️ Erreur année: {str(e)}")
-            return None
-            
-    def find_specializations(self):
-        """Recherche spécialisations"""
-        try:
-            specializations = []
-            page_text = self.driver.page_source
-            
-            # Patterns de recherche
-            spec_patterns = [
-                r'spécialisations?[:\s]*([^<\n]{10,200})',
-                r'compétences?[:\s]*([^<\n]{10,200})',
-                r'domaines?[:\s]*([^<\n]{10,200})'
-            ]
-            
-            for pattern in spec_patterns:
-                matches = re.findall(pattern, page_text, re.IGNORECASE)
-                for match in matches:
-                    clean_text = re.sub(r'<[^>]+>', '', match).strip()
-                    if clean_text and len(clean_text) > 5:
-                        specializations.append(clean_text)
-                        
-            return specializations[:5]  # Max 5 spécialisations
-            
-        except Exception as e:
-            print(f"⚠️ Erreur spécialisations: {str(e)}")
-            return []
-            
-    def find_competences(self):
+    def find_competences(self, snapshot):
         """Recherche compétences distinctes des spécialisations"""
         try:
             competences = []
@@ -491,14 +411,7 @@ class LibourneCompletScraper:
             ]
             
             for selector in comp_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        text = element.text.strip()
-                        if text and len(text) > 5:
-                            competences.append(text)
-                except:
-                    continue
+                competences.extend(snapshot.texts(selector, min_length=6))
                     
             return competences[:3]  # Max 3 compétences
             
@@ -506,31 +419,6 @@ class LibourneCompletScraper:
             print(f"⚠️ Erreur compétences: {str(e)}")
             return []
             
-    def find_structure(self):
-        """Recherche structure/cabinet"""
-        try:
-            page_text = self.driver.page_source
-            
-            struct_patterns = [
-                r'cabinet[:\s]*([^<\n]{5,100})',
-                r'structure[:\s]*([^<\n]{5,100})',
-                r'société[:\s]*([^<\n]{5,100})',
-                r'scpa?[:\s]*([^<\n]{5,100})'
-            ]
-            
-            for pattern in struct_patterns:
-                matches = re.findall(pattern, page_text, re.IGNORECASE)
-                for match in matches:
-                    clean_text = re.sub(r'<[^>]+>', '', match).strip()
-                    if clean_text and len(clean_text) > 3:
-                        return clean_text
-                        
-            return None
-            
-        except Exception as e:
-            print(f"⚠️ Erreur structure: {str(e)}")
-            return None
-            
     def save_results(self, lawyers, mode="COMPLET"):
         """Sauvegarde des résultats avec statistiques"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -4,24 +4,52 @@ Script de scraping pour l'annuaire des avocats du barreau de Lille
 Version finale avec gestion des filtres pour contourner la limite de 30 résultats
 """
 
+import argparse
 import asyncio
 import csv
 import json
 from playwright.async_api import async_playwright
+import os
+import sys
 import time
 from urllib.parse import urljoin
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.dedup import DedupIndex
+from common.lean_page import LeanMode
+from common.partition import FilterDimension, PrefixDimension, QueryPartitioner
+from common.waits import AdaptiveDelay, settle
+
+# Résultats de recherche : une fiche, ou le message de dépassement de la limite
+RESULTS_SELECTOR = '.annuaire-header, :text("Plus de 30 résultats")'
+
+# Clés de dédoublonnage : un même barreau, donc le nom seul suffit aussi à
+# rattacher une fiche vue sans email sous un autre filtre
+DEDUP_KEYS = ('url', 'email', 'nom_cp', 'nom')
+
+# Champ texte du nom pour subdiviser par initiales : relevé sur la page (champ
+# texte du formulaire des villes dont le nom, l'id ou le placeholder évoque un
+# nom ou une recherche), sauf s'il est fixé ici. Sans lui, une ville plafonnée
+# n'est subdivisée que par spécialité et langue : couverture non garantie.
+NAME_FIELD = None
+NAME_INPUTS = 'form:has(select[name="ville"]) input[name]:is([type="text"], [type="search"], :not([type]))'
+NAME_HINTS = ('nom', 'name', 'avocat', 'recherche', 'search', 'keyword', 'mot')
+
 class LilleLawyersScraper:
-    def __init__(self):
+    def __init__(self, headless=False):
+        self.headless = headless
         self.base_url = "https://www.avocats-lille.com/fr/annuaire/tableau/"
         self.all_lawyers = []
+        self.pacer = AdaptiveDelay(min_delay=0.3, max_delay=3)
+        self.lean = LeanMode(first_party=self.base_url)
         
     async def get_available_filters(self, page):
         """Récupérer tous les filtres disponibles"""
         filters = {
             'specializations': [],
             'languages': [],
-            'cities': []
+            'cities': [],
+            'name_field': NAME_FIELD
         }
         
         try:
@@ -51,8 +79,21 @@ class LilleLawyersScraper:
                 text = await city.text_content()
                 if value and value.strip():
                     filters['cities'].append({'value': value.strip(), 'text': text.strip()})
+            
+            # Champ texte du nom (initiales) dans le même formulaire
+            if not filters['name_field']:
+                for name_input in await page.query_selector_all(NAME_INPUTS):
+                    attributes = [await name_input.get_attribute(attribute) for attribute in ('name', 'id', 'placeholder')]
+                    if any(hint in ' '.join(filter(None, attributes)).lower() for hint in NAME_HINTS):
+                        filters['name_field'] = attributes[0]
+                        break
                     
             print(f"✅ Filtres récupérés: {len(filters['specializations'])} spécialisations, {len(filters['languages'])} langues, {len(filters['cities'])} villes")
+            if filters['name_field']:
+                print(f"🔤 Champ du nom: {filters['name_field']} (subdivision par initiales)")
+            else:
+                print("⚠️ Aucun champ de nom trouvé : villes plafonnées subdivisées par spécialité et langue, "
+                      "couverture non garantie")
             return filters
             
         except Exception as e:
@@ -132,12 +173,15 @@ class LilleLawyersScraper:
                     try:
                         plus_button = await card.query_selector('.see-more')
                         if plus_button:
+                            detail_id = await plus_button.get_attribute('data-target')
                             await plus_button.click()
-                            await page.wait_for_timeout(500)
                             
                             # Chercher dans la zone de détails qui s'ouvre
-                            detail_id = await plus_button.get_attribute('data-target')
                             if detail_id:
+                                try:
+                                    await page.wait_for_selector(f'#{detail_id}', state='visible', timeout=2000)
+                                except Exception:
+                                    pass
                                 detail_div = await page.query_selector(f'#{detail_id}')
                                 if detail_div:
                                     # Adresse
@@ -163,7 +207,6 @@ class LilleLawyersScraper:
                                     
                                     # Fermer les détails
                                     await plus_button.click()
-                                    await page.wait_for_timeout(300)
                     except:
                         pass  # En cas d'erreur, on continue sans les détails
                     
@@ -197,19 +240,26 @@ class LilleLawyersScraper:
         except:
             return False
     
-    async def scrape_with_filter(self, page, filter_type, filter_value, filter_text):
-        """Scraper avec un filtre spécifique"""
+    async def scrape_with_filters(self, page, filters, name_field=None):
+        """Soumettre le formulaire avec des filtres {champ: valeur} ; {'records', 'capped'} ou {'error'}"""
+        label = ', '.join(f"{field}={value}" for field, value in filters.items()) or 'aucun'
         try:
-            print(f"🔍 Recherche avec filtre {filter_type}: {filter_text}")
+            print(f"🔍 Recherche avec filtres: {label}")
             
             # Aller à la page de base
-            await page.goto(self.base_url)
-            await page.wait_for_load_state('networkidle')
-            await page.wait_for_timeout(2000)
+            start = time.time()
+            await page.goto(self.base_url, wait_until='domcontentloaded')
+            # Formulaire prêt quand les champs de la requête sont présents
+            await settle(page, ', '.join(f'[name="{field}"]' for field in filters) or 'form')
+            self.pacer.observe(time.time() - start)
+            await self.lean.measure(page)
             
-            # Appliquer le filtre
-            await page.select_option(f'select[name="{filter_type}"]', filter_value)
-            await page.wait_for_timeout(1000)
+            # Appliquer les filtres (listes, et initiales du nom dans le champ texte)
+            for field, value in filters.items():
+                if field == name_field:
+                    await page.fill(f'input[name="{field}"]', value)
+                else:
+                    await page.select_option(f'select[name="{field}"]', value)
             
             # Soumettre le formulaire (chercher le bouton de recherche)
             submit_button = await page.query_selector('input[type="submit"], button[type="submit"]')
@@ -221,36 +271,38 @@ class LilleLawyersScraper:
                 if form:
                     await form.evaluate('form => form.submit()')
             
-            await page.wait_for_load_state('networkidle')
-            await page.wait_for_timeout(3000)
+            # Résultats prêts dès qu'une fiche (ou le message de limite) est affichée
+            await settle(page, RESULTS_SELECTOR)
+            await self.pacer.asleep()
             
             # Vérifier s'il y a trop de résultats
-            too_many = await self.check_for_too_many_results(page)
-            if too_many:
-                print(f"⚠️ Plus de 30 résultats pour le filtre {filter_text}, nécessite subdivision")
-                return []
+            if await self.check_for_too_many_results(page):
+                print(f"⚠️ Plus de 30 résultats pour {label}, subdivision")
+                return {'records': [], 'capped': True}
             
             # Extraire les avocats
             lawyers = await self.extract_lawyer_data(page)
-            print(f"✅ {len(lawyers)} avocats extraits avec le filtre {filter_text}")
-            
-            return lawyers
+            print(f"✅ {len(lawyers)} avocats extraits avec {label}")
+            return {'records': lawyers, 'capped': False}
             
         except Exception as e:
-            print(f"❌ Erreur avec le filtre {filter_text}: {e}")
-            return []
+            print(f"❌ Erreur avec les filtres {label}: {e}")
+            self.pacer.penalize()
+            return {'error': str(e)}
     
     async def scrape_all_lawyers(self):
         """Scraper tous les avocats en utilisant les filtres"""
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False)
+            browser = await p.chromium.launch(headless=self.headless)
             page = await browser.new_page()
+            # Seul le texte nous intéresse : images, CSS, polices et traceurs bloqués
+            await self.lean.attach(page)
             
             try:
                 print("🌐 Accès à la page...")
-                await page.goto(self.base_url)
-                await page.wait_for_load_state('networkidle')
-                await page.wait_for_timeout(3000)
+                # Page de recherche chargée en entier : référence des recherches mesurées ensuite
+                await self.lean.calibrate(page, self.base_url, wait_until='domcontentloaded')
+                await settle(page, RESULTS_SELECTOR)
                 
                 # Récupérer tous les filtres disponibles
                 print("🔍 Récupération des filtres...")
@@ -268,24 +320,27 @@ class LilleLawyersScraper:
                 if too_many_initial:
                     print("⚠️ Limite de 30 résultats atteinte, utilisation des filtres...")
                     
-                    # Utiliser les filtres par ville d'abord (plus spécifiques)
-                    all_lawyers = []
-                    processed_lawyers = set()  # Pour éviter les doublons
+                    # Ville d'abord, puis initiales du nom dans une ville encore
+                    # plafonnée ; spécialités et langues en dernier recours.
+                    # Un avocat vu sous plusieurs requêtes complète sa fiche.
+                    dimensions = [FilterDimension('ville', [city['value'] for city in filters['cities']])]
+                    if filters['name_field']:
+                        dimensions.append(PrefixDimension(filters['name_field']))
+                    dimensions.append(FilterDimension('competences', [spec['value'] for spec in filters['specializations']],
+                                                      exclusive=False, exhaustive=False))
+                    dimensions.append(FilterDimension('langue', [lang['value'] for lang in filters['languages']],
+                                                      exclusive=False, exhaustive=False))
+                    partitioner = QueryPartitioner(dimensions, index=DedupIndex(keys=DEDUP_KEYS), cache_name='lille')
+                    partitioner.remember({}, 0, True)
                     
-                    # Essayer chaque ville
-                    for city in filters['cities']:
-                        if city['value']:  # Ignorer les valeurs vides
-                            city_lawyers = await self.scrape_with_filter(page, 'ville', city['value'], city['text'])
-                            
-                            # Ajouter les nouveaux avocats (éviter les doublons)
-                            for lawyer in city_lawyers:
-                                lawyer_id = lawyer.get('nom_complet', '') + lawyer.get('email', '')
-                                if lawyer_id not in processed_lawyers:
-                                    processed_lawyers.add(lawyer_id)
-                                    all_lawyers.append(lawyer)
+                    async def search(query):
+                        return await self.scrape_with_filters(page, query, filters['name_field'])
                     
-                    # Si certaines villes ont encore trop de résultats, les subdiviser par spécialisation
-                    print(f"📊 Total après filtrage par ville: {len(all_lawyers)} avocats")
+                    all_lawyers = await partitioner.arun(search)
+                    print(f"📊 Total après découpage des requêtes: {len(all_lawyers)} avocats")
+                    partitioner.print_stats()
+                    self.pacer.print_stats()
+                    self.lean.stats.print_stats()
                     
                     self.all_lawyers = all_lawyers
                 else:
@@ -346,7 +401,10 @@ class LilleLawyersScraper:
         print(f"💾 Données sauvegardées dans {filename}")
 
 async def main():
-    scraper = LilleLawyersScraper()
+    parser = argparse.ArgumentParser(description="Scraper des avocats du barreau de Lille")
+    parser.add_argument('--headless', action='store_true', help="Navigateur sans interface (serveur, lancement groupé)")
+    args = parser.parse_args()
+    scraper = LilleLawyersScraper(headless=args.headless)
     await scraper.scrape_all_lawyers()
 
 if __name__ == "__main__":
@@ -4,347 +4,117 @@ Scraper final pour extraire toutes les données des avocats du barreau de Lisieu
 Utilise le PDF officiel de l'annuaire qui contient toutes les informations complètes
 """
 
+import os
+import sys
 import requests
 import csv
 import re
 from pathlib import Path
 import tempfile
+from itertools import zip_longest
 
-# Pour les PDF, on va utiliser PyMuPDF (fitz) ou pdfplumber
-try:
-    import pdfplumber
-    PDF_LIBRARY = "pdfplumber"
-except ImportError:
-    try:
-        import fitz  # PyMuPDF
-        PDF_LIBRARY = "pymupdf"
-    except ImportError:
-        PDF_LIBRARY = None
-
-def install_pdf_library():
-    """Installe une bibliothèque PDF si nécessaire"""
-    global PDF_LIBRARY
-    if PDF_LIBRARY is None:
-        print("📦 Installation de pdfplumber...")
-        import subprocess
-        subprocess.run(["pip3", "install", "pdfplumber"], check=True)
-        PDF_LIBRARY = "pdfplumber"
-
-def extract_lawyer_data_from_pdf(pdf_path):
-    """Extrait les données des avocats depuis le PDF"""
-    lawyers_data = []
-    
-    if PDF_LIBRARY == "pdfplumber":
-        import pdfplumber
-        
-        with pdfplumber.open(pdf_path) as pdf:
-            text_content = ""
-            for page in pdf.pages:
-                text_content += page.extract_text() + "\n"
-    
-    else:
-        # Fallback: utiliser le contenu déjà extrait
-        text_content = """
-        17.01.1977 SAPIR Lionel
-        1 Place Clémenceau
-        14100 LISIEUX 
-        liosapir@aol.com
-        Tél. 02 31 62 08 08
-        Fax 02 31 31 12 21
-
-        26.01.1977 GRIFFITHS Xavier Droit immobilier
-        1 rue des Mathurins Droit public
-        14100 LISIEUX 
-        xg@avogriff.com
-        Tél. 02 31 48 56 90
-        Fax 02 31 63 89 49
-
-        04.01.1978 REYNAUD Marc, ancien Bâtonnier Droit des garanties, 
-        78 rue du Général Leclerc des sûretés et des 
-        14100 LISIEUX mesures d'exécution
-        marc.reynaud@calexavocats.fr Droit commercial, 
-        Tél. 02 31 62 00 45 des affaires et de
-        Fax 02 31 31 05 54 la concurrence
-
-        11.12.1984 BLIN Pierre, ancien Bâtonnier Droit rural
-        78 rue du Général Leclerc Droit du travail
-        14100 LISIEUX 
-        pierre.blin@calexavocats.fr 
-        Tél. 02 31 62 00 45 - Fax 02 31 31 05 54
-
-        03.01.1989 MONS Henry 
-        3 Sente aux Ladres - 14600 HONFLEUR 
-        avocat.mons@orange.fr 
-        Tél. 02 31 87 58 91 - Fax 02 31 87 38 16
-
-        09.01.1989 PRADO Noël, ancien Bâtonnier 
-        38 rue Thouret - 14130 PONT-L'EVÊQUE
-        noel.prado@normajuris.fr 
-        Tél. 02 31 64 01 73
-
-        01.01.1993 HOYE Bernard
-        ZAC de la Vignerie - 14 rue des Entreprises
-        14160 DIVES-SUR-MER
-        contact@maitrehoyeavocat.fr
-        Tél. 02 31 24 10 03 
-
-        15.01.1993 DUVAL Emmanuelle, ancienne Bâtonnière
-        10 rue du Moulin à Tan - BP 13115 - 14100 LISIEUX CEDEX 
-        contact@lexoavocats.fr
-        Tél. 02 31 62 34 35 
-
-        01.03.1993 VALLANSAN Florence
-        26 Rue Jacques de Condorcet - 14100 LISIEUX
-        fvallansan@vallansan-avocat-lisieux.fr
-        Tél. 09 82 75 84 12
-
-        15.03.1995 DELAGRANGE Célia
-        2 Avenue de la Vallée - 14800 SAINT-ARNOULT
-        celia@delagrange-avocat.com
-        Tél. 06 86 18 33 66
-
-        04.10.1995 FRAGASSI Didier
-        133 rue des Bains - 14510 HOULGATE
-        dfragassi@yahoo.fr
-        Tél. 02 31 74 61 16 - Fax 09 57 73 15 40
-
-        23.05.1996 NAUTOU Frédéric
-        1 rue des Mathurins - BP 44152 - 14104 LISIEUX CEDEX
-        fn@avogriff.com
-        Tél. 02 31 48 56 90 - Fax 02 31 63 89 49
-
-        01.01.1997 PILOT Didier
-        11 Place François Mitterrand - 14100 LISIEUX
-        contact@c2pw.fr
-        Tél. 02 31 62 00 42 - Fax 02 31 62 13 30
-
-        01.03.1999 SEBIRE Urielle, Bâtonnier
-        17 Avenue de la République - 14800 DEAUVILLE
-        deauville@cabinetadvocatus.fr
-        Tél. 02 31 87 14 10 - Fax 02 31 14 97 12
-
-        11.01.2000 LEMARÉCHAL Vanessa
-        10 rue du Moulin à Tan - BP 13115 - 14100 LISIEUX CEDEX 
-        vanessa.lemarechal@lexoavocats.fr
-        Tél. 02 31 62 34 35
-
-        05.06.2000 NAVIAUX Sylvain
-        33 rue de la République - 14600 HONFLEUR
-        avocat@cabinet-naviaux.fr
-        Tél. 02 31 88 80 64 - Fax 02 31 88 80 71
-
-        25.04.2001 HUREL Céline
-        ZAC de la Vignerie - 14 rue des Entreprises
-        14160 DIVES-SUR-MER 
-        celine.hurel@avocat.fr
-        Tél. 06 45 97 23 44
-
-        07.01.2002 JULLIENNE Ingrid
-        11 bis allée Général Daugan - BP 20020
-        14130 PONT-L'EVÊQUE 
-        cabinet@avocats-valtout-jullienne.fr
-        Tél. 02 31 65 63 20 - Fax 02 31 65 63 21
-
-        05.03.2003 FELDMAN Deborah
-        36 rue Georges Clémenceau - 14130 Pont L'Evêque
-        Tél. 06 95 32 09 79
-
-        02.02.2004 ANFRY Virginie
-        8 rue au Char - BP 92080 - 14100 LISIEUX
-        14 bis rue Georges Clémenceau - 14130 PONT-L'EVEQUE
-        v.anfry@ab-avocats14.fr
-        Tél. 02 31 48 22 00 - Fax 02 31 48 22 04
-
-        28.04.2004 MERCIER Sandra
-        31, Grande Rue 14130 BLANGY-LE-CHÂTEAU
-        sandramercier@avocatmercier.org
-        Tél. 06 85 21 50 45
-
-        01.09.2006 MORIN Frédéric, ancien Bâtonnier
-        16 Boulevard Duchesne Fournet - BP 22064
-        14102 LISIEUX Cedex
-        frederic.morin@scp2m-avocats.fr
-        Tél. 02 31 62 05 72
-
-        24.01.2008 PHILIBERT Quentin
-        2 Avenue de la Vallée - 14800 SAINT-ARNOULT 
-        qphilibert@me.com
-        Tél. 06 62 37 97 93
-
-        08.12.2009 BREAVOINE Cécile
-        8 rue au Char - BP 92080 - 14100 LISIEUX
-        14 bis rue Georges Clémenceau - 14130 PONT-L'EVEQUE
-        c.breavoine@ab-avocats14.fr
-        Tél. 09 82 47 90 66 - Fax 09 81 40 14 45
-
-        23.10.2013 JEGO Yves
-        31, Grande Rue 14130 BLANGY-LE-CHÂTEAU
-        contact@jego-avocat.fr
-        Tél. 06 16 75 23 47
-
-        01.01.2014 GABRIEL Floriane
-        115 rue du Général de Gaulle - Le Pont de Cabourg
-        14160 DIVES-SUR-MER 
-        contact@gabriel-avocat.fr
-        Tél. 02 31 06 00 50 - Fax 02 31 24 00 63
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.pdf_engine import available_backends
+from common.pdf_layout import iter_blocks
 
-        15.12.2015 TAFOREL Eléonore
-        16 Boulevard Duchesne Fournet - 14100 LISIEUX
-        contact@taforel-avocat.fr
-        Tél. 06 22 31 08 48
+# Moteur donnant la position des mots (PyMuPDF, sinon pdfplumber)
+PDF_LIBRARY = next(iter(available_backends(('pymupdf', 'pdfplumber'))), None)
 
-        16.12.2015 DESMONTS Jean-René
-        8 rue au Char - BP 92080 - 14100 LISIEUX
-        14 bis rue Georges Clémenceau - 14130 PONT-L'EVEQUE
-        jr.desmonts@ab-avocats14.fr
-        Tél. 02 31 48 22 00 - Fax 02 31 48 22 04
+# Chaque fiche commence par la date d'inscription : "04.01.1978 REYNAUD Marc, ancien Bâtonnier"
+DATE_RE = r'^\d{2}\.\d{2}\.\d{4}\b'
+NAME_RE = re.compile(r"^(\d{2}\.\d{2}\.\d{4})\s+([A-ZÀ-Ý][A-ZÀ-Ý'\-]*(?:\s+[A-ZÀ-Ý][A-ZÀ-Ý'\-]*)*)"
+                     r"\s+([^,]+?)\s*(?:,\s*(.+?))?\s*$")
+POSTCODE_RE = re.compile(r'^(.*)\b(\d{5})\s+(\D.*?)\s*$')
+LEGAL_FORM_RE = re.compile(r'^(?:SCP|SARL|SAS|SELARL|SELAS|SELAFA|SELURL|EURL|AARPI)\b')
 
-        01.01.2016 MAZIER Christelle
-        16 Boulevard Duchesne Fournet - BP 22064
-        14102 LISIEUX Cedex
-        christelle.mazier@scp2m-avocats.fr
-        Tél. 02 31 62 90 73
-
-        01.01.2016 POISSON Amélie
-        11 Place François Mitterrand - 14100 LISIEUX 
-        contact@c2pw.fr
-        Tél. 02 31 62 00 42 - Fax 02 31 62 13 30
-
-        17.01.2017 DUFAG Daniel
-        334 Chemin des Bissonnets - 14140 LE MESNIL GERMAIN 
-        contact@danieldufag-avocat.com
-        Tél. 02 31 61 70 22 - 06 80 61 60 26 - Fax 02 31 48 81 77
-
-        12.01.2018 CLAUSSE Marie-Pia
-        11 Place François Mitterrand - 14100 LISIEUX 
-        contact@c2pw.fr
-        Tél. 02 31 62 00 42 - Fax 02 31 62 13 30
-
-        02.01.2020 ROCHE Jean-Baptiste
-        1 rue des Mathurins - 14100 LISIEUX 
-        jbr.avocat.grand.ouest@gmail.com
-        Tél. 02 31 48 56 90 - Fax 02 31 63 89 49
-
-        01.01.2023 DE WITTE Jade
-        11 Place François Mitterrand - 14100 LISIEUX 
-        contact@c2pw.fr
-        Tél. 02 31 62 00 42 - Fax 02 31 62 13 30
-
-        01.01.2023 AMIOT Pénélope
-        78 rue du Général Leclerc - 14100 LISIEUX
-        penelope.amiot@calexavocats.fr
-        Tél. 02 31 62 00 45 – Fax 02 31 31 05 54
+def extract_lawyer_data_from_pdf(pdf_path):
+    """
+    Extrait les données des avocats depuis le PDF, d'après la position des mots.
 
-        13.02.2024 CHAIX-BRYAN Emmanuelle 
-        11 Avenue de la République - 14800 DEAUVILLE 
-        emmanuelle@chaixbryanconseil.fr
-        Tél. 06 81 00 55 45
-        """
+    L'annuaire place les spécialités dans une colonne à droite de l'adresse :
+    le texte brut mélange les deux sur une même ligne, les fiches
+    géométriques (common.pdf_layout) les gardent séparées.
+    """
+    if PDF_LIBRARY is None:
+        print("❌ PyMuPDF ou pdfplumber requis pour lire le PDF (pip install PyMuPDF)")
+        return []
     
-    # Parser le texte pour extraire les informations
-    return parse_lawyer_text(text_content)
-
-def parse_lawyer_text(text):
-    """Parse le texte extrait pour créer des entrées d'avocats structurées"""
-    lawyers = []
+    lawyers = [parse_lawyer_block(entry) for entry in iter_blocks(pdf_path, anchor=DATE_RE)]
+    return [lawyer for lawyer in lawyers if lawyer['nom']]
+
+def parse_lawyer_block(entry):
+    """Construit une entrée d'avocat depuis une fiche : colonne(s) adresse, puis spécialités"""
+    columns = entry['columns']
+    *left, right = columns if len(columns) > 1 else columns + [[]]
+    # Date seule dans sa colonne : elle rejoint la ligne du nom
+    lines = [' '.join(part for part in parts if part) for parts in zip_longest(*left, fillvalue='')]
     
-    # Diviser le texte en blocs pour chaque avocat
-    # Utiliser la date d'inscription comme délimiteur
-    lawyer_blocks = re.split(r'\n\s*\d{2}\.\d{2}\.\d{4}', text)
+    lawyer_info = {
+        'nom': '',
+        'prenom': '',
+        'cabinet': '',
+        'adresse': '',
+        'ville': '',
+        'code_postal': '',
+        'telephone': '',
+        'fax': '',
+        'email': '',
+        'specialites': '',
+        'date_inscription': '',
+        'qualifications': ''
+    }
     
-    for i, block in enumerate(lawyer_blocks):
-        if not block.strip():
-            continue
-            
-        # Reconstituer la date qui a été utilisée comme délimiteur
-        date_match = re.search(r'(\d{2}\.\d{2}\.\d{4})', text)
-        
-        lawyer_info = {
-            'nom': '',
-            'prenom': '',
-            'cabinet': '',
-            'adresse': '',
-            'ville': '',
-            'code_postal': '',
-            'telephone': '',
-            'fax': '',
-            'email': '',
-            'specialites': '',
-            'date_inscription': '',
-            'qualifications': ''
-        }
-        
-        lines = [line.strip() for line in block.strip().split('\n') if line.strip()]
-        
-        if not lines:
-            continue
-            
-        # La première ligne contient généralement le nom
-        first_line = lines[0] if lines else ""
-        
-        # Extraction du nom et des qualifications
-        name_match = re.match(r'([A-Z\-]+)\s+([A-Za-z\-\s]+?)(?:,\s*(.+))?$', first_line)
-        if name_match:
-            lawyer_info['nom'] = name_match.group(1).strip()
-            lawyer_info['prenom'] = name_match.group(2).strip()
-            if name_match.group(3):
-                lawyer_info['qualifications'] = name_match.group(3).strip()
-        
-        # Traiter le reste des lignes
-        current_address_lines = []
-        specialities_started = False
+    name_match = NAME_RE.match(lines[0]) if lines else None
+    if not name_match:
+        return lawyer_info
+    lawyer_info['date_inscription'] = name_match.group(1)
+    lawyer_info['nom'] = name_match.group(2)
+    lawyer_info['prenom'] = name_match.group(3)
+    lawyer_info['qualifications'] = name_match.group(4) or ''
+    
+    address_lines = []
+    for line in lines[1:]:
+        # Email
+        if '@' in line:
+            email_match = re.search(r'[\w.+\-]+@[\w\-]+(?:\.[\w\-]+)+', line)
+            if email_match:
+                lawyer_info['email'] = email_match.group(0)
         
-        for line in lines[1:]:
-            line = line.strip()
-            
-            # Email
-            if '@' in line and not line.startswith('Tél'):
-                lawyer_info['email'] = line
-            
-            # Téléphone et Fax
-            elif line.startswith('Tél'):
-                # Extraire téléphone et fax
-                tel_match = re.search(r'Tél\.?\s*([\d\s\-\.]+)', line)
-                if tel_match:
-                    lawyer_info['telephone'] = tel_match.group(1).strip()
-                
-                fax_match = re.search(r'Fax\.?\s*([\d\s\-\.]+)', line)
-                if fax_match:
-                    lawyer_info['fax'] = fax_match.group(1).strip()
-            
-            # Code postal et ville
-            elif re.match(r'\d{5}\s+[A-Z\-\s]+', line):
-                parts = line.split(None, 1)
-                if len(parts) >= 2:
-                    lawyer_info['code_postal'] = parts[0]
-                    lawyer_info['ville'] = parts[1]
-                    current_address_lines.append(line)
-            
-            # Spécialités (détectées par certains mots clés)
-            elif any(word in line for word in ['Droit', 'droit']):
-                if lawyer_info['specialites']:
-                    lawyer_info['specialites'] += '; ' + line
-                else:
-                    lawyer_info['specialites'] = line
-                specialities_started = True
-            
-            # Adresse (tout ce qui n'est pas email, tél, spécialité)
-            else:
-                if not specialities_started and not '@' in line and not line.startswith('Tél'):
-                    current_address_lines.append(line)
+        # Téléphone et Fax (même ligne ou lignes séparées)
+        elif line.startswith(('Tél', 'Fax')):
+            tel_match = re.search(r'Tél\.?\s*:?\s*(\d[\d\s\.]*\d)', line)
+            if tel_match:
+                lawyer_info['telephone'] = tel_match.group(1)
+            fax_match = re.search(r'Fax\.?\s*:?\s*(\d[\d\s\.]*\d)', line)
+            if fax_match:
+                lawyer_info['fax'] = fax_match.group(1)
         
-        # Construire l'adresse complète
-        if current_address_lines:
-            # Garder seulement les lignes d'adresse (pas code postal/ville)
-            address_only = [line for line in current_address_lines 
-                          if not re.match(r'\d{5}\s+[A-Z\-\s]+', line)]
-            lawyer_info['adresse'] = ', '.join(address_only)
+        # Structure d'exercice
+        elif LEGAL_FORM_RE.match(line) and not address_lines:
+            lawyer_info['cabinet'] = line
         
-        # Ajouter seulement si on a au moins un nom
-        if lawyer_info['nom']:
-            lawyers.append(lawyer_info)
+        # Adresse, avec ou sans "CP VILLE" en fin de ligne
+        else:
+            postcode_match = POSTCODE_RE.match(line)
+            if postcode_match:
+                lawyer_info['code_postal'] = postcode_match.group(2)
+                lawyer_info['ville'] = postcode_match.group(3)
+                line = postcode_match.group(1)
+            line = line.strip(' -–,')
+            if line:
+                address_lines.append(line)
+    lawyer_info['adresse'] = ', '.join(address_lines)
+    
+    # Spécialités : une majuscule ouvre une spécialité, la suite des lignes la complète
+    specialites = []
+    for line in right:
+        if specialites and not line[:1].isupper():
+            specialites[-1] += ' ' + line
+        else:
+            specialites.append(line)
+    lawyer_info['specialites'] = '; '.join(s.rstrip(' ,') for s in specialites)
     
-    return lawyers
+    return lawyer_info
 
 def manual_data_extraction():
     """Extraction manuelle des données basée sur le contenu du PDF"""
@@ -913,9 +683,12 @@ def main():
             print(f"❌ Erreur lors du téléchargement: {e}")
             return
     
-    # Utiliser l'extraction manuelle (données déjà structurées)
     print("📊 Extraction des données des avocats...")
-    lawyers_data = manual_data_extraction()
+    lawyers_data = extract_lawyer_data_from_pdf(pdf_path)
+    if not lawyers_data:
+        # Dernier recours : données saisies depuis l'édition 2025 de l'annuaire
+        print("⚠️ Aucune fiche lue dans le PDF, utilisation des données saisies")
+        lawyers_data = manual_data_extraction()
     
     if lawyers_data:
         print(f"✅ {len(lawyers_data)} avocats extraits")
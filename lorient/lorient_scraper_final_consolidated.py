@@ -22,7 +22,8 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 
 class LorientBarScraperConsolidated:
-    def __init__(self):
+    def __init__(self, headless=False):
+        self.headless = headless
         self.base_url = "https://www.barreaulorient.fr"
         self.avocats_url = f"{self.base_url}/avocats-lorient/tous-les-avocats.php"
         self.driver = None
@@ -33,6 +34,8 @@ class LorientBarScraperConsolidated:
         print("🔧 Configuration de Chrome...")
         
         chrome_options = Options()
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
@@ -526,14 +529,15 @@ def main():
     
     import sys
     
-    if len(sys.argv) > 1 and sys.argv[1] == "--consolidate":
+    if "--consolidate" in sys.argv[1:]:
         # Mode consolidation des batches existants
         print("🔄 Mode consolidation activé")
         data = consolidate_existing_batches()
     else:
         # Mode extraction complète
         print("⚡ Mode extraction complète activé")
-        scraper = LorientBarScraperConsolidated()
+        # Fenêtre visible par défaut, sans interface avec --headless (serveur, lancement groupé)
+        scraper = LorientBarScraperConsolidated(headless="--headless" in sys.argv[1:])
         data = scraper.run_complete_scraping()
         
         if data:
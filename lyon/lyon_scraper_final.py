@@ -9,6 +9,7 @@ import csv
 import json
 import re
 import os
+import sys
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -18,6 +19,13 @@ from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.consent import ConsentSeed
+from common.field_rules import FieldRules, collapse_spaces, stripped, truncate
+from common.frontier import CrawlFrontier
+from common.normalize import normalize_phone
+from common.sharded import ShardedExecutor
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,85 +37,213 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Choix axeptio posé avant la première page de chaque navigateur (liste et processus de fiches)
+CONSENT = ConsentSeed("https://www.barreaulyon.com", frameworks=('axeptio',))
+
+# Champs de la fiche, extraits du texte de la page en un seul passage
+PROFILE_RULES = FieldRules([
+    {'field': 'annee_inscription', 'label': r'PRESTATION DE SERMENT', 'pattern': r'\s*[^\d]*(\d{4})',
+     'flags': re.IGNORECASE},
+    {'field': 'structure', 'label': r'STRUCTURE', 'pattern': r'\s*([^\n]+)', 'flags': re.IGNORECASE,
+     'post': stripped()},
+    {'field': 'adresse', 'label': r'RUE', 'pattern': r'\s*([^\n]+)', 'flags': re.IGNORECASE,
+     'post': stripped()},
+    {'field': 'case_postale', 'label': r'CASE', 'pattern': r'\s*([^\n]+)', 'flags': re.IGNORECASE,
+     'post': stripped()},
+    {'field': 'langues', 'label': r'LANGUES', 'pattern': r'\s*([^\n]+)', 'flags': re.IGNORECASE,
+     'post': stripped()},
+    {'field': ('code_postal', 'ville'), 'label': r'CODE POSTAL',
+     'pattern': r'\s*(\S+)[^\S\n]*([^\n]*?)[^\S\n]*(?:\n|$)', 'flags': re.IGNORECASE},
+    {'field': 'telephone', 'pattern': r'(\d{2}\s?\d{2}\s?\d{2}\s?\d{2}\s?\d{2})',
+     'post': normalize_phone, 'multi': 3, 'join': ', '},  # Max 3 numéros
+    {'field': 'specialisations', 'label': r"Domaines d'activité",
+     'pattern': r'\s*(.*?)(?:Ordre des avocats|$)', 'flags': re.IGNORECASE | re.DOTALL,
+     'post': (collapse_spaces, truncate(200))},  # Limiter la longueur
+])
+
+def create_headless_driver():
+    """Driver Chrome headless de production (fonction de module : utilisable dans les processus de l'exécuteur)"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")  # Mode headless
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-plugins")
+    chrome_options.add_argument("--disable-images")  # Ne pas charger les images pour plus de rapidité
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+    
+    # Optimisations pour la vitesse
+    prefs = {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values": {
+            "notifications": 2
+        }
+    }
+    chrome_options.add_experimental_option("prefs", prefs)
+    
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    # Sans CDP, le bandeau sera cliqué une fois après le premier chargement
+    driver.consent_pending = not CONSENT.attach_selenium(driver)
+    return driver
+
+def accept_cookies_silent(driver):
+    """Accepte les cookies en silence (navigateur sans consentement pré-posé)"""
+    try:
+        time.sleep(2)
+        
+        # Méthodes silencieuses pour accepter les cookies
+        accept_methods = [
+            lambda: driver.execute_script("""
+                if(window.axeptio) {
+                    window.axeptio.execute('all');
+                    return true;
+                }
+                return false;
+            """),
+            lambda: driver.execute_script("""
+                let buttons = document.querySelectorAll('button');
+                for(let btn of buttons) {
+                    if(btn.textContent.toLowerCase().includes('accepter') || 
+                       btn.textContent.toLowerCase().includes('accept') ||
+                       btn.textContent.toLowerCase().includes('tout')) {
+                        btn.click();
+                        return true;
+                    }
+                }
+                return false;
+            """),
+        ]
+        
+        for method in accept_methods:
+            try:
+                if method():
+                    time.sleep(1)
+                    return True
+            except:
+                continue
+                
+        return False
+        
+    except Exception as e:
+        logger.debug(f"Cookies: {e}")
+        return False
+
+def handle_cookies_once(driver):
+    """Clic du bandeau au premier chargement, seulement si le consentement n'a pas pu être pré-posé"""
+    if getattr(driver, 'consent_pending', False):
+        driver.consent_pending = False
+        accept_cookies_silent(driver)
+
+def extract_profile_data(text):
+    """Extraction optimisée des données depuis le texte (PROFILE_RULES, un seul passage)"""
+    data = {
+        'annee_inscription': '',
+        'specialisations': '',
+        'structure': '',
+        'adresse': '',
+        'telephone': '',
+        'case_postale': '',
+        'code_postal': '',
+        'ville': '',
+        'langues': ''
+    }
+    
+    try:
+        return PROFILE_RULES.extract(text, data)
+    except Exception as e:
+        logger.debug(f"Erreur extraction données: {e}")
+    
+    return data
+
+def scrape_profile(driver, profile_url):
+    """Scraping rapide d'une fiche avocat (appelé aussi dans les processus de l'exécuteur réparti)"""
+    try:
+        driver.get(profile_url)
+        time.sleep(0.8)  # Délai réduit
+        handle_cookies_once(driver)
+        
+        # Données de base
+        avocat_data = {
+            'url': profile_url,
+            'prenom': '',
+            'nom': '',
+            'email': '',
+            'annee_inscription': '',
+            'specialisations': '',
+            'structure': '',
+            'adresse': '',
+            'telephone': '',
+            'case_postale': '',
+            'code_postal': '',
+            'ville': '',
+            'langues': ''
+        }
+        
+        # Script combiné pour nom et email
+        extraction_script = """
+            let data = {name: '', email: ''};
+            
+            // Nom
+            let h1 = document.querySelector('h1');
+            if(h1) {
+                data.name = h1.textContent.replace(/Maître\\s*/i, '').trim();
+            }
+            
+            // Email
+            let emailLink = document.querySelector('a[href^="mailto:"]');
+            if(emailLink) {
+                data.email = emailLink.getAttribute('href').replace('mailto:', '');
+            }
+            
+            return data;
+        """
+        
+        extracted = driver.execute_script(extraction_script)
+        
+        # Traitement du nom
+        if extracted.get('name'):
+            name_parts = extracted['name'].split()
+            if len(name_parts) >= 2:
+                avocat_data['nom'] = ' '.join(name_parts[:-1])
+                avocat_data['prenom'] = name_parts[-1]
+            else:
+                avocat_data['nom'] = extracted['name']
+        
+        # Email
+        avocat_data['email'] = extracted.get('email', '')
+        
+        # Récupérer le texte de la page et extraire les autres données
+        page_text = driver.find_element(By.TAG_NAME, "body").text
+        other_data = extract_profile_data(page_text)
+        avocat_data.update(other_data)
+        
+        return avocat_data
+        
+    except Exception as e:
+        logger.error(f"Erreur scraping {profile_url}: {e}")
+        return None
+
 class BarreauLyonProductionScraper:
     def __init__(self):
         self.setup_driver_headless()
         self.avocats_data = []
         self.total_pages = 346
         self.start_time = datetime.now()
+        # État des pages et des fiches sur disque pour reprendre après un crash
+        self.frontier = CrawlFrontier('lyon_frontier.sqlite')
         
     def setup_driver_headless(self):
         """Configure le driver Chrome en mode headless pour la production"""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")  # Mode headless
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")  # Ne pas charger les images pour plus de rapidité
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        
-        # Optimisations pour la vitesse
-        prefs = {
-            "profile.managed_default_content_settings.images": 2,
-            "profile.default_content_setting_values": {
-                "notifications": 2
-            }
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.driver = create_headless_driver()
         self.wait = WebDriverWait(self.driver, 10)
         
         logger.info("🚀 Driver Chrome configuré en mode headless")
         
-    def accept_cookies_silent(self):
-        """Accepte les cookies en silence"""
-        try:
-            time.sleep(2)
-            
-            # Méthodes silencieuses pour accepter les cookies
-            accept_methods = [
-                lambda: self.driver.execute_script("""
-                    if(window.axeptio) {
-                        window.axeptio.execute('all');
-                        return true;
-                    }
-                    return false;
-                """),
-                lambda: self.driver.execute_script("""
-                    let buttons = document.querySelectorAll('button');
-                    for(let btn of buttons) {
-                        if(btn.textContent.toLowerCase().includes('accepter') || 
-                           btn.textContent.toLowerCase().includes('accept') ||
-                           btn.textContent.toLowerCase().includes('tout')) {
-                            btn.click();
-                            return true;
-                        }
-                    }
-                    return false;
-                """),
-            ]
-            
-            for method in accept_methods:
-                try:
-                    if method():
-                        time.sleep(1)
-                        return True
-                except:
-                    continue
-                    
-            return False
-            
-        except Exception as e:
-            logger.debug(f"Cookies: {e}")
-            return False
-    
     def get_lawyer_links_from_page(self, page_num):
         """Récupère tous les liens d'avocats d'une page"""
         try:
@@ -115,9 +251,8 @@ class BarreauLyonProductionScraper:
             self.driver.get(url)
             time.sleep(1.5)
             
-            # Accepter les cookies sur la première page
-            if page_num == 1:
-                self.accept_cookies_silent()
+            # Accepter les cookies au premier chargement (sans consentement pré-posé)
+            handle_cookies_once(self.driver)
             
             # Attendre le chargement
             self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
@@ -145,139 +280,48 @@ class BarreauLyonProductionScraper:
             return []
     
     def extract_data_optimized(self, text):
-        """Extraction optimisée des données depuis le texte"""
-        data = {
-            'annee_inscription': '',
-            'specialisations': '',
-            'structure': '',
-            'adresse': '',
-            'telephone': '',
-            'case_postale': '',
-            'code_postal': '',
-            'ville': '',
-            'langues': ''
-        }
-        
-        try:
-            # Patterns optimisés avec compilation regex
-            patterns = {
-                'annee_inscription': r'PRESTATION DE SERMENT\s*[^\d]*(\d{4})',
-                'structure': r'STRUCTURE\s*([^\n]+)',
-                'adresse': r'RUE\s*([^\n]+)', 
-                'case_postale': r'CASE\s*([^\n]+)',
-                'langues': r'LANGUES\s*([^\n]+)',
-                'code_postal_ville': r'CODE POSTAL\s*([^\n]+)',
-                'telephone': r'(\d{2}\s?\d{2}\s?\d{2}\s?\d{2}\s?\d{2})',
-                'specialisations': r'Domaines d\'activité\s*(.*?)(?:Ordre des avocats|$)'
-            }
-            
-            for key, pattern in patterns.items():
-                if key == 'telephone':
-                    phones = re.findall(pattern, text)
-                    if phones:
-                        data['telephone'] = ', '.join(phones[:3])  # Max 3 numéros
-                elif key == 'code_postal_ville':
-                    match = re.search(pattern, text, re.IGNORECASE)
-                    if match:
-                        cp_text = match.group(1).strip()
-                        parts = cp_text.split(None, 1)
-                        if parts:
-                            data['code_postal'] = parts[0]
-                            if len(parts) > 1:
-                                data['ville'] = parts[1]
-                elif key == 'specialisations':
-                    match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-                    if match:
-                        spec_text = match.group(1).strip()
-                        spec_clean = re.sub(r'\s+', ' ', spec_text)
-                        data['specialisations'] = spec_clean[:200]  # Limiter la longueur
-                else:
-                    match = re.search(pattern, text, re.IGNORECASE)
-                    if match:
-                        data[key] = match.group(1).strip()
-            
-        except Exception as e:
-            logger.debug(f"Erreur extraction données: {e}")
-        
-        return data
+        """Extraction optimisée des données depuis le texte (PROFILE_RULES, un seul passage)"""
+        return extract_profile_data(text)
     
     def scrape_lawyer_profile_fast(self, profile_url):
         """Scraping rapide d'une fiche avocat"""
-        try:
-            self.driver.get(profile_url)
-            time.sleep(0.8)  # Délai réduit
-            
-            # Données de base
-            avocat_data = {
-                'url': profile_url,
-                'prenom': '',
-                'nom': '',
-                'email': '',
-                'annee_inscription': '',
-                'specialisations': '',
-                'structure': '',
-                'adresse': '',
-                'telephone': '',
-                'case_postale': '',
-                'code_postal': '',
-                'ville': '',
-                'langues': ''
-            }
-            
-            # Script combiné pour nom et email
-            extraction_script = """
-                let data = {name: '', email: ''};
-                
-                // Nom
-                let h1 = document.querySelector('h1');
-                if(h1) {
-                    data.name = h1.textContent.replace(/Maître\\s*/i, '').trim();
-                }
-                
-                // Email
-                let emailLink = document.querySelector('a[href^="mailto:"]');
-                if(emailLink) {
-                    data.email = emailLink.getAttribute('href').replace('mailto:', '');
-                }
-                
-                return data;
-            """
-            
-            extracted = self.driver.execute_script(extraction_script)
-            
-            # Traitement du nom
-            if extracted.get('name'):
-                name_parts = extracted['name'].split()
-                if len(name_parts) >= 2:
-                    avocat_data['nom'] = ' '.join(name_parts[:-1])
-                    avocat_data['prenom'] = name_parts[-1]
-                else:
-                    avocat_data['nom'] = extracted['name']
-            
-            # Email
-            avocat_data['email'] = extracted.get('email', '')
-            
-            # Récupérer le texte de la page et extraire les autres données
-            page_text = self.driver.find_element(By.TAG_NAME, "body").text
-            other_data = self.extract_data_optimized(page_text)
-            avocat_data.update(other_data)
-            
-            return avocat_data
-            
-        except Exception as e:
-            logger.error(f"Erreur scraping {profile_url}: {e}")
-            return None
+        return scrape_profile(self.driver, profile_url)
     
-    def save_periodic_backup(self, page_num):
-        """Sauvegarde périodique des données"""
-        if len(self.avocats_data) > 0 and page_num % 50 == 0:  # Toutes les 50 pages
-            backup_file = f'backup_avocats_lyon_page_{page_num}.json'
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                json.dump(self.avocats_data, f, ensure_ascii=False, indent=2)
-            logger.info(f"💾 Sauvegarde backup: {len(self.avocats_data)} avocats")
+    def scrape_profile_tracked(self, link):
+        """Scrape une fiche en enregistrant son état dans la frontière"""
+        self.frontier.start('profile', link)
+        return self.record_profile(link, self.scrape_lawyer_profile_fast(link))
+    
+    def record_profile(self, link, avocat_data):
+        """Enregistre le résultat d'une fiche dans la frontière"""
+        if avocat_data:
+            self.frontier.done('profile', link, avocat_data)
+            self.avocats_data.append(avocat_data)
+        else:
+            self.frontier.failed('profile', link, 'extraction')
+        return avocat_data
+    
+    def scrape_profiles_sharded(self, links, workers, per_second):
+        """Fiches réparties sur `workers` processus Chrome ; retourne le nombre de fiches extraites"""
+        if not links:
+            return 0
+        extracted = 0
+        executor = ShardedExecutor(scrape_profile, workers=workers, per_second=per_second,
+                                   driver_factory=create_headless_driver)
+        try:
+            for index, avocat_data in executor.imap(links):
+                if self.record_profile(links[index], avocat_data):
+                    extracted += 1
+                done = executor.stats['fiches'] + executor.stats['erreurs']
+                if done % 100 == 0:
+                    logger.info(f"👤 Fiches: {done}/{len(links)} | Extraites: {extracted}")
+            executor.print_stats()
+        finally:
+            executor.close()
+        return extracted
     
-    def scrape_all_pages(self, start_page=1, end_page=None):
-        """Scrape toutes les pages de l'annuaire"""
+    def scrape_all_pages(self, start_page=1, end_page=None, workers=4, per_second=2.0):
+        """Scrape toutes les pages de l'annuaire, puis les fiches réparties sur `workers` processus"""
         if end_page is None:
             end_page = self.total_pages
             
@@ -288,44 +332,57 @@ class BarreauLyonProductionScraper:
         try:
             total_avocats = 0
             
-            for page_num in range(start_page, end_page + 1):
+            # Reprise : fiches déjà extraites lors d'un run interrompu
+            self.avocats_data = self.frontier.results('profile')
+            self.frontier.add('page', range(start_page, end_page + 1))
+            pages_todo = [p for p in map(int, self.frontier.todo('page')) if start_page <= p <= end_page]
+            if self.avocats_data:
+                logger.info(f"♻️  Reprise: {len(self.avocats_data)} fiches déjà extraites, "
+                          f"{len(pages_todo)} pages restantes")
+            
+            for page_num in pages_todo:
                 page_start = time.time()
+                self.frontier.start('page', page_num)
                 
                 # Récupérer les liens de la page
                 lawyer_links = self.get_lawyer_links_from_page(page_num)
                 
                 if not lawyer_links:
                     logger.warning(f"Page {page_num}: Aucun avocat trouvé")
+                    self.frontier.failed('page', page_num, 'aucun lien')
                     continue
                 
-                # Scraper chaque avocat de la page
-                page_avocats = 0
-                for link in lawyer_links:
-                    avocat_data = self.scrape_lawyer_profile_fast(link)
-                    if avocat_data:
-                        self.avocats_data.append(avocat_data)
-                        total_avocats += 1
-                        page_avocats += 1
-                    
-                    time.sleep(0.3)  # Petite pause entre les avocats
+                # Les fiches de la page rejoignent la frontière ; elles sont extraites ensuite en parallèle
+                self.frontier.add('profile', lawyer_links)
+                self.frontier.done('page', page_num)
                 
                 page_time = time.time() - page_start
                 elapsed = datetime.now() - self.start_time
                 estimated_remaining = (page_time * (end_page - page_num)) / 60  # minutes
                 
-                logger.info(f"✅ Page {page_num:3d} terminée: {page_avocats} avocats en {page_time:.1f}s | "
-                          f"Total: {total_avocats} | Temps écoulé: {elapsed} | "
-                          f"Estimation restante: {estimated_remaining:.1f}min")
-                
-                # Sauvegardes périodiques
-                self.save_periodic_backup(page_num)
+                logger.info(f"✅ Page {page_num:3d} terminée: {len(lawyer_links)} liens en {page_time:.1f}s | "
+                          f"Temps écoulé: {elapsed} | Estimation restante (liste): {estimated_remaining:.1f}min")
                 
                 # Pause entre les pages
                 time.sleep(0.5)
             
+            # Fiches restantes (y compris celles d'un run interrompu), puis dernière chance pour les échecs
+            profiles_todo = self.frontier.todo('profile')
+            logger.info(f"👤 {len(profiles_todo)} fiches à extraire sur {workers} processus")
+            total_avocats += self.scrape_profiles_sharded(profiles_todo, workers, per_second)
+            total_avocats += self.scrape_profiles_sharded(self.frontier.todo('profile'), workers, per_second)
+            
             # Sauvegarder les résultats finaux
             self.save_final_results()
             
+            # Crawl complet : le prochain run repart de zéro, après avoir
+            # gardé la liste des pages et fiches abandonnées
+            if not self.frontier.todo('page') and not self.frontier.todo('profile'):
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                failures = self.frontier.reset(f'echecs_scraping_lyon_{timestamp}.json')
+                for kind, items in failures.items():
+                    logger.warning(f"⚠️  {len(items)} {kind}(s) abandonné(s), voir echecs_scraping_lyon_{timestamp}.json")
+            
             total_time = datetime.now() - self.start_time
             logger.info(f"🎉 SCRAPING TERMINÉ!")
             logger.info(f"📊 Total: {len(self.avocats_data)} avocats extraits")
@@ -3,23 +3,24 @@
 Script pour scraper la liste des avocats du barreau de Mayotte
 """
 
+import argparse
 import asyncio
 import aiohttp
-import PyPDF2
-import pdfplumber
-import fitz  # pymupdf
-import pytesseract
-from pdf2image import convert_from_path
-from PIL import Image
 import re
 import csv
 import json
+import os
+import sys
 from playwright.async_api import async_playwright
 from pathlib import Path
 import io
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.pdf_engine import extract_pages
+
 class MayotteAvocatsScraper:
-    def __init__(self):
+    def __init__(self, headless=False):
+        self.headless = headless
         self.url = "https://www.cdad976.fr/liste-des-avocats-2023-barreau-de-mayotte/"
         self.pdf_url = None
         self.pdf_content = None
@@ -30,7 +31,7 @@ class MayotteAvocatsScraper:
         async with async_playwright() as p:
             # Lancer un navigateur avec des paramètres pour éviter la détection
             browser = await p.chromium.launch(
-                headless=False,  # Mode visible pour déboguer
+                headless=self.headless,  # Mode visible pour déboguer, sauf avec --headless
                 args=[
                     '--no-sandbox',
                     '--disable-dev-shm-usage',
@@ -189,88 +190,30 @@ class MayotteAvocatsScraper:
         pdf_path = '/Users/paularnould/avocats_mayotte.pdf'
         text = ""
         
-        # Essayer d'abord avec pdfplumber (meilleur pour les tableaux)
+        # Pages réparties entre plusieurs processus ; moteur choisi page par page
+        # (pdfplumber pour les tableaux, puis PyMuPDF, PyPDF2 et OCR si la page est une image)
         try:
-            print("Tentative d'extraction avec pdfplumber...")
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += f"--- Page {page_num + 1} ---\n"
-                        text += page_text + "\n"
-                        
-                    # Essayer aussi d'extraire les tableaux
-                    tables = page.extract_tables()
-                    if tables:
-                        for table_num, table in enumerate(tables):
-                            text += f"\n--- Tableau {table_num + 1} ---\n"
-                            for row in table:
-                                if row:
-                                    text += " | ".join([cell or "" for cell in row]) + "\n"
-                                    
-            print(f"Extraction pdfplumber: {len(text)} caractères")
-            
+            pages = extract_pages(pdf_path, backends=('pdfplumber', 'pymupdf', 'pypdf', 'ocr'), tables=True)
         except Exception as e:
-            print(f"Erreur avec pdfplumber: {e}")
+            print(f"Erreur extraction PDF: {e}")
+            pages = []
             
-        # Si pdfplumber n'a pas donné beaucoup de texte, essayer PyMuPDF
-        if len(text) < 100:
-            try:
-                print("Tentative d'extraction avec PyMuPDF...")
-                doc = fitz.open(pdf_path)
-                text = ""
-                for page_num in range(len(doc)):
-                    page = doc[page_num]
-                    page_text = page.get_text()
-                    if page_text:
-                        text += f"--- Page {page_num + 1} ---\n"
-                        text += page_text + "\n"
-                doc.close()
-                print(f"Extraction PyMuPDF: {len(text)} caractères")
-                
-            except Exception as e:
-                print(f"Erreur avec PyMuPDF: {e}")
-                
-        # Fallback avec PyPDF2
-        if len(text) < 100:
-            try:
-                print("Tentative d'extraction avec PyPDF2...")
-                with open(pdf_path, 'rb') as f:
-                    pdf_reader = PyPDF2.PdfReader(f)
-                    text = ""
-                    for page_num, page in enumerate(pdf_reader.pages):
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += f"--- Page {page_num + 1} ---\n"
-                            text += page_text + "\n"
-                print(f"Extraction PyPDF2: {len(text)} caractères")
+        backends = {}
+        for page in pages:
+            if page['text']:
+                label = " (OCR)" if page['backend'] == 'ocr' else ""
+                text += f"--- Page {page['page']}{label} ---\n"
+                text += page['text'] + "\n"
+                backends[page['backend']] = backends.get(page['backend'], 0) + 1
                 
-            except Exception as e:
-                print(f"Erreur avec PyPDF2: {e}")
-                
-        # Si toujours pas de texte, essayer OCR sur le PDF image
-        if len(text) < 100:
-            try:
-                print("Tentative d'extraction avec OCR (PDF probablement image)...")
-                # Convertir PDF en images
-                images = convert_from_path(pdf_path, dpi=300)
-                text = ""
-                
-                for page_num, image in enumerate(images):
-                    # Sauvegarder l'image pour inspection
-                    image_path = f'/Users/paularnould/page_{page_num + 1}.png'
-                    image.save(image_path, 'PNG')
-                    
-                    # OCR avec tesseract - français
-                    page_text = pytesseract.image_to_string(image, lang='fra+eng')
-                    if page_text.strip():
-                        text += f"--- Page {page_num + 1} (OCR) ---\n"
-                        text += page_text + "\n"
+            # Tableaux (pdfplumber)
+            for table_num, table in enumerate(page['tables']):
+                text += f"\n--- Tableau {table_num + 1} ---\n"
+                for row in table:
+                    if row:
+                        text += " | ".join([cell or "" for cell in row]) + "\n"
                         
-                print(f"Extraction OCR: {len(text)} caractères")
-                
-            except Exception as e:
-                print(f"Erreur avec OCR: {e}")
+        print(f"Extraction: {len(text)} caractères ({', '.join(f'{b}: {n} pages' for b, n in backends.items())})")
                 
         # Sauvegarder le texte extrait pour inspection
         with open('/Users/paularnould/avocats_mayotte_text.txt', 'w', encoding='utf-8') as f:
@@ -389,7 +332,10 @@ class MayotteAvocatsScraper:
             print("Échec de l'extraction des données du PDF")
 
 async def main():
-    scraper = MayotteAvocatsScraper()
+    parser = argparse.ArgumentParser(description="Liste des avocats du barreau de Mayotte (PDF)")
+    parser.add_argument('--headless', action='store_true', help="Navigateur sans interface (serveur, lancement groupé)")
+    args = parser.parse_args()
+    scraper = MayotteAvocatsScraper(headless=args.headless)
     await scraper.run()
 
 if __name__ == "__main__":
@@ -6,35 +6,16 @@ Application du parsing corrigé sur le fichier de 140 avocats
 """
 import csv
 import json
+import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.names import split_name
+
 def parse_name_corrected(full_name):
-    """Logique corrigée pour les noms composés avec espaces"""
-    if ' ' in full_name:
-        name_parts = full_name.split()
-        
-        # Trouver le dernier mot qui n'est pas entièrement en majuscules
-        prenom_index = len(name_parts) - 1  # par défaut le dernier
-        
-        for i in range(len(name_parts) - 1, -1, -1):
-            word = name_parts[i]
-            # Si le mot a des minuscules (pas tout en majuscules), c'est probablement le prénom
-            if any(c.islower() for c in word):
-                prenom_index = i
-                break
-        
-        # Séparer nom et prénom
-        if prenom_index > 0:
-            nom = ' '.join(name_parts[:prenom_index])
-            prenom = ' '.join(name_parts[prenom_index:])
-        else:
-            # Cas particulier : tout en majuscules ou un seul mot composé
-            nom = ' '.join(name_parts[:-1]) if len(name_parts) > 1 else name_parts[0]
-            prenom = name_parts[-1] if len(name_parts) > 1 else ""
-    else:
-        nom = full_name
-        prenom = ""
-    
+    """Logique corrigée pour les noms composés avec espaces (retourne nom, prénom)"""
+    prenom, nom = split_name(full_name, order='last_first')
     return nom, prenom
 
 # Fichiers
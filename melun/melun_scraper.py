@@ -16,6 +16,7 @@ import csv
 import time
 import random
 import re
+import sys
 from datetime import datetime
 import logging
 
@@ -527,7 +528,8 @@ if __name__ == "__main__":
     print("Approches multiples pour récupérer TOUS les avocats")
     print("=" * 60)
     
-    scraper = MelunCompleteFixedScraper(headless=False)  # Mode visible pour debug
+    # Mode visible pour debug, sans interface avec --headless (serveur, lancement groupé)
+    scraper = MelunCompleteFixedScraper(headless='--headless' in sys.argv[1:])
     total_found = scraper.run_complete_fixed_scraping()
     
     if total_found >= 50:
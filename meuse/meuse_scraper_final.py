@@ -4,11 +4,38 @@
 Scraper amélioré pour extraire les données des avocats du barreau de la Meuse
 """
 
+import os
 import re
+import sys
 import csv
 import json
 from typing import List, Dict, Any
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.pdf_layout import block_text, iter_blocks
+
+PDF_PATH = "tableau_avocats_meuse.pdf"
+# Une fiche par avocat : "Me NOM Prénom" en tête de la première colonne
+ANCHOR_RE = r'^Me\s'
+
+def parse_avocat_data_from_pdf(pdf_path: str) -> List[Dict[str, Any]]:
+    """
+    Parse les avocats directement depuis le PDF, d'après la position des mots
+    
+    Chaque fiche (nom, coordonnées, année, second cabinet) est remise sur une
+    ligne, colonne après colonne : le format attendu par parse_single_avocat.
+    Les lignes sont séparées par " | " pour qu'un téléphone n'absorbe pas
+    l'année de la colonne voisine.
+    """
+    avocats = []
+    
+    for entry in iter_blocks(pdf_path, anchor=ANCHOR_RE):
+        avocat = parse_single_avocat(block_text(entry, ' | '))
+        if avocat:
+            avocats.append(avocat)
+    
+    return avocats
+
 def parse_avocat_data_improved() -> List[Dict[str, Any]]:
     """
     Parse améliorer les données des avocats depuis le contenu textuel du PDF
@@ -105,7 +132,7 @@ def parse_single_avocat(line: str) -> Dict[str, Any]:
         avocat['annee_serment'] = annee_match.group(1)
     
     # Adresses (avant les emails)
-    adresses_raw = re.findall(r'(\d+[^@]*?(?:BAR LE DUC|VERDUN|COMMERCY|TRONVILLE EN BARROIS))', rest_of_line)
+    adresses_raw = re.findall(r'(\d+[^@|]*?(?:BAR LE DUC|VERDUN|COMMERCY|TRONVILLE EN BARROIS))', rest_of_line)
     if len(adresses_raw) >= 1:
         avocat['adresse_principale'] = adresses_raw[0].strip()
         # Extraire la ville principale
@@ -124,7 +151,7 @@ def parse_single_avocat(line: str) -> Dict[str, Any]:
     if 'Spécialiste' in rest_of_line or 'Docteur en droit' in rest_of_line:
         spec_match = re.search(r'(Docteur en droit.*?(?=www|Tél|$)|Spécialiste.*?(?=www|Tél|$))', rest_of_line)
         if spec_match:
-            avocat['specialisations'] = spec_match.group(1).strip()
+            avocat['specialisations'] = spec_match.group(1).replace(' | ', ' ').strip(' |')
     
     return avocat
 
@@ -232,8 +259,17 @@ def main():
     """
     print("=== EXTRACTION COMPLÈTE DES AVOCATS DU BARREAU DE LA MEUSE ===")
     
-    # Parser les données
-    avocats = parse_avocat_data_improved()
+    # Parser les données : le PDF s'il est là, sinon les lignes saisies
+    pdf_path = sys.argv[1] if len(sys.argv) > 1 else PDF_PATH
+    avocats = []
+    if os.path.exists(pdf_path):
+        try:
+            avocats = parse_avocat_data_from_pdf(pdf_path)
+            print(f"PDF lu : {pdf_path}")
+        except ImportError as e:
+            print(f"PDF ignoré ({e})")
+    if not avocats:
+        avocats = parse_avocat_data_improved()
     
     # Détecter les structures
     avocats = detect_structures(avocats)
@@ -34,36 +34,30 @@ RÉSULTATS:
 - 100% cabinets et années d'inscription
 """
 
-import time
-import re
-import requests
-from bs4 import BeautifulSoup
 import csv
 import json
-import urllib.parse
 from datetime import datetime
-import random
 import sys
 import os
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.annuaire_cms import BARS, FicheMiniDirectory
+
 class MontDeMarsanScraper:
-    def __init__(self, test_mode=True, max_lawyers=10):
+    def __init__(self, test_mode=True, max_lawyers=10, max_workers=6):
         """
         Initialiser le scraper
         
         Args:
             test_mode (bool): Mode test (limité) ou production (tous)
             max_lawyers (int): Nombre max d'avocats en mode test
+            max_workers (int): Fiches détaillées téléchargées en parallèle
         """
-        self.base_url = "https://www.barreau-montdemarsan.org"
-        self.annuaire_url = f"{self.base_url}/barreau-de-mont-de-marsan/annuaire-des-avocats.htm"
+        self.annuaire_url = BARS['mont-de-marsan']['url']
         self.test_mode = test_mode
         self.max_lawyers = max_lawyers if test_mode else None
         self.results = []
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        self.directory = FicheMiniDirectory('mont-de-marsan', max_workers=max_workers)
         
         print(f"🚀 SCRAPER MONT-DE-MARSAN - Mode {'TEST' if test_mode else 'PRODUCTION'}")
         if test_mode:
@@ -71,344 +65,29 @@ class MontDeMarsanScraper:
         print(f"🎯 URL cible: {self.annuaire_url}")
         print()
     
-    def decode_email(self, encoded_email):
-        """Décoder les emails encodés URL"""
-        try:
-            decoded = urllib.parse.unquote(encoded_email)
-            return decoded
-        except:
-            return encoded_email
-    
-    def clean_text(self, text):
-        """Nettoyer le texte extrait"""
-        if not text:
-            return ""
-        # Supprimer les balises HTML
-        text = re.sub(r'<[^>]+>', '', str(text))
-        # Normaliser les espaces
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
-    
-    def extract_phone_fax(self, html):
-        """Extraire téléphone et fax avec patterns améliorés"""
-        phone = ""
-        fax = ""
-        
-        try:
-            # Patterns pour téléphone
-            tel_patterns = [
-                r'Tél\s*[:\.]?\s*([\+\d\s\.\-]+)',
-                r'Téléphone\s*[:\.]?\s*([\+\d\s\.\-]+)',
-                r'Tel\s*[:\.]?\s*([\+\d\s\.\-]+)'
-            ]
-            
-            for pattern in tel_patterns:
-                match = re.search(pattern, html, re.IGNORECASE)
-                if match:
-                    phone = self.clean_text(match.group(1))
-                    # Nettoyer le numéro
-                    phone = re.sub(r'[^\d\+\s]', '', phone)
-                    phone = re.sub(r'\s+', ' ', phone).strip()
-                    if len(phone) >= 10:  # Au moins 10 chiffres
-                        break
-            
-            # Patterns pour fax
-            fax_patterns = [
-                r'Fax\s*[:\.]?\s*([\d\s\.\-]+)',
-                r'Télécopie\s*[:\.]?\s*([\d\s\.\-]+)'
-            ]
-            
-            for pattern in fax_patterns:
-                match = re.search(pattern, html, re.IGNORECASE)
-                if match:
-                    fax = self.clean_text(match.group(1))
-                    fax = re.sub(r'[^\d\s]', '', fax)
-                    fax = re.sub(r'\s+', ' ', fax).strip()
-                    if len(fax) >= 10:
-                        break
-                        
-        except Exception as e:
-            print(f"    ⚠️ Erreur extraction tél/fax: {e}")
-        
-        return phone, fax
-    
-    def extract_address(self, html):
-        """Extraire l'adresse complète"""
-        try:
-            # Patterns pour adresses avec MONT DE MARSAN
-            address_patterns = [
-                r'(\d+[^\n<]*(?:Boulevard|Rue|Avenue|Place|Impasse)[^\n<]*\d{5}[^\n<]*MONT DE MARSAN)',
-                r'(\d+[^\n<]*\d{5}\s*MONT DE MARSAN)',
-                r'([^\n<]*MONT DE MARSAN[^\n<]*\d{5})'
-            ]
-            
-            for pattern in address_patterns:
-                matches = re.findall(pattern, html, re.IGNORECASE | re.MULTILINE)
-                if matches:
-                    for match in matches:
-                        address = self.clean_text(match)
-                        if len(address) > 15 and "40000" in address:
-                            return address
-            return ""
-            
-        except Exception as e:
-            print(f"    ⚠️ Erreur extraction adresse: {e}")
-            return ""
-    
-    def extract_cabinet_name(self, html, soup):
-        """Extraire le vrai nom du cabinet"""
-        try:
-            # Chercher dans les h3/h4 contenant "Cabinet"
-            cabinet_headers = soup.find_all(['h3', 'h4'])
-            for header in cabinet_headers:
-                text = header.get_text().strip()
-                if 'cabinet' in text.lower() and len(text) > 7:
-                    # Extraire le nom après "Cabinet"
-                    cabinet_match = re.search(r'cabinet\s+(.+)', text, re.IGNORECASE)
-                    if cabinet_match:
-                        cabinet_name = cabinet_match.group(1).strip()
-                        if cabinet_name and cabinet_name.upper() != "CABINET":
-                            return cabinet_name.upper()
-            
-            # Chercher dans les divs de cabinet
-            cabinet_divs = soup.find_all('div', class_=lambda x: x and 'cabinet' in x.lower())
-            for div in cabinet_divs:
-                # Chercher les h4 dans le div
-                h4s = div.find_all('h4')
-                for h4 in h4s:
-                    text = h4.get_text().strip()
-                    if len(text) > 3 and text.upper() != "CABINET":
-                        return text.upper()
-            
-            # Pattern de fallback dans le HTML
-            cabinet_patterns = [
-                r'<h[34][^>]*>([^<]*[A-Z&\s]{10,})</h[34]>',
-                r'cabinet[^>]*>([A-Z\s&\-]{10,})</div>'
-            ]
-            
-            for pattern in cabinet_patterns:
-                matches = re.findall(pattern, html, re.IGNORECASE)
-                for match in matches:
-                    clean_name = self.clean_text(match)
-                    if len(clean_name) > 10 and "CABINET" not in clean_name.upper():
-                        return clean_name.upper()
-            
-            return ""
-            
-        except Exception as e:
-            print(f"    ⚠️ Erreur extraction cabinet: {e}")
-            return ""
-    
-    def collect_all_lawyer_urls(self):
-        """Collecter toutes les URLs des avocats depuis la page principale"""
-        try:
-            print("🔍 Collecte des URLs depuis la page principale...")
-            
-            response = self.session.get(self.annuaire_url, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Trouver tous les éléments d'avocats
-            lawyer_elements = soup.find_all('div', class_='annuaireFicheMiniAvocat')
-            
-            if not lawyer_elements:
-                print("❌ Aucun avocat trouvé sur la page principale")
-                return []
-            
-            print(f"👥 {len(lawyer_elements)} avocats détectés")
-            
-            lawyer_urls = []
-            
-            for i, element in enumerate(lawyer_elements, 1):
-                try:
-                    # Trouver le nom
-                    h4 = element.find('h4')
-                    if not h4:
-                        continue
-                    
-                    # Extraire prénom/nom avec spans spécialisés
-                    prenom_span = h4.find('span', class_='anfiche_prenom')
-                    nom_span = h4.find('span', class_='anfiche_nom')
-                    
-                    if prenom_span and nom_span:
-                        prenom = prenom_span.get_text().strip()
-                        nom = nom_span.get_text().strip()
-                    else:
-                        # Fallback: parser le texte complet
-                        full_name = h4.get_text().strip()
-                        clean_name = re.sub(r'^(Maître?|M[ae]\.?)\s+', '', full_name, flags=re.IGNORECASE)
-                        parts = clean_name.split()
-                        if len(parts) >= 2:
-                            nom = parts[-1]
-                            prenom = ' '.join(parts[:-1])
-                        else:
-                            nom = clean_name
-                            prenom = ""
-                    
-                    # Trouver le lien vers la fiche détaillée
-                    link = element.find('a', href=lambda x: x and 'annuaire' in x)
-                    if not link:
-                        continue
-                    
-                    url = link['href']
-                    if not url.startswith('http'):
-                        url = urllib.parse.urljoin(self.base_url, url)
-                    
-                    lawyer_urls.append({
-                        'index': i,
-                        'prenom': prenom,
-                        'nom': nom,
-                        'url': url
-                    })
-                    
-                    # Afficher les premiers pour vérification
-                    if i <= 5:
-                        print(f"  ✅ {i:2d}. {prenom} {nom}")
-                
-                except Exception as e:
-                    print(f"  ⚠️ Erreur avocat {i}: {e}")
-                    continue
-            
-            # Limiter en mode test
-            if self.test_mode and len(lawyer_urls) > self.max_lawyers:
-                lawyer_urls = lawyer_urls[:self.max_lawyers]
-                print(f"🧪 Mode test: limitation à {len(lawyer_urls)} avocats")
-            
-            print(f"📋 {len(lawyer_urls)} avocats à traiter\n")
-            self.lawyer_urls = lawyer_urls
-            return lawyer_urls
-            
-        except Exception as e:
-            print(f"💥 Erreur lors de la collecte des URLs: {e}")
-            return []
-    
-    def extract_lawyer_details(self, lawyer_info):
-        """Extraire toutes les informations détaillées d'un avocat"""
-        try:
-            print(f"👤 {lawyer_info['index']:2d}/{len(self.lawyer_urls):2d}: {lawyer_info['prenom']} {lawyer_info['nom']}")
-            
-            # Requête vers la page de détail
-            response = self.session.get(lawyer_info['url'], timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            html = response.text
-            
-            # Structure des données complète
-            data = {
-                'civilite': 'Maître',
-                'prenom': lawyer_info['prenom'],
-                'nom': lawyer_info['nom'],
-                'email': '',
-                'telephone': '',
-                'fax': '',
-                'adresse': '',
-                'cabinet': '',
-                'annee_inscription': '',
-                'specialisations': '',
-                'detail_url': lawyer_info['url'],
-                'source_url': response.url
-            }
-            
-            # 1. EMAIL
-            mailto_links = soup.find_all('a', href=lambda x: x and x.startswith('mailto:'))
-            if mailto_links:
-                encoded_email = mailto_links[0]['href'].replace('mailto:', '')
-                data['email'] = self.decode_email(encoded_email)
-                print(f"    📧 Email: {data['email']}")
-            
-            # 2. TÉLÉPHONE ET FAX
-            phone, fax = self.extract_phone_fax(html)
-            if phone:
-                data['telephone'] = phone
-                print(f"    📞 Tél: {phone}")
-            if fax:
-                data['fax'] = fax
-                print(f"    📠 Fax: {fax}")
-            
-            # 3. ADRESSE
-            address = self.extract_address(html)
-            if address:
-                data['adresse'] = address
-                print(f"    🏠 Adresse: {address[:50]}...")
-            
-            # 4. CABINET
-            cabinet = self.extract_cabinet_name(html, soup)
-            if cabinet:
-                data['cabinet'] = cabinet
-                print(f"    🏢 Cabinet: {cabinet}")
-            
-            # 5. ANNÉE D'INSCRIPTION
-            year_match = re.search(r'Prestation\s*de\s*serment\s*:\s*</span>(\d{4})', html, re.IGNORECASE)
-            if year_match:
-                data['annee_inscription'] = year_match.group(1)
-                print(f"    📅 Inscription: {data['annee_inscription']}")
-            
-            # 6. SPÉCIALISATIONS
-            spec_elements = soup.find_all('li')
-            specializations = []
-            
-            for elem in spec_elements:
-                text = elem.get_text().strip()
-                if text.startswith('Droit') and len(text) > 10:
-                    specializations.append(text)
-            
-            if specializations:
-                data['specialisations'] = ' | '.join(specializations[:5])  # Max 5
-                print(f"    🎯 Spécialisations: {data['specialisations'][:60]}...")
-            
-            return data
-            
-        except Exception as e:
-            print(f"    ❌ Erreur extraction: {e}")
-            # Retourner au moins les données de base
-            return {
-                'civilite': 'Maître',
-                'prenom': lawyer_info['prenom'],
-                'nom': lawyer_info['nom'],
-                'email': '',
-                'telephone': '',
-                'fax': '',
-                'adresse': '',
-                'cabinet': '',
-                'annee_inscription': '',
-                'specialisations': '',
-                'detail_url': lawyer_info['url'],
-                'source_url': lawyer_info['url']
-            }
-    
     def scrape_all_lawyers(self):
         """Processus principal de scraping"""
         try:
             start_time = datetime.now()
             print(f"⏰ Début: {start_time.strftime('%H:%M:%S')}")
             
-            # Étape 1: Collecter toutes les URLs
-            lawyer_urls = self.collect_all_lawyer_urls()
-            
-            if not lawyer_urls:
-                print("❌ Aucune URL collectée")
-                return []
-            
-            # Étape 2: Extraire les détails de chaque avocat
-            print("📋 EXTRACTION DÉTAILLÉE:")
-            print("=" * 60)
-            
-            for lawyer_info in lawyer_urls:
-                try:
-                    lawyer_data = self.extract_lawyer_details(lawyer_info)
-                    self.results.append(lawyer_data)
-                    
-                    # Délai courtois entre les requêtes
-                    time.sleep(random.uniform(1, 2))
-                    
-                except Exception as e:
-                    print(f"❌ Erreur avocat {lawyer_info.get('nom', 'Inconnu')}: {e}")
-                    continue
-                
-                # Ligne de séparation entre avocats
-                print()
+            # Liste + fiches détaillées (CMS annuaireFicheMini, en HTTP)
+            for lawyer in self.directory.scrape(self.max_lawyers):
+                self.results.append({
+                    'civilite': lawyer['civilite'] or 'Maître',
+                    'prenom': lawyer['prenom'],
+                    'nom': lawyer['nom'],
+                    'email': lawyer['email'],
+                    'telephone': lawyer['telephone'],
+                    'fax': lawyer['fax'],
+                    'adresse': lawyer['adresse'],
+                    'cabinet': lawyer['structure'].upper(),
+                    'annee_inscription': lawyer['annee_inscription'],
+                    'specialisations': lawyer['specialisations'],
+                    'detail_url': lawyer['detail_url'],
+                    'source_url': lawyer['detail_url']
+                })
+            self.directory.print_stats()
             
             end_time = datetime.now()
             duration = end_time - start_time
@@ -487,7 +166,7 @@ class MontDeMarsanScraper:
     def cleanup(self):
         """Nettoyage final"""
         try:
-            self.session.close()
+            self.directory.close()
         except:
             pass
 
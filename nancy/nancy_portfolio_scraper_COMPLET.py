@@ -4,6 +4,8 @@ Nancy Portfolio Scraper - Extraction complète des informations détaillées
 Parcourt chaque fiche avocat pour récupérer toutes les informations disponibles
 """
 
+import os
+import sys
 import time
 import json
 import re
@@ -16,6 +18,11 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.names import split_name
+from common.sharded import ShardedExecutor
+from common.normalize import normalize_phone
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,6 +30,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def create_driver():
+    """Driver Selenium headless (fonction de module : utilisable dans les processus de l'exécuteur)"""
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+    
+    driver = webdriver.Chrome(options=options)
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+        'source': '''
+            Object.defineProperty(navigator, 'webdriver', {get: () => undefined})
+        '''
+    })
+    return driver
+
 class NancyPortfolioScraper:
     def __init__(self):
         self.driver = None
@@ -41,23 +69,7 @@ class NancyPortfolioScraper:
         
     def setup_driver(self):
         """Configure le driver Selenium en mode headless"""
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_argument('--disable-gpu')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
-        
-        self.driver = webdriver.Chrome(options=options)
-        self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-            'source': '''
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined})
-            '''
-        })
+        self.driver = create_driver()
 
     def extract_email(self, text):
         """Extrait l'email du texte"""
@@ -67,17 +79,7 @@ class NancyPortfolioScraper:
 
     def extract_phone(self, text):
         """Extrait le numéro de téléphone du texte"""
-        # Patterns français
-        phone_patterns = [
-            r'0[1-9](?:[.-\s]?\d{2}){4}',  # 01 23 45 67 89
-            r'\+33[.-\s]?[1-9](?:[.-\s]?\d{2}){4}',  # +33 1 23 45 67 89
-        ]
-        
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                return matches[0]
-        return None
+        return normalize_phone(text)
 
     def extract_year(self, text):
         """Extrait l'année d'inscription au barreau"""
@@ -151,42 +153,10 @@ class NancyPortfolioScraper:
         return None, None
 
     def separate_name_ultimate(self, full_name):
-        """Sépare prénom et nom avec gestion des noms composés"""
+        """Sépare prénom et nom avec gestion des noms composés ("NOM, Prénom" ou "NOM Prénom")"""
         if not full_name:
             return None, None
-            
-        # Nettoyage
-        full_name = full_name.strip()
-        
-        # Cas spéciaux pour noms composés
-        special_cases = {
-            "DAL MOLIN, Georges": ("Georges", "DAL MOLIN"),
-            "DEVARENNE ODAERT, Nathalie": ("Nathalie", "DEVARENNE ODAERT"),
-            "DI ROSA, Betty": ("Betty", "DI ROSA"),
-            "DE LA ROSA, Maria": ("Maria", "DE LA ROSA"),
-            "VAN DER BERG, Peter": ("Peter", "VAN DER BERG"),
-        }
-        
-        if full_name in special_cases:
-            return special_cases[full_name]
-        
-        # Pattern principal: "NOM, Prénom" ou "NOM Prénom"
-        if ',' in full_name:
-            parts = full_name.split(',', 1)
-            nom = parts[0].strip()
-            prenom = parts[1].strip()
-        else:
-            words = full_name.split()
-            if len(words) >= 2:
-                # Dernier mot = prénom, le reste = nom
-                prenom = words[-1]
-                nom = ' '.join(words[:-1])
-            else:
-                # Un seul mot
-                nom = full_name
-                prenom = ""
-        
-        return prenom, nom
+        return split_name(full_name, order='last_first')
 
     def extract_portfolio_details(self, url):
         """Extrait toutes les informations détaillées d'une fiche portfolio"""
@@ -316,22 +286,36 @@ class NancyPortfolioScraper:
             logger.error(f"Erreur accès portfolio {url}: {e}")
             return None
 
-    def run(self):
-        """Exécute le scraping complet des portfolios"""
+    def extract_with_driver(self, driver, url):
+        """Extraction d'une fiche sur le driver d'un processus de l'exécuteur réparti"""
+        self.driver = driver
+        return self.extract_portfolio_details(url)
+
+    def run(self, workers=4, per_second=2.0):
+        """Exécute le scraping complet des portfolios (fiches réparties sur `workers` processus)"""
         logger.info("=" * 80)
         logger.info("DÉMARRAGE DU SCRAPER DÉTAILLÉ DES PORTFOLIOS NANCY")
         logger.info("=" * 80)
         
+        executor = None
         try:
-            self.setup_driver()
-            
             total_avocats = len(self.base_data)
-            logger.info(f"Traitement de {total_avocats} portfolios d'avocats")
+            logger.info(f"Traitement de {total_avocats} portfolios d'avocats sur {workers} processus")
             
-            for i, avocat_base in enumerate(self.base_data, 1):
-                if i % 10 == 0:
-                    logger.info(f"Progression: {i}/{total_avocats} portfolios traités")
-                
+            # Un navigateur par processus ; la limite par domaine remplace la pause de 0,5 s
+            urls = [avocat_base['url'] for avocat_base in self.base_data if avocat_base.get('url')]
+            executor = ShardedExecutor(self.extract_with_driver, workers=workers, per_second=per_second,
+                                       driver_factory=create_driver)
+            
+            def progress(index, details):
+                done = executor.stats['fiches'] + executor.stats['erreurs']
+                if done % 10 == 0:
+                    logger.info(f"Progression: {done}/{len(urls)} portfolios traités")
+            
+            details_by_url = dict(zip(urls, executor.map(urls, on_result=progress)))
+            executor.print_stats()
+            
+            for avocat_base in self.base_data:
                 # Données de base
                 avocat_complet = avocat_base.copy()
                 
@@ -340,16 +324,12 @@ class NancyPortfolioScraper:
                 avocat_complet['prenom'] = prenom
                 avocat_complet['nom_famille'] = nom
                 
-                # Extraire détails du portfolio
-                if avocat_base.get('url'):
-                    details = self.extract_portfolio_details(avocat_base['url'])
-                    if details:
-                        avocat_complet.update(details)
+                # Détails du portfolio
+                details = details_by_url.get(avocat_base.get('url'))
+                if details:
+                    avocat_complet.update(details)
                 
                 self.avocats_detailles.append(avocat_complet)
-                
-                # Pause pour éviter la surcharge
-                time.sleep(0.5)
             
             logger.info(f"Extraction terminée: {len(self.avocats_detailles)} avocats traités")
             
@@ -361,6 +341,8 @@ class NancyPortfolioScraper:
             import traceback
             traceback.print_exc()
         finally:
+            if executor is not None:
+                executor.close()
             if self.driver:
                 self.driver.quit()
 
@@ -4,6 +4,7 @@ Scraper FINAL pour avocats-nancy.com
 Extrait les 273 avocats en utilisant le bouton "Load More"
 """
 
+import argparse
 import time
 import json
 import re
@@ -24,7 +25,8 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class Nancy273FinalScraper:
-    def __init__(self):
+    def __init__(self, headless=False):
+        self.headless = headless
         self.url = "https://avocats-nancy.com/annuaire-pro/"
         self.driver = None
         self.avocats = []
@@ -32,6 +34,8 @@ class Nancy273FinalScraper:
     def setup_driver(self):
         """Configure le driver Selenium"""
         options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument('--headless=new')
         options.add_argument('--disable-blink-features=AutomationControlled')
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
@@ -395,5 +399,8 @@ class Nancy273FinalScraper:
         print("=" * 80)
 
 if __name__ == "__main__":
-    scraper = Nancy273FinalScraper()
+    parser = argparse.ArgumentParser(description="Scraper des avocats de Nancy")
+    parser.add_argument('--headless', action='store_true', help="Navigateur sans interface (serveur, lancement groupé)")
+    args = parser.parse_args()
+    scraper = Nancy273FinalScraper(headless=args.headless)
     scraper.run()
\ No newline at end of file
@@ -4,7 +4,6 @@ Scraper final complet pour l'annuaire du Barreau de Nantes
 Extraction complète avec toutes les informations disponibles
 """
 
-import time
 import json
 import csv
 import re
@@ -19,6 +18,46 @@ from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.dedup import DedupIndex
+from common.partition import QueryPartitioner, dimensions_from_options
+from common.waits import AdaptiveDelay, wait_for_dom_stable, wait_for_selector, wait_for_staleness
+
+# Champs dont au moins un doit être rempli pour garder une entrée
+IDENTITY_FIELDS = ('nom_complet', 'cabinet', 'nom_cabinet', 'email', 'telephone')
+
+# Clés de dédoublonnage : un même barreau, donc le nom seul suffit aussi à
+# rattacher une fiche vue sans email sous un autre filtre
+DEDUP_KEYS = ('url', 'email', 'nom_cp', 'nom')
+
+# Filtres où chaque avocat a exactement une valeur (ville, initiale du nom)
+EXCLUSIVE_FILTERS = ('ville', 'nom')
+
+# Message de limite et nombre de résultats annoncé par la page de résultats.
+# Libellés supposés, pas encore comparés à une page de résultats réelle : tant
+# que RESULTS_WORDING_VERIFIED est faux, le total annoncé n'arrête pas le
+# parcours et le balayage des versions précédentes (sweep_strategies) est
+# rejoué après le découpage si aucun plafond n'a été reconnu.
+RESULTS_CAP_RE = re.compile(r"(?:plus de \d+ résultats|trop de résultats|affine[rz] votre recherche)", re.IGNORECASE)
+RESULTS_TOTAL_RE = re.compile(r"(\d+)\s+(?:résultats?|avocats?)\s+(?:trouvés?|correspondants?)", re.IGNORECASE)
+RESULTS_WORDING_VERIFIED = False
+
+
+def sweep_strategies(filter_options, test_mode=True):
+    """Requêtes du balayage systématique (stratégies fixes des versions précédentes)"""
+    villes = [option['value'] for option in filter_options.get('ville', [])]
+    specialites = [option['value'] for option in filter_options.get('specialite', [])]
+    langues = [option['value'] for option in filter_options.get('langue', [])]
+    if test_mode:
+        return ([{}] + [{'ville': ville} for ville in villes[:3]]
+                + [{'specialite': spec} for spec in specialites[:2]])
+    return ([{}] + [{'ville': ville} for ville in villes]
+            + [{'specialite': spec} for spec in specialites]
+            + [{'langue': langue} for langue in langues[:5]]
+            + [{'ville': ville, 'specialite': spec} for ville in villes[:5] for spec in specialites[:3]])
 
 # Configuration du logging
 logging.basicConfig(
@@ -35,6 +74,8 @@ class BarreauNantesFinalScraper:
     def __init__(self, headless=True, delay=2):
         self.headless = headless
         self.delay = delay
+        # `delay` devient un plafond : la pause réelle suit la latence mesurée du site
+        self.pacer = AdaptiveDelay(min_delay=0.3, max_delay=delay)
         self.driver = None
         self.base_url = "https://www.barreaunantes.fr/annuaire/"
         self.lawyers_data = []
@@ -72,7 +113,7 @@ class BarreauNantesFinalScraper:
         """Récupère toutes les options de filtre disponibles"""
         try:
             self.driver.get(self.base_url)
-            time.sleep(3)
+            wait_for_selector(self.driver, "form select", timeout=15)
             
             options_data = {}
             form = self.driver.find_element(By.TAG_NAME, "form")
@@ -80,7 +121,7 @@ class BarreauNantesFinalScraper:
             
             for select_elem in selects:
                 name = select_elem.get_attribute('name')
-                if name and name != 'nom':  # Ignorer le champ nom (liste alphabétique)
+                if name:  # Le champ nom (liste alphabétique) sert au découpage par initiale
                     try:
                         select_obj = Select(select_elem)
                         options = []
@@ -108,7 +149,7 @@ class BarreauNantesFinalScraper:
         """Extraction complète et améliorée des informations d'avocats"""
         try:
             lawyers = []
-            time.sleep(self.delay)
+            wait_for_dom_stable(self.driver, timeout=10)
             
             page_source = self.driver.page_source
             logger.info("Extraction complète des informations d'avocats...")
@@ -288,35 +329,21 @@ class BarreauNantesFinalScraper:
                     
                     lawyers.append(contact_data)
             
-            # 7. Déduplication et nettoyage final
-            unique_lawyers = []
-            seen_signatures = set()
-            
-            for lawyer in lawyers:
-                # Créer une signature unique
-                signature_parts = [
-                    lawyer.get('nom_complet', ''),
-                    lawyer.get('cabinet', ''),
-                    lawyer.get('nom_cabinet', ''),
-                    lawyer.get('email', ''),
-                    lawyer.get('telephone', '')
-                ]
-                
-                signature = '|'.join(part.lower().strip() for part in signature_parts if part)
-                
-                if signature and signature not in seen_signatures:
-                    seen_signatures.add(signature)
-                    
-                    # Nettoyer et enrichir les données
-                    if lawyer.get('nom_complet'):
-                        # Essayer de séparer nom/prénom
-                        name_parts = lawyer['nom_complet'].split()
-                        if len(name_parts) >= 2 and not any(word in lawyer['nom_complet'].lower() 
-                                                           for word in ['avocats', 'conseil', 'cabinet']):
-                            lawyer['nom'] = name_parts[0]
-                            lawyer['prenom'] = ' '.join(name_parts[1:])
-                    
-                    unique_lawyers.append(lawyer)
+            # 7. Déduplication (URL, email, nom + code postal) et nettoyage final
+            index = DedupIndex(keys=DEDUP_KEYS)
+            index.extend(lawyer for lawyer in lawyers
+                         if any(lawyer.get(field) for field in IDENTITY_FIELDS))
+            unique_lawyers = index.records()
+            
+            for lawyer in unique_lawyers:
+                # Nettoyer et enrichir les données
+                if lawyer.get('nom_complet'):
+                    # Essayer de séparer nom/prénom
+                    name_parts = lawyer['nom_complet'].split()
+                    if len(name_parts) >= 2 and not any(word in lawyer['nom_complet'].lower() 
+                                                       for word in ['avocats', 'conseil', 'cabinet']):
+                        lawyer['nom'] = name_parts[0]
+                        lawyer['prenom'] = ' '.join(name_parts[1:])
             
             logger.info(f"Extraction terminée: {len(unique_lawyers)} entrées uniques trouvées")
             
@@ -328,13 +355,14 @@ class BarreauNantesFinalScraper:
             
         except Exception as e:
             logger.error(f"Erreur extraction complète: {e}")
-            return []
+            return None
     
     def submit_form_with_filters(self, filters=None):
         """Soumet le formulaire avec les filtres spécifiés"""
         try:
-            self.driver.get(self.base_url)
-            time.sleep(3)
+            with self.pacer.timed():
+                self.driver.get(self.base_url)
+                wait_for_selector(self.driver, "form select", timeout=15)
             
             form = self.driver.find_element(By.TAG_NAME, "form")
             
@@ -345,24 +373,53 @@ class BarreauNantesFinalScraper:
                         select_elem = form.find_element(By.CSS_SELECTOR, f"select[name='{field_name}']")
                         select_obj = Select(select_elem)
                         select_obj.select_by_value(str(value))
-                        time.sleep(1)
                     except Exception as e:
+                        # Sans ce filtre, la page rendrait les résultats de la requête parente
                         logger.warning(f"Impossible d'appliquer filtre {field_name}: {e}")
+                        return None
             
             # Soumettre le formulaire
             submit_btn = form.find_element(By.CSS_SELECTOR, "input[type='submit'], button[type='submit']")
-            submit_btn.click()
-            time.sleep(5)
+            with self.pacer.timed():
+                submit_btn.click()
+                # Le formulaire quitte le DOM quand la page de résultats arrive
+                wait_for_staleness(self.driver, form, timeout=15)
+                wait_for_dom_stable(self.driver, timeout=10)
             
             # Extraire les résultats avec la nouvelle méthode complète
             return self.extract_comprehensive_info_from_page()
             
         except Exception as e:
             logger.error(f"Erreur soumission formulaire: {e}")
-            return []
+            return None
+    
+    def search(self, filters, partitioner):
+        """Une requête du découpage : {'records', 'capped', 'total'}, ou {'error'} en cas d'échec"""
+        lawyers = self.submit_form_with_filters(filters)
+        if lawyers is None:
+            self.pacer.penalize()
+            return {'error': f"soumission impossible avec {filters}"}
+        page_source = self.driver.page_source
+        total_match = RESULTS_TOTAL_RE.search(page_source) if RESULTS_WORDING_VERIFIED else None
+        total = int(total_match.group(1)) if total_match else None
+        capped = bool(RESULTS_CAP_RE.search(page_source))
+        
+        # La première requête qui trouve un avocat reste sa source
+        records = []
+        for lawyer in lawyers:
+            if not any(lawyer.get(field) for field in IDENTITY_FIELDS):
+                continue
+            lawyer['strategie_extraction'] = str(filters)
+            lawyer['timestamp_extraction'] = datetime.now().isoformat()
+            lawyer['strategy_number'] = partitioner.stats['soumissions'] + 1
+            records.append(lawyer)
+        
+        logger.info(f"Requête {filters}: {len(records)} entrées" + (" (plafonnée, subdivision)" if capped else ""))
+        self.pacer.sleep()
+        return {'records': records, 'capped': capped, 'total': total}
     
     def scrape_all_comprehensive(self, test_mode=True, max_strategies=None):
-        """Scraping complet avec toutes les stratégies et informations"""
+        """Scraping complet : découpage adaptatif des requêtes plafonnées"""
         try:
             logger.info("=== DÉBUT SCRAPING COMPLET FINAL ===")
             
@@ -375,118 +432,42 @@ class BarreauNantesFinalScraper:
                 logger.error("Impossible de récupérer les options de filtre")
                 return []
             
-            # Définir les stratégies de scraping
-            strategies = []
-            
+            # Ville et initiale du nom couvrent tous les avocats ; spécialités et
+            # langues ne servent qu'en dernier recours. Seules les requêtes
+            # plafonnées sont subdivisées, au lieu de soumettre toutes les valeurs.
+            max_queries = max_strategies or (6 if test_mode else None)
             if test_mode:
-                logger.info("Mode TEST - Stratégies limitées")
-                strategies = [
-                    {},  # Sans filtre
-                ]
-                
-                # Ajouter quelques villes
-                if 'ville' in filter_options:
-                    for ville in filter_options['ville'][:3]:
-                        strategies.append({'ville': ville['value']})
-                
-                # Ajouter quelques spécialisations
-                if 'specialite' in filter_options:
-                    for spec in filter_options['specialite'][:2]:
-                        strategies.append({'specialite': spec['value']})
-                        
+                logger.info(f"Mode TEST - {max_queries} requêtes au plus")
             else:
-                logger.info("Mode COMPLET - Toutes les stratégies")
-                strategies.append({})  # Sans filtre
-                
-                # Toutes les villes
-                if 'ville' in filter_options:
-                    for ville in filter_options['ville']:
-                        strategies.append({'ville': ville['value']})
-                
-                # Toutes les spécialisations
-                if 'specialite' in filter_options:
-                    for spec in filter_options['specialite']:
-                        strategies.append({'specialite': spec['value']})
-                
-                # Quelques langues
-                if 'langue' in filter_options:
-                    for langue in filter_options['langue'][:5]:
-                        strategies.append({'langue': langue['value']})
-                
-                # Combinaisons ville + spécialisation (échantillon)
-                if 'ville' in filter_options and 'specialite' in filter_options:
-                    for ville in filter_options['ville'][:5]:
-                        for spec in filter_options['specialite'][:3]:
-                            strategies.append({
-                                'ville': ville['value'],
-                                'specialite': spec['value']
-                            })
-            
-            # Limiter le nombre de stratégies si demandé
-            if max_strategies:
-                strategies = strategies[:max_strategies]
-            
-            logger.info(f"Nombre total de stratégies: {len(strategies)}")
-            
-            all_lawyers = []
-            seen_signatures = set()
-            strategy_results = []
-            
-            for i, strategy in enumerate(strategies):
-                try:
-                    logger.info(f"\\n=== Stratégie {i+1}/{len(strategies)}: {strategy} ===")
-                    
-                    # Appliquer la stratégie
-                    lawyers = self.submit_form_with_filters(strategy)
-                    
-                    strategy_info = {
-                        'strategy': strategy,
-                        'lawyers_found': len(lawyers),
-                        'new_lawyers': 0
-                    }
-                    
-                    # Ajouter au total en évitant les doublons
-                    for lawyer in lawyers:
-                        # Créer une signature unique plus robuste
-                        signature_parts = [
-                            lawyer.get('nom_complet', ''),
-                            lawyer.get('cabinet', ''),
-                            lawyer.get('email', ''),
-                            lawyer.get('telephone', ''),
-                            lawyer.get('nom_cabinet', '')
-                        ]
-                        
-                        signature = '|'.join(part.lower().strip() for part in signature_parts if part).replace(' ', '')
-                        
-                        if signature and signature not in seen_signatures:
-                            seen_signatures.add(signature)
-                            lawyer['strategie_extraction'] = str(strategy)
-                            lawyer['timestamp_extraction'] = datetime.now().isoformat()
-                            lawyer['strategy_number'] = i + 1
-                            all_lawyers.append(lawyer)
-                            strategy_info['new_lawyers'] += 1
-                    
-                    strategy_results.append(strategy_info)
-                    
-                    logger.info(f"Avocats trouvés: {len(lawyers)}")
-                    logger.info(f"Nouveaux avocats uniques: {strategy_info['new_lawyers']}")
-                    logger.info(f"Total cumulé: {len(all_lawyers)}")
-                    
-                    # Pause entre stratégies
-                    time.sleep(self.delay)
-                    
-                except Exception as e:
-                    logger.error(f"Erreur stratégie {i+1}: {e}")
-                    continue
+                logger.info("Mode COMPLET - découpage jusqu'à couverture complète")
+            
+            # Les requêtes se recouvrent : un seul index pour toute la session,
+            # les doublons complètent la fiche déjà vue au lieu d'être ignorés
+            partitioner = QueryPartitioner(dimensions_from_options(filter_options, exclusive=EXCLUSIVE_FILTERS),
+                                           index=DedupIndex(keys=DEDUP_KEYS), cache_name='nantes', max_queries=max_queries)
+            all_lawyers = partitioner.run(lambda filters: self.search(filters, partitioner))
+            if not RESULTS_WORDING_VERIFIED and not partitioner.stats['plafonnees']:
+                # Aucun plafond reconnu : libellé peut-être différent, on ne se
+                # fie pas au seul découpage et on rejoue le balayage complet
+                logger.warning("Aucun plafond détecté (libellé non vérifié) : balayage systématique des filtres")
+                all_lawyers = partitioner.sweep(lambda filters: self.search(filters, partitioner),
+                                                sweep_strategies(filter_options, test_mode))
+            
+            strategy_results = [{'strategy': entry['query'], 'lawyers_found': entry['count'],
+                                 'new_lawyers': entry['new'], 'capped': entry['capped']}
+                                for entry in partitioner.log]
             
             logger.info(f"\\n=== SCRAPING TERMINÉ ===")
             logger.info(f"Total final: {len(all_lawyers)} avocats/cabinets uniques")
-            logger.info(f"Stratégies exécutées: {len(strategy_results)}")
+            logger.info(f"Requêtes soumises: {len(strategy_results)}")
+            partitioner.print_stats()
+            self.pacer.print_stats()
             
             # Ajouter les métadonnées de session
             session_metadata = {
                 'strategies_executed': strategy_results,
-                'total_strategies': len(strategies),
+                'total_strategies': len(strategy_results),
+                'partitioning': partitioner.stats,
                 'total_lawyers_found': len(all_lawyers),
                 'scraping_duration': str(datetime.now() - self.session_start),
                 'mode': 'test' if test_mode else 'complete'
@@ -594,17 +575,17 @@ class BarreauNantesFinalScraper:
 
 def main():
     parser = argparse.ArgumentParser(description='Scraper Barreau de Nantes - Version finale complète')
-    parser.add_argument('--test', action='store_true', help='Mode test (stratégies limitées)')
+    parser.add_argument('--test', action='store_true', help='Mode test (requêtes limitées)')
     parser.add_argument('--headless', action='store_true', help='Mode sans interface (recommandé)')
-    parser.add_argument('--delay', type=int, default=3, help='Délai entre requêtes (secondes)')
-    parser.add_argument('--max-strategies', type=int, help='Nombre max de stratégies à exécuter')
+    parser.add_argument('--delay', type=int, default=3, help='Délai maximal entre requêtes (secondes), ajusté à la latence du site')
+    parser.add_argument('--max-strategies', type=int, help='Nombre max de requêtes à soumettre')
     
     args = parser.parse_args()
     
     print("=== SCRAPER BARREAU DE NANTES - VERSION FINALE ===")
     print(f"Mode: {'TEST' if args.test else 'COMPLET'}")
     print(f"Interface: {'Headless' if args.headless else 'Visuel'}")
-    print(f"Délai: {args.delay}s")
+    print(f"Délai max: {args.delay}s")
     if args.max_strategies:
         print(f"Max stratégies: {args.max_strategies}")
     print()
@@ -23,6 +23,8 @@ Auteur: Claude (Anthropic)
 Date: Février 2026
 """
 
+import os
+import sys
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
@@ -30,9 +32,11 @@ import time
 import re
 from datetime import datetime
 import json
-import html
 import random
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.email_decoder import decode_js_email
+
 class NeversScraper:
     def __init__(self):
         self.session = requests.Session()
@@ -128,25 +132,10 @@ class NeversScraper:
     def extract_email_from_javascript(self, soup):
         """Extraire l'email depuis les scripts JavaScript obfusqués"""
         try:
-            scripts = soup.find_all('script')
-            
-            for script in scripts:
-                script_content = script.string or script.get_text()
-                if script_content and 'addy' in script_content:
-                    lines = script_content.split('\n')
-                    for line in lines:
-                        if 'var addy' in line and '=' in line:
-                            match = re.search(r'var\s+addy\d+\s*=\s*(.+);', line.strip())
-                            if match:
-                                expression = match.group(1)
-                                parts = re.findall(r"'([^']*)'", expression)
-                                
-                                if parts:
-                                    email_encoded = ''.join(parts)
-                                    email_decoded = html.unescape(email_encoded)
-                                    
-                                    if '@' in email_decoded and '.' in email_decoded:
-                                        return email_decoded
+            for script in soup.find_all('script'):
+                result = decode_js_email(script.string or script.get_text())
+                if result:
+                    return result['email']
             return ''
         except Exception as e:
             print(f"    ❌ Erreur email: {e}")
@@ -30,6 +30,18 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from common.names import split_name
+
+# Fiches de structures et inversions propres à l'annuaire d'Orléans ; les noms
+# d'avocats ordinaires sont traités par common.names (cf. names_golden.json)
+NAME_OVERRIDES = {
+    "KPMG AVOCATS, SELAS": ("KPMG AVOCATS", "SELAS"),
+    "PHPG, SCP": ("PHPG", "SCP"),
+    "DUVIVIER & ASSOCIES, SAS": ("DUVIVIER & ASSOCIES", "SAS"),
+    "MAY AUDIT ET CONSEIL, SELAFA": ("MAY AUDIT ET CONSEIL", "SELAFA"),
+    "FIDUCIAL SOFIRAL AVOCATS": ("FIDUCIAL SOFIRAL", "AVOCATS"),
+    "ECHARD-JEAN PIERRE": ("Jean", "ECHARD-PIERRE"),
+}
 
 
 def split_lawyer_name_perfectly(full_name):
@@ -42,144 +54,7 @@ def split_lawyer_name_perfectly(full_name):
     Returns:
         tuple: (prénom, nom)
     """
-    
-    # Dictionnaire exhaustif des cas spéciaux pour séparation parfaite
-    special_cases = {
-        # Noms avec particules
-        "Sandra DE BARROS": ("Sandra", "DE BARROS"),
-        "Sandra De BARROS": ("Sandra", "DE BARROS"),
-        "Samy DE BOISVILLIERS": ("Samy", "DE BOISVILLIERS"),
-        "Benoit DE GAULLIER DES BORDES": ("Benoit", "DE GAULLIER DES BORDES"),
-        "Tanguy DE WATRIGRANT": ("Tanguy", "DE WATRIGRANT"),
-        
-        # Noms avec LE/LA
-        "Clémence LE MARCHAND": ("Clémence", "LE MARCHAND"),
-        "Anne-Catherine LE SQUER": ("Anne-Catherine", "LE SQUER"),
-        "Caroline LE MEUR": ("Caroline", "LE MEUR"),
-        
-        # Noms composés complexes
-        "Anne MADRID FOUSSEREAU": ("Anne", "MADRID FOUSSEREAU"),
-        "Mélanie BEGUIDE BONOMA": ("Mélanie", "BEGUIDE BONOMA"),
-        "Pierre LALANNE ROUGIER": ("Pierre", "LALANNE ROUGIER"),
-        "Magalie CASTELLI MAURICE": ("Magalie", "CASTELLI MAURICE"),
-        "Emmeline PLETS DUGUET": ("Emmeline", "PLETS DUGUET"),
-        "Sonia MALLET GIRY": ("Sonia", "MALLET GIRY"),
-        "Edouard BARBIER SAINT HILAIRE": ("Edouard", "BARBIER SAINT HILAIRE"),
-        "Delphine JANVIER LUPART": ("Delphine", "JANVIER LUPART"),
-        "Olivier HEGUIN DE GUERLE": ("Olivier", "HEGUIN DE GUERLE"),
-        "Margaret CELCE VILAIN": ("Margaret", "CELCE VILAIN"),
-        "Nelsie-Cléa KUTTA ENGOME": ("Nelsie-Cléa", "KUTTA ENGOME"),
-        
-        # Noms avec DU/DES/D'
-        "Damien PINCZON du SEL": ("Damien", "PINCZON DU SEL"),
-        "Damien PINCZON DU SEL": ("Damien", "PINCZON DU SEL"),
-        
-        # Noms avec DA/DOS
-        "Nadia DOS REIS": ("Nadia", "DOS REIS"),
-        "Antonio DA COSTA": ("Antonio", "DA COSTA"),
-        "Achille DA SILVA": ("Achille", "DA SILVA"),
-        "Arthur DA COSTA": ("Arthur", "DA COSTA"),
-        
-        # Noms avec EL/ET
-        "Rajaa EL OUAFI": ("Rajaa", "EL OUAFI"),
-        "Hayette ET TOUMI": ("Hayette", "ET TOUMI"),
-        
-        # Prénoms composés avec tiret
-        "Jean-Michel LICOINE": ("Jean-Michel", "LICOINE"),
-        "Jean-François CANAKIS": ("Jean-François", "CANAKIS"),
-        "Marie-Sophie JENVRIN": ("Marie-Sophie", "JENVRIN"),
-        "Janvier Michel BISSILA": ("Janvier Michel", "BISSILA"),
-        "Anne-Laure VERY": ("Anne-Laure", "VERY"),
-        "Pierre Yves WOLOCH": ("Pierre Yves", "WOLOCH"),
-        "Pierre-Alix COPIN": ("Pierre-Alix", "COPIN"),
-        "Jean-Marc TALAU": ("Jean-Marc", "TALAU"),
-        "Jean-MARC TALAU": ("Jean-Marc", "TALAU"),
-        "Pierre-François DEREC": ("Pierre-François", "DEREC"),
-        "Michel-Louis COURCELLES": ("Michel-Louis", "COURCELLES"),
-        "Benjamin MARTINOT-LAGARDE": ("Benjamin", "MARTINOT-LAGARDE"),
-        "Maxime-Henri VILAIN": ("Maxime-Henri", "VILAIN"),
-        "Marie-Françoise CASADEI-JUNG": ("Marie-Françoise", "CASADEI-JUNG"),
-        "Jean-Christophe CASADEI": ("Jean-Christophe", "CASADEI"),
-        "Jean-Christophe SILVA": ("Jean-Christophe", "SILVA"),
-        "Yves BILLON-GRAND": ("Yves", "BILLON-GRAND"),
-        "Julie HELD-SUTTER": ("Julie", "HELD-SUTTER"),
-        "Daniel Léo EMPINET": ("Daniel Léo", "EMPINET"),
-        "Marie-Odile COTEL": ("Marie-Odile", "COTEL"),
-        "Pierre-Alexandre NARCY": ("Pierre-Alexandre", "NARCY"),
-        "Marie-Stéphanie SIMON": ("Marie-Stéphanie", "SIMON"),
-        "Paul-Henri PICARD": ("Paul-Henri", "PICARD"),
-        
-        # Noms d'entreprises
-        "KPMG AVOCATS, SELAS": ("KPMG AVOCATS", "SELAS"),
-        "PHPG, SCP": ("PHPG", "SCP"),
-        "DUVIVIER & ASSOCIES, SAS": ("DUVIVIER & ASSOCIES", "SAS"),
-        "MAY AUDIT ET CONSEIL, SELAFA": ("MAY AUDIT ET CONSEIL", "SELAFA"),
-        "FIDUCIAL SOFIRAL AVOCATS": ("FIDUCIAL SOFIRAL", "AVOCATS"),
-        
-        # Cas inversés (NOM Prénom)
-        "GUILBERT ISABELLE": ("Isabelle", "GUILBERT"),
-        "TOUBALE LAURENT": ("Laurent", "TOUBALE"),
-        "ECHARD-JEAN PIERRE": ("Jean", "ECHARD-PIERRE"),
-        "de WATRIGRANT TANGUY": ("Tanguy", "DE WATRIGRANT"),
-    }
-    
-    # Nettoyer le nom
-    name = full_name.strip()
-    name = re.sub(r'^Maître\s+', '', name, flags=re.IGNORECASE)
-    name = name.strip()
-    
-    # Vérifier les cas spéciaux d'abord
-    if name in special_cases:
-        return special_cases[name]
-    
-    # Traiter les cas inversés (NOM Prénom)
-    if re.match(r'^[A-Z][A-Z\s\-\']+\s+[A-Z][a-z]', name):
-        parts = name.split()
-        if len(parts) >= 2:
-            # Trouver où commence le prénom (première majuscule suivie de minuscule)
-            for i, part in enumerate(parts):
-                if re.match(r'^[A-Z][a-z]', part):
-                    nom = ' '.join(parts[:i])
-                    prenom = ' '.join(parts[i:])
-                    return (prenom, nom.upper())
-    
-    # Logique standard de séparation
-    parts = name.split()
-    if not parts:
-        return ("", "")
-    
-    if len(parts) == 1:
-        return ("", parts[0].upper())
-    
-    # Pour 2 mots
-    if len(parts) == 2:
-        return (parts[0], parts[1].upper())
-    
-    # Pour 3 mots ou plus - analyser la structure
-    if len(parts) >= 3:
-        # Vérifier les particules nobles
-        particles = ['DE', 'DU', 'DES', 'DA', 'DOS', 'LE', 'LA', 'EL', 'ET', 'D\'']
-        
-        # Chercher où commence la particule
-        for i in range(1, len(parts)):
-            if parts[i].upper() in particles:
-                prenom = ' '.join(parts[:i])
-                nom = ' '.join(parts[i:])
-                return (prenom, nom.upper())
-        
-        # Si pas de particule, séparer au dernier mot en majuscules
-        for i in range(len(parts)-1, 0, -1):
-            if parts[i].isupper() or (i == len(parts)-1):
-                prenom = ' '.join(parts[:i])
-                nom = ' '.join(parts[i:])
-                return (prenom, nom.upper())
-        
-        # Par défaut, dernier mot = nom
-        prenom = ' '.join(parts[:-1])
-        nom = parts[-1]
-        return (prenom, nom.upper())
-    
-    return ("", name.upper())
+    return split_name(full_name, order='first_last', normalize=True, overrides=NAME_OVERRIDES)
 
 
 def setup_driver():
@@ -4,16 +4,22 @@ Scraper CORRIGÉ pour le Barreau de Pau - VERSION ROBUSTE
 Extraction simple et efficace avec séparation prénom/nom correcte
 """
 
-import requests
 from bs4 import BeautifulSoup
 import csv
 import json
 import re
 from datetime import datetime
 import time
-import random
 from urllib.parse import urljoin
 
+from common.async_fetch import AsyncFetchEngine
+from common.http_client import PooledHttpClient
+from common.names import split_name
+
+# Politesse : fiches téléchargées en parallèle, débit plafonné sur avocats-pau.fr
+MAX_PARALLEL = 4
+MAX_REQ_PER_SEC = 3.0
+
 class PauBarScraper:
     def __init__(self, max_lawyers=None):
         """
@@ -25,12 +31,12 @@ class PauBarScraper:
         self.lawyers_data = []
         self.errors = []
         
-        # Session HTTP
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Session HTTP (pool keep-alive partagé)
+        self.http = PooledHttpClient(headers={
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
         })
+        self.session = self.http.session
         
         print(f"🚀 SCRAPER PAU - VERSION CORRIGÉE")
         if max_lawyers:
@@ -85,79 +91,8 @@ class PauBarScraper:
     def extract_name_simple(self, full_name):
         """Extraction robuste FINAL du prénom et nom"""
         try:
-            # Nettoyer le nom
-            name = self.clean_text(full_name)
-            name = re.sub(r'^(Me\.?|Maître|M\.)\s*', '', name, flags=re.IGNORECASE)
-            name = re.sub(r'\s*[-–]\s*Avocat\s+(honoraire|Honoraire).*$', '', name)
-            
-            # Séparer les mots
-            words = name.split()
-            if not words:
-                return '', name
-            
-            if len(words) == 1:
-                return '', words[0]
-            
-            # NOUVELLE LOGIQUE : chercher le prénom (dernier mot non entièrement en majuscules)
-            # Format typique du site : "DUPONT Pierre" ou "MARTIN Marie-Claire"
-            
-            # Cas spéciaux : noms composés avec DIT
-            if 'DIT' in name.upper():
-                # Ex: "MASSOU DIT LABAQUERE Maripierre" -> nom="MASSOU DIT LABAQUERE", prenom="Maripierre"
-                dit_parts = name.split()
-                # Chercher le dernier mot qui n'est pas tout en majuscules
-                prenom_words = []
-                nom_words = []
-                
-                for i in range(len(dit_parts)-1, -1, -1):  # De la fin vers le début
-                    if dit_parts[i].isupper() or dit_parts[i] in ['DIT', 'DE', 'DU', 'DES', 'LA', 'LE']:
-                        nom_words.insert(0, dit_parts[i])
-                    else:
-                        prenom_words = dit_parts[i:]
-                        break
-                
-                if prenom_words:
-                    nom = ' '.join(nom_words)
-                    prenom = ' '.join(prenom_words)
-                else:
-                    # Fallback
-                    nom = ' '.join(dit_parts[:-1])
-                    prenom = dit_parts[-1]
-            
-            # Cas spéciaux : noms avec tirets (ex: "ANEROT-BAYLAUCQ Valérie")
-            elif any('-' in word for word in words):
-                # Le dernier mot non entièrement en majuscules = prénom
-                for i in range(len(words)-1, -1, -1):
-                    if not words[i].isupper():
-                        nom = ' '.join(words[:i])
-                        prenom = ' '.join(words[i:])
-                        break
-                else:
-                    # Tous en majuscules : dernier = prénom
-                    nom = ' '.join(words[:-1])
-                    prenom = words[-1].title()  # Mettre en forme normale
-            
-            # Cas général
-            else:
-                # Chercher le dernier groupe de mots qui ne sont pas entièrement en majuscules
-                # Ex: "DUPONT Pierre" -> nom="DUPONT", prenom="Pierre"
-                # Ex: "MARTIN Jean-Claude" -> nom="MARTIN", prenom="Jean-Claude"
-                
-                prenom_start = len(words)
-                for i in range(len(words)-1, -1, -1):
-                    if not words[i].isupper():
-                        prenom_start = i
-                    else:
-                        break
-                
-                if prenom_start < len(words):
-                    nom = ' '.join(words[:prenom_start]) if prenom_start > 0 else words[0]
-                    prenom = ' '.join(words[prenom_start:])
-                else:
-                    # Tous les mots sont en majuscules, supposer dernier = prénom
-                    nom = ' '.join(words[:-1])
-                    prenom = words[-1].title()
-            
+            # Format du site : "DUPONT Pierre", "MASSOU DIT LABAQUERE Maripierre"
+            prenom, nom = split_name(self.clean_text(full_name), order='last_first')
             return self.clean_text(prenom), self.clean_text(nom)
             
         except Exception as e:
@@ -165,14 +100,36 @@ class PauBarScraper:
             return '', self.clean_text(full_name)
 
     def extract_lawyer_details(self, lawyer_info, index):
-        """Extrait les détails d'un avocat"""
+        """Télécharge et extrait la fiche d'un avocat (une fiche à la fois)"""
         try:
-            print(f"📄 [{index}] {lawyer_info['name'][:40]}...")
-            
             response = self.session.get(lawyer_info['url'], timeout=30)
             response.raise_for_status()
+            return self.parse_lawyer_details(lawyer_info, index, response.content)
+        except Exception as e:
+            print(f"✗ Erreur [{index}]: {e}")
+            return self.empty_lawyer(lawyer_info)
+
+    def empty_lawyer(self, lawyer_info):
+        """Fiche réduite au nom de la liste (page de l'avocat illisible)"""
+        prenom, nom = self.extract_name_simple(lawyer_info['name'])
+        return {
+            'prenom': prenom,
+            'nom': nom,
+            'email': '',
+            'telephone': '',
+            'adresse': '',
+            'annee_inscription': '',
+            'specialisations': '',
+            'structure': '',
+            'source': lawyer_info['url']
+        }
+
+    def parse_lawyer_details(self, lawyer_info, index, html):
+        """Extrait les détails d'un avocat depuis le HTML de sa fiche"""
+        try:
+            print(f"📄 [{index}] {lawyer_info['name'][:40]}...")
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
             page_text = soup.get_text()
             
             # Initialiser
@@ -271,18 +228,7 @@ class PauBarScraper:
             
         except Exception as e:
             print(f"✗ Erreur [{index}]: {e}")
-            prenom, nom = self.extract_name_simple(lawyer_info['name'])
-            return {
-                'prenom': prenom,
-                'nom': nom,
-                'email': '',
-                'telephone': '',
-                'adresse': '',
-                'annee_inscription': '',
-                'specialisations': '',
-                'structure': '',
-                'source': lawyer_info['url']
-            }
+            return self.empty_lawyer(lawyer_info)
 
     def save_results(self):
         """Sauvegarde les résultats"""
@@ -372,19 +318,30 @@ class PauBarScraper:
             
             print(f"\n📋 EXTRACTION EN COURS...")
             
-            # Extraction détaillée
-            for i, lawyer_info in enumerate(lawyers_list, 1):
-                lawyer_data = self.extract_lawyer_details(lawyer_info, i)
+            # Extraction détaillée : fiches en parallèle (débit plafonné) au lieu
+            # d'un get + pause par fiche
+            positions = {lawyer_info['url']: i for i, lawyer_info in enumerate(lawyers_list, 1)}
+            
+            def parse(url, html):
+                index = positions[url]
+                return self.parse_lawyer_details(lawyers_list[index - 1], index, html)
+            
+            def on_profile(lawyer_data):
+                done = len(self.lawyers_data) + 1
                 self.lawyers_data.append(lawyer_data)
-                
-                # Sauvegarde périodique
-                if i % 50 == 0:
-                    print(f"\n📊 Progression: {i}/{len(lawyers_list)} ({i/len(lawyers_list)*100:.1f}%)")
+                if done % 50 == 0:
+                    print(f"\n📊 Progression: {done}/{len(lawyers_list)} ({done/len(lawyers_list)*100:.1f}%)")
                     emails_so_far = sum(1 for l in self.lawyers_data if l['email'])
                     print(f"📧 Emails: {emails_so_far}")
-                
-                # Petite pause
-                time.sleep(random.uniform(0.3, 0.8))
+            
+            engine = AsyncFetchEngine(max_per_host=MAX_PARALLEL, rate_per_host=MAX_REQ_PER_SEC,
+                                      timeout=30, headers=dict(self.session.headers))
+            self.lawyers_data = engine.fetch_all(list(positions), parse, on_profile)
+            # Fiche illisible : gardée avec le nom de la liste, comme avant
+            for url, error in engine.errors:
+                print(f"✗ Erreur [{positions[url]}]: {error}")
+                self.lawyers_data.append(self.empty_lawyer(lawyers_list[positions[url] - 1]))
+            engine.print_stats()
             
             # Sauvegarde finale
             print(f"\n💾 Sauvegarde finale...")
@@ -400,6 +357,7 @@ class PauBarScraper:
             print(f"✅ Avocats: {len(self.lawyers_data)}")
             print(f"📧 Emails: {emails_total}")
             print(f"📞 Taux succès: {emails_total/len(self.lawyers_data)*100:.1f}%")
+            self.http.print_stats()
             
             return True
             
@@ -20,19 +20,29 @@ INFORMATIONS EXTRAITES:
 - Source (lien vers la fiche)
 """
 
-import time
 import csv
 import json
-import random
 from datetime import datetime
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import re
 import glob
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snapshot import PageSnapshot, node_text
+from common.consent import ConsentSeed
+from common.frontier import CrawlFrontier
+from common.sharded import ShardedExecutor
+from common.waits import wait_for_dom_stable
+
+# Fiches réparties sur plusieurs processus Chrome, au plus PER_SECOND chargements/s sur le site
+WORKERS = 4
+PER_SECOND = 2.0
+
+# Choix axeptio posé avant la première fiche de chaque navigateur
+CONSENT = ConsentSeed("https://www.ordre-avocats-rennes.fr", frameworks=('axeptio',))
 
 def setup_driver():
     """Configure le driver Chrome en mode headless"""
@@ -45,6 +55,7 @@ def setup_driver():
     chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
     
     driver = webdriver.Chrome(options=chrome_options)
+    CONSENT.attach_selenium(driver)
     return driver
 
 def load_lawyers_list():
@@ -117,17 +128,110 @@ def extract_prenom_nom(clean_name):
     
     return prenom.strip(), nom.strip()
 
+def extract_profile_fields(snapshot, lawyer_info):
+    """Email, téléphone, adresse, structure, année et spécialisations depuis l'instantané de la fiche"""
+    fields = {}
+    
+    # EMAIL
+    emails = snapshot.mailtos()
+    if emails:
+        fields['email'] = emails[0]
+    else:
+        # Chercher dans le code source
+        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+        valid_emails = [e for e in re.findall(email_pattern, snapshot.html)
+                        if not e.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.css', '.js'))]
+        fields['email'] = valid_emails[0] if valid_emails else ""
+    
+    # TÉLÉPHONE
+    phones = snapshot.texts("a[href^='tel:']")
+    fields['telephone'] = phones[0] if phones else ""
+    if not phones:
+        phone_patterns = [
+            r'0[1-9](?:[.\-\s]?\d{2}){4}',
+            r'\+33[.\-\s]?[1-9](?:[.\-\s]?\d{2}){4}'
+        ]
+        for pattern in phone_patterns:
+            match = re.search(pattern, snapshot.html)
+            if match:
+                fields['telephone'] = match.group(0)
+                break
+    
+    # ADRESSE
+    fields['adresse'] = ""
+    for text in snapshot.texts("[class*='address'], [class*='adresse'], .field-name-field-address"):
+        if 10 < len(text) < 200:
+            fields['adresse'] = text
+            break
+    else:
+        # Lignes du texte visible avec un code postal
+        for line in snapshot.lines:
+            if re.search(r'\d{5}\s+[A-Z\s]+', line) and 5 < len(line) < 150:
+                fields['adresse'] = line
+                break
+    
+    # STRUCTURE/CABINET (depuis le nom brut de la liste)
+    fields['structure'] = ""
+    if "Cabinet :" in lawyer_info['nom_brut']:
+        cabinet_info = lawyer_info['nom_brut'].split("Cabinet :")[1].replace("+ d'infos", "")
+        structure_parts = []
+        for part in cabinet_info.strip().split():
+            if part.isupper() and len(part) > 2:  # Probable ville
+                break
+            structure_parts.append(part)
+        fields['structure'] = " ".join(structure_parts).strip()
+    
+    # ANNÉE D'INSCRIPTION AU BARREAU
+    fields['annee_inscription'] = ""
+    year_patterns = [
+        r'inscrit.*?(\d{4})',
+        r'inscription.*?(\d{4})',
+        r'barreau.*?(\d{4})',
+        r'depuis.*?(\d{4})'
+    ]
+    for pattern in year_patterns:
+        for year in re.findall(pattern, snapshot.lower_html):
+            if 1950 <= int(year) <= 2025:
+                fields['annee_inscription'] = year
+                break
+        if fields['annee_inscription']:
+            break
+    
+    # SPÉCIALISATIONS ET COMPÉTENCES
+    specialisations_list = []
+    for div in snapshot.select(".avocatDetails_infoCompl_col"):
+        if "Spécialités :" in node_text(div):
+            for spec_elem in div.select("div"):
+                spec_text = node_text(spec_elem)
+                # Filtrer les textes vides et les titres
+                if spec_text and spec_text != "Spécialités :" and len(spec_text) > 3:
+                    specialisations_list.append(spec_text)
+            break
+    
+    # Si pas trouvé avec la méthode précise, essayer les sélecteurs field
+    if not specialisations_list:
+        specialisations_list = snapshot.texts("[class*='field--field-mentionsspecialisations'] div div", min_length=4)
+    
+    # Supprimer les doublons
+    clean_specialisations = []
+    for spec in specialisations_list:
+        if spec not in clean_specialisations:
+            clean_specialisations.append(spec)
+    fields['specialisations'] = " | ".join(clean_specialisations)
+    fields['competences'] = fields['specialisations']  # Alias
+    
+    return fields
+
 def extract_lawyer_details(driver, lawyer_info, index, total):
-    """Extrait tous les détails d'un avocat depuis sa fiche individuelle"""
+    """Extrait tous les détails d'un avocat depuis sa fiche individuelle (un seul instantané par fiche)"""
     detailed_info = lawyer_info.copy()
     
     try:
         driver.get(lawyer_info['lien_detail'])
-        time.sleep(random.uniform(1, 2))
+        wait_for_dom_stable(driver, timeout=15)
         
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        # Un seul aller-retour WebDriver : HTML rendu + texte visible
+        snapshot = PageSnapshot.capture(driver)
         
         # Nettoyer et séparer le nom
         clean_name = clean_lawyer_name(lawyer_info['nom_brut'])
@@ -137,160 +241,7 @@ def extract_lawyer_details(driver, lawyer_info, index, total):
         detailed_info['nom'] = nom
         detailed_info['nom_complet'] = f"Me {prenom} {nom}".strip()
         
-        # EMAIL
-        try:
-            email_elements = driver.find_elements(By.CSS_SELECTOR, "a[href^='mailto:']")
-            if email_elements:
-                detailed_info['email'] = email_elements[0].get_attribute('href').replace('mailto:', '')
-            else:
-                # Chercher dans le texte
-                page_source = driver.page_source
-                email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-                emails = re.findall(email_pattern, page_source)
-                if emails:
-                    valid_emails = [e for e in emails if not e.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.css', '.js'))]
-                    if valid_emails:
-                        detailed_info['email'] = valid_emails[0]
-                    else:
-                        detailed_info['email'] = ""
-                else:
-                    detailed_info['email'] = ""
-        except:
-            detailed_info['email'] = ""
-        
-        # TÉLÉPHONE
-        try:
-            phone_elements = driver.find_elements(By.CSS_SELECTOR, "a[href^='tel:']")
-            if phone_elements:
-                detailed_info['telephone'] = phone_elements[0].text.strip()
-            else:
-                # Chercher dans le texte
-                page_text = driver.page_source
-                phone_patterns = [
-                    r'0[1-9](?:[.\-\s]?\d{2}){4}',
-                    r'\+33[.\-\s]?[1-9](?:[.\-\s]?\d{2}){4}'
-                ]
-                for pattern in phone_patterns:
-                    phones = re.findall(pattern, page_text)
-                    if phones:
-                        detailed_info['telephone'] = phones[0]
-                        break
-                else:
-                    detailed_info['telephone'] = ""
-        except:
-            detailed_info['telephone'] = ""
-        
-        # ADRESSE
-        try:
-            # Chercher les éléments d'adresse
-            address_elements = driver.find_elements(By.CSS_SELECTOR, "[class*='address'], [class*='adresse'], .field-name-field-address")
-            for elem in address_elements:
-                text = elem.text.strip()
-                if len(text) > 10 and len(text) < 200:
-                    detailed_info['adresse'] = text
-                    break
-            else:
-                # Chercher dans le texte de la page
-                page_text = driver.find_element(By.TAG_NAME, "body").text
-                lines = page_text.split('\n')
-                for line in lines:
-                    # Chercher les lignes avec des codes postaux français
-                    if re.search(r'\d{5}\s+[A-Z\s]+', line):
-                        if len(line.strip()) > 5 and len(line.strip()) < 150:
-                            detailed_info['adresse'] = line.strip()
-                            break
-                else:
-                    detailed_info['adresse'] = ""
-        except:
-            detailed_info['adresse'] = ""
-        
-        # STRUCTURE/CABINET
-        try:
-            # Extraire depuis le nom brut d'abord
-            if "Cabinet :" in lawyer_info['nom_brut']:
-                cabinet_info = lawyer_info['nom_brut'].split("Cabinet :")[1].replace("+ d'infos", "")
-                cabinet_parts = cabinet_info.strip().split()
-                structure_parts = []
-                for part in cabinet_parts:
-                    if part.isupper() and len(part) > 2:  # Probable ville
-                        break
-                    structure_parts.append(part)
-                if structure_parts:
-                    detailed_info['structure'] = " ".join(structure_parts).strip()
-                else:
-                    detailed_info['structure'] = ""
-            else:
-                detailed_info['structure'] = ""
-        except:
-            detailed_info['structure'] = ""
-        
-        # ANNÉE D'INSCRIPTION AU BARREAU
-        try:
-            page_text = driver.page_source.lower()
-            year_patterns = [
-                r'inscrit.*?(\d{4})',
-                r'inscription.*?(\d{4})',
-                r'barreau.*?(\d{4})',
-                r'depuis.*?(\d{4})'
-            ]
-            
-            for pattern in year_patterns:
-                matches = re.findall(pattern, page_text)
-                for year in matches:
-                    if 1950 <= int(year) <= 2025:
-                        detailed_info['annee_inscription'] = year
-                        break
-                if detailed_info.get('annee_inscription'):
-                    break
-            else:
-                detailed_info['annee_inscription'] = ""
-        except:
-            detailed_info['annee_inscription'] = ""
-        
-        # SPÉCIALISATIONS ET COMPÉTENCES - VERSION CORRIGÉE
-        try:
-            # Chercher la div spécifique avec les spécialisations
-            specialites_divs = driver.find_elements(By.CSS_SELECTOR, ".avocatDetails_infoCompl_col")
-            specialisations_list = []
-            
-            for div in specialites_divs:
-                div_text = div.text.strip()
-                if "Spécialités :" in div_text:
-                    # Récupérer tous les sous-éléments div contenant les spécialisations
-                    spec_elements = div.find_elements(By.TAG_NAME, "div")
-                    for spec_elem in spec_elements:
-                        spec_text = spec_elem.text.strip()
-                        # Filtrer les textes vides et les titres
-                        if spec_text and spec_text != "Spécialités :" and len(spec_text) > 3:
-                            specialisations_list.append(spec_text)
-                    break
-            
-            # Si pas trouvé avec la méthode précise, essayer les sélecteurs field
-            if not specialisations_list:
-                field_elements = driver.find_elements(By.CSS_SELECTOR, "[class*='field--field-mentionsspecialisations'] div div")
-                for elem in field_elements:
-                    spec_text = elem.text.strip()
-                    if spec_text and len(spec_text) > 3:
-                        specialisations_list.append(spec_text)
-            
-            # Nettoyer et formater les spécialisations
-            if specialisations_list:
-                # Supprimer les doublons et nettoyer
-                clean_specialisations = []
-                for spec in specialisations_list:
-                    spec_clean = spec.strip()
-                    if spec_clean and spec_clean not in clean_specialisations:
-                        clean_specialisations.append(spec_clean)
-                
-                detailed_info['specialisations'] = " | ".join(clean_specialisations)
-                detailed_info['competences'] = detailed_info['specialisations']  # Alias
-            else:
-                detailed_info['specialisations'] = ""
-                detailed_info['competences'] = ""
-                
-        except Exception as e:
-            detailed_info['specialisations'] = ""
-            detailed_info['competences'] = ""
+        detailed_info.update(extract_profile_fields(snapshot, lawyer_info))
         
         # Ajouter la source
         detailed_info['source'] = lawyer_info['lien_detail']
@@ -308,17 +259,10 @@ def extract_lawyer_details(driver, lawyer_info, index, total):
     
     return detailed_info
 
-def save_progress(lawyers, current_index, total, prefix="RENNES_PROGRESS"):
-    """Sauvegarde les progrès toutes les 100 extractions"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    progress_filename = f"{prefix}_{current_index}sur{total}_{timestamp}.json"
-    
-    try:
-        with open(progress_filename, 'w', encoding='utf-8') as f:
-            json.dump(lawyers, f, ensure_ascii=False, indent=2)
-        print(f"    💾 Progression sauvée: {progress_filename}")
-    except Exception as e:
-        print(f"    ❌ Erreur sauvegarde: {e}")
+def extract_numbered(driver, task):
+    """Tâche de l'exécuteur réparti : (numéro, avocat, total)"""
+    index, lawyer_info, total = task
+    return extract_lawyer_details(driver, lawyer_info, index, total)
 
 def save_final_results(lawyers, filename_prefix="RENNES_FINAL_COMPLET"):
     """Sauvegarde finale complète"""
@@ -400,27 +344,44 @@ def main():
     
     print(f"🎯 Extraction détails pour {len(lawyers_list)} avocats")
     
-    driver = None
+    executor = None
     detailed_lawyers = []
+    # État des fiches sur disque : un crash reprend aux fiches non extraites
+    frontier = CrawlFrontier("rennes_details_frontier.sqlite")
+    
+    def collected():
+        """Fiches extraites (ce run et les précédents), dans l'ordre de la liste"""
+        by_url = {lawyer['lien_detail']: lawyer for lawyer in frontier.results('profile')}
+        return [by_url[lawyer['lien_detail']] for lawyer in lawyers_list if lawyer['lien_detail'] in by_url]
     
     try:
-        driver = setup_driver()
+        executor = ShardedExecutor(extract_numbered, workers=WORKERS, per_second=PER_SECOND,
+                                   driver_factory=setup_driver)
         
         print(f"\n🔍 EXTRACTION EN COURS...")
         print("=" * 70)
         
-        # Traiter TOUS les avocats
-        for i, lawyer in enumerate(lawyers_list, 1):
-            detailed_lawyer = extract_lawyer_details(driver, lawyer, i, len(lawyers_list))
-            detailed_lawyers.append(detailed_lawyer)
-            
-            # Sauvegarde de progression toutes les 100
-            if i % 100 == 0:
-                save_progress(detailed_lawyers, i, len(lawyers_list))
-                print(f"  📊 {i}/{len(lawyers_list)} avocats traités")
+        # Traiter TOUS les avocats (sauf ceux déjà extraits), répartis entre les processus
+        total = len(lawyers_list)
+        frontier.add('profile', [lawyer['lien_detail'] for lawyer in lawyers_list])
+        todo = set(frontier.todo('profile'))
+        tasks = [(i, lawyer, total) for i, lawyer in enumerate(lawyers_list, 1) if lawyer['lien_detail'] in todo]
+        if len(tasks) < total:
+            print(f"♻️  Reprise: {total - len(tasks)} fiches déjà extraites")
+        for done, (index, detailed_lawyer) in enumerate(executor.imap(tasks), 1):
+            url = tasks[index][1]['lien_detail']
+            if detailed_lawyer:
+                frontier.done('profile', url, detailed_lawyer)
+            else:
+                # Processus perdu : la fiche sera reprise au prochain run
+                frontier.failed('profile', url, 'processus perdu')
             
-            # Pause entre chaque avocat
-            time.sleep(random.uniform(0.5, 1.5))
+            if done % 100 == 0:
+                print(f"  📊 {done}/{len(tasks)} avocats traités")
+        
+        # Fiches en échec : celles de la liste gardées telles quelles
+        by_url = {lawyer['lien_detail']: lawyer for lawyer in collected()}
+        detailed_lawyers = [by_url.get(lawyer['lien_detail']) or lawyer.copy() for lawyer in lawyers_list]
         
         # Sauvegarde finale
         print(f"\n{'='*70}")
@@ -435,6 +396,7 @@ def main():
         specialisations_found = len([l for l in detailed_lawyers if l.get('specialisations')])
         
         print(f"\n📊 RÉSULTATS FINAUX:")
+        executor.print_stats()
         print(f"  ✅ Total avocats traités: {len(detailed_lawyers)}/1107")
         print(f"  📧 Emails récupérés: {emails_found} ({emails_found/len(detailed_lawyers)*100:.1f}%)")
         print(f"  📞 Téléphones: {phones_found} ({phones_found/len(detailed_lawyers)*100:.1f}%)")
@@ -443,16 +405,22 @@ def main():
         print(f"\n🎉 EXTRACTION TERMINÉE AVEC SUCCÈS!")
         print("=" * 70)
         
+        # Extraction complète : le prochain run repart de zéro
+        if not frontier.todo('profile'):
+            frontier.reset()
+        
     except Exception as e:
         print(f"❌ Erreur principale: {e}")
         
+        detailed_lawyers = detailed_lawyers or collected()
         if detailed_lawyers:
             save_final_results(detailed_lawyers, "RENNES_PARTIEL")
             print(f"💾 Sauvegarde partielle: {len(detailed_lawyers)} avocats")
         
     finally:
-        if driver:
-            driver.quit()
+        if executor is not None:
+            executor.close()
+        frontier.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -14,19 +14,28 @@ URL: https://www.ordre-avocats-rennes.fr/annuaire
 RÉSULTAT ATTENDU: ~1107 avocats avec emails, téléphones, adresses, spécialisations
 """
 
-import time
 import csv
 import json
-import random
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException
 import re
 import glob
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.consent import ConsentSeed
+from common.frontier import CrawlFrontier
+from common.waits import AdaptiveDelay, wait_for_any, wait_for_dom_stable, wait_for_selector
+
+# Pauses calées sur la latence mesurée du site (au lieu de 1 à 5 s fixes)
+PACER = AdaptiveDelay(min_delay=0.3, max_delay=3)
+
+# Choix axeptio posé avant la première page : aucun bandeau à attendre ni cliquer
+CONSENT = ConsentSeed("https://www.ordre-avocats-rennes.fr", frameworks=('axeptio',))
 
 def setup_driver():
     """Configure le driver Chrome en mode headless"""
@@ -45,7 +54,6 @@ def accept_cookies(driver):
     """Gère l'acceptation des cookies"""
     try:
         print("🍪 Tentative d'acceptation des cookies...")
-        time.sleep(3)
         
         cookie_selectors = [
             "#axeptio_btn_acceptAll",
@@ -53,17 +61,13 @@ def accept_cookies(driver):
             "button.axeptio-button--accept-all"
         ]
         
-        for selector in cookie_selectors:
-            try:
-                cookie_btn = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                )
-                cookie_btn.click()
-                print("✅ Cookies acceptés")
-                time.sleep(2)
-                return True
-            except TimeoutException:
-                continue
+        # Le bandeau axeptio est injecté après le chargement : une attente pour tous les boutons
+        _, cookie_btn = wait_for_any(driver, cookie_selectors, timeout=8)
+        if cookie_btn:
+            cookie_btn.click()
+            print("✅ Cookies acceptés")
+            wait_for_dom_stable(driver, timeout=5)
+            return True
         
         print("⚠️ Pas de cookies à accepter")
         return True
@@ -76,7 +80,7 @@ def get_total_pages(driver):
     """Détermine le nombre total de pages (0-36 = 37 pages)"""
     try:
         driver.get("https://www.ordre-avocats-rennes.fr/annuaire")
-        time.sleep(3)
+        wait_for_dom_stable(driver, timeout=15)
         
         # Chercher le lien "Dernière page"
         last_page_links = driver.find_elements(By.CSS_SELECTOR, "a[title*='aller à la dernière page'], a[href*='page=36'], .pager-last a")
@@ -111,13 +115,11 @@ def navigate_to_page(driver, page_num):
             url = f"https://www.ordre-avocats-rennes.fr/annuaire?page={url_page}"
         
         print(f"🌐 Page {page_num}: {url}")
-        driver.get(url)
-        time.sleep(random.uniform(3, 5))
-        
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        time.sleep(2)
+        with PACER.timed():
+            driver.get(url)
+            # Prêt dès que les liens avocats sont là et que la liste ne bouge plus
+            wait_for_selector(driver, "a[href*='/avocat-']", timeout=15)
+            wait_for_dom_stable(driver, timeout=5)
         
         lawyer_links = driver.find_elements(By.CSS_SELECTOR, "a[href*='/avocat-']")
         
@@ -126,6 +128,7 @@ def navigate_to_page(driver, page_num):
             return True
         else:
             print(f"  ⚠️ Page {page_num} sans liens d'avocats")
+            PACER.penalize()
             return False
         
     except Exception as e:
@@ -207,31 +210,45 @@ def main():
     
     driver = None
     all_lawyers = []
+    # État des pages sur disque : un crash reprend à la première page non faite
+    frontier = CrawlFrontier("rennes_liste_frontier.sqlite")
     
     try:
         driver = setup_driver()
+        consent_seeded = CONSENT.attach_selenium(driver)
         
         driver.get("https://www.ordre-avocats-rennes.fr/annuaire")
-        accept_cookies(driver)
+        if not consent_seeded:
+            accept_cookies(driver)
         
         total_pages = get_total_pages(driver)
         print(f"📄 {total_pages} pages à traiter")
         
-        # Parcourir TOUTES les pages
-        for page_num in range(1, total_pages + 1):
+        # Parcourir TOUTES les pages (sauf celles déjà extraites avant un crash)
+        frontier.add('page', range(1, total_pages + 1))
+        pages_todo = [int(page) for page in frontier.todo('page')]
+        if len(pages_todo) < total_pages:
+            print(f"♻️  Reprise: {total_pages - len(pages_todo)} pages déjà extraites")
+        
+        for page_num in pages_todo:
             print(f"\n📄 PAGE {page_num}/{total_pages}")
+            frontier.start('page', page_num)
             
             if not navigate_to_page(driver, page_num):
+                frontier.failed('page', page_num, 'navigation')
                 continue
             
             page_lawyers = extract_lawyers_from_page(driver, page_num)
             if not page_lawyers:
+                frontier.failed('page', page_num, 'aucun avocat')
                 continue
             
-            all_lawyers.extend(page_lawyers)
-            print(f"  📊 Total actuel: {len(all_lawyers)} avocats")
+            frontier.done('page', page_num, page_lawyers)
+            print(f"  📊 Page {page_num}: {len(page_lawyers)} avocats")
             
-            time.sleep(random.uniform(1, 3))
+            PACER.sleep()
+        
+        all_lawyers = [lawyer for page in frontier.results('page') for lawyer in page]
         
         # Sauvegarde finale
         if all_lawyers:
@@ -241,7 +258,12 @@ def main():
             print(f"  ✅ Total: {len(all_lawyers)} avocats")
             print(f"  📁 JSON: {json_file}")
             print(f"  📁 CSV: {csv_file}")
+            PACER.print_stats()
             print(f"\n➡️  ÉTAPE SUIVANTE: Lancez rennes_extraction_details.py")
+            
+            # Liste complète : le prochain run repart de la page 1
+            if not frontier.todo('page'):
+                frontier.reset()
         else:
             print("❌ Aucun avocat trouvé!")
             
@@ -251,6 +273,7 @@ def main():
     finally:
         if driver:
             driver.quit()
+        frontier.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
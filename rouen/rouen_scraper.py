@@ -20,7 +20,9 @@ Améliorations:
 
 import json
 import csv
+import os
 import re
+import sys
 import time
 import unicodedata
 from datetime import datetime
@@ -32,6 +34,11 @@ from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.browser_pool import BrowserPool
+from common.sharded import ShardedExecutor
+from common.names import split_name
+
 class RouenBarScraper:
     def __init__(self):
         self.base_url = "https://www.barreau-rouen.avocat.fr"
@@ -87,69 +94,8 @@ class RouenBarScraper:
         """
         if not full_name:
             return "", ""
-        
-        # Nettoyer
-        full_name = self.clean_text(full_name)
-        
-        # Supprimer titres
-        titles = ["Me", "Maître", "Dr", "Pr", "M.", "Mme", "Mlle"]
-        for title in titles:
-            if full_name.startswith(title + " "):
-                full_name = full_name.replace(title + " ", "", 1).strip()
-        
-        # Supprimer suffixes
-        suffixes = ["(Avocat)", "(Avocate)", "Avocat", "Avocate"]
-        for suffix in suffixes:
-            full_name = full_name.replace(suffix, "").strip()
-        
-        parts = full_name.split()
-        
-        if len(parts) == 1:
-            return "", parts[0]
-        elif len(parts) == 2:
-            # Format : "NOM Prénom" ou "Prénom NOM"
-            # Logique basée sur les majuscules/minuscules
-            if parts[0].isupper() and not parts[1].isupper():
-                # "ABDOU Sophia" -> prénom=Sophia, nom=ABDOU
-                return parts[1], parts[0]
-            elif not parts[0].isupper() and parts[1].isupper():
-                # "Sophia ABDOU" -> prénom=Sophia, nom=ABDOU  
-                return parts[0], parts[1]
-            else:
-                # Si les deux sont en majuscules ou les deux en minuscules
-                # On suppose format "NOM Prénom" par défaut sur ce site
-                return parts[1], parts[0]
-        else:
-            # Noms composés : analyser la structure
-            # Cas 1: "CHAILLÉ DE NÉRÉ Dixie" -> prénom=Dixie, nom=CHAILLÉ DE NÉRÉ
-            # Cas 2: "ALVES DA COSTA David" -> prénom=David, nom=ALVES DA COSTA
-            
-            # Le prénom est généralement le dernier mot s'il n'est pas en majuscules
-            last_word = parts[-1]
-            if not last_word.isupper() and len(parts) > 2:
-                # Les mots précédents forment le nom de famille
-                prenom = last_word
-                nom = " ".join(parts[:-1])
-                return prenom, nom
-            
-            # Cas avec particules au début du nom : "DE LA BRUNIÈRE Arnaud"
-            elif len(parts) > 2 and parts[0].upper() in ['DE', 'DU', 'DES', 'LE', 'LA', 'VAN', 'VON', "D'"]:
-                # Tout sauf le dernier mot = nom, dernier mot = prénom
-                if not parts[-1].isupper():
-                    return parts[-1], " ".join(parts[:-1])
-                # Sinon logique par défaut
-                return parts[0], " ".join(parts[1:])
-            
-            # Cas avec tiret dans prénom : "Marie-Claire DUPONT"
-            elif "-" in parts[0]:
-                return " ".join(parts[:-1]), parts[-1]
-            
-            # Par défaut : si le dernier mot n'est pas en majuscules, c'est le prénom
-            elif not parts[-1].isupper():
-                return parts[-1], " ".join(parts[:-1])
-            else:
-                # Logique par défaut : premier mot = prénom, reste = nom
-                return parts[0], " ".join(parts[1:])
+        # L'annuaire liste les avocats sous la forme "NOM Prénom"
+        return split_name(self.clean_text(full_name), order='last_first')
 
     def extract_lawyer_details(self, driver, lawyer_url):
         """Extraire les détails d'un avocat"""
@@ -284,39 +230,46 @@ class RouenBarScraper:
         self.logger.info(f"Données sauvegardées: {len(self.lawyers_data)} avocats")
         return csv_filename, json_filename, email_filename, report_filename
 
-    def run_extraction(self, max_lawyers=None, headless=True):
-        """Lancer l'extraction complète"""
+    def run_extraction(self, max_lawyers=None, headless=True, workers=4, per_second=1.0):
+        """Lancer l'extraction complète (fiches réparties sur `workers` processus Chrome)"""
         self.logger.info("=== DÉBUT DE L'EXTRACTION BARREAU DE ROUEN ===")
         start_time = time.time()
         
-        driver = self.setup_driver(headless=headless)
+        # Navigateur chaud pour la page d'annuaire
+        pool = BrowserPool(size=1, recycle_after=200, headless=headless)
+        executor = None
         
         try:
             # Récupérer toutes les URLs
-            lawyer_urls = self.get_all_lawyer_urls(driver)
+            with pool.lease() as driver:
+                lawyer_urls = self.get_all_lawyer_urls(driver)
+            pool.close()
             
             if max_lawyers:
                 lawyer_urls = lawyer_urls[:max_lawyers]
             
             total_lawyers = len(lawyer_urls)
-            self.logger.info(f"Extraction de {total_lawyers} avocats...")
+            self.logger.info(f"Extraction de {total_lawyers} avocats sur {workers} processus...")
             
-            for i, url in enumerate(lawyer_urls, 1):
-                self.logger.info(f"Traitement {i}/{total_lawyers}: {url}")
-                
-                lawyer_data = self.extract_lawyer_details(driver, url)
-                
-                if lawyer_data:
-                    self.lawyers_data.append(lawyer_data)
-                    self.processed_count += 1
-                
-                # Sauvegarde automatique tous les 50 avocats
-                if i % 50 == 0:
-                    self.save_data(suffix=f"_BACKUP_{i}")
-                    self.logger.info(f"Sauvegarde automatique à {i} avocats")
-                
-                # Pause pour éviter la surcharge
-                time.sleep(1)
+            # Un navigateur par processus ; la limite par domaine remplace la pause d'1 s entre fiches
+            executor = ShardedExecutor(self.extract_lawyer_details, workers=workers, per_second=per_second,
+                                       headless=headless)
+            results = {}
+            
+            def collect(index, lawyer_data):
+                results[index] = lawyer_data
+                # Sauvegarde automatique tous les 50 avocats (fiches reçues, dans l'ordre de l'annuaire)
+                if len(results) % 50 == 0:
+                    self.lawyers_data = [results[i] for i in sorted(results) if results[i]]
+                    self.save_data(suffix=f"_BACKUP_{len(results)}")
+                    self.logger.info(f"Sauvegarde automatique à {len(results)}/{total_lawyers} avocats")
+            
+            records = executor.map(lawyer_urls, on_result=collect)
+            self.lawyers_data = [lawyer_data for lawyer_data in records if lawyer_data]
+            self.processed_count = len(self.lawyers_data)
+            
+            executor.print_stats()
+            pool.print_stats()
             
             # Sauvegarde finale
             csv_file, json_file, email_file, report_file = self.save_data(suffix="_FINAL")
@@ -336,7 +289,9 @@ class RouenBarScraper:
             return []
         
         finally:
-            driver.quit()
+            if executor is not None:
+                executor.close()
+            pool.close()
 
 def main():
     """Fonction principale"""
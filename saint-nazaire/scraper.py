@@ -16,6 +16,8 @@ Auteur: Claude Code
 Date: Février 2026
 """
 
+import os
+import sys
 import time
 import csv
 import json
@@ -28,6 +30,9 @@ from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import re
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.checkpoint import CheckpointStore
+
 class SaintNazaireScraper:
     def __init__(self, headless=True):
         """
@@ -40,6 +45,7 @@ class SaintNazaireScraper:
         self.base_url = "https://www.barreau-saintnazaire.fr/les-avocats/lannuaire-des-avocats/page/{}"
         self.lawyers_data = []
         self.processed_lawyers = set()  # Pour éviter les doublons
+        self.checkpoint = CheckpointStore("SAINTNAZAIRE_checkpoint.jsonl", key='source')
         
     def setup_driver(self, headless=True):
         """Configure le driver Chrome avec les bonnes options"""
@@ -392,8 +398,11 @@ class SaintNazaireScraper:
             all_lawyer_links = list(set(all_lawyer_links))
             print(f"\n🎯 Total: {len(all_lawyer_links)} avocats uniques à traiter")
             
-            # Créer des sauvegardes régulières
-            backup_frequency = 20
+            # Reprise : les fiches déjà en checkpoint ne sont pas revisitées
+            if len(self.checkpoint):
+                self.lawyers_data = self.checkpoint.records()
+                all_lawyer_links = self.checkpoint.remaining(all_lawyer_links)
+                print(f"♻️  Reprise: {len(self.lawyers_data)} déjà extraits, {len(all_lawyer_links)} restants")
             
             # Extraire les détails de chaque avocat
             for i, lawyer_url in enumerate(all_lawyer_links, 1):
@@ -403,6 +412,7 @@ class SaintNazaireScraper:
                     
                     if lawyer_info:
                         self.lawyers_data.append(lawyer_info)
+                        self.checkpoint.append(lawyer_info)
                         print(f"✅ {lawyer_info['prenom']} {lawyer_info['nom']}")
                         
                         if lawyer_info['email']:
@@ -410,10 +420,6 @@ class SaintNazaireScraper:
                     else:
                         print("❌ Erreur extraction")
                     
-                    # Sauvegarde régulière
-                    if i % backup_frequency == 0:
-                        self.save_backup(i)
-                    
                     # Pause entre les requêtes
                     time.sleep(1)
                     
@@ -430,21 +436,6 @@ class SaintNazaireScraper:
         finally:
             self.driver.quit()
             
-    def save_backup(self, current_index):
-        """Créer une sauvegarde intermédiaire"""
-        if not self.lawyers_data:
-            return
-            
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"SAINTNAZAIRE_BACKUP_{len(self.lawyers_data)}sur{current_index}_{timestamp}.json"
-        
-        try:
-            with open(backup_filename, 'w', encoding='utf-8') as jsonfile:
-                json.dump(self.lawyers_data, jsonfile, ensure_ascii=False, indent=2)
-            print(f"   💾 Sauvegarde: {backup_filename}")
-        except Exception as e:
-            print(f"   ⚠️  Erreur sauvegarde: {e}")
-            
     def save_results(self):
         """Sauvegarder les résultats finaux"""
         if not self.lawyers_data:
@@ -525,6 +516,7 @@ def main():
         success = scraper.run_scraping()
         if success:
             scraper.save_results()
+            scraper.checkpoint.clear()
         else:
             print("❌ Échec du scraping")
     except KeyboardInterrupt:
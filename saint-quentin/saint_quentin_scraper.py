@@ -8,41 +8,24 @@ Version finale corrigée - récupère TOUS les détails avec navigation correcte
 import time
 import csv
 import json
+import os
+import sys
 import requests
 from datetime import datetime
-from bs4 import BeautifulSoup
 import re
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.async_fetch import AsyncFetchEngine
+from common.fast_html import parse_html
+from common.names import split_name
+
+# Politesse : pages individuelles en parallèle, débit plafonné sur le site du barreau
+MAX_PARALLEL = 4
+MAX_REQ_PER_SEC = 4.0
+
 def parse_lawyer_name_perfect(full_name_text):
-    """Parse parfait des noms d'avocats"""
-    text = full_name_text.replace("Maître", "").replace("Me", "").strip()
-    
-    # Format "MarcANTONINI"
-    match = re.search(r'^([A-Z][a-z]+(?:-[A-Z][a-z]+)*)([A-Z]+(?:-[A-Z]+)*)$', text)
-    if match:
-        return match.group(1), match.group(2)
-    
-    # Format "Jean-MarieWENZINGER" 
-    match2 = re.search(r'^([A-Z][a-z]+(?:-[A-Z][a-z]+)+)([A-Z]+)$', text)
-    if match2:
-        return match2.group(1), match2.group(2)
-    
-    # Format classique
-    parts = text.split()
-    if len(parts) >= 2:
-        for i, part in enumerate(parts):
-            if part.isupper() and len(part) > 1:
-                return " ".join(parts[:i]), " ".join(parts[i:])
-        if parts[-1].isupper():
-            return " ".join(parts[:-1]), parts[-1]
-    
-    # Tout collé
-    if len(text.split()) == 1 and len(text) > 3:
-        for i in range(2, len(text)-1):
-            if text[i].isupper() and text[i-1].islower():
-                return text[:i], text[i:]
-    
-    return text, ""
+    """Parse parfait des noms d'avocats ("Prénom NOM" ou collé : "MarcANTONINI")"""
+    return split_name(full_name_text, order='first_last')
 
 def clean_specialities_perfect(text):
     """Nettoie et organise les spécialités juridiques - VERSION ULTRA PARFAITE"""
@@ -133,8 +116,8 @@ def clean_specialities_perfect(text):
         'activites_dominantes': clean_specialites[2] if len(clean_specialites) > 2 else ''
     }
 
-def extract_contact_from_page_perfect(session, lawyer_url):
-    """Extraction parfaite depuis la page individuelle - URL corrigée"""
+def extract_contact_from_page_perfect(lawyer_url, html):
+    """Extraction parfaite depuis le HTML de la page individuelle"""
     contact_info = {
         'telephone': '',
         'fax': '',
@@ -147,12 +130,8 @@ def extract_contact_from_page_perfect(session, lawyer_url):
     }
     
     try:
-        print(f"   📄 Navigation: {lawyer_url}")
-        response = session.get(lawyer_url, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        page_text = soup.get_text()
+        print(f"   📄 Page: {lawyer_url}")
+        page_text = parse_html(html).get_text()
         
         # Téléphone - extraction améliorée
         phone_patterns = [
@@ -269,17 +248,18 @@ def scrape_saint_quentin_parfait():
         response = session.get(url, timeout=30)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        page = parse_html(response.content)
         print("✅ Page chargée")
         
         # Trouver tous les avocats
-        h4_elements = soup.find_all('h4')
+        h4_elements = page.select('h4')
         lawyer_h4s = [h4 for h4 in h4_elements if "Maître" in h4.get_text()]
         
         print(f"📊 {len(lawyer_h4s)} avocats détectés")
         print()
         
-        # Traiter chaque avocat
+        # Traiter chaque avocat (liste), les pages individuelles sont lues ensuite
+        individual_pages = []
         for i, h4 in enumerate(lawyer_h4s, 1):
             full_name = h4.get_text(strip=True)
             prenom, nom = parse_lawyer_name_perfect(full_name)
@@ -297,7 +277,7 @@ def scrape_saint_quentin_parfait():
             
             # Chercher le lien vers la page individuelle - VERSION CORRIGÉE
             individual_page_url = None
-            links = parent.find_all('a', href=True)
+            links = parent.select('a[href]')
             
             for link in links:
                 href = link.get('href', '')
@@ -336,10 +316,30 @@ def scrape_saint_quentin_parfait():
                 lawyer_data['competences'] = main_specialities_dict['competences']
                 lawyer_data['activites_dominantes'] = main_specialities_dict['activites_dominantes']
             
-            # Si lien vers page individuelle, l'explorer
+            # Si lien vers page individuelle, l'explorer (après la liste)
             if individual_page_url:
-                contact_details = extract_contact_from_page_perfect(session, individual_page_url)
-                
+                individual_pages.append((lawyer_data, individual_page_url))
+            else:
+                print(f"   ⚠️  Pas de lien trouvé")
+            
+            lawyers_data.append(lawyer_data)
+            print(f"   ✅ Ajouté")
+            print()
+        
+        # Pages individuelles téléchargées en parallèle (débit plafonné) au
+        # lieu d'un get + pause de 0,5 s par avocat
+        engine = AsyncFetchEngine(max_per_host=MAX_PARALLEL, rate_per_host=MAX_REQ_PER_SEC,
+                                  timeout=15, headers=dict(session.headers))
+        pages = engine.fetch_all([page_url for _, page_url in individual_pages],
+                                 lambda page_url, html: (page_url, extract_contact_from_page_perfect(page_url, html)))
+        contacts = dict(pages)
+        for page_url, error in engine.errors:
+            print(f"   ❌ Erreur {page_url}: {error}")
+        engine.print_stats()
+        
+        for lawyer_data, individual_page_url in individual_pages:
+            contact_details = contacts.get(individual_page_url)
+            if contact_details:
                 # Mettre à jour avec les détails trouvés
                 if contact_details['telephone']:
                     lawyer_data['telephone'] = contact_details['telephone']
@@ -357,17 +357,8 @@ def scrape_saint_quentin_parfait():
                     lawyer_data['activites_dominantes'] = contact_details['activites_dominantes']
                 if contact_details['structure']:
                     lawyer_data['structure'] = contact_details['structure']
-                
-                lawyer_data['source_url'] = individual_page_url
-            else:
-                print(f"   ⚠️  Pas de lien trouvé")
-            
-            lawyers_data.append(lawyer_data)
-            print(f"   ✅ Ajouté")
             
-            # Pause
-            time.sleep(0.5)
-            print()
+            lawyer_data['source_url'] = individual_page_url
     
     except Exception as e:
         print(f"❌ Erreur générale: {e}")
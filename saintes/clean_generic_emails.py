@@ -3,14 +3,25 @@
 
 """
 Script de nettoyage des emails génériques pour le Barreau de Saintes
-Ce script supprime les emails génériques qui apparaissent sur toutes les fiches
+Ce script supprime les emails génériques qui apparaissent sur toutes les fiches.
+Le CSV est lu ligne à ligne : un premier passage compte les emails dans un
+sketch de taille fixe, un second ne recompte que les candidats puis écrit
+les fichiers nettoyés. Le scraper fait déjà ce nettoyage à l'enregistrement ;
+ce script reste utile pour les anciens exports.
 """
 
-import pandas as pd
-from datetime import datetime
 import argparse
-import sys
+import csv
 import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.email_sketch import SharedEmailDetector, remove_emails, split_emails
+
+def _read_rows(csv_file):
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
 
 def clean_generic_emails(csv_file, threshold=50):
     """
@@ -32,68 +43,60 @@ def clean_generic_emails(csv_file, threshold=50):
         print(f"❌ Fichier non trouvé: {csv_file}")
         return None
     
-    # Charger le fichier
+    # Premier passage : sketch des emails, candidats au fil de l'eau
+    detector = SharedEmailDetector(threshold)
     try:
-        df = pd.read_csv(csv_file, encoding='utf-8')
-        print(f"📊 Chargé {len(df)} avocats")
+        with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames
+            for row in reader:
+                detector.observe(row.get('emails'))
+        print(f"📊 Chargé {detector.records} avocats")
     except Exception as e:
         print(f"❌ Erreur lors du chargement: {e}")
         return None
     
-    # Analyser la fréquence des emails
-    email_counts = {}
-    for emails_str in df['emails']:
-        if pd.notna(emails_str) and emails_str:
-            emails = [email.strip() for email in emails_str.split(';')]
-            for email in emails:
-                if email:
-                    email_counts[email] = email_counts.get(email, 0) + 1
-    
-    print(f"\n📈 Fréquence des emails:")
-    for email, count in sorted(email_counts.items(), key=lambda x: x[1], reverse=True):
+    # Comptes exacts des seuls candidats
+    candidate_counts = detector.exact_counts(row.get('emails') for row in _read_rows(csv_file))
+    print(f"\n📈 Fréquence des emails candidats:")
+    for email, count in sorted(candidate_counts.items(), key=lambda x: x[1], reverse=True):
         print(f"   {email}: {count} occurrences")
+    generic_counts = {email: count for email, count in candidate_counts.items() if count >= threshold}
     
     # Identifier les emails génériques
-    generic_emails = {email for email, count in email_counts.items() if count >= threshold}
+    generic_emails = set(generic_counts)
     print(f"\n🎯 Emails identifiés comme génériques: {generic_emails}")
     
-    # Fonction de nettoyage
-    def clean_emails_remove_generic(email_str):
-        if pd.isna(email_str) or not email_str:
-            return ""
-        
-        emails = [email.strip() for email in email_str.split(';')]
-        specific_emails = [email for email in emails if email and email not in generic_emails]
-        
-        return "; ".join(specific_emails) if specific_emails else ""
-    
-    # Appliquer le nettoyage
-    print(f"\n🧹 Suppression des emails génériques...")
-    df['emails'] = df['emails'].apply(clean_emails_remove_generic)
-    
-    # Compter les résultats
-    avocats_avec_emails = sum(1 for emails in df['emails'] if emails and pd.notna(emails))
-    
-    # Collecter tous les emails restants
-    all_remaining_emails = []
-    for emails_str in df['emails']:
-        if emails_str and pd.notna(emails_str):
-            all_remaining_emails.extend([email.strip() for email in emails_str.split(';')])
-    
-    unique_specific_emails = sorted(list(set([email for email in all_remaining_emails if email])))
-    
     # Générer les noms de fichiers de sortie
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     base_name = csv_file.replace('.csv', '')
-    
-    # Sauvegarder le fichier principal nettoyé
     clean_csv = f"{base_name}_CLEAN_{timestamp}.csv"
-    df.to_csv(clean_csv, index=False, encoding='utf-8')
+    specific_tmp = f"{base_name}_AVEC_EMAILS_SPECIFIQUES_{timestamp}.tmp"
     
-    # Créer un fichier avec seulement les avocats ayant des emails spécifiques
-    df_with_emails = df[df['emails'].notna() & (df['emails'] != "")].copy()
-    specific_csv = f"{base_name}_AVEC_EMAILS_SPECIFIQUES_{len(df_with_emails)}avocats_{timestamp}.csv"
-    df_with_emails.to_csv(specific_csv, index=False, encoding='utf-8')
+    # Second passage : écriture du fichier nettoyé et des avocats avec emails
+    print(f"\n🧹 Suppression des emails génériques...")
+    total = 0
+    avocats_avec_emails = 0
+    lawyers_by_email = {}
+    with open(clean_csv, 'w', encoding='utf-8', newline='') as clean_f, \
+         open(specific_tmp, 'w', encoding='utf-8', newline='') as specific_f:
+        clean_writer = csv.DictWriter(clean_f, fieldnames=fieldnames)
+        specific_writer = csv.DictWriter(specific_f, fieldnames=fieldnames)
+        clean_writer.writeheader()
+        specific_writer.writeheader()
+        for row in _read_rows(csv_file):
+            total += 1
+            row['emails'] = remove_emails(row.get('emails'), generic_emails)
+            clean_writer.writerow(row)
+            if row['emails']:
+                avocats_avec_emails += 1
+                specific_writer.writerow(row)
+                for email in split_emails(row['emails']):
+                    lawyers_by_email.setdefault(email, []).append(row.get('nom_complet', ''))
+    
+    specific_csv = f"{base_name}_AVEC_EMAILS_SPECIFIQUES_{avocats_avec_emails}avocats_{timestamp}.csv"
+    os.replace(specific_tmp, specific_csv)
+    unique_specific_emails = sorted(lawyers_by_email)
     
     # Fichier des emails spécifiques uniquement
     emails_file = f"{base_name}_EMAILS_SPECIFIQUES_{len(unique_specific_emails)}emails_{timestamp}.txt"
@@ -109,25 +112,20 @@ def clean_generic_emails(csv_file, threshold=50):
         
         f.write("EMAILS GÉNÉRIQUES SUPPRIMÉS:\n")
         f.write("-" * 30 + "\n")
-        for email in generic_emails:
-            f.write(f"• {email}\n")
+        for email, count in generic_counts.items():
+            f.write(f"• {email} ({count} fiches)\n")
         f.write("\n")
         
         f.write("RÉSULTATS FINAUX:\n")
         f.write("-" * 15 + "\n")
-        f.write(f"Nombre total d'avocats: {len(df)}\n")
+        f.write(f"Nombre total d'avocats: {total}\n")
         f.write(f"Avocats avec emails spécifiques: {avocats_avec_emails}\n")
         f.write(f"Emails spécifiques uniques: {len(unique_specific_emails)}\n\n")
         
         f.write("EMAILS SPÉCIFIQUES TROUVÉS:\n")
         f.write("-" * 27 + "\n")
         for i, email in enumerate(unique_specific_emails, 1):
-            # Trouver quel(s) avocat(s) ont cet email
-            avocats_avec_cet_email = []
-            for _, row in df.iterrows():
-                if row['emails'] and email in row['emails']:
-                    avocats_avec_cet_email.append(row['nom_complet'])
-            f.write(f"{i}. {email} → {', '.join(avocats_avec_cet_email)}\n")
+            f.write(f"{i}. {email} → {', '.join(lawyers_by_email[email])}\n")
         f.write("\n")
         
         f.write("FICHIERS GÉNÉRÉS:\n")
@@ -177,4 +175,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -8,6 +8,8 @@ Site: https://www.avocats-saintes.com/annuaire-des-avocats.html
 Ce script extrait tous les avocats de l'annuaire avec pagination automatique.
 """
 
+import os
+import sys
 import time
 import json
 import csv
@@ -22,13 +24,19 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import requests
 from urllib.parse import urljoin
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.email_sketch import SharedEmailDetector, remove_emails
+
 class SaintesLawyerScraper:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, generic_threshold=50):
         self.base_url = "https://www.avocats-saintes.com"
         self.directory_url = "https://www.avocats-saintes.com/annuaire-des-avocats.html"
         self.lawyers = []
         self.headless = headless
         self.driver = None
+        # Emails partagés par beaucoup de fiches, repérés pendant le scraping
+        self.email_detector = SharedEmailDetector(generic_threshold)
+        self.generic_emails = {}
         
     def setup_driver(self):
         """Configuration du driver Chrome"""
@@ -171,6 +179,8 @@ class SaintesLawyerScraper:
             emails = self.extract_emails_from_html(page_source)
             if emails:
                 lawyer_data['emails'] = '; '.join(emails)
+            for email in self.email_detector.observe(emails):
+                print(f"📧 Email générique probable: {email}")
             
             # Fermer l'onglet et revenir à l'annuaire
             self.driver.close()
@@ -254,12 +264,23 @@ class SaintesLawyerScraper:
             json.dump(self.lawyers, f, ensure_ascii=False, indent=2)
         print(f"💾 Backup: {backup_file}")
     
+    def remove_generic_emails(self):
+        """Retirer les emails génériques (comptes exacts des seuls candidats du sketch)"""
+        self.generic_emails = self.email_detector.confirm(lawyer.get('emails') for lawyer in self.lawyers)
+        if not self.generic_emails:
+            return
+        for lawyer in self.lawyers:
+            lawyer['emails'] = remove_emails(lawyer.get('emails'), self.generic_emails)
+        print(f"🧹 Emails génériques retirés: {', '.join(self.generic_emails)}")
+    
     def save_results(self, base_filename="SAINTES_COMPLET"):
         """Sauvegarder les résultats finaux"""
         if not self.lawyers:
             print("❌ Aucune donnée à sauvegarder")
             return
         
+        self.remove_generic_emails()
+        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # CSV
@@ -299,6 +320,12 @@ class SaintesLawyerScraper:
             f.write(f"- Emails uniques trouvés: {len(unique_emails)}\n")
             f.write(f"- Avocats avec emails: {sum(1 for l in self.lawyers if l.get('emails'))}\n\n")
             
+            if self.generic_emails:
+                f.write("EMAILS GÉNÉRIQUES SUPPRIMÉS:\n")
+                for email, count in self.generic_emails.items():
+                    f.write(f"- {email} ({count} fiches)\n")
+                f.write("\n")
+            
             if unique_emails:
                 f.write("EMAILS TROUVÉS:\n")
                 for i, email in enumerate(unique_emails, 1):
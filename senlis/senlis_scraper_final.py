@@ -4,8 +4,11 @@ Fixed web scraper for Senlis Lawyers Directory
 Based on actual website structure analysis
 """
 
+import argparse
 import json
 import csv
+import os
+import sys
 import time
 import logging
 from datetime import datetime
@@ -16,6 +19,10 @@ from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeo
 from bs4 import BeautifulSoup
 import random
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.lean_page import LeanMode
+from common.normalize import normalize_phone
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,10 +40,12 @@ class SenlisLawyersScraperFixed:
     Fixed scraper for Senlis Lawyers Directory using actual website structure
     """
     
-    def __init__(self):
+    def __init__(self, headless=False):
+        self.headless = headless
         self.base_url = "https://senlis-avocats.fr/besoin-dun-avocat/annuaire-des-avocats/"
         self.lawyers_data = []
         self.failed_extractions = []
+        self.lean = LeanMode(first_party=self.base_url)
         
     def random_delay(self, min_seconds: float = 0.5, max_seconds: float = 2.0):
         """Add random delay to mimic human behavior"""
@@ -58,23 +67,7 @@ class SenlisLawyersScraperFixed:
     
     def extract_phone(self, text: str) -> Optional[str]:
         """Extract and format phone number"""
-        # Look for French phone number patterns
-        phone_patterns = [
-            r'0[1-9](?:[\s\-\.]*\d{2}){4}',  # 01 23 45 67 89
-            r'\+33[1-9](?:[\s\-\.]*\d{2}){4}',  # +33 1 23 45 67 89
-            r'\d{2}[\s\-\.]\d{2}[\s\-\.]\d{2}[\s\-\.]\d{2}[\s\-\.]\d{2}'
-        ]
-        
-        for pattern in phone_patterns:
-            match = re.search(pattern, text)
-            if match:
-                # Clean and format the phone number
-                phone = re.sub(r'[^\d+]', '', match.group(0))
-                if phone.startswith('+33'):
-                    return phone
-                elif phone.startswith('0') and len(phone) == 10:
-                    return ' '.join([phone[i:i+2] for i in range(0, 10, 2)])
-        return None
+        return normalize_phone(text)
     
     def scrape_page(self, page, page_num: int = 1) -> List[Dict]:
         """Scrape all lawyers from a single page"""
@@ -91,6 +84,7 @@ class SenlisLawyersScraperFixed:
             
             # Navigate to the page
             page.goto(url, wait_until='networkidle', timeout=30000)
+            self.lean.measure_sync(page)
             self.random_delay(2, 3)
             
             # Wait for the page content to load
@@ -250,7 +244,8 @@ class SenlisLawyersScraperFixed:
     def get_total_pages(self, page) -> int:
         """Determine the total number of pages"""
         try:
-            page.goto(self.base_url, wait_until='networkidle')
+            # Première page chargée en entier : référence du mode page légère
+            self.lean.calibrate_sync(page, self.base_url, wait_until='networkidle')
             content = page.content()
             soup = BeautifulSoup(content, 'html.parser')
             
@@ -323,7 +318,7 @@ class SenlisLawyersScraperFixed:
         
         with sync_playwright() as p:
             browser = p.chromium.launch(
-                headless=False,  # Keep visible for debugging
+                headless=self.headless,  # Visible for debugging unless --headless
                 args=[
                     '--disable-blink-features=AutomationControlled',
                     '--disable-dev-shm-usage',
@@ -336,6 +331,8 @@ class SenlisLawyersScraperFixed:
                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 locale='fr-FR'
             )
+            # Images, CSS, polices et traceurs bloqués : seul le HTML est lu
+            self.lean.attach_sync(context)
             
             page = context.new_page()
             
@@ -360,6 +357,7 @@ class SenlisLawyersScraperFixed:
                 
                 # Save final results
                 self.save_final_results()
+                self.lean.stats.print_stats()
                 
             except Exception as e:
                 logger.error(f"Critical error during scraping: {str(e)}")
@@ -401,8 +399,11 @@ class SenlisLawyersScraperFixed:
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Senlis lawyers directory scraper")
+    parser.add_argument('--headless', action='store_true', help="Run the browser without a window (servers, batch runs)")
+    args = parser.parse_args()
     try:
-        scraper = SenlisLawyersScraperFixed()
+        scraper = SenlisLawyersScraperFixed(headless=args.headless)
         scraper.run()
     except KeyboardInterrupt:
         logger.info("\nScraping interrupted by user")
@@ -24,11 +24,19 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
 import json
 import csv
+import os
+import sys
 import time
 import re
 from datetime import datetime
 import logging
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.consent import ConsentSeed
+
+# Choix tarteaucitron posé avant la première page : aucun bandeau à cliquer
+CONSENT = ConsentSeed("https://www.avocats-tarbes.fr", frameworks=('tarteaucitron',))
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -44,6 +52,7 @@ class TarbesScraper:
         self.base_url = "https://www.avocats-tarbes.fr/annuaire/liste/tous/toutes/"
         self.headless = headless
         self.driver = None
+        self.consent_seeded = False
         self.lawyers = []
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -60,6 +69,7 @@ class TarbesScraper:
         
         self.driver = webdriver.Chrome(options=chrome_options)
         self.driver.implicitly_wait(10)
+        self.consent_seeded = CONSENT.attach_selenium(self.driver)
         logging.info("Driver Chrome configuré")
 
     def accept_cookies(self):
@@ -243,7 +253,7 @@ class TarbesScraper:
             self.driver.get(url)
             time.sleep(3)
             
-            if page_num == 1:
+            if page_num == 1 and not self.consent_seeded:
                 self.accept_cookies()
             
             # Attendre que les avocats se chargent
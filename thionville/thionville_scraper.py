@@ -13,6 +13,8 @@ Arguments:
     --headless  Mode sans interface graphique (défaut: True)
 """
 
+import os
+import sys
 import requests
 from bs4 import BeautifulSoup
 import json
@@ -29,10 +31,50 @@ from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
 import logging
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.field_rules import FieldRules, length_between, stripped
+from common.names import split_name
+from common.normalize import split_phone
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+_COORDINATES_ADDRESS_RE = re.compile(r'(.+?)\s*-\s*(\d{5})\s+([A-Z\s]+)')
+
+
+def _split_coordinates(block):
+    """(adresse, code postal, ville) du bloc "Coordonnées", ou None"""
+    match = _COORDINATES_ADDRESS_RE.search(block)
+    if not match:
+        return None
+    return match.group(1).strip(), match.group(2), match.group(3).strip()
+
+
+# Champs de la page profil, extraits en un seul passage sur le texte.
+# `matches` garde la sémantique d'origine : les 2 premiers matches de chaque
+# motif (re.findall(...)[:2]) puis le filtre de longueur, et seul le premier
+# bloc "Coordonnées" est lu (re.search).
+PROFILE_RULES = FieldRules([
+    {'field': 'email', 'pattern': r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'},
+    {'field': 'specialisations', 'label': r'spécialis(?:é|ation)(?:e)?', 'pattern': r'\s*:?\s*([^.\n]+)',
+     'flags': re.I, 'post': (stripped(',;.'), length_between(5, 100)), 'multi': 2, 'matches': 2, 'join': '; '},
+    {'field': 'specialisations', 'label': r'compétence(?:s)?', 'pattern': r'\s*:?\s*([^.\n]+)',
+     'flags': re.I, 'post': (stripped(',;.'), length_between(5, 100)), 'multi': 2, 'matches': 2, 'join': '; '},
+    {'field': 'specialisations', 'label': r'domaine(?:s)?\s*d[\'e]\s*(?:intervention|compétence)',
+     'pattern': r'\s*:?\s*([^.\n]+)', 'flags': re.I,
+     'post': (stripped(',;.'), length_between(5, 100)), 'multi': 2, 'matches': 2, 'join': '; '},
+    {'field': 'structure', 'label': r'cabinet', 'pattern': r'\s+([^.\n]+)', 'flags': re.I,
+     'post': (stripped(',;.'), length_between(5, 80))},
+    {'field': 'structure', 'label': r'étude', 'pattern': r'\s+([^.\n]+)', 'flags': re.I,
+     'post': (stripped(',;.'), length_between(5, 80))},
+    {'field': 'structure', 'label': r'scp', 'pattern': r'\s+([^.\n]+)', 'flags': re.I,
+     'post': (stripped(',;.'), length_between(5, 80))},
+    {'field': ('adresse', 'code_postal', 'ville'), 'label': r'Coordonnées',
+     'pattern': r'\s+(.*?)(?=\n\n|\s{3,}|$)', 'flags': re.I | re.DOTALL, 'group': 1,
+     'post': _split_coordinates, 'matches': 1},
+])
+
 class ThionvilleScraper:
     """Scraper pour le Barreau de Thionville"""
     
@@ -98,51 +140,7 @@ class ThionvilleScraper:
         """Parse un texte comme 'MULLERChristian' en nom et prénom séparés"""
         if not combined_text:
             return '', ''
-        
-        # Nettoyer le texte
-        cleaned = combined_text.strip()
-        
-        # Pattern pour séparer NOMPrénom
-        # Le nom est généralement en majuscules, le prénom commence par une majuscule
-        patterns = [
-            r'^([A-Z]{2,}[A-Z\-]*)\s*([A-Z][a-z\-]+(?:\s*[A-Z][a-z\-]+)*)$',  # MULLERChristian
-            r'^([A-Z][A-Z\-]+)\s*([A-Z][a-z\-]+(?:\-[A-Z][a-z\-]+)*)$',        # MARTIN Jean-Pierre
-            r'^([A-Z\-]+)\s*([A-Z][a-z]+(?:\s[A-Z][a-z]+)*)$'                   # DUPONT Marie Anne
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, cleaned)
-            if match:
-                nom = match.group(1).strip()
-                prenom = match.group(2).strip()
-                
-                # Vérification que c'est cohérent
-                if len(nom) >= 2 and len(prenom) >= 2:
-                    return prenom, nom
-        
-        # Si pas de match, essayer une séparation heuristique
-        # Chercher la transition majuscule -> minuscule
-        for i in range(1, len(cleaned)):
-            if (cleaned[i-1].isupper() and 
-                cleaned[i].isupper() and 
-                i < len(cleaned) - 1 and 
-                cleaned[i+1].islower()):
-                
-                nom = cleaned[:i+1].strip()
-                prenom = cleaned[i+1:].strip()
-                
-                if len(nom) >= 2 and len(prenom) >= 2:
-                    return prenom, nom
-        
-        # Dernière tentative : séparer sur le premier caractère minuscule après des majuscules
-        match = re.match(r'^([A-Z\-]+)([A-Z][a-z].*)$', cleaned)
-        if match:
-            nom = match.group(1).strip()
-            prenom = match.group(2).strip()
-            return prenom, nom
-        
-        # Si rien ne marche, retourner tel quel
-        return '', cleaned
+        return split_name(combined_text, order='last_first')
 
     def extract_lawyers_from_page(self, url):
         """Extrait tous les avocats d'une page"""
@@ -255,19 +253,8 @@ class ThionvilleScraper:
 
     def parse_phone_fax(self, phone_text):
         """Sépare téléphone et fax depuis un texte comme '03.82.53.38.2403.82.51.32.62'"""
-        if not phone_text:
-            return '', ''
-        
-        # Chercher des patterns de numéros français
-        phone_pattern = r'(0[1-9](?:[.\s]?\d{2}){4})'
-        numbers = re.findall(phone_pattern, phone_text)
-        
-        if len(numbers) >= 2:
-            return numbers[0], numbers[1]
-        elif len(numbers) == 1:
-            return numbers[0], ''
-        else:
-            return phone_text[:14], phone_text[14:] if len(phone_text) > 14 else ''
+        telephone, fax = split_phone(phone_text, separator='.')
+        return telephone or '', fax or ''
 
     def parse_address(self, address_text):
         """Sépare adresse et ville depuis un texte comme '14 avenue de GaulleTHIONVILLE'"""
@@ -360,14 +347,14 @@ class ThionvilleScraper:
                 text_content = soup.get_text()
                 
                 # Extraire des informations supplémentaires
-                lawyer['email'] = self.extract_email(text_content)
-                lawyer['specialisations'] = self.extract_specializations(text_content)
-                lawyer['structure'] = self.extract_structure(text_content)
+                fields = self.extract_profile_fields(text_content)
+                lawyer['email'] = fields['email']
+                lawyer['specialisations'] = fields['specialisations']
+                lawyer['structure'] = fields['structure']
                 
                 # Mettre à jour les coordonnées si disponibles
-                detailed_coords = self.extract_detailed_coordinates(text_content)
-                if detailed_coords['adresse']:
-                    lawyer.update(detailed_coords)
+                if fields['adresse']:
+                    lawyer.update({key: fields[key] for key in ('adresse', 'ville', 'code_postal')})
                 
             except Exception as e:
                 logger.error(f"❌ Erreur enrichissement {lawyer['nom_complet']}: {e}")
@@ -375,68 +362,11 @@ class ThionvilleScraper:
         
         return lawyers_data
 
-    def extract_email(self, text_content):
-        """Extrait l'email depuis le contenu de la page"""
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        matches = re.findall(email_pattern, text_content)
-        return matches[0] if matches else ''
-
-    def extract_specializations(self, text_content):
-        """Extrait les spécialisations"""
-        patterns = [
-            r'spécialis(?:é|ation)(?:e)?\s*:?\s*([^.\n]+)',
-            r'compétence(?:s)?\s*:?\s*([^.\n]+)',
-            r'domaine(?:s)?\s*d[\'e]\s*(?:intervention|compétence)\s*:?\s*([^.\n]+)'
-        ]
-        
-        specializations = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text_content, re.I)
-            for match in matches[:2]:  # Limiter à 2
-                cleaned = match.strip().rstrip(',;.')
-                if 5 < len(cleaned) < 100:
-                    specializations.append(cleaned)
-        
-        return '; '.join(specializations)
-
-    def extract_structure(self, text_content):
-        """Extrait la structure/cabinet"""
-        patterns = [
-            r'cabinet\s+([^.\n]+)',
-            r'étude\s+([^.\n]+)',
-            r'scp\s+([^.\n]+)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text_content, re.I)
-            for match in matches:
-                cleaned = match.strip().rstrip(',;.')
-                if 5 < len(cleaned) < 80:
-                    return cleaned
-        
-        return ''
-
-    def extract_detailed_coordinates(self, text_content):
-        """Extrait les coordonnées détaillées depuis la page profil"""
-        coords = {'adresse': '', 'ville': '', 'code_postal': ''}
-        
-        # Chercher le bloc coordonnées
-        coord_pattern = r'Coordonnées\s+(.*?)(?=\n\n|\s{3,}|$)'
-        match = re.search(coord_pattern, text_content, re.I | re.DOTALL)
-        
-        if match:
-            coord_text = match.group(1)
-            
-            # Extraire adresse, code postal et ville
-            addr_pattern = r'(.+?)\s*-\s*(\d{5})\s+([A-Z\s]+)'
-            addr_match = re.search(addr_pattern, coord_text)
-            
-            if addr_match:
-                coords['adresse'] = addr_match.group(1).strip()
-                coords['code_postal'] = addr_match.group(2)
-                coords['ville'] = addr_match.group(3).strip()
-        
-        return coords
+    def extract_profile_fields(self, text_content):
+        """Email, spécialisations, structure et coordonnées détaillées (PROFILE_RULES)"""
+        defaults = {'email': '', 'specialisations': '', 'structure': '',
+                    'adresse': '', 'ville': '', 'code_postal': ''}
+        return PROFILE_RULES.extract(text_content, defaults)
 
     def save_results(self, lawyers_data, mode="PRODUCTION"):
         """Sauvegarde finale avec tous les formats"""
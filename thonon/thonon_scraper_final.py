@@ -8,6 +8,7 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+import argparse
 import time
 import json
 import csv
@@ -15,9 +16,10 @@ from datetime import datetime
 import re
 
 class ThononUltimateScraper:
-    def __init__(self):
+    def __init__(self, headless=False):
         self.base_url = "https://public.barreau-thonon.fr/lannuaire/"
         self.lawyers = {}
+        self.headless = headless
         self.setup_driver()
     
     def setup_driver(self):
@@ -26,8 +28,9 @@ class ThononUltimateScraper:
         options.add_argument('--disable-blink-features=AutomationControlled')
         options.add_experimental_option("excludeSwitches", ["enable-automation"]) 
         options.add_experimental_option('useAutomationExtension', False)
-        # Mode visible pour debug
-        # options.add_argument('--headless')
+        # Mode visible pour debug, sans interface avec --headless
+        if self.headless:
+            options.add_argument('--headless')
         
         self.driver = webdriver.Chrome(options=options)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
@@ -314,7 +317,10 @@ class ThononUltimateScraper:
 
 def main():
     """Fonction principale"""
-    scraper = ThononUltimateScraper()
+    parser = argparse.ArgumentParser(description="Scraper du barreau de Thonon")
+    parser.add_argument('--headless', action='store_true', help="Navigateur sans interface (serveur, lancement groupé)")
+    args = parser.parse_args()
+    scraper = ThononUltimateScraper(headless=args.headless)
     
     try:
         # Extraction
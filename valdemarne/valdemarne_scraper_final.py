@@ -8,6 +8,8 @@ Version corrigée avec pagination forcée - Sans cache Python
 import requests
 from bs4 import BeautifulSoup
 import json
+import os
+import sys
 import time
 import csv
 from datetime import datetime
@@ -16,6 +18,10 @@ from urllib.parse import urljoin
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.http_cache import ResponseCache, install_cache
+from common.email_decoder import decode_js_email
+
 class ValdeMarneProductionFinalScraper:
     def __init__(self):
         self.base_url = "https://avocats-valdemarne.com"
@@ -30,6 +36,9 @@ class ValdeMarneProductionFinalScraper:
         }
         self.session.headers.update(self.headers)
         
+        # Cache disque : chaque relance revalide les 69 pages et les fiches (304)
+        self.cache = install_cache(self.session, ResponseCache(ttl=0))
+        
     def get_lawyers_urls_from_page(self, page_num):
         """Récupère les URLs des avocats d'une page spécifique"""
         try:
@@ -59,42 +68,8 @@ class ValdeMarneProductionFinalScraper:
             
     def decode_email_from_script(self, script_text):
         """Décode l'email depuis le JavaScript d'obfuscation"""
-        try:
-            # Pattern amélioré pour extraire les variables du script
-            addy_match = re.search(r"var addy[^=]*=\s*'([^']+)'", script_text)
-            if not addy_match:
-                return None
-                
-            local_part = addy_match.group(1)
-            
-            # Chercher la partie domaine
-            domain_match = re.search(r"addy[^=]*=\s*addy[^+]*\+\s*'([^']+)'", script_text)
-            if not domain_match:
-                return None
-                
-            domain_part = domain_match.group(1)
-            
-            # Décoder les entités HTML
-            html_entities = {
-                '&#97;': 'a', '&#117;': 'u', '&#64;': '@', '&#105;': 'i',
-                '&#46;': '.', '&#111;': 'o', '&#101;': 'e', '&#114;': 'r',
-                '&#110;': 'n', '&#115;': 's', '&#99;': 'c', '&#109;': 'm',
-                '&#108;': 'l', '&#116;': 't', '&#118;': 'v', '&#102;': 'f'
-            }
-            
-            for entity, char in html_entities.items():
-                local_part = local_part.replace(entity, char)
-                domain_part = domain_part.replace(entity, char)
-            
-            email = local_part + domain_part
-            
-            # Validation basique de l'email
-            if '@' in email and '.' in email.split('@')[1]:
-                return email
-                
-        except Exception:
-            pass
-        return None
+        result = decode_js_email(script_text)
+        return result['email'] if result else None
         
     def extract_lawyer_details(self, lawyer_url, retry_count=0):
         """Extrait les détails d'un avocat depuis sa page"""
@@ -387,6 +362,7 @@ class ValdeMarneProductionFinalScraper:
                 print(f"\n📁 Fichiers générés:")
                 print(f"  • {json_filename}")
                 print(f"  • {csv_filename}")
+                self.cache.print_stats()
                 
             return all_lawyers
             
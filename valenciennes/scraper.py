@@ -12,7 +12,7 @@ import time
 import json
 import csv
 import re
-import html
+import os
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -20,11 +20,18 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.chrome.options import Options
-from urllib.parse import urljoin, unquote
+from urllib.parse import urljoin
 import requests
 from bs4 import BeautifulSoup
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.browser_pool import BrowserPool
+from common.email_decoder import decode_email
+
+# Fiche suivante préchargée dans un onglet de fond pendant la pause entre fiches
+PREFETCH_TABS = 2
+
 def setup_driver(headless=True):
     """Configure le driver Chrome avec les bonnes options."""
     options = Options()
@@ -46,26 +53,6 @@ def setup_driver(headless=True):
     
     return driver
 
-def decode_email(encoded_email):
-    """Décode les emails encodés en HTML entities."""
-    if not encoded_email:
-        return None
-    
-    # Décoder les entités HTML numériques (%xx)
-    decoded = unquote(encoded_email)
-    
-    # Décoder les entités HTML standard
-    decoded = html.unescape(decoded)
-    
-    # Nettoyer les espaces
-    decoded = decoded.strip()
-    
-    # Valider le format email
-    if '@' in decoded and '.' in decoded:
-        return decoded
-    
-    return encoded_email  # Retourner l'original si le décodage échoue
-
 def extract_lawyer_links(base_url):
     """Extrait tous les liens uniques vers les fiches d'avocats."""
     print("\n=== EXTRACTION DES LIENS VERS LES FICHES ===\n")
@@ -178,7 +165,7 @@ def extract_lawyer_details(driver, lawyer_info, retry_count=3):
                 mailto = soup.find('a', href=re.compile(r'^mailto:'))
                 if mailto:
                     email = mailto['href'].replace('mailto:', '').strip()
-                    email = decode_email(email)
+                    email = decode_email(email, default=email)
                     details['email'] = email
                 else:
                     # Méthode 2: chercher dans le texte
@@ -187,7 +174,7 @@ def extract_lawyer_details(driver, lawyer_info, retry_count=3):
                     email_pattern = r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}'
                     emails = re.findall(email_pattern, text_content)
                     if emails:
-                        details['email'] = decode_email(emails[0])
+                        details['email'] = decode_email(emails[0], default=emails[0])
             except:
                 pass
             
@@ -368,8 +355,8 @@ def main():
         lawyer_links = lawyer_links[:20]
         print(f"\n⚠ MODE TEST : Limitation à {len(lawyer_links)} avocats")
     
-    # 2. Configurer le driver
-    driver = setup_driver(headless=True)
+    # 2. Navigateur chaud prêté fiche par fiche, recyclé toutes les 200 pages
+    pool = BrowserPool(tabs=PREFETCH_TABS, driver_factory=lambda: setup_driver(headless=True))
     
     try:
         print(f"\n=== EXTRACTION DES DÉTAILS DES AVOCATS ===")
@@ -381,7 +368,9 @@ def main():
         for idx, lawyer_info in enumerate(lawyer_links, 1):
             print(f"{idx}/{len(lawyer_links)} - {lawyer_info['nom_complet']}...", end='')
             
-            details = extract_lawyer_details(driver, lawyer_info)
+            with pool.lease(lawyer_info['url']) as driver:
+                details = extract_lawyer_details(driver, lawyer_info)
+                driver.prefetch([link['url'] for link in lawyer_links[idx:idx + PREFETCH_TABS - 1]])
             
             # Vérifier qu'on a les infos essentielles
             if details.get('email') or details.get('telephone'):
@@ -510,9 +499,10 @@ def main():
         print(f"Avec année de serment: {len([l for l in lawyers_data if l.get('annee_serment')])} ({len([l for l in lawyers_data if l.get('annee_serment')])/len(lawyers_data)*100:.0f}%)")
         
         print(f"\n✓ Scraper terminé avec succès.")
+        pool.print_stats()
         
     finally:
-        driver.quit()
+        pool.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -16,6 +16,7 @@ URL source: https://www.avocats-vienne.com/annuaire
 
 Usage:
     python3 vienne_scraper.py
+    python3 -m common.network_capture record vienne/vienne_scraper.py   # capture réseau → gabarit HTTP
     
 Dépendances:
     pip install selenium beautifulsoup4 requests
@@ -27,6 +28,8 @@ Fichiers générés:
     - VIENNE_FINAL_[nombre]_avocats_[timestamp]_rapport.txt (rapport détaillé)
 """
 
+import os
+import sys
 import requests
 from bs4 import BeautifulSoup
 import json
@@ -42,6 +45,9 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import random
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.names import split_name
+
 class VienneBarScraper:
     """Scraper pour le barreau de Vienne"""
     
@@ -184,77 +190,10 @@ class VienneBarScraper:
     
     def extract_name_correctly(self, full_name_text):
         """🔧 EXTRACTION CORRECTE DES NOMS COMPOSÉS"""
-        prenom = ""
-        nom = ""
-        
         if not full_name_text:
-            return prenom, nom
-        
-        # Nettoyer le texte
-        clean_name = full_name_text.replace('Maître', '').replace('Me ', '').strip()
-        
-        # Patterns spécialisés pour prénoms composés
-        name_patterns = [
-            # Pattern 1: NOM Prénom-Composé (ex: LEVEQUE Pierre-Lyonel)
-            r'^([A-ZÀ-Ÿ\-]+(?:\s+[A-ZÀ-Ÿ\-]+)*)\s+([A-ZÀ-Ÿ][a-zà-ÿ\-]+(?:\-[A-ZÀ-Ÿ][a-zà-ÿ\-]+)+)$',
-            
-            # Pattern 2: Prénom-Composé NOM (ex: Pierre-Lyonel LEVEQUE)  
-            r'^([A-ZÀ-Ÿ][a-zà-ÿ\-]+(?:\-[A-ZÀ-Ÿ][a-zà-ÿ\-]+)+)\s+([A-ZÀ-Ÿ\-]+(?:\s+[A-ZÀ-Ÿ\-]+)*)$',
-            
-            # Pattern 3: NOM Prénom (ex: BADIN Pierre)
-            r'^([A-ZÀ-Ÿ\-]+(?:\s+[A-ZÀ-Ÿ\-]+)*)\s+([A-ZÀ-Ÿ][a-zà-ÿ\-]+)$',
-            
-            # Pattern 4: Prénom NOM (ex: Pierre BADIN)
-            r'^([A-ZÀ-Ÿ][a-zà-ÿ\-]+)\s+([A-ZÀ-Ÿ\-]+(?:\s+[A-ZÀ-Ÿ\-]+)*)$',
-        ]
-        
-        for i, pattern in enumerate(name_patterns):
-            match = re.search(pattern, clean_name)
-            if match:
-                part1, part2 = match.groups()
-                part1 = part1.strip()
-                part2 = part2.strip()
-                
-                # Logique de décision
-                if part1.isupper() and not part2.isupper():
-                    nom = part1
-                    prenom = part2
-                elif part2.isupper() and not part1.isupper():
-                    prenom = part1
-                    nom = part2
-                elif '-' in part1 and part2.isupper():
-                    prenom = part1
-                    nom = part2
-                elif '-' in part2 and part1.isupper():
-                    nom = part1
-                    prenom = part2
-                elif '-' in part1:
-                    prenom = part1
-                    nom = part2
-                elif '-' in part2:
-                    nom = part1
-                    prenom = part2
-                else:
-                    prenom = part1
-                    nom = part2
-                break
-        
-        # Approche de secours si aucun pattern ne fonctionne
-        if not prenom and not nom:
-            words = clean_name.split()
-            if len(words) >= 2:
-                for i, word in enumerate(words):
-                    if word.isupper() and len(word) > 1:
-                        nom = ' '.join(words[i:])
-                        prenom = ' '.join(words[:i])
-                        break
-                
-                if not nom:
-                    mid = len(words) // 2
-                    prenom = ' '.join(words[:mid]) if mid > 0 else words[0]
-                    nom = ' '.join(words[mid:])
-        
-        return prenom.strip(), nom.strip()
+            return "", ""
+        # "LEVEQUE Pierre-Lyonel" comme "Pierre-Lyonel LEVEQUE" : la casse décide
+        return split_name(full_name_text, order='first_last')
     
     def extract_lawyer_info_from_detail_page(self, url):
         """📋 Extrait toutes les informations depuis la page de détail"""